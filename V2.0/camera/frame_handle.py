@@ -0,0 +1,162 @@
+"""
+Frame Handle
+
+Zero-copy access to a Picamera2 capture. ``capture_array`` copies the
+frame out of the camera's DMA buffer; a FrameHandle instead keeps the
+request (``capture_request``) and exposes a read-only view of its mapped
+buffer, which encoders and storage read directly. The buffer returns to
+the camera when the handle is released, so consumers must call
+``release()`` (or use the handle as a context manager) as soon as they
+are done. ``detach()`` makes a single private copy for consumers that
+need the pixels longer.
+
+Brightness is measured on the lores stream or on subsampled pixels, so no
+full-resolution copy is made just to decide on preview enhancement.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Every Nth pixel in each direction for subsampled statistics
+BRIGHTNESS_STEP = 8
+
+
+def subsampled_brightness(image: np.ndarray, step: int = BRIGHTNESS_STEP) -> float:
+    """Mean pixel value of every ``step``-th row and column (no full-frame pass)"""
+    return float(image[::step, ::step].mean())
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class FrameHandle:
+    """
+    Read-only view of one captured frame, backed by the camera buffer
+
+    Args:
+        request: Picamera2 CompletedRequest (None for an owned array)
+        stream: Stream name to map ('main')
+        array: Frame pixels when no request is held
+    """
+
+    def __init__(self, request: Any = None, stream: str = 'main', array: Optional[np.ndarray] = None):
+        self._request = request
+        self._mapped = None
+        self._lock = threading.Lock()
+        self.stream = stream
+        self.metadata: Dict[str, Any] = {}
+
+        if request is not None:
+            from picamera2 import MappedArray
+
+            self._mapped = MappedArray(request, stream)
+            array = self._mapped.__enter__().array
+            try:
+                self.metadata = request.get_metadata() or {}
+            except Exception:
+                self.metadata = {}
+
+        if array is None:
+            raise ValueError("FrameHandle needs a request or an array")
+        self._owned = array if request is None else None
+        self._array = _read_only(array)
+
+    @classmethod
+    def capture(cls, camera, stream: str = 'main') -> 'FrameHandle':
+        """Capture from a Picamera2 camera, holding its buffer when supported"""
+        if hasattr(camera, 'capture_request'):
+            try:
+                return cls(camera.capture_request(), stream)
+            except ImportError:
+                pass  # No MappedArray in this picamera2 build: copy instead
+        return cls(array=camera.capture_array(stream))
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> 'FrameHandle':
+        return cls(array=array)
+
+    @property
+    def held(self) -> bool:
+        """True while a camera buffer is held"""
+        return self._request is not None
+
+    @property
+    def array(self) -> np.ndarray:
+        if self._array is None:
+            raise ValueError("Frame handle already released")
+        return self._array
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+    def memoryview(self) -> memoryview:
+        """Read-only buffer over the frame pixels"""
+        return memoryview(self.array)
+
+    def brightness(self, lores_stream: Optional[str] = 'lores') -> float:
+        """Mean brightness from the lores Y plane if available, else subsampled pixels"""
+        if self._request is not None and lores_stream:
+            try:
+                from picamera2 import MappedArray
+
+                with MappedArray(self._request, lores_stream) as lores:
+                    # YUV420: the first two thirds of the rows are the Y plane
+                    y_rows = lores.array.shape[0] * 2 // 3
+                    return float(lores.array[:y_rows].mean())
+            except Exception:
+                pass
+        return subsampled_brightness(self.array)
+
+    def detach(self) -> np.ndarray:
+        """Copy the pixels into private memory and release the camera buffer"""
+        if self._request is None and self._owned is not None:
+            array = self._owned  # Already private - no copy needed
+        else:
+            array = np.array(self.array, copy=True)
+        self.release()
+        return array
+
+    def release(self):
+        """Return the buffer to the camera (idempotent)"""
+        with self._lock:
+            mapped, request = self._mapped, self._request
+            self._mapped = self._request = None
+            self._array = self._owned = None
+
+        if mapped is not None:
+            try:
+                mapped.__exit__(None, None, None)
+            except Exception as e:
+                logger.debug(f"CAMERA: Unmapping frame buffer failed: {e}")
+        if request is not None:
+            try:
+                request.release()
+            except Exception as e:
+                logger.warning(f"CAMERA: Releasing capture request failed: {e}")
+
+    def __enter__(self) -> 'FrameHandle':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def __del__(self):
+        # Safety net so a dropped handle cannot starve the camera of buffers
+        if getattr(self, '_request', None) is not None:
+            self.release()
@@ -0,0 +1,45 @@
+"""
+Preview JPEG Output
+
+File-like sink for Picamera2's MJPEGEncoder. The encoder writes one complete
+JPEG per frame; this output keeps only the newest one so the web preview can
+serve encoder bytes directly without any Python-side encoding.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import io
+import threading
+from typing import Optional, Tuple
+
+
+class PreviewJpegOutput(io.BufferedIOBase):
+    """Holds the most recent JPEG frame written by an encoder"""
+
+    def __init__(self):
+        super().__init__()
+        self._condition = threading.Condition()
+        self._frame: Optional[bytes] = None
+        self._sequence = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, buf) -> int:
+        with self._condition:
+            self._frame = bytes(buf)
+            self._sequence += 1
+            self._condition.notify_all()
+        return len(buf)
+
+    def latest(self) -> Tuple[int, Optional[bytes]]:
+        """Return (sequence, jpeg bytes) of the newest frame"""
+        with self._condition:
+            return self._sequence, self._frame
+
+    def wait_for_frame(self, after_sequence: int, timeout: float = 0.5) -> Tuple[int, Optional[bytes]]:
+        """Wait for a frame newer than ``after_sequence`` (returns latest on timeout)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence != after_sequence, timeout=timeout)
+            return self._sequence, self._frame
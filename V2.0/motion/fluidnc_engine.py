@@ -0,0 +1,1072 @@
+#!/usr/bin/env python3
+"""
+FluidNC Engine
+
+The single FluidNC communication engine every motion controller facade
+wraps: serial reader, ordered command replies, status cache, motion
+completion and homing detection. It grew out of the fixed simplified
+protocol (which it replaces - ``motion.simplified_fluidnc_protocol_fixed``
+is kept as an alias) and adds an asyncio API for async callers.
+
+The serial reader stays a dedicated thread: pyserial is blocking, and the
+thread lets synchronous callers (scripts, the streamer) share the same
+engine. Async callers use ``execute``/``wait_until_idle``/``home`` and
+``status_updates``, which never block the event loop.
+
+Author: Scanner System Redesign  
+Created: September 24, 2025
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import serial
+from collections import deque
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Tuple, Deque
+from dataclasses import dataclass, field
+
+from motion.status_report import StatusDispatcher, StatusParser, StatusReport
+
+logger = logging.getLogger(__name__)
+
+
+# Status reports are immutable records from the fast parser
+FluidNCStatus = StatusReport
+
+
+@dataclass
+class PendingResponse:
+    """Waiter for the ok/error reply to one line sent to FluidNC"""
+    command: str
+    sent_time: float = 0.0
+    response: Optional[str] = None
+    status_sequence: int = 0  # Status reports seen when the reply arrived
+    event: threading.Event = field(default_factory=threading.Event)
+    callback: Optional[Callable[['PendingResponse'], None]] = None
+    
+    def resolve(self, response: str, status_sequence: int):
+        """Complete the waiter with the controller's reply"""
+        self.response = response
+        self.status_sequence = status_sequence
+        self.event.set()
+        
+        if self.callback:
+            try:
+                self.callback(self)
+            except Exception as e:
+                logger.error(f"❌ Response callback error: {e}")
+    
+    def wait(self, timeout: float) -> Optional[str]:
+        """Block until the reply arrives or the timeout expires"""
+        if self.event.wait(timeout):
+            return self.response
+        return None
+
+
+class FluidNCEngine:
+    """
+    FluidNC communication engine with proper motion completion waiting
+    
+    Key improvements:
+    - Waits for motion to complete before returning
+    - Properly tracks current position
+    - Handles "Idle" state transitions correctly
+    
+    A single reader thread owns all serial reads. It parses every line once,
+    resolves ok/error replies in FIFO order and notifies ``state_condition``
+    on every status report, so command and motion waiters sleep until the
+    relevant line arrives instead of polling the port.
+    
+    Status reports are pushed by FluidNC (``$Report/Interval``), which also
+    reports every state change. The interval is shortened while a motion
+    waiter is active and lengthened again when the machine is idle. If the
+    firmware refuses the setting the reader falls back to ``?`` polling.
+    """
+    
+    def __init__(self, port: str = '/dev/ttyUSB0', baud_rate: int = 115200, 
+                 command_timeout: float = 10.0, auto_report: bool = True,
+                 report_interval_ms: int = 500, motion_report_interval_ms: int = 50):
+        self.port = port
+        self.baud_rate = baud_rate
+        self.command_timeout = command_timeout
+        
+        # Connection
+        self.serial_connection: Optional[serial.Serial] = None
+        self.connection_lock = threading.RLock()
+        self.connected = False
+        
+        # Status monitoring (reader thread)
+        self.current_status: Optional[FluidNCStatus] = None
+        self.status_callbacks: list[Callable[[FluidNCStatus], None]] = []
+        self.status_parser = StatusParser()
+        self.status_dispatcher = StatusDispatcher(self.status_callbacks)  # Callbacks run off the reader thread
+        self.status_monitor_running = False
+        self.status_thread: Optional[threading.Thread] = None
+        self.status_interval = 0.5  # '?' cadence while idle
+        self.motion_status_interval = 0.05  # '?' cadence while a motion waiter is active
+        self.read_timeout = 0.05  # Serial read timeout inside the reader thread
+        
+        # Auto-reporting ($Report/Interval) instead of '?' polling
+        self.auto_report = auto_report
+        self.auto_reporting = False  # True once FluidNC accepted $Report/Interval
+        self.report_interval_ms = report_interval_ms  # Idle interval
+        self.motion_report_interval_ms = motion_report_interval_ms  # Interval while a motion waiter is active
+        self.active_report_interval_ms = 0  # Last interval sent to the controller
+        self.report_timeout = 2.0  # Query once with '?' if pushed reports stop arriving
+        self.last_status_time = 0.0
+        
+        # Event-driven waiting
+        self.write_lock = threading.Lock()  # Serializes bytes onto the wire
+        self.response_lock = threading.Lock()
+        self.pending_responses: Deque[PendingResponse] = deque()
+        self.state_condition = threading.Condition()
+        self.status_sequence = 0  # Incremented for every parsed status report
+        self.message_sequence = 0  # Incremented for every captured line
+        self.motion_waiters = 0
+        self.idle_confirmations = 2  # Fresh Idle reports needed when Run was never seen
+        
+        # Command execution with motion completion
+        self.command_lock = threading.RLock()
+        self.last_command_time = 0
+        self.command_delay = 0.02  # Reduced from 0.1s to 20ms for responsiveness
+        self.manual_command_delay = 0.005  # Ultra-fast for manual operations - 5ms
+        self.motion_timeout = 30.0  # Maximum time to wait for motion completion
+        
+        # Command queue management  
+        self.pending_commands = 0
+        self.max_pending_commands = 5  # Increased limit to prevent dropping important commands
+        
+        # Message capture for enhanced homing detection
+        self.recent_raw_messages: list[str] = []
+        self.max_message_history = 100
+        self.message_lock = threading.RLock()
+        
+        # Numbered settings ($110=1000.000 ...) seen in controller output
+        self.settings: Dict[int, float] = {}
+        
+        # Statistics
+        self.stats: Dict[str, Any] = {
+            'commands_sent': 0,
+            'responses_received': 0,
+            'timeouts': 0,
+            'motion_commands': 0,
+            'motion_timeouts': 0,
+            'connection_time': 0.0,
+            'debug_messages_captured': 0,
+            'status_reports': 0,
+            'status_queries': 0
+        }
+    
+    def connect(self) -> bool:
+        """Connect to FluidNC controller"""
+        with self.connection_lock:
+            try:
+                logger.info(f"🔌 Connecting to FluidNC at {self.port}")
+                
+                # Close existing connection
+                self._close_connection()
+                
+                # Open new connection
+                self.serial_connection = serial.Serial(
+                    port=self.port,
+                    baudrate=self.baud_rate,
+                    timeout=1.0,
+                    write_timeout=1.0
+                )
+                
+                # Clear any pending data
+                time.sleep(0.5)
+                self.serial_connection.reset_input_buffer()
+                self.serial_connection.reset_output_buffer()
+                
+                # Test connection with status request
+                if self._test_connection():
+                    self._start_session()
+                    logger.info("✅ FluidNC connected successfully")
+                    return True
+                else:
+                    self._close_connection()
+                    return False
+                    
+            except Exception as e:
+                logger.error(f"❌ Connection failed: {e}")
+                self._close_connection()
+                return False
+    
+    def attach(self, serial_connection: Any) -> bool:
+        """
+        Run the engine on an already-open serial-like port
+        
+        Used for ports opened elsewhere (e.g. a pyserial URL such as
+        ``socket://host:23`` for FluidNC's telnet server, or a simulator).
+        """
+        with self.connection_lock:
+            self._close_connection()
+            self.serial_connection = serial_connection
+            if not self._test_connection():
+                self._close_connection()
+                return False
+            self._start_session()
+            logger.info("✅ FluidNC attached")
+            return True
+    
+    def _start_session(self):
+        """Start the reader thread and status reporting on a verified port"""
+        self.connected = True
+        self.stats['connection_time'] = time.time()
+        self._start_status_monitoring()
+        self._enable_auto_report()
+    
+    def disconnect(self) -> bool:
+        """Disconnect from FluidNC"""
+        with self.connection_lock:
+            try:
+                logger.info("🔌 Disconnecting from FluidNC")
+                
+                # Stop pushed reports so the next host starts from a quiet line
+                if self.auto_reporting:
+                    try:
+                        self._send_line("$Report/Interval=0").wait(1.0)
+                    except Exception as e:
+                        logger.debug(f"Disabling auto-report failed: {e}")
+                    self.auto_reporting = False
+                    self.active_report_interval_ms = 0
+                
+                # Stop status monitoring
+                self._stop_status_monitoring()
+                
+                # Close connection
+                self._close_connection()
+                self._fail_pending_responses("disconnected")
+                
+                logger.info("✅ FluidNC disconnected")
+                return True
+                
+            except Exception as e:
+                logger.error(f"❌ Disconnect error: {e}")
+                return False
+    
+    def is_connected(self) -> bool:
+        """Check if connected with enhanced stability checking"""
+        try:
+            is_conn = (self.connected and 
+                      self.serial_connection is not None and 
+                      self.serial_connection.is_open)
+            
+            # If connection appears good, verify it's actually responsive
+            if is_conn and time.time() - self.last_command_time > 5.0:
+                # Haven't sent commands recently, connection might be stale
+                # Quick validation without blocking
+                try:
+                    if self.serial_connection and self.serial_connection.in_waiting is not None:
+                        return True
+                    else:
+                        logger.debug("Connection validation failed - serial not responsive")
+                        return False
+                except:
+                    logger.debug("Connection validation failed - exception during check")
+                    return False
+            
+            return is_conn
+        except Exception as e:
+            logger.debug(f"Connection check failed: {e}")
+            return False
+    
+    def send_command_with_motion_wait(self, command: str, priority: str = "normal") -> Tuple[bool, str]:
+        """
+        Send command and wait for motion completion if it's a motion command
+        
+        This is the key fix - we wait for the machine to return to Idle state
+        after motion commands before considering the command complete.
+        
+        Args:
+            command: G-code command to send
+            priority: Command priority ("high" for manual operations, "normal" for scans)
+        """
+        start_time = time.time()
+        logger.debug(f"🕐 [TIMING] Starting {priority} priority command: {command}")
+        
+        # Check for command queue buildup (only for motion commands to prevent system overload)
+        is_motion_cmd = self._is_motion_command(command)
+        if priority == "high" and is_motion_cmd and self.pending_commands > self.max_pending_commands:
+            logger.debug(f"⚠️ Dropping high-priority motion command due to queue buildup: {self.pending_commands}")
+            return False, "Motion command queue full"
+        
+        with self.command_lock:
+            if not self.is_connected():
+                return False, "Not connected"
+            
+            # Track pending commands
+            self.pending_commands += 1
+            
+            try:
+                # Enforce command delay (priority-aware)
+                current_time = time.time()
+                time_since_last = current_time - self.last_command_time
+                
+                # Use faster delay for high priority (manual) operations
+                if priority == "high":
+                    active_delay = self.manual_command_delay
+                    delay_type = "High-priority"
+                else:
+                    active_delay = self.command_delay
+                    delay_type = "Standard"
+                
+                if time_since_last < active_delay:
+                    delay_needed = active_delay - time_since_last
+                    logger.debug(f"⏳ [TIMING] {delay_type} command delay: {delay_needed*1000:.1f}ms")
+                    time.sleep(delay_needed)
+                
+                # Continue with command execution
+                command_ready_time = time.time()
+                logger.debug(f"🕐 [TIMING] Command ready after: {(command_ready_time-start_time)*1000:.1f}ms")
+                logger.debug(f"📤 Command: {command}")
+                
+                # Send command
+                if self.serial_connection is None:
+                    return False, "No serial connection"
+                
+                pending = self._send_line(command)
+                
+                command_sent_time = time.time()
+                logger.debug(f"📤 [TIMING] Command sent after: {(command_sent_time-start_time)*1000:.1f}ms")
+                
+                # Wait for immediate response (ok/error) - shorter timeout for manual commands
+                response_timeout = 2.0 if priority == "high" else self.command_timeout
+                immediate_response = self._wait_for_immediate_response(pending, response_timeout)
+                response_received_time = time.time() 
+                logger.debug(f"📥 [TIMING] Response received after: {(response_received_time-start_time)*1000:.1f}ms")
+                
+                if not immediate_response:
+                    self.stats['timeouts'] += 1
+                    return False, "Command timeout"
+                
+                if immediate_response.startswith('error'):
+                    return False, immediate_response
+                
+                # Check if this is a motion command
+                is_motion_command = self._is_motion_command(command)
+                
+                if is_motion_command:
+                    logger.debug(f"⏳ [TIMING] Starting motion wait: {command}")
+                    motion_wait_start = time.time()
+                    self.stats['motion_commands'] += 1
+                    
+                    # Wait for motion to complete (machine returns to Idle)
+                    if self._wait_for_motion_completion(pending.status_sequence):
+                        motion_complete_time = time.time()
+                        logger.debug(f"✅ [TIMING] Motion completed: {command} - Motion wait: {(motion_complete_time-motion_wait_start)*1000:.1f}ms")
+                        logger.debug(f"🏁 [TIMING] Total command time: {(motion_complete_time-start_time)*1000:.1f}ms")
+                        return True, immediate_response
+                    else:
+                        motion_timeout_time = time.time()
+                        logger.warning(f"⚠️ [TIMING] Motion completion timeout: {command} - Timeout after: {(motion_timeout_time-motion_wait_start)*1000:.1f}ms")
+                        self.stats['motion_timeouts'] += 1
+                        # Still return success as the command was accepted
+                        return True, immediate_response
+                else:
+                    # Non-motion command, immediate response is sufficient
+                    non_motion_complete_time = time.time()
+                    logger.debug(f"🏁 [TIMING] Non-motion command completed: {(non_motion_complete_time-start_time)*1000:.1f}ms")
+                    return True, immediate_response
+                
+            except Exception as e:
+                logger.error(f"❌ Command failed: {command} - {e}")
+                return False, f"Command error: {e}"
+            finally:
+                # Always decrement pending commands
+                self.pending_commands = max(0, self.pending_commands - 1)
+    
+    def send_command(self, command: str) -> Tuple[bool, str]:
+        """Send command (legacy interface, uses motion wait)"""
+        return self.send_command_with_motion_wait(command)
+    
+    def send_homing_command(self, command: str = "$H") -> Tuple[bool, str]:
+        """
+        Send homing command - simplified version that just sends the command.
+        
+        FluidNC handles homing internally. We just need to:
+        1. Send the $H command
+        2. Let FluidNC do its thing
+        3. Monitor via regular status updates
+        """
+        logger.info(f"🏠 Sending homing command: {command}")
+        
+        with self.command_lock:
+            if not self.is_connected():
+                return False, "Not connected"
+            
+            try:
+                if self.serial_connection is None:
+                    return False, "No serial connection"
+                
+                # The ok for $H only arrives once homing finishes; the reader
+                # thread consumes it so later replies stay in order
+                self._send_line(command)
+                
+                logger.info(f"✅ Homing command sent successfully: {command}")
+                logger.info("🏠 FluidNC will handle homing - monitor status for progress")
+                
+                return True, "Homing command sent"
+                    
+            except Exception as e:
+                logger.error(f"❌ Homing command error: {e}")
+                return False, f"Command error: {e}"
+
+    def _monitor_homing_completion(self) -> Tuple[bool, str]:
+        """Monitor FluidNC messages for homing completion."""
+        start_time = time.time()
+        timeout = 120.0  # 2 minutes for homing
+        homing_started = False
+        homing_done = False
+        seen_messages = self.message_sequence
+        
+        logger.info("📊 Monitoring homing progress via debug messages...")
+        
+        with self.state_condition:
+            while (time.time() - start_time) < timeout:
+                # Examine lines captured by the reader since the last wakeup
+                new_count = self.message_sequence - seen_messages
+                seen_messages = self.message_sequence
+                for entry in (self.get_recent_raw_messages(new_count) if new_count else []):
+                    line = entry.split(': ', 1)[-1]
+                    if '[MSG:DBG: Homing' in line:
+                        homing_started = True
+                        if 'done' in line.lower():
+                            logger.info(f"✅ Homing completion detected: {line}")
+                            homing_done = True
+                        else:
+                            logger.info(f"📊 Homing progress: {line}")
+                    elif 'ALARM' in line.upper():
+                        logger.error(f"❌ Homing failed with alarm: {line}")
+                        return False, f"Alarm during homing: {line}"
+                    elif line.startswith('error:'):
+                        logger.error(f"❌ Homing failed with error: {line}")
+                        return False, f"Error during homing: {line}"
+                
+                # Confirm completion with the machine state
+                if homing_started and self.current_status:
+                    if self.current_status.state == "Idle" and homing_done:
+                        logger.info("✅ Homing completed (confirmed by status and debug message)")
+                        return True, "Homing completed successfully"
+                    elif self.current_status.state == "Alarm":
+                        logger.error("❌ Homing failed - status shows Alarm")
+                        return False, "Status changed to Alarm"
+                
+                self.state_condition.wait(timeout=1.0)
+        
+        # Timeout occurred
+        if homing_started:
+            logger.error(f"⏰ Homing timeout after {timeout}s (homing started but didn't complete)")
+        else:
+            logger.error(f"⏰ Homing timeout after {timeout}s (homing never started)")
+        
+        return False, "Homing timeout"
+
+
+    def _process_incoming_data(self, data: str):
+        """Process incoming data from FluidNC."""
+        if not data.strip():
+            return
+            
+        # Process each line
+        for line in data.strip().split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+                
+            # Status reports (e.g., <Idle|MPos:0.000,0.000,0.000|...>)
+            if line.startswith('<') and line.endswith('>'):
+                self._parse_status_report(line)
+                logger.debug(f"📡 Status update: {line}")
+            
+            # Error responses
+            elif line.startswith('error:'):
+                logger.error(f"🔴 FluidNC error: {line}")
+            
+            # Alarm messages
+            elif 'ALARM' in line.upper():
+                logger.warning(f"⚠️ Alarm message: {line}")
+            
+            # OK responses
+            elif line.strip().lower() == 'ok':
+                logger.debug("✅ Received 'ok' response")
+            
+            # Grbl messages
+            elif line.startswith('[') and line.endswith(']'):
+                logger.info(f"📢 FluidNC message: {line}")
+            
+            # Other responses
+            else:
+                logger.debug(f"📥 FluidNC: {line}")
+
+    def monitor_homing_progress(self, callback=None) -> bool:
+        """
+        Monitor homing progress using real-time status updates.
+        Returns True when homing completes, False if it fails or times out.
+        """
+        logger.info("📊 Monitoring homing progress via real-time status updates...")
+        
+        start_time = time.time()
+        last_status_time = start_time
+        last_position = None
+        position_unchanged_count = 0
+        max_homing_time = 120.0  # 2 minutes max for homing
+        inactivity_timeout = 15.0  # 15 seconds without status updates
+        
+        while (time.time() - start_time) < max_homing_time:
+            self.wait_for_status_update(timeout=0.5)
+            
+            current_time = time.time()
+            elapsed_time = current_time - start_time
+            
+            # Check for status updates
+            if self.current_status:
+                current_status = self.current_status.state
+                current_position = getattr(self.current_status, 'position', None)
+                
+                # Update callback with progress
+                if callback:
+                    try:
+                        callback(f"homing", f"Homing in progress (status: {current_status})", elapsed_time)
+                    except Exception as e:
+                        logger.debug(f"Callback error: {e}")
+                
+                # Check if we have recent status updates
+                status_age = current_time - (getattr(self.current_status, 'timestamp', 0) or last_status_time)
+                if status_age < 2.0:  # Status is recent
+                    last_status_time = current_time
+                    
+                    # Check for position changes (axes moving)
+                    if current_position and last_position:
+                        if current_position != last_position:
+                            position_unchanged_count = 0
+                            logger.debug(f"🔄 Axes moving: {last_position} → {current_position}")
+                        else:
+                            position_unchanged_count += 1
+                    
+                    last_position = current_position
+                
+                # Check for completion
+                if current_status == "Idle":
+                    # Confirm completion with brief delay
+                    time.sleep(1.0)
+                    if self.current_status and self.current_status.state == "Idle":
+                        logger.info("✅ Homing completed successfully")
+                        if callback:
+                            callback("complete", "Homing completed successfully!", elapsed_time)
+                        return True
+                
+                # Check for errors
+                elif current_status == "Alarm":
+                    logger.error("❌ Homing failed - ALARM state")
+                    if callback:
+                        callback("error", "Homing failed - ALARM triggered", elapsed_time)
+                    return False
+                
+                # Check for stuck condition (no movement for too long)
+                if position_unchanged_count > 20 and current_status == "Homing":  # 10+ seconds no movement
+                    logger.warning(f"⚠️ No axis movement detected for {position_unchanged_count/2}s during homing")
+                    # Don't fail immediately - axes might move slowly
+            
+            # Check for system inactivity
+            if (current_time - last_status_time) > inactivity_timeout:
+                logger.error(f"❌ No status updates for {inactivity_timeout}s - system unresponsive")
+                if callback:
+                    callback("error", "System unresponsive - no status updates", elapsed_time)
+                return False
+        
+        logger.error(f"❌ Homing timeout after {max_homing_time}s")
+        if callback:
+            callback("error", f"Homing timeout after {max_homing_time}s", elapsed_time)
+        return False
+    
+    def _is_motion_command(self, command: str) -> bool:
+        """Check if command causes motion"""
+        command_upper = command.upper().strip()
+        
+        # G-code motion commands
+        motion_gcodes = ['G0', 'G1', 'G2', 'G3', 'G38']
+        
+        for gcode in motion_gcodes:
+            if command_upper.startswith(gcode):
+                return True
+        
+        # Homing commands
+        if command_upper.startswith('$H') or command_upper == '$H':
+            return True
+            
+        return False
+    
+    def _wait_for_motion_completion(self, since_sequence: int = 0) -> bool:
+        """
+        Wait for motion to complete by monitoring machine state
+        
+        Sleeps on ``state_condition`` and is woken by the reader thread as
+        soon as a status report arrives. Only reports received after the
+        command's ok (``since_sequence``) are considered.
+        """
+        start_time = time.time()
+        deadline = start_time + self.motion_timeout
+        motion_started = False
+        idle_reports = 0
+        last_seen = since_sequence
+        
+        with self.state_condition:
+            self.motion_waiters += 1
+            first_waiter = self.motion_waiters == 1
+        if not self.auto_reporting:
+            self.send_immediate_command('?')  # Fresh report without waiting for the next poll
+        elif first_waiter:
+            self._set_report_interval(self.motion_report_interval_ms)
+        
+        try:
+            with self.state_condition:
+                while True:
+                    if self.status_sequence > last_seen and self.current_status:
+                        last_seen = self.status_sequence
+                        state = self.current_status.state.lower()
+                        
+                        if state in ['run', 'jog', 'home']:
+                            motion_started = True
+                            logger.debug(f"🔄 Motion in progress: {state}")
+                        elif state == 'idle':
+                            idle_reports += 1
+                            if motion_started:
+                                logger.debug("✅ Motion completed - machine idle")
+                                return True
+                            if idle_reports >= self.idle_confirmations:
+                                # Short or zero-length move finished between reports
+                                logger.debug("✅ Motion completed - machine remained idle")
+                                return True
+                        elif state.startswith('alarm') or state == 'error':
+                            logger.warning(f"⚠️ Motion stopped due to: {state}")
+                            return False
+                    
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.state_condition.wait(remaining)
+        finally:
+            with self.state_condition:
+                self.motion_waiters -= 1
+                last_waiter = self.motion_waiters == 0
+            if last_waiter:
+                self._set_report_interval(self.report_interval_ms)
+        
+        logger.warning(f"⏰ Motion completion timeout after {self.motion_timeout}s")
+        return False
+    
+    def _wait_for_immediate_response(self, pending: PendingResponse, timeout: float) -> Optional[str]:
+        """Wait for immediate command response (ok/error) resolved by the reader thread"""
+        try:
+            response = pending.wait(timeout)
+            if response is not None:
+                self.stats['responses_received'] += 1
+            return response
+            
+        except Exception as e:
+            logger.error(f"❌ Response wait error: {e}")
+            return None
+    
+    def wait_for_idle(self, since_sequence: int = 0) -> bool:
+        """Block until motion queued before ``since_sequence`` has finished"""
+        return self._wait_for_motion_completion(since_sequence)
+    
+    def wait_for_status_update(self, timeout: float) -> bool:
+        """Block until the reader thread parses a new status report"""
+        with self.state_condition:
+            seen = self.status_sequence
+            self.state_condition.wait_for(lambda: self.status_sequence != seen, timeout)
+            return self.status_sequence != seen
+    
+    def send_line_nowait(self, command: str,
+                         callback: Optional[Callable[[PendingResponse], None]] = None) -> PendingResponse:
+        """
+        Write one line without waiting for its reply
+        
+        The caller is responsible for flow control (see
+        motion.fluidnc_streamer) and must hold ``command_lock`` so that no
+        other sender interleaves lines with the stream.
+        """
+        return self._send_line(command, callback)
+    
+    def _send_line(self, command: str,
+                   callback: Optional[Callable[[PendingResponse], None]] = None) -> PendingResponse:
+        """Register a reply waiter and write one line to the controller"""
+        pending = PendingResponse(command=command, sent_time=time.time(), callback=callback)
+        with self.response_lock:
+            self.pending_responses.append(pending)
+        try:
+            self._write_bytes(f"{command}\n".encode('utf-8'))
+        except Exception:
+            with self.response_lock:
+                if pending in self.pending_responses:
+                    self.pending_responses.remove(pending)
+            raise
+        
+        self.stats['commands_sent'] += 1
+        self.last_command_time = time.time()
+        return pending
+    
+    def _enable_auto_report(self) -> bool:
+        """Ask FluidNC to push status reports; keep polling if it refuses"""
+        if not self.auto_report:
+            return False
+        
+        try:
+            command = f"$Report/Interval={self.report_interval_ms}"
+            response = self._send_line(command).wait(2.0)
+        except Exception as e:
+            response = f"error:{e}"
+        
+        if response == 'ok':
+            self.auto_reporting = True
+            self.active_report_interval_ms = self.report_interval_ms
+            logger.info(f"✅ FluidNC auto-reporting every {self.report_interval_ms}ms")
+            return True
+        
+        logger.warning(f"⚠️ FluidNC auto-report not available ({response}), polling status with '?'")
+        self.auto_reporting = False
+        return False
+    
+    def _set_report_interval(self, interval_ms: int):
+        """
+        Change the auto-report interval without waiting for the reply
+        
+        Only called between commands (after their ok), so the setting line
+        never lands inside a character-counted stream.
+        """
+        if not self.auto_reporting or interval_ms == self.active_report_interval_ms:
+            return
+        
+        self.active_report_interval_ms = interval_ms
+        try:
+            self._send_line(f"$Report/Interval={interval_ms}", self._on_report_interval_reply)
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to set report interval: {e}")
+    
+    def _on_report_interval_reply(self, pending: PendingResponse):
+        # Only numeric codes come from FluidNC; resets/disconnects fail waiters locally
+        code = (pending.response or '').partition('error:')[2].strip()
+        if code.isdigit():
+            logger.warning(f"⚠️ {pending.command} rejected ({pending.response}), polling status with '?'")
+            self.auto_reporting = False
+    
+    def _write_bytes(self, data: bytes):
+        """Write raw bytes; the reader thread itself only ever writes '?'"""
+        with self.write_lock:
+            if self.serial_connection is None:
+                raise serial.SerialException("No serial connection")
+            self.serial_connection.write(data)
+            self.serial_connection.flush()
+    
+    def _resolve_pending_response(self, response: str):
+        """Hand an ok/error line to the oldest outstanding command"""
+        with self.response_lock:
+            pending = self.pending_responses.popleft() if self.pending_responses else None
+        
+        if pending is None:
+            logger.debug(f"📥 Unsolicited response: {response}")
+            return
+        
+        pending.resolve(response, self.status_sequence)
+    
+    def _fail_pending_responses(self, reason: str):
+        """Release every waiter after a reset or disconnect"""
+        with self.response_lock:
+            pending_list = list(self.pending_responses)
+            self.pending_responses.clear()
+        for pending in pending_list:
+            pending.resolve(f"error:{reason}", self.status_sequence)
+        with self.state_condition:
+            self.state_condition.notify_all()
+    
+    def _parse_status_report(self, status_line: str):
+        """Parse a status report, publish it to waiters and queue it for callbacks"""
+        try:
+            status = self.status_parser.parse(status_line)
+        except Exception as e:
+            logger.error(f"❌ Status parsing error: {e}")
+            return
+        if status is None:
+            return
+        
+        # Update current status and wake anything waiting on state
+        with self.state_condition:
+            self.current_status = status
+            self.status_sequence += 1
+            self.last_status_time = status.timestamp
+            self.state_condition.notify_all()
+        self.stats['status_reports'] += 1
+        
+        self.status_dispatcher.submit(status)
+    
+    def _test_connection(self) -> bool:
+        """Test connection with status request"""
+        try:
+            if self.serial_connection is None:
+                return False
+                
+            # Send status request
+            self.serial_connection.write(b'?\n')
+            self.serial_connection.flush()
+            
+            # Wait for status response
+            start_time = time.time()
+            while time.time() - start_time < 3.0:
+                if self.serial_connection.in_waiting > 0:
+                    response = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
+                    # Capture all messages
+                    self._capture_raw_message(response)
+                    if response.startswith('<') and response.endswith('>'):
+                        self._parse_status_report(response)
+                        return True
+                time.sleep(0.1)
+            
+            return False
+            
+        except Exception:
+            return False
+    
+    def _close_connection(self):
+        """Close serial connection"""
+        try:
+            self.connected = False
+            if self.serial_connection:
+                self.serial_connection.close()
+                self.serial_connection = None
+        except Exception as e:
+            logger.error(f"❌ Close connection error: {e}")
+    
+    def _start_status_monitoring(self):
+        """Start the reader thread that owns all serial reads"""
+        if self.status_monitor_running:
+            return
+        
+        if self.serial_connection:
+            self.serial_connection.timeout = self.read_timeout
+        
+        self.status_monitor_running = True
+        self.status_dispatcher.start()
+        self.status_thread = threading.Thread(target=self._status_monitor_loop, daemon=True)
+        self.status_thread.start()
+        logger.info("✅ FluidNC reader thread started")
+    
+    def _stop_status_monitoring(self):
+        """Stop background status monitoring"""
+        self.status_monitor_running = False
+        if self.status_thread:
+            self.status_thread.join(timeout=1.0)
+            self.status_thread = None
+        self.status_dispatcher.stop()
+    
+    def _status_monitor_loop(self):
+        """
+        Reader thread: parse every incoming line once and dispatch it
+        
+        With auto-reporting the controller pushes status and the reader only
+        sends ``?`` if no report arrived for ``report_timeout``. Otherwise
+        status requests are sent at ``status_interval``, or at
+        ``motion_status_interval`` while a motion waiter is active.
+        """
+        last_status_request = 0.0
+        buffer = bytearray()
+        
+        while self.status_monitor_running and self.serial_connection is not None:
+            try:
+                current_time = time.time()
+                if self.auto_reporting:
+                    status_interval = self.report_timeout
+                    last_request = max(last_status_request, self.last_status_time)
+                else:
+                    status_interval = self.motion_status_interval if self.motion_waiters else self.status_interval
+                    last_request = last_status_request
+                if current_time - last_request >= status_interval:
+                    self._write_bytes(b'?')
+                    last_status_request = current_time
+                    self.stats['status_queries'] += 1
+                
+                # Blocks for at most read_timeout when the line is quiet
+                connection = self.serial_connection
+                if connection is None:
+                    break
+                data = connection.read(connection.in_waiting or 1)
+                if not data:
+                    continue
+                
+                buffer.extend(data)
+                while b'\n' in buffer:
+                    raw_line, _, remainder = buffer.partition(b'\n')
+                    buffer = bytearray(remainder)
+                    line = raw_line.decode('utf-8', errors='ignore').strip()
+                    if line:
+                        self._handle_line(line)
+                
+            except Exception as e:
+                if not self.status_monitor_running:
+                    break
+                logger.error(f"❌ Status monitor error: {e}")
+                time.sleep(0.5)
+        
+        logger.debug("Status monitoring stopped")
+    
+    def _handle_line(self, line: str):
+        """Dispatch one complete line from FluidNC"""
+        self._capture_raw_message(line)
+        
+        if line.startswith('<') and line.endswith('>'):
+            self._parse_status_report(line)
+            return  # _parse_status_report already notified waiters
+        
+        if line.lower() == 'ok' or line.startswith('error'):
+            self._resolve_pending_response(line)
+        elif line.startswith('ALARM:'):
+            logger.warning(f"⚠️ Alarm message: {line}")
+        elif line.startswith('[') and line.endswith(']'):
+            logger.debug(f"📢 FluidNC message: {line}")
+        elif line.startswith('$') and '=' in line:
+            self._record_setting(line)
+        elif line.startswith('Grbl') or line.startswith('FluidNC'):
+            # Controller restarted - nothing already sent will be acknowledged
+            logger.info(f"🔄 Controller banner: {line}")
+            self._fail_pending_responses("controller reset")
+            if self.auto_reporting:
+                # A rebooted controller starts without auto-reporting
+                self.active_report_interval_ms = 0
+                self._set_report_interval(
+                    self.motion_report_interval_ms if self.motion_waiters else self.report_interval_ms
+                )
+        else:
+            logger.debug(f"📥 FluidNC: {line}")
+        
+        # Wake waiters that watch message history (e.g. homing)
+        with self.state_condition:
+            self.state_condition.notify_all()
+    
+    def _record_setting(self, line: str):
+        """Remember a numbered setting line from $$ output"""
+        key, _, value = line[1:].partition('=')
+        try:
+            self.settings[int(key)] = float(value)
+        except ValueError:
+            logger.debug(f"📥 FluidNC setting: {line}")
+    
+    def query_settings(self) -> Dict[int, float]:
+        """Read the numbered settings ($$), e.g. {110: 1000.0, 120: 25.0}"""
+        success, response = self.send_command('$$')
+        if not success:
+            logger.warning(f"⚠️ Settings query failed: {response}")
+            return {}
+        # The reader records every setting line before the ok that ends them
+        return dict(self.settings)
+    
+    # Status and utility methods
+    def get_current_status(self) -> Optional[FluidNCStatus]:
+        """Get current status"""
+        return self.current_status
+    
+    def get_recent_raw_messages(self, count: int = 20) -> list[str]:
+        """Get recent raw messages for debug message detection"""
+        with self.message_lock:
+            return self.recent_raw_messages[-count:] if self.recent_raw_messages else []
+    
+    def _capture_raw_message(self, message: str):
+        """Capture raw message for homing detection"""
+        with self.message_lock:
+            self.recent_raw_messages.append(f"{time.time():.3f}: {message}")
+            self.message_sequence += 1
+            
+            # Limit history size
+            if len(self.recent_raw_messages) > self.max_message_history:
+                self.recent_raw_messages = self.recent_raw_messages[-self.max_message_history:]
+            
+            # Count debug messages
+            if "[MSG:DBG:" in message or "[MSG:Homed:" in message:
+                self.stats['debug_messages_captured'] += 1
+    
+    def add_status_callback(self, callback: Callable[[FluidNCStatus], None]):
+        """Add status callback"""
+        self.status_callbacks.append(callback)
+    
+    def remove_status_callback(self, callback: Callable[[FluidNCStatus], None]):
+        if callback in self.status_callbacks:
+            self.status_callbacks.remove(callback)
+    
+    # asyncio API - blocking waits run in the default executor
+    async def execute(self, command: str, priority: str = "normal") -> Tuple[bool, str]:
+        """Send a command and, for motion, wait until the machine is idle again"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.send_command_with_motion_wait, command, priority
+        )
+    
+    async def wait_until_idle(self, since_sequence: int = 0) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(None, self.wait_for_idle, since_sequence)
+    
+    async def next_status(self, timeout: float = 1.0) -> Optional[FluidNCStatus]:
+        """The next status report, or None if none arrived within the timeout"""
+        loop = asyncio.get_running_loop()
+        if await loop.run_in_executor(None, self.wait_for_status_update, timeout):
+            return self.current_status
+        return None
+    
+    async def home(self, command: str = "$H") -> Tuple[bool, str]:
+        """Start homing and wait for FluidNC to report it finished"""
+        loop = asyncio.get_running_loop()
+        success, message = await loop.run_in_executor(None, self.send_homing_command, command)
+        if not success:
+            return success, message
+        return await loop.run_in_executor(None, self._monitor_homing_completion)
+    
+    async def status_updates(self, max_queued: int = 100) -> AsyncIterator[FluidNCStatus]:
+        """
+        Async iterator over status reports
+        
+        Reports are handed from the callback thread to the event loop; if
+        the consumer falls behind, the oldest queued reports are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(max_queued)
+        
+        def enqueue(status):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(status)
+        
+        def on_status(status):
+            loop.call_soon_threadsafe(enqueue, status)
+        
+        self.add_status_callback(on_status)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.remove_status_callback(on_status)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get statistics"""
+        return self.stats.copy()
+    
+    def send_immediate_command(self, command: str) -> bool:
+        """Send immediate command (?, !, ~, reset)"""
+        if not self.is_connected():
+            return False
+        
+        try:
+            logger.debug(f"📤 Immediate: {command}")
+            
+            if command in ['?', '!', '~']:
+                self._write_bytes(command.encode('utf-8'))
+            elif command == 'reset':
+                self._write_bytes(b'\x18')  # Ctrl-X
+                # Soft reset flushes the controller's line buffer
+                self._fail_pending_responses("reset")
+            else:
+                return False
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Immediate command failed: {command} - {e}")
+            return False
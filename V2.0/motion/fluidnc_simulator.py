@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""
+FluidNC Simulator
+
+A FluidNC stand-in on a pseudo-terminal. It speaks the real line protocol
+(``ok``/``error:N``, ``<State|MPos:...|FS:...>``, ``[MSG:...]``,
+``ALARM:N``, ``$H``/``$X``/``$$``/``$Report/Interval``) and the realtime
+characters ``?``, ``!``, ``~`` and 0x18, so any controller class can open
+``simulator.port`` exactly like ``/dev/ttyUSB0``.
+
+Moves are timed with FluidNC's trapezoidal profile using the per-axis
+``max_feedrate`` and ``acceleration`` from ``motion.axes`` in the YAML
+configuration. Input is limited by the serial RX buffer and the planner
+(a line is acknowledged when it enters the planner and stays in the RX
+buffer while the planner is full), so streaming and back-pressure behave
+like the board. Not modelled: junction blending between blocks (every
+block starts and ends at rest, so multi-segment paths run slightly slower
+than on the real machine), deceleration on feed hold, limit switches and
+spindle/IO.
+
+Usage:
+    python -m motion.fluidnc_simulator [--config config/scanner_config.yaml] [--time-scale 1.0]
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import logging
+import math
+import os
+import re
+import select
+import threading
+import time
+import tty
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from motion.motion_time import DEFAULT_ACCELERATION, trapezoid_time
+
+logger = logging.getLogger(__name__)
+
+VERSION = "FluidNC v3.7.8 (simulator)"
+BANNER = f"Grbl 3.7 [{VERSION} '$' for help]"
+
+# Config axis name -> G-code letter (the camera tilt axis is A in FluidNC)
+AXIS_LETTERS = (('x', 'X'), ('y', 'Y'), ('z', 'Z'), ('c', 'A'))
+
+# Realtime characters are acted on as soon as they arrive, never buffered
+RESET = 0x18
+REALTIME = {ord('?'), ord('!'), ord('~'), RESET}
+
+# FluidNC sends WCO every N reports (it is constant most of the time)
+WCO_REPORT_EVERY = 10
+
+# Output held back while the host is not reading before it is dropped
+MAX_TX_BACKLOG = 64 * 1024
+
+_WORD = re.compile(r'([A-Z])([-+]?(?:\d+\.?\d*|\.\d+))')
+
+Axes = Tuple[float, ...]
+
+
+@dataclass
+class SimAxis:
+    """Kinematic limits of one simulated axis"""
+    name: str                    # Config name ('x', 'y', 'z', 'c')
+    letter: str                  # G-code word ('X', 'Y', 'Z', 'A')
+    max_rate: float              # mm/min (deg/min for rotational axes)
+    acceleration: float          # mm/s² (deg/s²)
+    min_travel: float
+    max_travel: float
+    home_position: float = 0.0
+    soft_limits: bool = True
+    homing: bool = False
+
+
+def axes_from_config(motion_config: Dict[str, Any]) -> List[SimAxis]:
+    """Build simulator axes from the ``motion`` configuration section"""
+    axes_config = motion_config.get('axes', {})
+    axes = []
+    for name, letter in AXIS_LETTERS:
+        axis = axes_config.get(f'{name}_axis', {})
+        axes.append(SimAxis(
+            name=name,
+            letter=letter,
+            max_rate=float(axis.get('max_feedrate', 1000.0)),
+            acceleration=float(axis.get('acceleration', DEFAULT_ACCELERATION)),
+            min_travel=float(axis.get('min_limit', -1000.0)),
+            max_travel=float(axis.get('max_limit', 1000.0)),
+            home_position=float(axis.get('home_position', 0.0)),
+            soft_limits=not axis.get('continuous', False),
+            homing=bool(axis.get('homing_required', False))
+        ))
+    return axes
+
+
+@dataclass
+class MotionBlock:
+    """One planner block: a straight move, a dwell or a homing cycle"""
+    start: Axes
+    target: Axes
+    duration: float                 # Machine seconds
+    length: float = 0.0
+    speed: float = 0.0              # Peak speed along the path (units/s)
+    acceleration: float = 1.0
+    kind: str = 'move'              # 'move', 'dwell' or 'home'
+    blocks_parser: bool = False     # Following lines wait until this block is done
+    on_complete: Optional[Callable[[], None]] = None
+    elapsed: float = 0.0
+
+    def progress(self) -> Tuple[float, float]:
+        """Distance travelled and current speed at ``elapsed``"""
+        if self.kind == 'dwell' or self.length <= 0:
+            return 0.0, 0.0
+        t = min(self.elapsed, self.duration)
+        ramp = self.speed / self.acceleration
+        if t < ramp:
+            return 0.5 * self.acceleration * t * t, self.acceleration * t
+        remaining = self.duration - t
+        if remaining < ramp:
+            return self.length - 0.5 * self.acceleration * remaining * remaining, self.acceleration * remaining
+        return 0.5 * self.speed * ramp + self.speed * (t - ramp), self.speed
+
+    def position(self) -> Axes:
+        if self.length <= 0:
+            return self.target
+        fraction = min(self.progress()[0] / self.length, 1.0)
+        return tuple(s + (t - s) * fraction for s, t in zip(self.start, self.target))
+
+
+def plan_move(start: Axes, target: Axes, feed_rate: Optional[float], axes: List[SimAxis]) -> MotionBlock:
+    """
+    Plan a coordinated straight move the way Grbl's planner limits it
+
+    The path speed is the programmed feed (``None`` for rapids) capped so
+    that no axis exceeds its max rate, and the path acceleration is capped
+    the same way by each axis's acceleration.
+    """
+    delta = [t - s for s, t in zip(start, target)]
+    length = math.sqrt(sum(d * d for d in delta))
+    if length <= 0:
+        return MotionBlock(start, target, 0.0)
+
+    speed = feed_rate / 60.0 if feed_rate else math.inf
+    acceleration = math.inf
+    for axis, d in zip(axes, delta):
+        share = abs(d) / length
+        if share > 0:
+            speed = min(speed, axis.max_rate / 60.0 / share)
+            acceleration = min(acceleration, axis.acceleration / share)
+
+    duration = trapezoid_time(length, speed * 60.0, acceleration)
+    peak = min(speed, math.sqrt(length * acceleration))
+    return MotionBlock(start, target, duration, length, peak, acceleration)
+
+
+class FluidNCSimulator:
+    """
+    Simulated FluidNC board on a pty
+
+    Args:
+        motion_config: The ``motion`` configuration section (axes, homing,
+            safety, controller.streaming.rx_buffer_size)
+        time_scale: Machine seconds per wall-clock second (e.g. 20 to run
+            long moves quickly in tests)
+        rx_buffer_size: Serial RX buffer in bytes (default from config, 128)
+        planner_blocks: Planner queue depth
+        must_home: Start in Alarm until ``$H``/``$X`` (default from
+            ``motion.safety.must_home``)
+    """
+
+    def __init__(self, motion_config: Optional[Dict[str, Any]] = None, time_scale: float = 1.0,
+                 rx_buffer_size: Optional[int] = None, planner_blocks: int = 16,
+                 must_home: Optional[bool] = None):
+        motion_config = motion_config or {}
+        streaming = motion_config.get('controller', {}).get('streaming', {})
+        homing = motion_config.get('homing', {})
+
+        self.axes = axes_from_config(motion_config)
+        self.time_scale = time_scale
+        self.rx_buffer_size = rx_buffer_size or int(streaming.get('rx_buffer_size', 128))
+        self.planner_blocks = planner_blocks
+        self.must_home = (motion_config.get('safety', {}).get('must_home', False)
+                          if must_home is None else must_home)
+        self.homing_seek_rate = float(homing.get('seek_rate', 500.0))
+        self.homing_feed_rate = float(homing.get('feed_rate', 100.0))
+        self.homing_pulloff = float(homing.get('pulloff_distance', 1.0))
+        self.homing_order = [step['axis'] for step in homing.get('sequence', [])] or \
+            [axis.name for axis in self.axes if axis.homing]
+
+        # Machine state (owned by the simulator thread)
+        self.position: Axes = tuple(0.0 for _ in self.axes)
+        self.wco: Axes = tuple(0.0 for _ in self.axes)
+        self.state = 'Alarm' if self.must_home else 'Idle'
+        self.held = False
+        self.homed = False
+        self.report_interval_ms = 0
+        self._planned: Axes = self.position
+        self._motion_mode = 0
+        self._relative = False
+        self._feed_rate = 0.0
+        self._blocks: Deque[MotionBlock] = deque()
+        self._rx = bytearray()
+        self._tx = bytearray()
+        self._reports = 0
+        self._last_report = 0.0
+        self._reported_state = ''
+
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self.port: Optional[str] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'lines': 0,
+            'errors': 0,
+            'moves': 0,
+            'status_reports': 0,
+            'realtime_commands': 0,
+            'rx_overflows': 0,
+            'tx_dropped': 0,
+            'max_planner_depth': 0,
+            'motion_time': 0.0
+        }
+
+    @classmethod
+    def from_config(cls, config_manager, **kwargs) -> 'FluidNCSimulator':
+        """Create a simulator from a ConfigManager"""
+        return cls(config_manager.get('motion', {}), **kwargs)
+
+    # Lifecycle
+
+    def start(self) -> str:
+        """Open the pty and start the simulator thread; returns the port path"""
+        if self._running:
+            return self.port
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.port = os.ttyname(self._slave)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="fluidnc-simulator", daemon=True)
+        self._thread.start()
+        logger.info(f"🧪 FluidNC simulator listening on {self.port}")
+        return self.port
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+
+    def __enter__(self) -> 'FluidNCSimulator':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # Inspection (safe from other threads)
+
+    @property
+    def machine_position(self) -> Dict[str, float]:
+        with self._lock:
+            position = self._blocks[0].position() if self._blocks else self.position
+        return {axis.name: value for axis, value in zip(self.axes, position)}
+
+    @property
+    def planner_depth(self) -> int:
+        return len(self._blocks)
+
+    def move_time(self, start: Dict[str, float], target: Dict[str, float],
+                  feed_rate: Optional[float] = None) -> float:
+        """Machine seconds the simulator takes for a move (``None`` feed = rapid)"""
+        start_axes = tuple(start.get(axis.name, 0.0) for axis in self.axes)
+        target_axes = tuple(target.get(axis.name, start.get(axis.name, 0.0)) for axis in self.axes)
+        return plan_move(start_axes, target_axes, feed_rate, self.axes).duration
+
+    # Simulator thread
+
+    def _run(self):
+        last = time.monotonic()
+        while self._running:
+            timeout = 0.001 if self._blocks or self._tx else 0.02
+            try:
+                readable, _, _ = select.select([self._master], [], [], timeout)
+                if readable:
+                    data = os.read(self._master, 4096)
+                    if data:
+                        self._receive(data)
+            except OSError:
+                if not self._running:
+                    break
+                time.sleep(0.01)  # No reader on the slave side yet
+
+            now = time.monotonic()
+            with self._lock:
+                self._advance((now - last) * self.time_scale)
+                self._parse_lines()
+                self._auto_report(now)
+            last = now
+            self._flush()
+
+    def _emit(self, line: str):
+        if len(self._tx) > MAX_TX_BACKLOG:
+            self.stats['tx_dropped'] += 1
+            return
+        self._tx.extend(line.encode() + b'\r\n')
+
+    def _flush(self):
+        if not self._tx or self._master is None:
+            return
+        try:
+            written = os.write(self._master, self._tx)
+            del self._tx[:written]
+        except (BlockingIOError, OSError):
+            pass
+
+    def _receive(self, data: bytes):
+        for byte in data:
+            if byte in REALTIME or byte >= 0x80:
+                self.stats['realtime_commands'] += 1
+                with self._lock:
+                    self._realtime(byte)
+            elif len(self._rx) < self.rx_buffer_size:
+                self._rx.append(byte)
+            else:
+                self.stats['rx_overflows'] += 1  # The board drops bytes too
+
+    def _realtime(self, byte: int):
+        if byte == ord('?'):
+            self._report_status()
+        elif byte == ord('!'):
+            if self._blocks and not self.held and self.state != 'Alarm':
+                self.held = True
+                self._update_state()
+        elif byte == ord('~'):
+            if self.held:
+                self.held = False
+                self._update_state()
+        elif byte == RESET:
+            self._reset()
+
+    def _reset(self):
+        moving = any(block.kind != 'dwell' for block in self._blocks)
+        if self._blocks:
+            self.position = self._blocks[0].position()
+        self._blocks.clear()
+        self._planned = self.position
+        self._rx.clear()
+        self.held = False
+        self.report_interval_ms = 0
+        self._motion_mode, self._relative = 0, False
+        self._emit(BANNER)
+        if moving or self.state == 'Alarm':
+            # Position is lost when motion is aborted
+            if moving:
+                self._emit("ALARM:3")
+            self.state = 'Alarm'
+            self._emit("[MSG:'$H'|'$X' to unlock]")
+        else:
+            self.state = 'Idle'
+
+    def _advance(self, dt: float):
+        """Run the planner for ``dt`` machine seconds"""
+        if self.held:
+            return
+        while dt > 0 and self._blocks:
+            block = self._blocks[0]
+            remaining = block.duration - block.elapsed
+            if dt < remaining:
+                block.elapsed += dt
+                break
+            dt -= remaining
+            self._blocks.popleft()
+            self.position = block.target
+            self.stats['motion_time'] += block.duration
+            if block.on_complete:
+                block.on_complete()
+        self._update_state()
+
+    def _update_state(self):
+        if self.state == 'Alarm':
+            return
+        if self.held:
+            self.state = 'Hold:0'
+        elif not self._blocks or self._blocks[0].kind == 'dwell':
+            self.state = 'Idle'
+        elif self._blocks[0].kind == 'home':
+            self.state = 'Home'
+        else:
+            self.state = 'Run'
+
+    def _auto_report(self, now: float):
+        if not self.report_interval_ms:
+            return
+        if self.state != self._reported_state or now - self._last_report >= self.report_interval_ms / 1000.0:
+            self._report_status()
+
+    def _report_status(self):
+        position = self._blocks[0].position() if self._blocks else self.position
+        speed = self._blocks[0].progress()[1] * 60.0 if self._blocks and not self.held else 0.0
+        report = f"<{self.state}|MPos:{','.join(f'{v:.3f}' for v in position)}|FS:{speed:.0f},0"
+        if self._reports % WCO_REPORT_EVERY == 0:
+            report += f"|WCO:{','.join(f'{v:.3f}' for v in self.wco)}"
+        self._emit(report + ">")
+        self._reports += 1
+        self._last_report = time.monotonic()
+        self._reported_state = self.state
+        self.stats['status_reports'] += 1
+
+    # Line protocol
+
+    def _parse_lines(self):
+        while b'\n' in self._rx:
+            if self._blocks and self._blocks[-1].blocks_parser:
+                return  # Dwell/homing in progress: its ok has not been sent yet
+            raw, _, rest = self._rx.partition(b'\n')
+            line = re.sub(r'\([^)]*\)|;.*', '', raw.decode('ascii', errors='ignore'))
+            line = line.replace(' ', '').replace('\r', '').upper()
+            if self._is_motion(line) and len(self._blocks) >= self.planner_blocks:
+                return  # Planner full: the line waits in the RX buffer
+            self._rx[:] = rest
+            self.stats['lines'] += 1
+            self._execute(line)
+
+    def _is_motion(self, line: str) -> bool:
+        return bool(line) and not line.startswith('$') and any(
+            letter in line for letter in 'XYZAC')
+
+    def _reply(self, code: int = 0):
+        if code:
+            self.stats['errors'] += 1
+            self._emit(f"error:{code}")
+        else:
+            self._emit("ok")
+
+    def _execute(self, line: str):
+        if not line:
+            self._reply()
+        elif line.startswith('$'):
+            self._system_command(line)
+        elif self.state == 'Alarm':
+            self._reply(9)  # G-code locked out during alarm
+        else:
+            self._gcode(line)
+
+    def _system_command(self, line: str):
+        command, _, value = line.partition('=')
+        if command.startswith('$H'):
+            self._start_homing(command[2:])
+        elif command == '$X':
+            if self.state == 'Alarm':
+                self.state = 'Idle'
+                self._emit("[MSG:Caution: Unlocked]")
+            self._reply()
+        elif command == '$$':
+            for group, values in ((110, [a.max_rate for a in self.axes]),
+                                  (120, [a.acceleration for a in self.axes]),
+                                  (130, [a.max_travel - a.min_travel for a in self.axes])):
+                for i, setting in enumerate(values):
+                    self._emit(f"${group + i}={setting:.3f}")
+            self._reply()
+        elif command == '$I':
+            self._emit(f"[VER:3.7 {VERSION}:]")
+            self._reply()
+        elif command == '$G':
+            self._emit(f"[GC:G{self._motion_mode} G54 G17 G21 G{91 if self._relative else 90} "
+                       f"G94 M5 M9 T0 F{self._feed_rate:g} S0]")
+            self._reply()
+        elif command == '$REPORT/INTERVAL':
+            try:
+                self.report_interval_ms = max(0, int(float(value))) if value else self.report_interval_ms
+            except ValueError:
+                self._reply(3)
+                return
+            if not value:
+                self._emit(f"$Report/Interval={self.report_interval_ms}")
+            self._reply()
+        else:
+            self._reply(3)  # Unsupported system command
+
+    def _start_homing(self, letters: str):
+        order = self.homing_order
+        if letters:
+            names = {axis.letter: axis.name for axis in self.axes}
+            order = [names[letter] for letter in letters if letter in names]
+        axes = [axis for axis in self.axes if axis.name in order]
+        if not axes:
+            self._reply()
+            return
+
+        self.state = 'Idle'
+        position = list(self.position)
+        for name in order:
+            index = next(i for i, axis in enumerate(self.axes) if axis.name == name)
+            axis = self.axes[index]
+            start = tuple(position)
+            position[index] = axis.home_position
+            seek = plan_move(start, tuple(position), self.homing_seek_rate, self.axes)
+            # Locate: pull off and approach the switch again at the feed rate
+            locate = 2.0 * trapezoid_time(self.homing_pulloff, self.homing_feed_rate, axis.acceleration)
+            self._emit(f"[MSG:DBG: Homing Cycle {axis.letter}]")
+            seek.duration += locate
+            seek.kind = 'home'
+            seek.blocks_parser = True
+            self._blocks.append(seek)
+        self._blocks[-1].on_complete = self._homing_done
+        self._planned = tuple(position)
+        self._update_state()
+
+    def _homing_done(self):
+        self.homed = True
+        self.state = 'Idle'
+        self._emit("[MSG:DBG: Homing done]")
+        self._reply()
+
+    def _gcode(self, line: str):
+        words = _WORD.findall(line)
+        if ''.join(letter + value for letter, value in words) != line:
+            self._reply(1)  # Expected command letter
+            return
+
+        axis_index = {axis.letter: i for i, axis in enumerate(self.axes)}
+        axis_index['C'] = axis_index['A']  # Older tools still send C for the tilt axis
+        targets: Dict[int, float] = {}
+        dwell = set_offsets = False
+        seconds = 0.0
+        for letter, value in words:
+            number = float(value)
+            if letter == 'G':
+                code = int(number)
+                if code in (0, 1):
+                    self._motion_mode = code
+                elif code == 4:
+                    dwell = True
+                elif code in (90, 91):
+                    self._relative = code == 91
+                elif code == 92:
+                    set_offsets = True
+                elif code not in (17, 21, 54, 94):
+                    self._reply(20)  # Unsupported G-code
+                    return
+            elif letter == 'F':
+                self._feed_rate = number
+            elif letter == 'P':
+                seconds = number
+            elif letter in axis_index:
+                targets[axis_index[letter]] = number
+            elif letter not in ('M', 'S', 'T', 'N'):
+                self._reply(20)
+                return
+
+        if dwell:
+            self._blocks.append(MotionBlock(self._planned, self._planned, seconds, kind='dwell',
+                                            blocks_parser=True, on_complete=self._reply))
+            return
+        if set_offsets:
+            self.wco = tuple(self._planned[i] - targets[i] if i in targets else offset
+                             for i, offset in enumerate(self.wco))
+            self._reports = 0  # Report the new WCO with the next status
+            self._reply()
+            return
+        if not targets:
+            self._reply()
+            return
+        if self._motion_mode == 1 and self._feed_rate <= 0:
+            self._reply(22)  # Feed rate has not yet been set
+            return
+
+        target = tuple(
+            (self._planned[i] + targets[i] if self._relative else targets[i] + self.wco[i])
+            if i in targets else self._planned[i]
+            for i in range(len(self.axes))
+        )
+        for axis, value in zip(self.axes, target):
+            if axis.soft_limits and not axis.min_travel <= value <= axis.max_travel:
+                self._soft_limit(axis, value)
+                return
+
+        block = plan_move(self._planned, target, self._feed_rate if self._motion_mode == 1 else None, self.axes)
+        self._planned = target
+        if block.duration > 0:
+            self._blocks.append(block)
+            self.stats['moves'] += 1
+            self.stats['max_planner_depth'] = max(self.stats['max_planner_depth'], len(self._blocks))
+            self._update_state()
+        self._reply()
+
+    def _soft_limit(self, axis: SimAxis, value: float):
+        logger.debug(f"🧪 Soft limit on {axis.letter}: {value:.3f}")
+        if self._blocks:
+            self.position = self._blocks[0].position()
+        self._blocks.clear()
+        self._planned = self.position
+        self.state = 'Alarm'
+        self._emit("ALARM:2")
+        self._reply()
+
+
+def main():
+    import argparse
+    from pathlib import Path
+
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Run a simulated FluidNC board on a pty")
+    parser.add_argument('--config', default=str(Path(__file__).resolve().parents[1] / 'config' / 'scanner_config.yaml'))
+    parser.add_argument('--time-scale', type=float, default=1.0, help="Machine seconds per wall second")
+    parser.add_argument('--no-alarm', action='store_true', help="Start unlocked instead of requiring $H")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with open(args.config) as f:
+        motion_config = yaml.safe_load(f).get('motion', {})
+
+    simulator = FluidNCSimulator(motion_config, time_scale=args.time_scale,
+                                 must_home=False if args.no_alarm else None)
+    port = simulator.start()
+    print(f"🧪 Simulated FluidNC on {port} - point motion.controller.port at it (Ctrl-C to stop)")
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
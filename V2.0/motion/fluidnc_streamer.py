@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Character-Counting G-code Streamer for FluidNC
+
+Implements the standard GRBL character-counting streaming protocol on top of
+FluidNCEngine. Instead of waiting for each "ok" before
+sending the next line, the streamer keeps as many lines in flight as fit in
+the controller's serial RX buffer. FluidNC's planner therefore always holds
+the next segments and multi-point paths run without stop-start gaps.
+
+Every line is acknowledged asynchronously through an optional callback.
+Note that an "ok" means the line was accepted into the planner, not that
+the move has finished - use ``wait_for_completion`` for that.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+from motion.fluidnc_engine import FluidNCEngine, PendingResponse
+
+logger = logging.getLogger(__name__)
+
+# Default serial RX buffer size for GRBL-compatible firmware
+DEFAULT_RX_BUFFER_SIZE = 128
+
+
+@dataclass
+class StreamResult:
+    """Outcome of streaming a block of G-code lines"""
+    success: bool
+    lines_sent: int = 0
+    lines_acknowledged: int = 0
+    errors: List[Tuple[int, str, str]] = field(default_factory=list)  # (index, line, response)
+    motion_completed: bool = False
+    duration: float = 0.0
+
+
+class CharacterCountingStreamer:
+    """
+    Stream G-code to FluidNC using RX-buffer character counting
+
+    The streamer tracks the number of bytes sent but not yet acknowledged.
+    A new line is written only while the total stays within
+    ``rx_buffer_size``, so the controller never drops input.
+    """
+
+    def __init__(self, protocol: FluidNCEngine,
+                 rx_buffer_size: int = DEFAULT_RX_BUFFER_SIZE,
+                 ack_timeout: Optional[float] = None):
+        if rx_buffer_size <= 0:
+            raise ValueError("rx_buffer_size must be positive")
+
+        self.protocol = protocol
+        self.rx_buffer_size = rx_buffer_size
+        self.ack_timeout = ack_timeout if ack_timeout is not None else protocol.command_timeout
+
+        # Statistics
+        self.stats = {
+            'streams': 0,
+            'lines_streamed': 0,
+            'max_lines_in_flight': 0,
+            'errors': 0
+        }
+
+    def stream(self, lines: Iterable[str],
+               on_line_complete: Optional[Callable[[int, str, str], None]] = None,
+               wait_for_completion: bool = True) -> StreamResult:
+        """
+        Stream lines to the controller, keeping the RX buffer full
+
+        Args:
+            lines: G-code lines (without trailing newline)
+            on_line_complete: Called as (index, line, response) when each
+                line is acknowledged. Runs on the protocol reader thread.
+            wait_for_completion: Block until the machine returns to Idle
+                after the last line was accepted
+
+        Returns:
+            StreamResult describing what was sent and acknowledged
+        """
+        start_time = time.time()
+        result = StreamResult(success=True)
+        in_flight: Deque[Tuple[int, str, int, PendingResponse]] = deque()
+        buffered_bytes = 0
+        last_pending: Optional[PendingResponse] = None
+
+        self.stats['streams'] += 1
+
+        def make_callback(index: int, line: str):
+            def callback(pending: PendingResponse):
+                if on_line_complete:
+                    on_line_complete(index, line, pending.response or "")
+            return callback
+
+        def retire_oldest() -> bool:
+            nonlocal buffered_bytes
+            index, line, size, pending = in_flight.popleft()
+            response = pending.wait(self.ack_timeout)
+            buffered_bytes -= size
+
+            if response is None:
+                result.errors.append((index, line, "timeout"))
+                return False
+
+            result.lines_acknowledged += 1
+            if response.startswith('error'):
+                result.errors.append((index, line, response))
+                return False
+            return True
+
+        with self.protocol.command_lock:
+            if not self.protocol.is_connected():
+                return StreamResult(success=False, errors=[(-1, "", "Not connected")])
+
+            for index, raw_line in enumerate(lines):
+                line = raw_line.strip()
+                if not line:
+                    continue
+
+                size = len(line.encode('utf-8')) + 1  # Trailing newline counts
+                if size > self.rx_buffer_size:
+                    result.errors.append((index, line, "line exceeds RX buffer"))
+                    break
+
+                # Wait for acknowledgements until the line fits
+                while in_flight and buffered_bytes + size > self.rx_buffer_size:
+                    if not retire_oldest():
+                        break
+                if result.errors:
+                    break
+
+                last_pending = self.protocol.send_line_nowait(line, make_callback(index, line))
+                in_flight.append((index, line, size, last_pending))
+                buffered_bytes += size
+                result.lines_sent += 1
+
+                self.stats['lines_streamed'] += 1
+                self.stats['max_lines_in_flight'] = max(self.stats['max_lines_in_flight'], len(in_flight))
+
+            # Drain remaining acknowledgements (lines already buffered still execute)
+            while in_flight:
+                retire_oldest()
+
+            if result.errors:
+                result.success = False
+                self.stats['errors'] += len(result.errors)
+                logger.error(f"❌ Stream stopped: {result.errors[0]}")
+            elif wait_for_completion and last_pending is not None:
+                result.motion_completed = self.protocol.wait_for_idle(last_pending.status_sequence)
+                result.success = result.motion_completed
+
+        result.duration = time.time() - start_time
+        logger.debug(f"📤 Streamed {result.lines_sent} lines in {result.duration*1000:.1f}ms")
+        return result
+
+    def get_stats(self):
+        """Get streaming statistics"""
+        return self.stats.copy()
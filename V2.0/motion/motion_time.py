@@ -0,0 +1,238 @@
+"""
+Motion Time Estimation
+
+Kinematic move times from the real axis limits instead of fixed speeds.
+Each move follows FluidNC's rest-to-rest trapezoidal profile (triangular
+when the move is too short to reach cruise speed). For coordinated moves
+the path speed and acceleration are limited the way Grbl's planner does
+it - the axis that would exceed its max rate or acceleration first sets
+the pace - which for the usual case is the slowest axis's own profile time.
+
+Limits come from ``motion.axes.*.max_feedrate``/``acceleration`` in the
+configuration or from the controller's ``$110..$113``/``$120..$123``
+settings. Whole point lists are evaluated at once with NumPy; a 10k point
+pattern takes about 3 ms (``python tests/validation/benchmark_motion_time.py``).
+
+Junction blending is not modelled, so a chain of short moves that FluidNC
+runs without stopping is estimated slightly high; scan moves stop at each
+point anyway.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import logging
+import math
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Axis order of every array here
+AXIS_NAMES = ('x', 'y', 'z', 'c')
+
+# FluidNC's default acceleration_mm_per_sec2 when an axis does not set one
+DEFAULT_ACCELERATION = 25.0
+
+# Shipped scanner limits (mm/min or deg/min) for planners built without config
+DEFAULT_MAX_RATES = (1000.0, 1000.0, 800.0, 5000.0)
+
+# Grbl settings: $110+i max rate, $120+i acceleration for axis i
+MAX_RATE_SETTING = 110
+ACCELERATION_SETTING = 120
+
+# Axis movement below this is treated as no movement (as in get_optimal_feedrate)
+MOVE_THRESHOLD = 0.001
+
+FeedRate = Union[None, float, Sequence[float]]
+
+
+def trapezoid_time(distance: float, rate: float, acceleration: float) -> float:
+    """
+    Duration of a rest-to-rest move with a trapezoidal velocity profile
+
+    Args:
+        distance: Path length (mm or degrees)
+        rate: Cruise rate in units/min
+        acceleration: units/s²
+
+    Short moves never reach ``rate`` and follow a triangular profile.
+    """
+    if distance <= 0:
+        return 0.0
+    speed = rate / 60.0
+    if distance >= speed * speed / acceleration:
+        return distance / speed + speed / acceleration
+    return 2.0 * math.sqrt(distance / acceleration)
+
+
+def trapezoid_times(distance: np.ndarray, speed: np.ndarray, acceleration: np.ndarray) -> np.ndarray:
+    """Vectorized ``trapezoid_time`` (speed in units/s)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trapezoid = distance / speed + speed / acceleration
+        triangle = 2.0 * np.sqrt(distance / acceleration)
+        times = np.where(distance >= speed * speed / acceleration, trapezoid, triangle)
+    return np.where(distance > 0, times, 0.0)
+
+
+def as_positions(points: Any) -> np.ndarray:
+    """
+    Positions as an (N, 4) float array in x, y, z, c order
+
+    Accepts an array, a sequence of Position4D (or anything with x/y/z/c
+    attributes), or scan points with a ``position`` attribute.
+    """
+    if isinstance(points, np.ndarray):
+        return np.asarray(points, dtype=float).reshape(-1, len(AXIS_NAMES))
+    rows = []
+    for point in points:
+        position = getattr(point, 'position', point)
+        if hasattr(position, 'x'):
+            rows.append((position.x, position.y, position.z, position.c))
+        else:
+            rows.append(tuple(position))
+    return np.array(rows, dtype=float).reshape(-1, len(AXIS_NAMES))
+
+
+class MotionTimeEstimator:
+    """
+    Move-time estimates from per-axis max rates and accelerations
+
+    Args:
+        max_rates: Max rate per axis in units/min (x, y, z, c)
+        accelerations: Acceleration per axis in units/s²
+        feed_rates: Programmed feed per axis in units/min, used when no feed
+            is given to the estimate. Like the controller's
+            ``get_optimal_feedrate``, a move runs at the lowest feed of the
+            axes it moves. None estimates rapids (max rates only).
+    """
+
+    def __init__(self, max_rates: Sequence[float] = DEFAULT_MAX_RATES,
+                 accelerations: Sequence[float] = (DEFAULT_ACCELERATION,) * len(AXIS_NAMES),
+                 feed_rates: Optional[Sequence[float]] = None):
+        self.max_rates = np.asarray(max_rates, dtype=float)
+        self.accelerations = np.asarray(accelerations, dtype=float)
+        self.feed_rates = None if feed_rates is None else np.asarray(feed_rates, dtype=float)
+        if self.max_rates.shape != (4,) or self.accelerations.shape != (4,):
+            raise ValueError("Need a max rate and an acceleration for each of x, y, z, c")
+        if np.any(self.max_rates <= 0) or np.any(self.accelerations <= 0):
+            raise ValueError("Max rates and accelerations must be positive")
+
+    @classmethod
+    def from_config(cls, motion_config: Dict[str, Any], mode: Optional[str] = 'scanning_mode') -> 'MotionTimeEstimator':
+        """
+        Build from the ``motion`` configuration section
+
+        Args:
+            motion_config: Section with ``axes`` (and optionally ``feedrates``)
+            mode: Feedrate mode whose per-axis feeds moves use, or None for rapids
+        """
+        axes = motion_config.get('axes', {})
+        max_rates, accelerations = [], []
+        for name, default_rate in zip(AXIS_NAMES, DEFAULT_MAX_RATES):
+            axis = axes.get(f'{name}_axis', {})
+            max_rates.append(float(axis.get('max_feedrate', default_rate)))
+            accelerations.append(float(axis.get('acceleration', DEFAULT_ACCELERATION)))
+
+        feed_rates = None
+        mode_feeds = motion_config.get('feedrates', {}).get(mode, {}) if mode else {}
+        if mode_feeds:
+            feed_rates = [float(mode_feeds.get(f'{name}_axis', rate)) for name, rate in zip(AXIS_NAMES, max_rates)]
+        return cls(max_rates, accelerations, feed_rates)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[Any, Any],
+                      fallback: Optional['MotionTimeEstimator'] = None) -> 'MotionTimeEstimator':
+        """
+        Build from controller settings (``$$`` output)
+
+        Args:
+            settings: Setting number (110 or '$110') -> value
+            fallback: Limits to use for settings the controller did not report
+        """
+        fallback = fallback or cls()
+        values = {}
+        for key, value in settings.items():
+            try:
+                values[int(str(key).lstrip('$'))] = float(value)
+            except ValueError:
+                continue
+
+        max_rates = [values.get(MAX_RATE_SETTING + i, fallback.max_rates[i]) for i in range(len(AXIS_NAMES))]
+        accelerations = [values.get(ACCELERATION_SETTING + i, fallback.accelerations[i]) for i in range(len(AXIS_NAMES))]
+        return cls(max_rates, accelerations, fallback.feed_rates)
+
+    @classmethod
+    def from_controller(cls, protocol, fallback: Optional['MotionTimeEstimator'] = None) -> 'MotionTimeEstimator':
+        """Query ``$$`` once from a connected FluidNCEngine; falls back on failure"""
+        try:
+            settings = protocol.query_settings()
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read controller settings: {e}")
+            settings = {}
+        if not settings:
+            logger.info("📊 Using configured axis limits for motion time estimates")
+            return fallback or cls()
+        return cls.from_settings(settings, fallback)
+
+    def move_times(self, points: Any, start: Any = None, feed_rate: FeedRate = None,
+                   speed_factor: float = 1.0) -> np.ndarray:
+        """
+        Time of every move along a point list
+
+        Args:
+            points: Positions (see ``as_positions``)
+            start: Position before the first point; without it the first
+                point is the starting position
+            feed_rate: Programmed feed (units/min) for every move, or one
+                feed per axis; defaults to the estimator's ``feed_rates``
+            speed_factor: Feed override applied to max rates and feeds
+
+        Returns:
+            Move times in seconds, one per move
+        """
+        positions = as_positions(points)
+        if start is not None:
+            positions = np.vstack((as_positions([start]), positions))
+        if len(positions) < 2:
+            return np.zeros(0)
+
+        delta = np.abs(np.diff(positions, axis=0))
+        length = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = delta / length[:, None]
+            moving = share > 0
+            # Path limits that keep every moving axis within its own limits
+            speed = np.where(moving, self.max_rates * speed_factor / 60.0 / share, np.inf).min(axis=1)
+            acceleration = np.where(moving, self.accelerations / share, np.inf).min(axis=1)
+
+        feed = self.feed_rates if feed_rate is None else feed_rate
+        if feed is not None:
+            feed = np.asarray(feed, dtype=float)
+            if feed.ndim:
+                # Lowest feed of the axes that move, like get_optimal_feedrate
+                per_axis = feed
+                feed = np.where(delta > MOVE_THRESHOLD, per_axis, np.inf).min(axis=1)
+                feed = np.where(np.isfinite(feed), feed, per_axis[0])
+            speed = np.minimum(speed, feed * speed_factor / 60.0)
+
+        return trapezoid_times(length, speed, acceleration)
+
+    def path_time(self, points: Any, start: Any = None, feed_rate: FeedRate = None,
+                  speed_factor: float = 1.0) -> float:
+        """Total motion time along a point list in seconds"""
+        return float(self.move_times(points, start, feed_rate, speed_factor).sum())
+
+    def move_time(self, from_pos: Any, to_pos: Any, feed_rate: FeedRate = None,
+                  speed_factor: float = 1.0) -> float:
+        """Time of a single move in seconds"""
+        return self.path_time([from_pos, to_pos], feed_rate=feed_rate, speed_factor=speed_factor)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'max_rates': dict(zip(AXIS_NAMES, self.max_rates.tolist())),
+            'accelerations': dict(zip(AXIS_NAMES, self.accelerations.tolist())),
+            'feed_rates': None if self.feed_rates is None else dict(zip(AXIS_NAMES, self.feed_rates.tolist()))
+        }
+
@@ -15,10 +15,11 @@ Created: September 24, 2025
 import asyncio
 import logging
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
 
 # Import the fixed protocol
-from motion.simplified_fluidnc_protocol_fixed import SimplifiedFluidNCProtocolFixed, FluidNCStatus
+from motion.fluidnc_engine import FluidNCEngine, FluidNCStatus
+from motion.fluidnc_streamer import CharacterCountingStreamer, DEFAULT_RX_BUFFER_SIZE
 from motion.base import MotionController, Position4D, MotionStatus, MotionCapabilities, MotionLimits
 from core.events import EventBus
 from core.exceptions import MotionError, MotionSafetyError, ConfigurationError
@@ -59,11 +60,15 @@ class SimplifiedFluidNCControllerFixed(MotionController):
         self.port = config.get('port', '/dev/ttyUSB0')
         self.baud_rate = config.get('baud_rate', 115200)
         
-        # Protocol instance (fixed version)
-        self.protocol = SimplifiedFluidNCProtocolFixed(
+        # Protocol instance (fixed version); status is pushed by FluidNC
+        status_config = config.get('status_reports', {})
+        self.protocol = FluidNCEngine(
             port=self.port,
             baud_rate=self.baud_rate,
-            command_timeout=config.get('command_timeout', 10.0)
+            command_timeout=config.get('command_timeout', 10.0),
+            auto_report=status_config.get('auto_report', True),
+            report_interval_ms=status_config.get('idle_interval_ms', 500),
+            motion_report_interval_ms=status_config.get('motion_interval_ms', 50)
         )
         
         # State management
@@ -71,6 +76,17 @@ class SimplifiedFluidNCControllerFixed(MotionController):
         self.current_position = Position4D()  # Tracked from machine
         self.target_position = Position4D()
         
+        # Opt-in character-counting streaming for move_through_positions paths
+        streaming_config = config.get('streaming', {})
+        self.streaming_enabled = streaming_config.get('enabled', False)
+        self.streamer = CharacterCountingStreamer(
+            self.protocol,
+            rx_buffer_size=streaming_config.get('rx_buffer_size', DEFAULT_RX_BUFFER_SIZE)
+        )
+        
+        # Last modal state sent to FluidNC (None = unknown, must be resent)
+        self._modal_state: Dict[str, Any] = {'distance_mode': None, 'feedrate': None}
+        
         # Operating mode for feedrate selection
         self.operating_mode = "manual_mode"  # Default to manual/jog mode
         
@@ -138,6 +154,8 @@ class SimplifiedFluidNCControllerFixed(MotionController):
             )
             
             if connected:
+                self._invalidate_modal_state()
+                
                 # Check initial status - might be in alarm state
                 status = await self.get_status()
                 logger.info(f"📊 Initial FluidNC status: {status}")
@@ -283,17 +301,13 @@ class SimplifiedFluidNCControllerFixed(MotionController):
                 feedrate = self.get_optimal_feedrate(delta)
                 logger.debug(f"🎯 Auto-selected feedrate: {feedrate} ({self.operating_mode})")
             
-            # Set feedrate
-            await self._send_command(f"F{feedrate}")
-            
-            # Send absolute movement (G90 is default, but ensure it)
-            await self._send_command("G90")
-            
-            # Send move command
-            gcode = f"G1 X{position.x:.3f} Y{position.y:.3f} Z{position.z:.3f} A{position.c:.3f}"
+            # Single coordinated move - G90 and F only included when they change
+            gcode = self._build_absolute_move("G1", position, feedrate)
             success, response = await self._send_command(gcode)
             
             if success:
+                self._modal_state['distance_mode'] = 'G90'
+                self._modal_state['feedrate'] = feedrate
                 self.target_position = position.copy()
                 self.stats['movements_completed'] += 1
                 
@@ -342,27 +356,15 @@ class SimplifiedFluidNCControllerFixed(MotionController):
                 feedrate = self.get_optimal_feedrate(delta)
                 logger.debug(f"🎯 Auto-selected feedrate: {feedrate} ({self.operating_mode})")
             
-            # Optimize for manual operations: combine commands to reduce delays
-            if self.operating_mode == "manual_mode":
-                # For manual jogging, combine feedrate and move into single command
-                # FluidNC supports F parameter directly in move commands
-                gcode = f"G90 G1 X{target.x:.3f} Y{target.y:.3f} Z{target.z:.3f} A{target.c:.3f} F{feedrate}"
-                success, response = await self._send_command(gcode, priority="high")
-            else:
-                # For scan operations, use separate commands for precision and reliability
-                # Set feedrate
-                await self._send_command(f"F{feedrate}", priority="normal")
-                
-                # Use absolute positioning to avoid coordinate drift
-                success, response = await self._send_command("G90", priority="normal")
-                if not success:
-                    return False
-                
-                # Send absolute move to calculated target
-                gcode = f"G1 X{target.x:.3f} Y{target.y:.3f} Z{target.z:.3f} A{target.c:.3f}"
-                success, response = await self._send_command(gcode, priority="normal")
+            # Absolute move to calculated target avoids coordinate drift;
+            # manual jogs use the fast high-priority path
+            priority = "high" if self.operating_mode == "manual_mode" else "normal"
+            gcode = self._build_absolute_move("G1", target, feedrate)
+            success, response = await self._send_command(gcode, priority=priority)
             
             if success:
+                self._modal_state['distance_mode'] = 'G90'
+                self._modal_state['feedrate'] = feedrate
                 self.target_position = target.copy()
                 self.stats['movements_completed'] += 1
                 
@@ -389,19 +391,102 @@ class SimplifiedFluidNCControllerFixed(MotionController):
             self.stats['errors_encountered'] += 1
             return False
     
+    async def move_through_positions(self, positions: List[Position4D], feedrate: Optional[float] = None,
+                                     on_point_accepted: Optional[Callable[[int, Position4D], None]] = None) -> bool:
+        """
+        Move through a sequence of positions as one continuous path
+        
+        With streaming enabled the moves are queued in FluidNC's planner
+        using character counting, so there is no stop between segments.
+        Otherwise each position is visited with a separate move_to_position.
+        
+        Scans do not use this: every scan point is a capture point, so the
+        orchestrator stops and waits for Idle at each one.
+        
+        Args:
+            positions: Absolute waypoints in order
+            feedrate: Feedrate for all segments (auto-selected if None)
+            on_point_accepted: Called as (index, position) when FluidNC
+                accepts each segment into its planner (reader thread)
+        """
+        if not positions:
+            return True
+        
+        if not self.streaming_enabled:
+            for index, position in enumerate(positions):
+                if not await self.move_to_position(position, feedrate):
+                    return False
+                if on_point_accepted:
+                    on_point_accepted(index, position)
+            return True
+        
+        try:
+            for position in positions:
+                if not self._validate_position_limits(position):
+                    raise MotionSafetyError(f"Path position {position} exceeds limits")
+            
+            if feedrate is None:
+                current = await self.get_position()
+                last = positions[-1]
+                feedrate = self.get_optimal_feedrate(Position4D(
+                    last.x - current.x, last.y - current.y,
+                    last.z - current.z, last.c - current.c
+                ))
+            
+            # First line carries any modal changes, the rest are bare G1 words
+            lines = []
+            for position in positions:
+                lines.append(self._build_absolute_move("G1", position, feedrate))
+                self._modal_state['distance_mode'] = 'G90'
+                self._modal_state['feedrate'] = feedrate
+            
+            def line_complete(index: int, line: str, response: str):
+                if on_point_accepted and response == 'ok':
+                    on_point_accepted(index, positions[index])
+            
+            self.stats['commands_sent'] += len(lines)
+            result = await asyncio.get_event_loop().run_in_executor(
+                None, self.streamer.stream, lines, line_complete
+            )
+            
+            if not result.success:
+                # Modal state is unknown after a partially accepted stream
+                self._invalidate_modal_state()
+                logger.error(f"❌ Streamed path failed: {result.errors}")
+                self.stats['errors_encountered'] += 1
+                return False
+            
+            self.target_position = positions[-1].copy()
+            self.stats['movements_completed'] += len(positions)
+            await self._update_current_position()
+            
+            self._emit_event("motion_completed", {
+                "target_position": self.target_position.to_dict(),
+                "actual_position": self.current_position.to_dict(),
+                "feedrate": feedrate,
+                "operating_mode": self.operating_mode,
+                "streamed_points": len(positions)
+            })
+            
+            logger.info(f"✅ Streamed path of {len(positions)} points in {result.duration:.2f}s")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Streamed path failed: {e}")
+            self.stats['errors_encountered'] += 1
+            return False
+    
     async def rapid_move(self, position: Position4D) -> bool:
         """Rapid (G0) move to position"""
         try:
             if not self._validate_position_limits(position):
                 raise MotionSafetyError(f"Rapid move position {position} exceeds limits")
             
-            # Ensure absolute mode
-            await self._send_command("G90")
-            
-            gcode = f"G0 X{position.x:.3f} Y{position.y:.3f} Z{position.z:.3f} A{position.c:.3f}"
+            gcode = self._build_absolute_move("G0", position)
             success, response = await self._send_command(gcode)
             
             if success:
+                self._modal_state['distance_mode'] = 'G90'
                 self.target_position = position.copy()
                 self.stats['movements_completed'] += 1
                 
@@ -426,6 +511,7 @@ class SimplifiedFluidNCControllerFixed(MotionController):
             
             # Reset homed status at start of homing
             self.is_homed = False
+            self._invalidate_modal_state()
             logger.info(f"🔄 Reset is_homed flag to False at homing start")
             
             # Determine homing command
@@ -441,18 +527,8 @@ class SimplifiedFluidNCControllerFixed(MotionController):
             logger.info(f"🏠 Sending: {homing_command}")
             
             try:
-                # Direct serial send to avoid motion wait conflicts during homing
-                with self.protocol.connection_lock:
-                    if self.protocol.serial_connection:
-                        command_bytes = f"{homing_command}\n".encode('utf-8')
-                        self.protocol.serial_connection.write(command_bytes)
-                        self.protocol.serial_connection.flush()
-                        logger.info("✅ Homing command sent directly via serial")
-                        success = True
-                        response = "Command sent via direct serial"
-                    else:
-                        success = False
-                        response = "No serial connection available"
+                # Send without motion wait; the protocol reader tracks the deferred ok
+                success, response = self.protocol.send_homing_command(homing_command)
             except Exception as e:
                 success = False
                 response = f"Direct send error: {e}"
@@ -668,6 +744,7 @@ class SimplifiedFluidNCControllerFixed(MotionController):
             
             if stopped:
                 self.motion_status = MotionStatus.ALARM
+                self._invalidate_modal_state()
                 
                 # Update position after stop
                 await self._update_current_position()
@@ -697,6 +774,8 @@ class SimplifiedFluidNCControllerFixed(MotionController):
             )
             
             if reset:
+                self._invalidate_modal_state()
+                
                 # Wait for controller to restart
                 await asyncio.sleep(2.0)
                 
@@ -804,6 +883,8 @@ class SimplifiedFluidNCControllerFixed(MotionController):
     async def execute_gcode(self, gcode: str) -> bool:
         """Execute raw G-code command"""
         try:
+            # Raw G-code may change modal state behind our back
+            self._invalidate_modal_state()
             success, response = await self._send_command(gcode)
             
             if success:
@@ -843,6 +924,26 @@ class SimplifiedFluidNCControllerFixed(MotionController):
             return False
     
     # Helper Methods
+    def _build_absolute_move(self, motion_code: str, position: Position4D,
+                             feedrate: Optional[float] = None) -> str:
+        """
+        Build a single coordinated 4-axis move line
+        
+        Modal words (G90, F) are only emitted when they differ from the
+        last state sent, so repeated scan moves are one short line each.
+        """
+        words = []
+        if self._modal_state['distance_mode'] != 'G90':
+            words.append("G90")
+        words.append(f"{motion_code} X{position.x:.3f} Y{position.y:.3f} Z{position.z:.3f} A{position.c:.3f}")
+        if feedrate is not None and self._modal_state['feedrate'] != feedrate:
+            words.append(f"F{feedrate}")
+        return " ".join(words)
+    
+    def _invalidate_modal_state(self):
+        """Forget cached modal state (after reset, alarm or raw G-code)"""
+        self._modal_state = {'distance_mode': None, 'feedrate': None}
+    
     async def _send_command(self, command: str, command_id: Optional[str] = None, priority: str = "normal") -> tuple[bool, str]:
         """Send command using fixed protocol with motion completion
         
@@ -908,13 +1009,19 @@ class SimplifiedFluidNCControllerFixed(MotionController):
     async def _request_status_update(self):
         """Request fresh status from controller"""
         try:
-            # Send status request
-            await asyncio.get_event_loop().run_in_executor(
-                None, self.protocol.send_immediate_command, '?'
-            )
-            
-            # Give time for response
-            await asyncio.sleep(0.1)
+            if self.protocol.auto_reporting:
+                # Reports are pushed - wait for the next one instead of querying
+                await asyncio.get_event_loop().run_in_executor(
+                    None, self.protocol.wait_for_status_update, 0.2
+                )
+            else:
+                # Send status request
+                await asyncio.get_event_loop().run_in_executor(
+                    None, self.protocol.send_immediate_command, '?'
+                )
+                
+                # Give time for response
+                await asyncio.sleep(0.1)
             
             # Update position from response
             await self._update_current_position()
@@ -1248,6 +1355,7 @@ class SimplifiedFluidNCControllerFixed(MotionController):
                     logger.warning(f"⚠️ Pre-homing alarm clear failed (continuing anyway): {e}")
             
             # Send homing command and then monitor status
+            self._invalidate_modal_state()
             logger.info("🏠 Sending homing command ($H)...")
             logger.info("⚠️ SAFETY: Ensure all axes can move freely to limit switches")
             
@@ -1362,6 +1470,7 @@ class SimplifiedFluidNCControllerFixed(MotionController):
                 status_callback("homing", "Sending homing command ($H)...")
             
             logger.info("🏠 Sending homing command ($H)...")
+            self._invalidate_modal_state()
             
             success, response = await asyncio.get_event_loop().run_in_executor(
                 None, self.protocol.send_homing_command
@@ -0,0 +1,220 @@
+"""
+FluidNC Status Reports
+
+Fast parsing of ``<State|MPos:...|FS:...|WCO:...>`` status lines into an
+immutable ``StatusReport`` and a dispatcher that runs status callbacks off
+the serial reader thread.
+
+FluidNC only sends ``WCO`` and ``Ov`` every few reports, so ``StatusParser``
+remembers the last values and fills them into every record; work position
+is derived from ``MPos - WCO`` (or the other way round for ``WPos``) on
+access. Position dictionaries are only built when a consumer asks for
+them - the reader thread itself never allocates them, and repeated field
+values are not converted again.
+
+Run ``python tests/validation/benchmark_status_parser.py`` for a
+microbenchmark.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Axes = Tuple[float, ...]
+
+AXIS_NAMES = ('x', 'y', 'z', 'a')
+ZERO_AXES: Axes = (0.0, 0.0, 0.0, 0.0)
+
+# Leading well-formed number, used only to repair corrupted values like '0.0000.673'
+_NUMBER = re.compile(r'-?\d*\.?\d+')
+
+
+class StatusReport(NamedTuple):
+    """One parsed FluidNC status report (immutable)"""
+    state: str = "Unknown"
+    mpos: Optional[Axes] = None
+    wpos: Optional[Axes] = None
+    feed_rate: float = 0.0
+    spindle_speed: float = 0.0
+    wco: Optional[Axes] = None
+    pins: str = ""
+    overrides: Optional[Axes] = None
+    timestamp: float = 0.0
+
+    @property
+    def machine_axes(self) -> Axes:
+        if self.mpos is not None:
+            return self.mpos
+        if self.wpos is not None and self.wco is not None:
+            return tuple(w + o for w, o in zip(self.wpos, self.wco))
+        return self.wpos or ZERO_AXES
+
+    @property
+    def work_axes(self) -> Axes:
+        if self.wpos is not None:
+            return self.wpos
+        if self.mpos is not None and self.wco is not None:
+            return tuple(m - o for m, o in zip(self.mpos, self.wco))
+        return self.mpos or ZERO_AXES
+
+    @property
+    def machine_position(self) -> dict:
+        return dict(zip(AXIS_NAMES, self.machine_axes))
+
+    @property
+    def work_position(self) -> dict:
+        return dict(zip(AXIS_NAMES, self.work_axes))
+
+    @property
+    def position(self) -> dict:
+        """Machine position as an axis dict ('x', 'y', 'z', 'a')"""
+        return self.machine_position
+
+
+def _repair_axes(value: str) -> Axes:
+    """Slow path for values the fast parser rejected"""
+    axes = []
+    for coord in value.split(','):
+        match = _NUMBER.match(coord.strip())
+        if match is None:
+            raise ValueError(f"bad coordinate '{coord}'")
+        axes.append(float(match.group()))
+    logger.warning(f"🔧 Repaired corrupted coordinates: '{value}'")
+    return tuple(axes)
+
+
+def _axes(value: str) -> Axes:
+    try:
+        return tuple(map(float, value.split(',')))
+    except ValueError:
+        return _repair_axes(value)
+
+
+class StatusParser:
+    """
+    Parser for status lines
+
+    Keeps the WCO/overrides FluidNC sends only occasionally so every record
+    is complete, and reuses the parsed tuple when a field repeats verbatim
+    (an idle machine reports the same position over and over), so most
+    reports need no float conversion at all.
+    """
+
+    __slots__ = ('wco', 'overrides', '_cache')
+
+    def __init__(self):
+        self.wco: Optional[Axes] = None
+        self.overrides: Optional[Axes] = None
+        self._cache: Dict[str, Tuple[str, Axes]] = {}
+
+    def _field(self, name: str, value: str) -> Axes:
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == value:
+            return cached[1]
+        axes = _axes(value)
+        self._cache[name] = (value, axes)
+        return axes
+
+    def parse(self, line: str, timestamp: Optional[float] = None) -> Optional[StatusReport]:
+        """Parse one ``<...>`` line, or return None if it is not a status report"""
+        if not (line.startswith('<') and line.endswith('>')):
+            return None
+
+        fields = line[1:-1].split('|')
+        mpos = wpos = None
+        feed = spindle = 0.0
+        pins = ""
+        for field in fields[1:]:
+            name, _, value = field.partition(':')
+            try:
+                if name == 'MPos':
+                    mpos = self._field(name, value)
+                elif name == 'WPos':
+                    wpos = self._field(name, value)
+                elif name == 'FS' or name == 'F':
+                    rates = self._field(name, value)
+                    feed = rates[0]
+                    spindle = rates[1] if len(rates) > 1 else 0.0
+                elif name == 'WCO':
+                    self.wco = self._field(name, value)
+                elif name == 'Pn':
+                    pins = value
+                elif name == 'Ov':
+                    self.overrides = self._field(name, value)
+            except (ValueError, IndexError) as e:
+                # Skip corrupted fields but keep the rest of the report
+                logger.debug(f"🔧 Skipping corrupted status field '{field}' - {e}")
+
+        return StatusReport(fields[0], mpos, wpos, feed, spindle, self.wco, pins, self.overrides,
+                            time.time() if timestamp is None else timestamp)
+
+
+class StatusDispatcher:
+    """
+    Runs status callbacks on their own thread
+
+    Consecutive reports with the same state are coalesced (only the newest
+    position matters), but every state change is delivered in order, so a
+    slow callback can fall behind without blocking the serial reader or
+    missing a Run -> Idle transition.
+    """
+
+    def __init__(self, callbacks: List[Callable[[StatusReport], None]]):
+        self.callbacks = callbacks
+        self._pending: Deque[StatusReport] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.stats = {'dispatched': 0, 'coalesced': 0}
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="fluidnc-status-callbacks", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def submit(self, status: StatusReport):
+        """Queue a report for the callbacks (called on the reader thread)"""
+        if not self.callbacks or not self._running:
+            return
+        with self._condition:
+            if self._pending and self._pending[-1].state == status.state:
+                self._pending[-1] = status
+                self.stats['coalesced'] += 1
+            else:
+                self._pending.append(status)
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                if not self._running:
+                    return
+                status = self._pending.popleft()
+
+            for callback in list(self.callbacks):
+                try:
+                    callback(status)
+                except Exception as e:
+                    logger.error(f"❌ Status callback error: {e}")
+            self.stats['dispatched'] += 1
@@ -19,6 +19,7 @@ from pathlib import Path
 from core.exceptions import PathPlanningError
 from core.events import ScannerEvent
 from motion.base import Position4D
+from motion.motion_time import MotionTimeEstimator
 
 
 class ScanStrategy(Enum):
@@ -209,6 +210,9 @@ class PathPlanner(ABC):
         self.saved_paths: Dict[str, ScanPath] = {}
         self.event_callbacks: List[Callable] = []
         self.planning_active = False
+        
+        # Move times from the configured axis rates and accelerations
+        self.motion_time = MotionTimeEstimator.from_config(config.get('motion', config))
     
     # Path Generation
     @abstractmethod
@@ -563,6 +567,9 @@ class PathPlanner(ABC):
         """
         Calculate movement time between positions
         
+        Uses trapezoidal acceleration profiles with the axis limits from
+        the motion configuration (see ``motion.motion_time``).
+        
         Args:
             from_pos: Starting position
             to_pos: Target position
@@ -571,22 +578,20 @@ class PathPlanner(ABC):
         Returns:
             Movement time in seconds
         """
-        # Base movement speeds (units/second)
-        linear_speed = 50.0  # mm/s
-        angular_speed = 90.0  # degrees/s
-        
-        # Calculate movement distances
-        linear_dist = ((to_pos.x - from_pos.x)**2 + (to_pos.y - from_pos.y)**2)**0.5
-        z_dist = abs(to_pos.z - from_pos.z)
-        c_dist = abs(to_pos.c - from_pos.c)
-        
-        # Calculate movement times
-        linear_time = linear_dist / (linear_speed * speed_factor)
-        z_time = z_dist / (angular_speed * speed_factor)
-        c_time = c_dist / (angular_speed * speed_factor)
+        return self.motion_time.move_time(from_pos, to_pos, speed_factor=speed_factor)
+    
+    def calculate_path_movement_time(self, positions: List[Position4D], speed_factor: float = 1.0) -> float:
+        """
+        Calculate total movement time along a sequence of positions
         
-        # Return maximum time (limiting axis)
-        return max(linear_time, z_time, c_time)
+        Args:
+            positions: Positions in visiting order
+            speed_factor: Speed scaling factor
+            
+        Returns:
+            Movement time in seconds
+        """
+        return self.motion_time.path_time(positions, speed_factor=speed_factor)
 
 
 # Utility functions for path planning
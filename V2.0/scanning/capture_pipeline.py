@@ -0,0 +1,166 @@
+"""
+Capture Pipeline - Overlapped Encode and Storage
+
+Decouples image encoding and disk writes from the scan loop. The orchestrator
+submits raw frames as soon as the sensor readout for a point finishes and
+immediately starts moving to the next point, while a small worker pool
+encodes and saves the previous frames in the background.
+
+The queue is bounded: if encoding falls behind, ``submit`` waits for a free
+slot, so memory use stays at roughly ``max_queue`` full-resolution frames.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CaptureJob:
+    """Frames captured at one scan point, waiting to be encoded and saved"""
+    point_index: int
+    frames: List[Dict[str, Any]]
+    submitted_at: float = field(default_factory=time.time)
+
+
+class CapturePipeline:
+    """
+    Bounded producer/consumer pipeline for frame encoding and storage
+
+    Args:
+        save_frame: Blocking function that encodes and writes one frame and
+            returns a capture result dict (``success``, ``camera_id``, ...).
+            Runs in the pipeline's thread pool.
+        max_queue: Maximum number of points waiting to be encoded
+        workers: Number of concurrent encode/save workers
+        on_result: Called on the event loop as (point_index, results)
+            once every frame of a point has been processed
+    """
+
+    def __init__(self,
+                 save_frame: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 max_queue: int = 4,
+                 workers: int = 2,
+                 on_result: Optional[Callable[[int, List[Dict[str, Any]]], None]] = None):
+        if max_queue < 1:
+            raise ValueError("max_queue must be at least 1")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
+        self.save_frame = save_frame
+        self.max_queue = max_queue
+        self.workers = workers
+        self.on_result = on_result
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+        self.stats = {
+            'jobs_submitted': 0,
+            'jobs_completed': 0,
+            'frames_saved': 0,
+            'frames_failed': 0,
+            'backpressure_time': 0.0,  # Time the scan loop waited for a free slot
+            'encode_time': 0.0
+        }
+
+    @property
+    def running(self) -> bool:
+        return bool(self._worker_tasks)
+
+    async def start(self):
+        """Start encode workers"""
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="capture-encode")
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(worker_id)) for worker_id in range(self.workers)
+        ]
+        logger.info(f"Capture pipeline started ({self.workers} workers, queue {self.max_queue})")
+
+    async def submit(self, job: CaptureJob):
+        """Queue a job, waiting for a free slot if the encoders are behind"""
+        if not self._queue:
+            raise RuntimeError("Capture pipeline is not running")
+
+        wait_start = time.time()
+        await self._queue.put(job)
+        waited = time.time() - wait_start
+
+        self.stats['jobs_submitted'] += 1
+        self.stats['backpressure_time'] += waited
+        if waited > 0.05:
+            logger.debug(f"Capture pipeline back-pressure: waited {waited*1000:.0f}ms for point {job.point_index}")
+
+    async def drain(self):
+        """Wait until every submitted job has been encoded and saved"""
+        if self._queue:
+            await self._queue.join()
+
+    async def stop(self):
+        """Drain outstanding jobs and shut the workers down"""
+        if not self.running:
+            return
+
+        await self.drain()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._queue = None
+        logger.info(f"Capture pipeline stopped: {self.stats}")
+
+    async def _worker(self, worker_id: int):
+        """Encode and save queued frames"""
+        loop = asyncio.get_running_loop()
+        assert self._queue is not None
+
+        while True:
+            job = await self._queue.get()
+            try:
+                encode_start = time.time()
+                results = []
+                for frame in job.frames:
+                    try:
+                        result = await loop.run_in_executor(self._executor, self.save_frame, frame)
+                    except Exception as e:
+                        result = {'camera_id': frame.get('camera_id', 'unknown'), 'success': False, 'error': str(e)}
+                    finally:
+                        # Camera buffers must go back even if save_frame did not release them
+                        if frame.get('handle') is not None:
+                            frame['handle'].release()
+                    results.append(result)
+
+                    if result.get('success'):
+                        self.stats['frames_saved'] += 1
+                    else:
+                        self.stats['frames_failed'] += 1
+
+                self.stats['encode_time'] += time.time() - encode_start
+                self.stats['jobs_completed'] += 1
+
+                if self.on_result:
+                    try:
+                        self.on_result(job.point_index, results)
+                    except Exception as e:
+                        logger.error(f"Capture pipeline result handler failed: {e}")
+            except Exception as e:
+                logger.error(f"Capture pipeline worker {worker_id} failed on point {job.point_index}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pipeline statistics"""
+        return self.stats.copy()
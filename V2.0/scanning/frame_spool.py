@@ -0,0 +1,196 @@
+"""
+Frame Spool - Raw Capture with Deferred Encoding
+
+In spool mode the scan loop does not encode JPEGs at all: each frame's raw
+pixels are appended to a spool file (one sequential write, no encoder on
+the capture path) and described by a line in ``index.jsonl``. After the
+scan, ``SpoolEncoder`` memory-maps the spool and encodes every frame with
+one worker per core through the normal ``save_frame`` path, so output
+files are identical to the direct pipeline.
+
+The index is flushed per frame, so a spool left behind by a crash or power
+loss can be encoded later with ``FrameSpool.open`` + ``SpoolEncoder``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SPOOL_FILE = 'frames.raw'
+INDEX_FILE = 'index.jsonl'
+
+
+class FrameSpool:
+    """
+    Append-only raw frame store
+
+    Args:
+        directory: Spool directory (created; should be on the same disk as
+            the scan output so encoding does not cross devices)
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._data = open(self.directory / SPOOL_FILE, 'ab')
+        self._index = open(self.directory / INDEX_FILE, 'a')
+        self._offset = self._data.tell()
+        self.stats = {'frames': 0, 'bytes': 0, 'write_time': 0.0}
+
+    @classmethod
+    def open(cls, directory: Path) -> 'FrameSpool':
+        """Reopen an existing spool (e.g. left over from an interrupted scan)"""
+        if not (Path(directory) / INDEX_FILE).exists():
+            raise FileNotFoundError(f"No frame spool in {directory}")
+        return cls(directory)
+
+    def write_frame(self, frame: Dict[str, Any]) -> Dict[str, Any]:
+        """Spool one captured frame (blocking - run in a worker thread)"""
+        image = np.ascontiguousarray(frame['image'])
+        entry = {
+            'camera_id': frame['camera_id'],
+            'output_path': str(frame['output_path']),
+            'shape': list(image.shape),
+            'dtype': image.dtype.str,
+            'metadata': frame.get('metadata', {})
+        }
+
+        try:
+            start = time.time()
+            with self._lock:
+                entry['offset'] = self._offset
+                self._data.write(memoryview(image).cast('B'))
+                self._data.flush()
+                self._offset += image.nbytes
+                self._index.write(json.dumps(entry, default=str) + '\n')
+                self._index.flush()
+            self.stats['frames'] += 1
+            self.stats['bytes'] += image.nbytes
+            self.stats['write_time'] += time.time() - start
+        except Exception as e:
+            logger.error(f"CAMERA: Failed to spool frame for {entry['output_path']}: {e}")
+            return {'camera_id': frame['camera_id'], 'success': False, 'error': str(e)}
+        finally:
+            # Written straight from the camera buffer - hand it back now
+            if frame.get('handle') is not None:
+                frame['handle'].release()
+
+        return {
+            'camera_id': frame['camera_id'],
+            'spooled': True,
+            'resolution': image.shape,
+            'success': True,
+            'metadata': entry['metadata']
+        }
+
+    def close(self):
+        with self._lock:
+            self._data.close()
+            self._index.close()
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Index entries of every complete frame in the spool"""
+        size = (self.directory / SPOOL_FILE).stat().st_size
+        entries = []
+        with open(self.directory / INDEX_FILE) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # Torn last line after a crash
+                if entry['offset'] + int(np.prod(entry['shape'])) * np.dtype(entry['dtype']).itemsize <= size:
+                    entries.append(entry)
+        return entries
+
+    def frames(self) -> List[Dict[str, Any]]:
+        """Spooled frames as ``save_frame`` inputs (images are memory-mapped views)"""
+        frames = []
+        if (self.directory / SPOOL_FILE).stat().st_size == 0:
+            return frames
+
+        spool = np.memmap(self.directory / SPOOL_FILE, dtype=np.uint8, mode='r')
+        for entry in self.entries():
+            dtype = np.dtype(entry['dtype'])
+            count = int(np.prod(entry['shape']))
+            image = np.frombuffer(spool, dtype=dtype, count=count, offset=entry['offset']).reshape(entry['shape'])
+            frames.append({
+                'camera_id': entry['camera_id'],
+                'image': image,
+                'output_path': Path(entry['output_path']),
+                'metadata': entry['metadata']
+            })
+        return frames
+
+    def remove(self):
+        """Delete the spool once every frame has been encoded"""
+        if not self._data.closed:
+            self.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class SpoolEncoder:
+    """
+    Batch encoder for a frame spool
+
+    Args:
+        save_frame: Blocking encode + write function (same as the capture
+            pipeline's); OpenCV releases the GIL while encoding, so threads
+            use every core
+        workers: Concurrent encoders (default: one per CPU core)
+        on_result: Called on the event loop with each frame's result
+    """
+
+    def __init__(self, save_frame: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 workers: Optional[int] = None,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.save_frame = save_frame
+        self.workers = workers or os.cpu_count() or 1
+        self.on_result = on_result
+        self.stats = {'frames_encoded': 0, 'frames_failed': 0, 'encode_time': 0.0}
+
+    async def encode(self, spool: FrameSpool, remove_when_done: bool = True) -> List[Dict[str, Any]]:
+        """Encode every spooled frame; the spool is removed if all succeeded"""
+        spool.close()
+        frames = spool.frames()
+        loop = asyncio.get_running_loop()
+        start = time.time()
+        logger.info(f"Encoding {len(frames)} spooled frames with {self.workers} workers")
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="spool-encode") as executor:
+            async def encode_one(frame):
+                try:
+                    result = await loop.run_in_executor(executor, self.save_frame, frame)
+                except Exception as e:
+                    result = {'camera_id': frame['camera_id'], 'success': False, 'error': str(e)}
+
+                self.stats['frames_encoded' if result.get('success') else 'frames_failed'] += 1
+                if self.on_result:
+                    try:
+                        self.on_result(result)
+                    except Exception as e:
+                        logger.error(f"Spool encoder result handler failed: {e}")
+                return result
+
+            results = await asyncio.gather(*(encode_one(frame) for frame in frames))
+
+        self.stats['encode_time'] += time.time() - start
+        del frames  # Release the memory map before deleting the file
+
+        if remove_when_done and not self.stats['frames_failed']:
+            spool.remove()
+        elif self.stats['frames_failed']:
+            logger.warning(f"Keeping frame spool {spool.directory}: {self.stats['frames_failed']} frames failed to encode")
+        logger.info(f"Spool encode finished: {self.stats}")
+        return list(results)
@@ -27,6 +27,11 @@ from core.exceptions import ScannerSystemError, HardwareError, ConfigurationErro
 
 from .scan_patterns import ScanPattern, ScanPoint, GridScanPattern
 from .scan_state import ScanState, ScanStatus, ScanPhase
+from .capture_pipeline import CapturePipeline, CaptureJob
+from .frame_spool import FrameSpool, SpoolEncoder
+from camera.preview_output import PreviewJpegOutput
+from camera.frame_handle import FrameHandle, subsampled_brightness
+from motion.motion_time import MotionTimeEstimator
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +101,16 @@ class MockMotionController:
         self._position['rotation'] = rotation
         return True
         
+    async def move_to_position(self, position, feedrate: Optional[float] = None) -> bool:
+        await asyncio.sleep(0.2)  # Single coordinated move
+        self._position.update({'x': position.x, 'y': position.y, 'z': position.z, 'rotation': position.c})
+        return True
+        
+    async def get_current_position(self):
+        from motion.base import Position4D
+        return Position4D(x=self._position['x'], y=self._position['y'],
+                          z=self._position['z'], c=self._position['rotation'])
+        
     async def emergency_stop(self) -> bool:
         return True
         
@@ -603,7 +618,33 @@ class CameraManagerAdapter:
         self._camera_instances = {}   # Store camera instances for each mode
         self._last_mode_switch = 0
         self._mode_switch_cooldown = 1.0  # Minimum seconds between mode switches
-        
+
+        # Scan session: still pipeline stays configured for the whole scan,
+        # preview comes from its lores stream and focus runs only when the
+        # camera-to-object geometry (X distance / C tilt) changes
+        session_config = config_manager.get('cameras.scan_session', {}) if config_manager else {}
+        self._scan_session_enabled = session_config.get('enabled', True)
+        self._scan_session_active = False
+        self._focus_distance_tolerance = session_config.get('focus_distance_tolerance', 1.0)  # mm
+        self._focus_tilt_tolerance = session_config.get('focus_tilt_tolerance', 0.5)  # degrees
+        self._autofocus_timeout = session_config.get('autofocus_timeout', 2.0)  # seconds
+        self._last_focus_geometry = None
+
+        # Zero-copy captures: frames stay in camera buffers until encoded. One
+        # buffer is always left free for the next capture; beyond that frames
+        # are copied out so the sensor never waits for the encoders.
+        self._capture_buffers = max(1, session_config.get('capture_buffers', 2))
+        self._held_frames: List[FrameHandle] = []
+
+        # Preview source: 'lores' encodes the small YUV stream, 'mjpeg' serves
+        # Picamera2 MJPEGEncoder output as-is, 'main' keeps the 1080p path
+        streaming_config = config_manager.get('cameras.streaming', {}) if config_manager else {}
+        self._preview_source = streaming_config.get('preview_source', 'lores')
+        self._preview_quality = streaming_config.get('quality', 70)
+        self._mjpeg_encoder = None
+        self._mjpeg_output: Optional[PreviewJpegOutput] = None
+        self._last_preview_sequence = 0
+
         # Camera resource locking (simplified for dual-mode)
         import threading
         self._mode_lock = threading.Lock()  # Lock for mode switching
@@ -649,20 +690,22 @@ class CameraManagerAdapter:
                     # OPTIMAL: RGB888 format with direct output provides correct colors
                     self._stream_config = camera.create_video_configuration(
                         main={"size": (1920, 1080), "format": "RGB888"},
-                        lores={"size": (640, 480), "format": "YUV420"},  # Thumbnail for processing
+                        lores={"size": (640, 360), "format": "YUV420"},  # Preview stream (16:9 like main)
                         display="lores"  # Use low-res for display efficiency
                     )
                     
                     # OPTIMAL: RGB888 format for high-res capture
                     self._capture_config = camera.create_still_configuration(
                         main={"size": (4608, 2592), "format": "RGB888"},  # Full sensor resolution
-                        lores={"size": (1920, 1080), "format": "YUV420"},  # Preview
-                        display="lores"
+                        lores={"size": (640, 360), "format": "YUV420"},  # Preview during scans
+                        display="lores",
+                        buffer_count=self._capture_buffers
                     )
                     
                     # Start in streaming mode
                     camera.configure(self._stream_config)
                     camera.start()
+                    self._start_mjpeg_preview(camera)
                     
                     self._current_mode = "streaming"
                     self.logger.info("CAMERA: OPTIMAL CONFIGURATION - RGB888 native output provides perfect colors")
@@ -670,13 +713,18 @@ class CameraManagerAdapter:
         except Exception as e:
             self.logger.error(f"CAMERA: Failed to setup dual-mode configurations: {e}")
     
-    async def _switch_camera_mode(self, target_mode: str):
+    async def _switch_camera_mode(self, target_mode: str, force: bool = False):
         """Efficiently switch between streaming and capture modes"""
         try:
             current_time = time.time()
-            
+
+            # During a scan session the still configuration stays running;
+            # preview is served from its lores stream instead
+            if self._scan_session_active and target_mode == "streaming" and not force:
+                return True
+
             # Check cooldown to prevent rapid switching
-            if current_time - self._last_mode_switch < self._mode_switch_cooldown:
+            if not force and current_time - self._last_mode_switch < self._mode_switch_cooldown:
                 return False
             
             with self._mode_lock:
@@ -689,6 +737,7 @@ class CameraManagerAdapter:
                     
                     if camera:
                         # Stop current mode
+                        self._stop_mjpeg_preview(camera)
                         if hasattr(camera, 'stop'):
                             camera.stop()
                         
@@ -700,6 +749,7 @@ class CameraManagerAdapter:
                         
                         # Restart with new configuration
                         camera.start()
+                        self._start_mjpeg_preview(camera)
                         
                         self._current_mode = target_mode
                         self._last_mode_switch = current_time
@@ -710,59 +760,138 @@ class CameraManagerAdapter:
         except Exception as e:
             self.logger.error(f"CAMERA: Mode switch to {target_mode} failed: {e}")
             return False
-        
+
+    async def begin_scan_session(self) -> bool:
+        """Configure the still pipeline once and keep it running for the whole scan"""
+        if not self._scan_session_enabled:
+            return False
+
+        switched = await self._switch_camera_mode("capture", force=True)
+        self._scan_session_active = self._current_mode == "capture"
+        self._last_focus_geometry = None
+
+        if self._scan_session_active:
+            self.logger.info("CAMERA: Scan session started - still mode held, preview from lores stream")
+        else:
+            self.logger.warning("CAMERA: Could not enter still mode, falling back to per-point mode switches")
+        return bool(switched) and self._scan_session_active
+
+    async def end_scan_session(self) -> None:
+        """Leave the scan session and return to the streaming configuration"""
+        if not self._scan_session_active:
+            return
+
+        self._scan_session_active = False
+        self._last_focus_geometry = None
+        
+        # Buffers are freed by the reconfigure below
+        held = [handle for handle in self._held_frames if handle.held]
+        if held:
+            self.logger.warning(f"CAMERA: Releasing {len(held)} frame buffers still held at end of scan session")
+            for handle in held:
+                handle.release()
+        self._held_frames = []
+        
+        await self._switch_camera_mode("streaming", force=True)
+        self.logger.info("CAMERA: Scan session ended - back to streaming mode")
+
+    def _focus_required(self, metadata: Dict[str, Any]) -> bool:
+        """Check whether camera distance (X) or tilt (C) changed since the last focus"""
+        position = metadata.get('position') or {}
+        distance = position.get('x')
+        tilt = metadata.get('rotation')
+
+        if distance is None or tilt is None or self._last_focus_geometry is None:
+            return True
+
+        last_distance, last_tilt = self._last_focus_geometry
+        return (abs(distance - last_distance) > self._focus_distance_tolerance or
+                abs(tilt - last_tilt) > self._focus_tilt_tolerance)
+
+    async def _run_autofocus(self, camera_id) -> bool:
+        """Run one autofocus cycle and wait for the lens to settle"""
+        camera = self.controller.cameras.get(0) if hasattr(self.controller, 'cameras') else None
+
+        if camera is not None and hasattr(camera, 'autofocus_cycle'):
+            loop = asyncio.get_running_loop()
+            try:
+                # Picamera2 blocks until AfState reports focused/failed
+                return bool(await asyncio.wait_for(
+                    loop.run_in_executor(None, camera.autofocus_cycle),
+                    timeout=self._autofocus_timeout
+                ))
+            except asyncio.TimeoutError:
+                self.logger.warning(f"CAMERA: Autofocus did not settle within {self._autofocus_timeout}s")
+                return False
+            except Exception as e:
+                self.logger.error(f"CAMERA: Autofocus cycle failed for {camera_id}: {e}")
+                return False
+
+        # No blocking cycle available - trigger and allow the lens to move
+        triggered = await self.trigger_autofocus(camera_id)
+        await asyncio.sleep(self._autofocus_timeout / 2)
+        return triggered
+
     async def capture_all(self, output_dir: Path, filename_base: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Capture from all available cameras with autofocus and optimization"""
+        frames = await self.capture_frames(output_dir, filename_base, metadata)
+        
+        # Encode and save off the event loop
+        loop = asyncio.get_running_loop()
         results = []
+        for frame in frames:
+            if frame.get('success') is False:
+                results.append(frame)
+            else:
+                results.append(await loop.run_in_executor(None, self.save_frame, frame))
+        return results
+    
+    async def capture_frames(self, output_dir: Path, filename_base: str, metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Capture raw frames from all cameras without encoding them
+        
+        Returns as soon as the sensor readout is done. Each entry holds the
+        image array and its target path and is handed to ``save_frame``;
+        failed captures are returned as ``{'success': False, ...}`` results.
+        """
+        frames = []
         
         try:
-            # Switch to capture mode for high-resolution images
+            # Switch to capture mode for high-resolution images (no-op in a scan session)
             await self._switch_camera_mode("capture")
-            
-            # Trigger autofocus before capture for optimal sharpness
-            self.logger.info("CAMERA: Triggering autofocus before capture")
-            await self.trigger_autofocus('camera_1')
-            
-            # Brief wait for autofocus to complete
-            await asyncio.sleep(1.0)
-            
+
+            # Refocus only when the camera-to-object geometry changed
+            autofocus_used = False
+            if self._focus_required(metadata):
+                self.logger.info("CAMERA: Running autofocus before capture")
+                autofocus_used = await self._run_autofocus('camera_1')
+                position = metadata.get('position') or {}
+                if position.get('x') is not None and metadata.get('rotation') is not None:
+                    self._last_focus_geometry = (position['x'], metadata['rotation'])
+
             # Capture high-resolution image from Camera 0
             try:
-                # Use high-resolution capture method
-                high_res_image = await self.capture_high_resolution('camera_1', metadata.get('camera_settings'))
+                # Use high-resolution capture method (frame stays in the camera buffer)
+                handle = await self.capture_high_resolution_handle('camera_1', metadata.get('camera_settings'))
                 
-                if high_res_image is not None:
-                    # Save the high-resolution image
-                    output_path = output_dir / f"{filename_base}_camera_1.jpg"
-                    
-                    # Encode and save
-                    import cv2
-                    success = cv2.imwrite(str(output_path), high_res_image, [
-                        cv2.IMWRITE_JPEG_QUALITY, 95,  # High quality for scanning
-                        cv2.IMWRITE_JPEG_OPTIMIZE, 1
-                    ])
-                    
-                    if success:
-                        results.append({
-                            'camera_id': 'camera_1',
-                            'filepath': str(output_path),
-                            'resolution': high_res_image.shape,
-                            'success': True,
-                            'metadata': {
-                                'autofocus_used': True,
-                                'capture_mode': 'high_resolution',
-                                **metadata
-                            }
-                        })
-                        self.logger.info(f"CAMERA: High-res capture saved: {output_path}, shape: {high_res_image.shape}")
-                    else:
-                        self.logger.error(f"CAMERA: Failed to save high-res image to {output_path}")
+                if handle is not None:
+                    frames.append({
+                        'camera_id': 'camera_1',
+                        'image': handle.array,
+                        'handle': handle,
+                        'output_path': output_dir / f"{filename_base}_camera_1.jpg",
+                        'metadata': {
+                            'autofocus_used': autofocus_used,
+                            'capture_mode': 'high_resolution',
+                            **metadata
+                        }
+                    })
                 else:
                     self.logger.error("CAMERA: High-resolution capture returned None")
                     
             except Exception as capture_error:
                 self.logger.error(f"CAMERA: High-resolution capture failed: {capture_error}")
-                results.append({
+                frames.append({
                     'camera_id': 'camera_1',
                     'success': False,
                     'error': str(capture_error)
@@ -779,7 +908,40 @@ class CameraManagerAdapter:
             except:
                 pass
                 
-        return results
+        return frames
+    
+    def save_frame(self, frame: Dict[str, Any]) -> Dict[str, Any]:
+        """Encode one captured frame to JPEG and write it (blocking - run in a worker thread)"""
+        output_path = frame['output_path']
+        image = frame['image']
+        shape = image.shape
+        
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            success = cv2.imwrite(str(output_path), image, [
+                cv2.IMWRITE_JPEG_QUALITY, 95,  # High quality for scanning
+                cv2.IMWRITE_JPEG_OPTIMIZE, 1
+            ])
+        except Exception as e:
+            self.logger.error(f"CAMERA: Failed to encode image {output_path}: {e}")
+            return {'camera_id': frame['camera_id'], 'success': False, 'error': str(e)}
+        finally:
+            # Encoded straight from the camera buffer - hand it back now
+            if frame.get('handle') is not None:
+                frame['handle'].release()
+        
+        if not success:
+            self.logger.error(f"CAMERA: Failed to save high-res image to {output_path}")
+            return {'camera_id': frame['camera_id'], 'success': False, 'error': f"Failed to write {output_path}"}
+        
+        self.logger.info(f"CAMERA: High-res capture saved: {output_path}, shape: {shape}")
+        return {
+            'camera_id': frame['camera_id'],
+            'filepath': str(output_path),
+            'resolution': shape,
+            'success': True,
+            'metadata': frame['metadata']
+        }
         
     async def check_camera_health(self) -> bool:
         status = await self.controller.get_status()
@@ -830,6 +992,10 @@ class CameraManagerAdapter:
                 
                 if camera and hasattr(camera, 'capture_array'):
                     try:
+                        # Scan session: preview from the still config's lores stream
+                        if self._scan_session_active and self._current_mode == "capture":
+                            return self._capture_lores_preview(camera)
+
                         # Ensure we're in streaming mode for live preview
                         if self._current_mode != "streaming":
                             asyncio.create_task(self._switch_camera_mode("streaming"))
@@ -840,8 +1006,8 @@ class CameraManagerAdapter:
                         frame_array = camera.capture_array("main")
                         
                         if frame_array is not None and frame_array.size > 0:
-                            # OPTIMAL: Use camera RGB888 output directly - provides perfect colors
-                            frame_bgr = frame_array.copy()  # Direct use - optimal performance
+                            # capture_array already returns a private array - use it as-is
+                            frame_bgr = frame_array
                             
                             if not hasattr(self, '_color_format_logged'):
                                 self.logger.info("CAMERA: Using native RGB888 output directly - optimal configuration (no conversion overhead)")
@@ -850,8 +1016,8 @@ class CameraManagerAdapter:
                             # Frame is ready for OpenCV JPEG encoding
                             
                             # Optional: Apply minimal enhancement for better web display
-                            # Only if the frame appears too dark/flat
-                            mean_brightness = np.mean(frame_bgr)
+                            # Only if the frame appears too dark/flat (judged on subsampled pixels)
+                            mean_brightness = subsampled_brightness(frame_bgr)
                             if mean_brightness < 80:  # Dark frame
                                 frame_bgr = cv2.convertScaleAbs(frame_bgr, alpha=1.2, beta=15)
                             
@@ -878,7 +1044,84 @@ class CameraManagerAdapter:
         except Exception as e:
             self.logger.error(f"CAMERA: Error in native preview frame for {camera_id}: {e}")
             return None
-    
+
+    def _capture_lores_preview(self, camera):
+        """Grab a preview frame from the lores (YUV420) stream of the active configuration"""
+        yuv = camera.capture_array("lores")
+        if yuv is None or yuv.size == 0:
+            return None
+        return cv2.cvtColor(yuv, cv2.COLOR_YUV2BGR_I420)
+
+    def get_preview_jpeg(self, camera_id) -> Optional[bytes]:
+        """
+        Get an already-encoded preview JPEG for streaming
+
+        Uses the MJPEG encoder output or a small lores-stream encode instead of
+        re-encoding the 1080p main stream. Returns None when the 'main'
+        preview source is configured or no frame is available, in which case
+        callers fall back to ``get_preview_frame``.
+        """
+        if self._preview_source == 'main' or camera_id not in [0, '0', 'camera_1']:
+            return None
+
+        camera = self.controller.cameras.get(0) if hasattr(self.controller, 'cameras') else None
+        if camera is None or not hasattr(camera, 'capture_array'):
+            return None
+
+        try:
+            if self._mjpeg_encoder is not None and self._mjpeg_output is not None:
+                sequence, jpeg = self._mjpeg_output.wait_for_frame(self._last_preview_sequence, timeout=0.2)
+                self._last_preview_sequence = sequence
+                return jpeg
+
+            frame = self._capture_lores_preview(camera)
+            if frame is None:
+                return None
+            ret, jpeg_buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self._preview_quality])
+            return jpeg_buffer.tobytes() if ret else None
+
+        except Exception as e:
+            current_time = time.time()
+            if not hasattr(self, '_last_error_log') or (current_time - self._last_error_log) > 10.0:
+                self.logger.error(f"CAMERA: Lores preview failed: {e}")
+                self._last_error_log = current_time
+            return None
+
+    def _start_mjpeg_preview(self, camera):
+        """Attach Picamera2's MJPEG encoder to the lores stream (mjpeg preview source only)"""
+        if self._preview_source != 'mjpeg' or self._mjpeg_encoder is not None:
+            return
+
+        try:
+            from picamera2.encoders import MJPEGEncoder
+            from picamera2.outputs import FileOutput
+        except ImportError:
+            self.logger.warning("CAMERA: MJPEGEncoder not available, using lores preview encoding")
+            self._preview_source = 'lores'
+            return
+
+        try:
+            output = self._mjpeg_output or PreviewJpegOutput()
+            encoder = MJPEGEncoder()
+            camera.start_encoder(encoder, FileOutput(output), name="lores")
+            self._mjpeg_encoder = encoder
+            self._mjpeg_output = output
+            self.logger.info("CAMERA: MJPEG encoder attached to lores stream for preview")
+        except Exception as e:
+            self.logger.error(f"CAMERA: Failed to start MJPEG preview encoder, using lores encoding: {e}")
+            self._preview_source = 'lores'
+
+    def _stop_mjpeg_preview(self, camera):
+        """Detach the MJPEG encoder before the camera is reconfigured"""
+        if self._mjpeg_encoder is None:
+            return
+
+        try:
+            camera.stop_encoder(self._mjpeg_encoder)
+        except Exception as e:
+            self.logger.warning(f"CAMERA: Failed to stop MJPEG preview encoder: {e}")
+        self._mjpeg_encoder = None
+
     async def capture_high_resolution(self, camera_id, settings=None):
         """
         Capture high-resolution photo for scanning using native Picamera2 functions
@@ -890,6 +1133,17 @@ class CameraManagerAdapter:
         Returns:
             numpy.ndarray: High-resolution image or None if failed
         """
+        handle = await self.capture_high_resolution_handle(camera_id, settings)
+        return handle.detach() if handle is not None else None
+    
+    async def capture_high_resolution_handle(self, camera_id, settings=None) -> Optional[FrameHandle]:
+        """
+        Capture high-resolution photo as a FrameHandle
+        
+        During a scan session the handle keeps the camera buffer (zero-copy)
+        while a buffer is left for the next capture; otherwise the frame is
+        copied out once. Callers must release the handle.
+        """
         try:
             with self._capture_lock:
                 # Switch to capture mode for maximum quality
@@ -923,16 +1177,22 @@ class CameraManagerAdapter:
                         self.logger.info("CAMERA: Capturing high-resolution image (4K+)")
                         
                         # Use still capture for maximum quality
-                        image_array = camera.capture_array("main")
+                        handle = FrameHandle.capture(camera, "main")
                         
-                        if image_array is not None and image_array.size > 0:
-                            # OPTIMAL: Use camera RGB888 output directly for high-res captures
-                            image_bgr = image_array.copy()  # Direct use - optimal performance
+                        if handle.array.size > 0:
+                            # Hold the buffer only while the still config stays up and one is spare
+                            self._held_frames = [held for held in self._held_frames if held.held]
+                            if handle.held and (not self._scan_session_active or
+                                                len(self._held_frames) >= self._capture_buffers - 1):
+                                handle = FrameHandle.from_array(handle.detach())
+                            elif handle.held:
+                                self._held_frames.append(handle)
                             
                             # No conversions needed - camera provides perfect format
-                            self.logger.info(f"CAMERA: High-res capture using optimal native RGB888 format: {image_bgr.shape}, dtype: {image_bgr.dtype}")
-                            return image_bgr
+                            self.logger.info(f"CAMERA: High-res capture using optimal native RGB888 format: {handle.shape}, dtype: {handle.array.dtype}")
+                            return handle
                         else:
+                            handle.release()
                             self.logger.error("CAMERA: High-res capture returned empty array")
                             
                 # Switch back to streaming mode
@@ -1279,34 +1539,7 @@ class ScanOrchestrator:
                 storage_config = config_manager.get('storage', {})
                 
                 # Create motion controller configuration with feedrates from YAML
-                controller_config = {
-                    'port': motion_config.get('controller', {}).get('port', '/dev/ttyUSB0'),
-                    'baud_rate': motion_config.get('controller', {}).get('baudrate', 115200),
-                    'command_timeout': motion_config.get('controller', {}).get('timeout', 30.0),
-                    'motion_limits': {
-                        'x': {
-                            'min': motion_config.get('axes', {}).get('x_axis', {}).get('min_limit', 0.0),
-                            'max': motion_config.get('axes', {}).get('x_axis', {}).get('max_limit', 200.0),
-                            'max_feedrate': motion_config.get('axes', {}).get('x_axis', {}).get('max_feedrate', 1000.0)
-                        },
-                        'y': {
-                            'min': motion_config.get('axes', {}).get('y_axis', {}).get('min_limit', 0.0),
-                            'max': motion_config.get('axes', {}).get('y_axis', {}).get('max_limit', 200.0),
-                            'max_feedrate': motion_config.get('axes', {}).get('y_axis', {}).get('max_feedrate', 1000.0)
-                        },
-                        'z': {
-                            'min': motion_config.get('axes', {}).get('z_axis', {}).get('min_limit', -180.0),
-                            'max': motion_config.get('axes', {}).get('z_axis', {}).get('max_limit', 180.0),
-                            'max_feedrate': motion_config.get('axes', {}).get('z_axis', {}).get('max_feedrate', 800.0)
-                        },
-                        'c': {
-                            'min': motion_config.get('axes', {}).get('c_axis', {}).get('min_limit', -90.0),
-                            'max': motion_config.get('axes', {}).get('c_axis', {}).get('max_limit', 90.0),
-                            'max_feedrate': motion_config.get('axes', {}).get('c_axis', {}).get('max_feedrate', 5000.0)
-                        }
-                    },
-                    'feedrates': motion_config.get('feedrates', {})  # Include feedrate configuration
-                }
+                controller_config = self._motion_controller_config(motion_config)
                 
                 # Create hardware controllers - NEW enhanced controller with timeout fixes and feedrate management
                 fluidnc_controller = SimplifiedFluidNCControllerFixed(controller_config)
@@ -1345,9 +1578,62 @@ class ScanOrchestrator:
             'processing_time': 0.0
         }
         
+        # Kinematic move-time estimates for scan patterns (refined from $$ on connect)
+        self.motion_time = MotionTimeEstimator.from_config(config_manager.get('motion', {}) or {})
+        
+        # Overlapped encode/save of captured frames
+        self._pipeline_config = config_manager.get('scanning.pipeline', {}) or {}
+        self._capture_pipeline: Optional[CapturePipeline] = None
+        self._frame_spool: Optional[FrameSpool] = None
+        self._images_captured = 0
+        
         # Subscribe to events
         self._setup_event_handlers()
     
+    @staticmethod
+    def _motion_controller_config(motion_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the SimplifiedFluidNCControllerFixed config from the motion section"""
+        return {
+            'port': motion_config.get('controller', {}).get('port', '/dev/ttyUSB0'),
+            'baud_rate': motion_config.get('controller', {}).get('baudrate', 115200),
+            'command_timeout': motion_config.get('controller', {}).get('timeout', 30.0),
+            'motion_limits': {
+                'x': {
+                    'min': motion_config.get('axes', {}).get('x_axis', {}).get('min_limit', 0.0),
+                    'max': motion_config.get('axes', {}).get('x_axis', {}).get('max_limit', 200.0),
+                    'max_feedrate': motion_config.get('axes', {}).get('x_axis', {}).get('max_feedrate', 1000.0)
+                },
+                'y': {
+                    'min': motion_config.get('axes', {}).get('y_axis', {}).get('min_limit', 0.0),
+                    'max': motion_config.get('axes', {}).get('y_axis', {}).get('max_limit', 200.0),
+                    'max_feedrate': motion_config.get('axes', {}).get('y_axis', {}).get('max_feedrate', 1000.0)
+                },
+                'z': {
+                    'min': motion_config.get('axes', {}).get('z_axis', {}).get('min_limit', -180.0),
+                    'max': motion_config.get('axes', {}).get('z_axis', {}).get('max_limit', 180.0),
+                    'max_feedrate': motion_config.get('axes', {}).get('z_axis', {}).get('max_feedrate', 800.0)
+                },
+                'c': {
+                    'min': motion_config.get('axes', {}).get('c_axis', {}).get('min_limit', -90.0),
+                    'max': motion_config.get('axes', {}).get('c_axis', {}).get('max_limit', 90.0),
+                    'max_feedrate': motion_config.get('axes', {}).get('c_axis', {}).get('max_feedrate', 5000.0)
+                }
+            },
+            'feedrates': motion_config.get('feedrates', {}),  # Include feedrate configuration
+            'streaming': motion_config.get('controller', {}).get('streaming', {}),
+            'status_reports': motion_config.get('controller', {}).get('status_reports', {})
+        }
+    
+    async def _load_controller_motion_limits(self):
+        """Use the controller's own rate/acceleration settings for move-time estimates"""
+        protocol = getattr(self.motion_controller, 'protocol', None)
+        if protocol is None or not hasattr(protocol, 'query_settings'):
+            return
+        loop = asyncio.get_running_loop()
+        self.motion_time = await loop.run_in_executor(
+            None, MotionTimeEstimator.from_controller, protocol, self.motion_time)
+        self.logger.info(f"📊 Motion time limits: {self.motion_time.to_dict()}")
+    
     def _setup_event_handlers(self):
         """Setup event handlers for system events"""
         
@@ -1411,6 +1697,7 @@ class ScanOrchestrator:
                         motion_ok = True  # Consider alarm state as "connected"
                     else:
                         self.logger.info("✅ Motion controller initialized and ready")
+                    await self._load_controller_motion_limits()
                 else:
                     self.logger.error("❌ Motion controller failed to initialize")
             except Exception as e:
@@ -1566,6 +1853,10 @@ class ScanOrchestrator:
             if hasattr(self.camera_manager, 'set_scanning_mode'):
                 self.camera_manager.set_scanning_mode(True)
                 self.logger.info("Camera switched to scanning mode")
+
+            # Hold the still configuration for the whole scan instead of per-point switches
+            if hasattr(self.camera_manager, 'begin_scan_session'):
+                await self.camera_manager.begin_scan_session()
             
             # Start the scan
             self.current_scan.start()
@@ -1598,6 +1889,11 @@ class ScanOrchestrator:
         
         finally:
             # Always switch camera back to live streaming mode
+            if hasattr(self.camera_manager, 'end_scan_session'):
+                try:
+                    await self.camera_manager.end_scan_session()
+                except Exception as e:
+                    self.logger.error(f"Failed to end camera scan session: {e}")
             if hasattr(self.camera_manager, 'set_scanning_mode'):
                 self.camera_manager.set_scanning_mode(False)
                 self.logger.info("Camera switched back to live streaming mode")
@@ -1627,45 +1923,101 @@ class ScanOrchestrator:
         scan_points = self.current_pattern.generate_points()
         self.logger.info(f"Starting scan of {len(scan_points)} points")
         
-        for i, point in enumerate(scan_points):
-            if self._check_stop_conditions():
-                self.logger.info(f"Scan stopped at point {i}")
-                break
-            
-            # Handle pause requests
-            await self._handle_pause()
-            
-            try:
-                self.logger.debug(f"Processing point {i+1}/{len(scan_points)}: {point.position}")
-                
-                # Move to position
-                await self._move_to_point(point)
-                
-                # Capture images
-                images_captured = await self._capture_at_point(point, i)
-                
-                # Update progress
-                self.current_scan.update_progress(i + 1, images_captured)
+        self._images_captured = 0
+        use_pipeline = (self._pipeline_config.get('enabled', True)
+                        and hasattr(self.camera_manager, 'capture_frames'))
+        if use_pipeline:
+            save_frame = self.camera_manager.save_frame
+            workers = self._pipeline_config.get('workers', 2)
+            if self._pipeline_config.get('mode', 'encode') == 'spool':
+                # Raw frames to disk now, JPEG encoding after the last point
+                output_dir = self.current_scan.output_directory if self.current_scan else Path('.')
+                self._frame_spool = FrameSpool(Path(output_dir) / '.spool')
+                save_frame, workers = self._frame_spool.write_frame, 1
+            self._capture_pipeline = CapturePipeline(
+                save_frame,
+                max_queue=self._pipeline_config.get('max_queue', 4),
+                workers=workers,
+                on_result=self._on_frames_saved
+            )
+            await self._capture_pipeline.start()
+        
+        try:
+            for i, point in enumerate(scan_points):
+                if self._check_stop_conditions():
+                    self.logger.info(f"Scan stopped at point {i}")
+                    break
                 
-                self.logger.debug(f"Completed point {i+1}/{len(scan_points)}")
+                # Handle pause requests
+                await self._handle_pause()
                 
-            except Exception as e:
-                self.logger.error(f"Failed to process point {i}: {e}")
-                self.current_scan.add_error(
-                    "point_processing_error",
-                    f"Failed to process scan point {i}: {e}",
-                    {'point_index': i, 'point_data': point.__dict__},
-                    recoverable=True
-                )
-                
-                # Continue with next point unless it's a critical error
-                if not isinstance(e, HardwareError):
-                    continue
-                else:
-                    raise
+                try:
+                    self.logger.debug(f"Processing point {i+1}/{len(scan_points)}: {point.position}")
+                    
+                    # Move to position
+                    await self._move_to_point(point)
+                    
+                    if use_pipeline:
+                        # Readout only - encoding overlaps with the next move
+                        await self._capture_to_pipeline(point, i)
+                    else:
+                        self._images_captured += await self._capture_at_point(point, i)
+                    
+                    # Update progress
+                    self.current_scan.update_progress(i + 1, self._images_captured)
+                    
+                    self.logger.debug(f"Completed point {i+1}/{len(scan_points)}")
+                    
+                except Exception as e:
+                    self.logger.error(f"Failed to process point {i}: {e}")
+                    self.current_scan.add_error(
+                        "point_processing_error",
+                        f"Failed to process scan point {i}: {e}",
+                        {'point_index': i, 'point_data': point.__dict__},
+                        recoverable=True
+                    )
+                    
+                    # Continue with next point unless it's a critical error
+                    if not isinstance(e, HardwareError):
+                        continue
+                    else:
+                        raise
+        finally:
+            if self._capture_pipeline:
+                # Let queued frames finish saving before the scan is reported complete
+                await self._capture_pipeline.stop()
+                self._timing_stats['processing_time'] += self._capture_pipeline.stats['encode_time']
+                self._capture_pipeline = None
+            if self._frame_spool:
+                await self._encode_spool()
+            if self.current_scan:
+                self.current_scan.progress.images_captured = self._images_captured
         
         self.logger.info(f"Scan execution completed")
     
+    async def _encode_spool(self):
+        """Encode the scan's spooled raw frames to image files on every core"""
+        spool, self._frame_spool = self._frame_spool, None
+        if self.current_scan:
+            self.current_scan.set_phase(ScanPhase.PROCESSING)
+        
+        encoder = SpoolEncoder(
+            self.camera_manager.save_frame,
+            workers=self._pipeline_config.get('encode_workers'),
+            on_result=self._on_spooled_frame_encoded
+        )
+        try:
+            await encoder.encode(spool)
+        except Exception as e:
+            self.logger.error(f"Spool encoding failed, raw frames kept in {spool.directory}: {e}")
+        self._timing_stats['processing_time'] += encoder.stats['encode_time']
+    
+    def _on_spooled_frame_encoded(self, result: Dict[str, Any]):
+        """Frames were counted when spooled; take back any that failed to encode"""
+        if not result.get('success'):
+            self._images_captured -= 1
+            self._record_capture_failures([result])
+    
     async def _move_to_point(self, point: ScanPoint):
         """Move to a scan point"""
         move_start = time.time()
@@ -1673,19 +2025,23 @@ class ScanOrchestrator:
         if self.current_scan:
             self.current_scan.set_phase(ScanPhase.POSITIONING)
         
-        # Move to XY position
-        if not await self.motion_controller.move_to(point.position.x, point.position.y):
-            raise HardwareError(f"Failed to move to position ({point.position.x}, {point.position.y})")
-        
-        # Set Z rotation angle if specified
-        if point.position.z is not None:
-            if not await self.motion_controller.move_z_to(point.position.z):
-                raise HardwareError(f"Failed to rotate Z-axis to {point.position.z} degrees")
-        
-        # Set rotation if specified
-        if point.position.c is not None:
-            if not await self.motion_controller.rotate_to(point.position.c):
-                raise HardwareError(f"Failed to rotate to {point.position.c} degrees")
+        if hasattr(self.motion_controller, 'move_to_position'):
+            # One coordinated X/Y/Z/C move - a single accelerate/decelerate cycle per point
+            await self._move_coordinated(point)
+        else:
+            # Move to XY position
+            if not await self.motion_controller.move_to(point.position.x, point.position.y):
+                raise HardwareError(f"Failed to move to position ({point.position.x}, {point.position.y})")
+            
+            # Set Z rotation angle if specified
+            if point.position.z is not None:
+                if not await self.motion_controller.move_z_to(point.position.z):
+                    raise HardwareError(f"Failed to rotate Z-axis to {point.position.z} degrees")
+            
+            # Set rotation if specified
+            if point.position.c is not None:
+                if not await self.motion_controller.rotate_to(point.position.c):
+                    raise HardwareError(f"Failed to rotate to {point.position.c} degrees")
         
         # Wait for stabilization
         stabilization_delay = self.config.get('motion', {}).get('stabilization_delay', 0.5)
@@ -1693,78 +2049,101 @@ class ScanOrchestrator:
         
         self._timing_stats['movement_time'] += time.time() - move_start
     
+    async def _move_coordinated(self, point: ScanPoint):
+        """Move all four axes to a scan point with a single G1 command"""
+        from motion.base import Position4D
+        
+        z, c = point.position.z, point.position.c
+        if z is None or c is None:
+            # Unspecified axes hold their current position
+            current = await self.motion_controller.get_current_position()
+            z = current.z if z is None else z
+            c = current.c if c is None else c
+        
+        target = Position4D(x=point.position.x, y=point.position.y, z=z, c=c)
+        if not await self.motion_controller.move_to_position(target):
+            raise HardwareError(f"Failed to move to position {target}")
+    
+    async def _prepare_capture(self, point: ScanPoint, point_index: int):
+        """Apply lighting and build the filename/metadata for a capture"""
+        # Generate filename for this point
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename_base = f"scan_{self.current_scan.scan_id if self.current_scan else 'unknown'}_point_{point_index:04d}_{timestamp}"
+        
+        # Apply lighting if configured and available
+        lighting_applied = False
+        if hasattr(point, 'lighting_settings') and point.lighting_settings and self.lighting_controller.is_available():
+            try:
+                from lighting.base import LightingSettings
+                
+                # Convert lighting settings to proper format
+                settings = LightingSettings(
+                    brightness=point.lighting_settings.get('brightness', 0.8),
+                    duration_ms=point.lighting_settings.get('duration_ms', 100),
+                    fade_time_ms=point.lighting_settings.get('fade_time_ms', 50)
+                )
+                
+                # Get zones to activate
+                zones = point.lighting_settings.get('zones', ['top_ring', 'side_ring'])
+                
+                # Flash lighting for capture
+                flash_result = await self.lighting_controller.flash(zones, settings)
+                lighting_applied = flash_result.get('success', False)
+                
+                if not lighting_applied:
+                    self.logger.warning(f"Lighting flash failed at point {point_index}")
+                
+            except Exception as e:
+                self.logger.warning(f"Failed to apply lighting at point {point_index}: {e}")
+        
+        # Small delay to allow lighting to stabilize before capture
+        if lighting_applied:
+            await asyncio.sleep(0.02)  # 20ms stabilization delay
+        
+        metadata = {
+            'scan_id': self.current_scan.scan_id if self.current_scan else 'unknown',
+            'point_index': point_index,
+            'position': {
+                'x': point.position.x, 
+                'y': point.position.y, 
+                'z': point.position.z
+            },
+            'rotation': point.position.c,
+            'timestamp': timestamp,
+            'lighting_applied': lighting_applied
+        }
+        return filename_base, metadata
+    
+    def _record_capture_failures(self, capture_results: List[Dict[str, Any]]) -> int:
+        """Log failed captures on the scan state and return the success count"""
+        for result in capture_results:
+            if not result['success'] and self.current_scan:
+                self.current_scan.add_error(
+                    "capture_error",
+                    f"Failed to capture from camera {result['camera_id']}: {result.get('error', 'Unknown error')}",
+                    result,
+                    recoverable=True
+                )
+        return len([r for r in capture_results if r['success']])
+    
     async def _capture_at_point(self, point: ScanPoint, point_index: int) -> int:
         """Capture images at a scan point"""
         capture_start = time.time()
-        images_captured = 0
         
         if self.current_scan:
             self.current_scan.set_phase(ScanPhase.CAPTURING)
         
         try:
-            # Generate filename for this point
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename_base = f"scan_{self.current_scan.scan_id if self.current_scan else 'unknown'}_point_{point_index:04d}_{timestamp}"
-            
-            # Apply lighting if configured and available
-            lighting_applied = False
-            if hasattr(point, 'lighting_settings') and point.lighting_settings and self.lighting_controller.is_available():
-                try:
-                    from lighting.base import LightingSettings
-                    
-                    # Convert lighting settings to proper format
-                    settings = LightingSettings(
-                        brightness=point.lighting_settings.get('brightness', 0.8),
-                        duration_ms=point.lighting_settings.get('duration_ms', 100),
-                        fade_time_ms=point.lighting_settings.get('fade_time_ms', 50)
-                    )
-                    
-                    # Get zones to activate
-                    zones = point.lighting_settings.get('zones', ['top_ring', 'side_ring'])
-                    
-                    # Flash lighting for capture
-                    flash_result = await self.lighting_controller.flash(zones, settings)
-                    lighting_applied = flash_result.get('success', False)
-                    
-                    if not lighting_applied:
-                        self.logger.warning(f"Lighting flash failed at point {point_index}")
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to apply lighting at point {point_index}: {e}")
-            
-            # Small delay to allow lighting to stabilize before capture
-            if lighting_applied:
-                await asyncio.sleep(0.02)  # 20ms stabilization delay
+            filename_base, metadata = await self._prepare_capture(point, point_index)
             
             # Capture from all cameras
             capture_results = await self.camera_manager.capture_all(
                 output_dir=self.current_scan.output_directory if self.current_scan else Path('.'),
                 filename_base=filename_base,
-                metadata={
-                    'scan_id': self.current_scan.scan_id if self.current_scan else 'unknown',
-                    'point_index': point_index,
-                    'position': {
-                        'x': point.position.x, 
-                        'y': point.position.y, 
-                        'z': point.position.z
-                    },
-                    'rotation': point.position.c,
-                    'timestamp': timestamp,
-                    'lighting_applied': lighting_applied
-                }
+                metadata=metadata
             )
             
-            images_captured = len([r for r in capture_results if r['success']])
-            
-            # Log any capture failures
-            for result in capture_results:
-                if not result['success'] and self.current_scan:
-                    self.current_scan.add_error(
-                        "capture_error",
-                        f"Failed to capture from camera {result['camera_id']}: {result.get('error', 'Unknown error')}",
-                        result,
-                        recoverable=True
-                    )
+            images_captured = self._record_capture_failures(capture_results)
             
             self._timing_stats['capture_time'] += time.time() - capture_start
             return images_captured
@@ -1773,6 +2152,40 @@ class ScanOrchestrator:
             self._timing_stats['capture_time'] += time.time() - capture_start
             raise HardwareError(f"Failed to capture images at point {point_index}: {e}")
     
+    async def _capture_to_pipeline(self, point: ScanPoint, point_index: int):
+        """Read out frames at a scan point and queue them for encoding"""
+        capture_start = time.time()
+        
+        if self.current_scan:
+            self.current_scan.set_phase(ScanPhase.CAPTURING)
+        
+        try:
+            filename_base, metadata = await self._prepare_capture(point, point_index)
+            
+            frames = await self.camera_manager.capture_frames(
+                output_dir=self.current_scan.output_directory if self.current_scan else Path('.'),
+                filename_base=filename_base,
+                metadata=metadata
+            )
+            self._timing_stats['capture_time'] += time.time() - capture_start
+            
+        except Exception as e:
+            self._timing_stats['capture_time'] += time.time() - capture_start
+            raise HardwareError(f"Failed to capture images at point {point_index}: {e}")
+        
+        # Readout failures are reported now; encode results arrive via _on_frames_saved
+        failed = [f for f in frames if f.get('success') is False]
+        self._record_capture_failures(failed)
+        
+        pending = [f for f in frames if f.get('success') is not False]
+        if pending and self._capture_pipeline:
+            # Blocks only when the encoders are max_queue points behind
+            await self._capture_pipeline.submit(CaptureJob(point_index=point_index, frames=pending))
+    
+    def _on_frames_saved(self, point_index: int, results: List[Dict[str, Any]]):
+        """Pipeline callback: account for frames encoded and written to disk"""
+        self._images_captured += self._record_capture_failures(results)
+    
     async def _handle_pause(self):
         """Handle pause requests"""
         if self._pause_requested and self.current_scan:
@@ -2028,7 +2441,9 @@ class ScanOrchestrator:
         # Generate pattern ID
         pattern_id = f"grid_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        return GridScanPattern(pattern_id=pattern_id, parameters=parameters)
+        pattern = GridScanPattern(pattern_id=pattern_id, parameters=parameters)
+        pattern.motion_time = self.motion_time
+        return pattern
     
     def create_cylindrical_pattern(self,
                                  x_range: tuple[float, float],
@@ -2066,7 +2481,9 @@ class ScanOrchestrator:
         # Generate pattern ID
         pattern_id = f"cylindrical_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        return CylindricalScanPattern(pattern_id=pattern_id, parameters=parameters)
+        pattern = CylindricalScanPattern(pattern_id=pattern_id, parameters=parameters)
+        pattern.motion_time = self.motion_time
+        return pattern
     
     async def shutdown(self):
         """Shutdown the orchestrator"""
@@ -15,6 +15,7 @@ from typing import Iterator, List, Optional, Tuple, Dict, Any
 
 from core.types import Position4D, CameraSettings
 from core.events import EventBus, ScannerEvent
+from motion.motion_time import MotionTimeEstimator
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +91,8 @@ class ScanPattern(ABC):
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self._points_cache: Optional[List[ScanPoint]] = None
         self._current_index = 0
+        # Set by the orchestrator from the motion configuration
+        self.motion_time: Optional[MotionTimeEstimator] = None
         
     @property
     @abstractmethod
@@ -209,6 +212,11 @@ class ScanPattern(ABC):
             'parameters': self.parameters
         }
     
+    def estimate_motion_time(self) -> float:
+        """Time spent moving between the pattern's points in seconds"""
+        estimator = self.motion_time or MotionTimeEstimator()
+        return estimator.path_time(self.get_points())
+    
     def reset(self):
         """Reset pattern iterator to beginning"""
         self._current_index = 0
@@ -415,11 +423,11 @@ class CylindricalScanPattern(ScanPattern):
         """Estimate total scan duration in seconds"""
         points = self.get_points()
         
-        # Estimate time per point including movement
-        move_time = 2.0  # Average movement time
-        capture_time = 0.5  # Capture and processing time
+        # Settling and capture at each point, plus the kinematic move times
+        capture_time = 0.5  # Capture and processing time per image
+        point_time = sum(point.dwell_time + point.capture_count * capture_time for point in points)
         
-        return len(points) * (move_time + capture_time)
+        return self.estimate_motion_time() + point_time
     
     def estimated_duration(self) -> float:
         """Abstract method implementation - same as estimate_duration"""
@@ -456,9 +464,7 @@ class GridScanPattern(ScanPattern):
             time_per_point *= self.grid_params.exposure_steps
             
         # Add movement time estimation
-        avg_movement_time = 5.0  # seconds per movement
-        
-        total_time = len(points) * (time_per_point + avg_movement_time)
+        total_time = len(points) * time_per_point + self.estimate_motion_time()
         
         return total_time / 60.0  # Convert to minutes
     
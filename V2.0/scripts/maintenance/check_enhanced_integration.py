@@ -2,8 +2,8 @@
 """
 Simple Enhanced Protocol Integration Check
 
-Quick validation that enhanced FluidNC protocol is correctly integrated
-and performing well. Run this to verify the integration is working.
+Quick validation that the FluidNC engine (motion/fluidnc_engine.py) is
+correctly integrated and performing well. Run this to verify the integration is working.
 
 Author: Scanner System Development  
 Created: September 2025
@@ -38,9 +38,9 @@ async def check_enhanced_protocol():
     # Test 1: Import Integration
     logger.info("\n1️⃣  Testing Import Integration...")
     try:
-        from motion.protocol_bridge import ProtocolBridgeController
-        from motion.fluidnc_protocol import FluidNCCommunicator
-        logger.info("✅ Enhanced protocol modules imported successfully")
+        from motion.fluidnc_engine import FluidNCEngine
+        from motion.simplified_fluidnc_controller_fixed import SimplifiedFluidNCControllerFixed
+        logger.info("✅ FluidNC engine and controller imported successfully")
         success_count += 1
     except Exception as e:
         logger.error(f"❌ Import failed: {e}")
@@ -48,30 +48,30 @@ async def check_enhanced_protocol():
     # Test 2: Orchestrator Integration
     logger.info("\n2️⃣  Testing Orchestrator Integration...")
     try:
-        # Check that scan orchestrator will use enhanced protocol
+        # Check that scan orchestrator uses the controller on the shared engine
         with open('scanning/scan_orchestrator.py', 'r') as f:
             content = f.read()
         
-        if 'protocol_bridge import ProtocolBridgeController' in content:
-            logger.info("✅ Scan orchestrator configured for enhanced protocol")
+        if 'simplified_fluidnc_controller_fixed import SimplifiedFluidNCControllerFixed' in content:
+            logger.info("✅ Scan orchestrator configured for the FluidNC engine")
             success_count += 1
         else:
-            logger.error("❌ Scan orchestrator not using enhanced protocol") 
+            logger.error("❌ Scan orchestrator not using the FluidNC engine") 
     except Exception as e:
         logger.error(f"❌ Orchestrator check failed: {e}")
     
     # Test 3: Performance Test
     logger.info("\n3️⃣  Testing Performance...")
     try:
-        from motion.protocol_bridge import ProtocolBridgeController
+        from motion.simplified_fluidnc_controller_fixed import SimplifiedFluidNCControllerFixed
         from motion.base import Position4D
         
-        config = {'port': '/dev/ttyUSB0', 'baudrate': 115200}
-        controller = ProtocolBridgeController(config)
+        config = {'port': '/dev/ttyUSB0', 'baud_rate': 115200}
+        controller = SimplifiedFluidNCControllerFixed(config)
         
         # Test connection and basic operation
         start_time = time.time()
-        init_success = await controller.initialize(auto_unlock=True)
+        init_success = await controller.initialize()
         init_time = time.time() - start_time
         
         if init_success:
@@ -96,8 +96,8 @@ async def check_enhanced_protocol():
             else:
                 logger.warning("⚠️  Performance: ACCEPTABLE but could be better")
             
-            # Get protocol stats
-            stats = controller.get_protocol_stats()
+            # Get controller and engine stats
+            stats = controller.get_stats()
             logger.info(f"   📊 Protocol Stats: {stats}")
             
             await controller.shutdown()
@@ -112,9 +112,8 @@ async def check_enhanced_protocol():
     try:
         # Check key files exist
         key_files = [
-            'motion/protocol_bridge.py',
-            'motion/fluidnc_protocol.py', 
-            'motion/enhanced_fluidnc_controller.py',
+            'motion/fluidnc_engine.py',
+            'motion/simplified_fluidnc_controller_fixed.py',
             'scanning/scan_orchestrator.py',
             'web/web_interface.py'
         ]
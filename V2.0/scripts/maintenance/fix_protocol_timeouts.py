@@ -4,6 +4,10 @@ Quick Protocol Timeout Fix
 
 Applies immediate fixes to the enhanced protocol to resolve command timeout issues.
 This patches the protocol to be more tolerant of FluidNC behavior variations.
+
+Only applies to the pre-engine protocol and bridge, now in
+archive/deprecated/motion. motion/fluidnc_protocol.py is an alias for
+FluidNCEngine, which has per-command timeouts, so there is nothing to patch.
 """
 
 import asyncio
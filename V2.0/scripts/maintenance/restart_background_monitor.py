@@ -34,24 +34,23 @@ async def restart_monitor():
         # Since we're running alongside the web interface, let's try a different approach
         
         # Import the FluidNC controller directly
-        from motion.fluidnc_controller import FluidNCController
+        from motion.simplified_fluidnc_controller_fixed import SimplifiedFluidNCControllerFixed
         
         # Create a temporary connection to restart monitor
         motion_config = {
             'port': '/dev/ttyUSB0',
-            'baudrate': 115200,
-            'timeout': 10.0
+            'baud_rate': 115200,
+            'command_timeout': 10.0
         }
         
-        controller = FluidNCController(motion_config)
+        controller = SimplifiedFluidNCControllerFixed(motion_config)
         
         # Try to connect and restart monitor
         if await controller.connect():
             logger.info("✅ Connected to FluidNC")
             
-            # Force restart the background monitor
-            await controller.restart_background_monitor()
-            logger.info("✅ Background monitor restarted")
+            # The engine's status reader thread starts with the connection
+            logger.info("✅ Status reader running")
             
             # Keep alive for a moment to let it start
             await asyncio.sleep(2)
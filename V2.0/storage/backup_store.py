@@ -0,0 +1,256 @@
+"""
+Content-Addressed Backup Store
+
+Backups are blobs named by their SHA-256 (``objects/ab/abcdef...``), so a
+file that is already backed up (same content in another session, a re-run
+of a backup) is never copied again.
+
+Link modes when the backup is on the same filesystem as the data:
+    auto      reflink (copy-on-write clone) if supported, else copy
+    reflink   same as auto
+    hardlink  hard link (no extra space, but shares blocks with the
+              original: protects against deletion, not corruption)
+    copy      always copy
+
+Copies happen after capture on BackupQueue's own thread, under a
+bytes-per-second budget. By default the queue holds back while a scan
+session is writing, so backups do not compete with the capture path for
+SD card bandwidth.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from storage.integrity import CHUNK_SIZE, IOBudget
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows development machines
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Linux ioctl for copy-on-write clones (btrfs, xfs, bcachefs)
+FICLONE = 0x40049409
+
+LINK_MODES = ('auto', 'reflink', 'hardlink', 'copy')
+
+
+class ContentAddressedStore:
+    """
+    Blob store keyed by SHA-256
+
+    Args:
+        root: Store directory
+        link_mode: One of LINK_MODES
+    """
+
+    def __init__(self, root: Path, link_mode: str = 'auto'):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown backup link mode: {link_mode}")
+        self.root = Path(root)
+        self.link_mode = link_mode
+        self.stats = {'stored': 0, 'deduplicated': 0, 'reflinked': 0, 'hardlinked': 0,
+                      'copied': 0, 'bytes_copied': 0, 'errors': 0}
+
+    def blob_path(self, checksum: str) -> Path:
+        return self.root / 'objects' / checksum[:2] / checksum
+
+    def contains(self, checksum: str) -> bool:
+        return self.blob_path(checksum).exists()
+
+    def put_file(self, source: Path, checksum: Optional[str] = None,
+                 throttle: Optional[Callable[[int], None]] = None) -> Tuple[str, str]:
+        """
+        Store a file's content; returns (checksum, method)
+
+        method is 'exists', 'reflink', 'hardlink' or 'copy'. A copy is
+        verified against ``checksum`` and rejected if the source changed.
+        """
+        if checksum and self.contains(checksum):
+            self.stats['deduplicated'] += 1
+            return checksum, 'exists'
+
+        tmp_dir = self.root / 'tmp'
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = tmp_dir / f"{os.getpid()}_{time.monotonic_ns()}"
+
+        try:
+            method = None
+            if checksum and self.link_mode != 'copy' and self._same_filesystem(source):
+                method = self._link(source, tmp_path)
+
+            if method is None:
+                actual = self._copy(source, tmp_path, throttle)
+                if checksum and actual != checksum:
+                    raise ValueError(f"Source content does not match checksum {checksum[:12]}")
+                checksum = actual
+                method = 'copy'
+
+            blob = self.blob_path(checksum)
+            if blob.exists():
+                tmp_path.unlink()
+                self.stats['deduplicated'] += 1
+                return checksum, 'exists'
+
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, blob)
+            self.stats['stored'] += 1
+            self.stats[{'reflink': 'reflinked', 'hardlink': 'hardlinked', 'copy': 'copied'}[method]] += 1
+            return checksum, method
+
+        except Exception:
+            self.stats['errors'] += 1
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    def restore(self, checksum: str, destination: Path) -> Path:
+        """Copy a blob back out"""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        self._copy(self.blob_path(checksum), destination, None)
+        return destination
+
+    def _same_filesystem(self, source: Path) -> bool:
+        self.root.mkdir(parents=True, exist_ok=True)
+        return source.stat().st_dev == self.root.stat().st_dev
+
+    def _link(self, source: Path, target: Path) -> Optional[str]:
+        if self.link_mode == 'hardlink':
+            try:
+                os.link(source, target)
+                return 'hardlink'
+            except OSError:
+                return None
+
+        # auto / reflink: copy-on-write clone where the filesystem supports it
+        if fcntl is None:
+            return None
+        try:
+            with open(source, 'rb') as src, open(target, 'wb') as dst:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return 'reflink'
+        except OSError:
+            if target.exists():
+                target.unlink()
+            return None
+
+    def _copy(self, source: Path, target: Path, throttle: Optional[Callable[[int], None]]) -> str:
+        digest = hashlib.sha256()
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                dst.write(chunk)
+                self.stats['bytes_copied'] += len(chunk)
+                if throttle:
+                    throttle(len(chunk))
+            dst.flush()
+            os.fsync(dst.fileno())
+        return digest.hexdigest()
+
+
+class BackupQueue:
+    """
+    Deferred, bandwidth-limited backups into a ContentAddressedStore
+
+    Args:
+        store: Destination store
+        is_busy: Returns True while capture is writing (backups wait)
+        bytes_per_second: Copy budget (0 = unlimited)
+        on_complete: Called as ``on_complete(file_id, checksum, method)``
+            on the event loop after each backup
+        idle_check: Seconds between busy checks
+    """
+
+    def __init__(self, store: ContentAddressedStore,
+                 is_busy: Optional[Callable[[], bool]] = None,
+                 bytes_per_second: float = 10 * 1024 * 1024,
+                 on_complete: Optional[Callable[[str, str, str], Any]] = None,
+                 idle_check: float = 1.0):
+        self.store = store
+        self.is_busy = is_busy
+        self.budget = IOBudget(bytes_per_second)
+        self.on_complete = on_complete
+        self.idle_check = idle_check
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._ignore_busy = False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def submit(self, file_id: str, source: Path, checksum: Optional[str] = None):
+        """Queue a file for backup (returns immediately)"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-backup")
+            self._task = asyncio.create_task(self._run())
+        self._queue.put_nowait((file_id, Path(source), checksum))
+
+    async def drain(self, ignore_busy: bool = False):
+        """Wait until every queued backup has been processed"""
+        if self._queue is None:
+            return
+        self._ignore_busy = ignore_busy
+        try:
+            await self._queue.join()
+        finally:
+            self._ignore_busy = False
+
+    async def stop(self, drain: bool = True):
+        """Stop the worker, optionally finishing queued backups first"""
+        if self._queue is None:
+            return
+        if drain:
+            await self.drain(ignore_busy=True)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._executor.shutdown(wait=True)
+        self._queue = self._task = self._executor = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            file_id, source, checksum = await self._queue.get()
+            try:
+                while self.is_busy and not self._ignore_busy and self.is_busy():
+                    await asyncio.sleep(self.idle_check)
+
+                checksum, method = await loop.run_in_executor(
+                    self._executor, self.store.put_file, source, checksum, self.budget)
+                logger.debug(f"Backed up {file_id} ({method}) as {checksum[:12]}")
+
+                if self.on_complete:
+                    result = self.on_complete(file_id, checksum, method)
+                    if asyncio.iscoroutine(result):
+                        await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Backup of {file_id} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue and store statistics"""
+        stats = dict(self.store.stats)
+        stats['pending'] = self.pending
+        return stats
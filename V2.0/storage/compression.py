@@ -0,0 +1,200 @@
+"""
+Storage Compression
+
+Pluggable codecs for ``CompressionType`` and a small worker pool that
+compresses non-image payloads (metadata, logs, point clouds, raw frames)
+before they reach the SD card. JPEG/PNG data is already compressed and is
+never passed through a codec.
+
+Built-in codecs: GZIP and LZMA (standard library) and ZSTD (needs the
+``zstandard`` package; sessions fall back to GZIP without it). Additional
+codecs can be added with ``register_codec``.
+
+Compressed files get the codec's suffix (``.zst``, ``.gz``, ``.xz``), the
+manifest records ``compression`` and ``uncompressed_size``, and checksums
+cover the bytes on disk so integrity checks and backups work unchanged.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import lzma
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional
+
+from storage.base import CompressionType, DataType
+from storage.integrity import CHUNK_SIZE, HashResult
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Payloads worth compressing (JPEG/PNG images are excluded)
+DEFAULT_COMPRESSED_TYPES = (
+    DataType.RAW_IMAGE, DataType.POINT_CLOUD, DataType.MESH_DATA, DataType.SCAN_METADATA,
+    DataType.SCAN_PATH, DataType.CALIBRATION_DATA, DataType.LOG_DATA
+)
+
+
+@dataclass(frozen=True)
+class Codec:
+    """
+    Compression codec
+
+    ``open_writer(fileobj, level)`` returns a writable stream that
+    compresses into fileobj without closing it.
+    """
+    compression_type: CompressionType
+    suffix: str
+    default_level: int
+    compress: Callable[[bytes, int], bytes]
+    decompress: Callable[[bytes], bytes]
+    open_writer: Callable[[BinaryIO, int], BinaryIO]
+
+    @property
+    def name(self) -> str:
+        return self.compression_type.value
+
+
+_CODECS: Dict[CompressionType, Codec] = {}
+
+
+def register_codec(codec: Codec):
+    """Add or replace the codec for its CompressionType"""
+    _CODECS[codec.compression_type] = codec
+
+
+def get_codec(compression: Any) -> Codec:
+    """Codec for a CompressionType or its value"""
+    compression_type = CompressionType(compression)
+    if compression_type not in _CODECS:
+        raise ValueError(f"Compression codec not available: {compression_type.value}")
+    return _CODECS[compression_type]
+
+
+def available_codecs() -> List[CompressionType]:
+    return list(_CODECS)
+
+
+register_codec(Codec(
+    CompressionType.GZIP, '.gz', 6,
+    compress=lambda data, level: gzip.compress(data, compresslevel=level, mtime=0),
+    decompress=gzip.decompress,
+    open_writer=lambda fileobj, level: gzip.GzipFile(fileobj=fileobj, mode='wb', compresslevel=level, mtime=0)
+))
+
+register_codec(Codec(
+    CompressionType.LZMA, '.xz', 1,
+    compress=lambda data, level: lzma.compress(data, preset=level),
+    decompress=lzma.decompress,
+    open_writer=lambda fileobj, level: lzma.LZMAFile(fileobj, mode='wb', preset=level)
+))
+
+if ZSTD_AVAILABLE:
+    register_codec(Codec(
+        CompressionType.ZSTD, '.zst', 3,
+        compress=lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+        # decompressobj also handles frames written without a content size
+        decompress=lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+        open_writer=lambda fileobj, level: zstandard.ZstdCompressor(level=level).stream_writer(fileobj, closefd=False)
+    ))
+
+
+class _HashingWriter:
+    """File wrapper hashing everything written through it"""
+
+    def __init__(self, fileobj: BinaryIO):
+        self._fileobj = fileobj
+        self.digest = hashlib.sha256()
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.digest.update(data)
+        return self._fileobj.write(data)
+
+    def flush(self):
+        self._fileobj.flush()
+
+    def close(self):
+        self.closed = True
+
+
+def write_bytes_compressed(path: Path, data: bytes, codec: Codec, level: int) -> HashResult:
+    """Compress data and write it, hashing the stored bytes"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    compressed = codec.compress(data, level)
+    digest = hashlib.sha256(compressed)
+    with open(path, 'wb') as f:
+        f.write(compressed)
+    stat = path.stat()
+    return HashResult(digest.hexdigest(), stat.st_size, stat.st_mtime_ns)
+
+
+def copy_file_compressed(source: Path, destination: Path, codec: Codec, level: int) -> HashResult:
+    """Stream-compress a file, hashing the stored bytes"""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        hasher = _HashingWriter(dst)
+        with codec.open_writer(hasher, level) as out:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+    stat = destination.stat()
+    return HashResult(hasher.digest.hexdigest(), stat.st_size, stat.st_mtime_ns)
+
+
+class CompressionPool:
+    """
+    Codec selection plus the threads compression runs on
+
+    zlib, lzma and zstd release the GIL, so a thread pool compresses in
+    parallel while keeping compression off the storage I/O threads that
+    image writes use.
+
+    Args:
+        compression: Preferred codec (falls back to GZIP if unavailable)
+        level: Codec level (None = codec default)
+        data_types: Data types to compress
+        workers: Compression threads
+    """
+
+    def __init__(self, compression: Any = CompressionType.ZSTD, level: Optional[int] = None,
+                 data_types: Iterable[Any] = DEFAULT_COMPRESSED_TYPES, workers: int = 2):
+        try:
+            self.codec = get_codec(compression)
+        except ValueError:
+            logger.warning(f"⚠️ Compression codec {compression} not available, using gzip")
+            self.codec = get_codec(CompressionType.GZIP)
+        self.level = self.codec.default_level if level is None else level
+        self.data_types = {DataType(data_type) for data_type in data_types}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="storage-compress")
+
+    def codec_for(self, data_type: Any) -> Optional[Codec]:
+        """Codec to store a data type with, or None to store it as-is"""
+        try:
+            return self.codec if DataType(data_type) in self.data_types else None
+        except ValueError:
+            return None
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a blocking compression call on the pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def decompress(self, compression: str, data: bytes) -> bytes:
+        return await self.run(get_codec(compression).decompress, data)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
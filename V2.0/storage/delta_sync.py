@@ -0,0 +1,296 @@
+"""
+Delta Sync Between Storage Locations
+
+Rsync-style one-way sync driven by a state snapshot instead of a full
+compare of both trees. The snapshot (SQLite, kept in the destination under
+``.scanner_sync/``) records every synced file's size, mtime and SHA-256,
+and every source directory's mtime.
+
+Change detection:
+    - A directory whose mtime matches the snapshot has had no entries
+      added, removed or renamed, so its files are not stat'ed (the
+      listing itself comes from readdir without per-file stats). Files
+      that change in place (``append_only_patterns``, e.g. manifests) are
+      always stat'ed.
+    - Everything else is compared on (size, mtime) against the snapshot;
+      the destination is never walked.
+    - A full scan (every file stat'ed) runs every ``full_scan_interval``
+      seconds, or on request.
+
+Changed files are copied by a worker pool to a temporary name, hashed on
+the way through and renamed into place. The snapshot is committed in
+batches as copies finish, so an interrupted sync resumes where it stopped.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import fnmatch
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from storage.integrity import copy_file_hashed
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = '.scanner_sync'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+DEFAULT_APPEND_ONLY_PATTERNS = ('*.jsonl', '*.log')
+DEFAULT_EXCLUDE_PATTERNS = (STATE_DIR, '*.partial', '*.sqlite3', '*.sqlite3-wal', '*.sqlite3-shm')
+
+
+@dataclass
+class SyncReport:
+    """Outcome and throughput of one sync run"""
+    source: str
+    destination: str
+    full_scan: bool = False
+    directories_scanned: int = 0
+    directories_unchanged: int = 0
+    files_seen: int = 0
+    files_stat_skipped: int = 0
+    files_copied: int = 0
+    bytes_copied: int = 0
+    files_removed_from_snapshot: int = 0
+    errors: List[str] = field(default_factory=list)
+    scan_seconds: float = 0.0
+    copy_seconds: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_copied / self.copy_seconds if self.copy_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['success'] = self.success
+        data['bytes_per_second'] = self.bytes_per_second
+        return data
+
+
+class DeltaSync:
+    """
+    One-way snapshot-based sync from ``source`` to ``destination``
+
+    Args:
+        source: Source root
+        destination: Destination root (holds the snapshot)
+        name: Snapshot name, one per source (e.g. the location name)
+        workers: Parallel copy threads
+        full_scan_interval: Seconds between full scans (0 = every run)
+        append_only_patterns: File name patterns that change in place
+        exclude_patterns: File/directory name patterns never synced
+    """
+
+    def __init__(self, source: Path, destination: Path, name: str = 'default',
+                 workers: int = 4, full_scan_interval: float = 7 * 24 * 3600,
+                 append_only_patterns=DEFAULT_APPEND_ONLY_PATTERNS,
+                 exclude_patterns=DEFAULT_EXCLUDE_PATTERNS,
+                 commit_every: int = 200):
+        self.source = Path(source)
+        self.destination = Path(destination)
+        self.name = name
+        self.workers = max(1, workers)
+        self.full_scan_interval = full_scan_interval
+        self.append_only_patterns = tuple(append_only_patterns)
+        self.exclude_patterns = tuple(exclude_patterns)
+        self.commit_every = commit_every
+        self.state_path = self.destination / STATE_DIR / f"{name}.sqlite3"
+
+    def run(self, full_scan: Optional[bool] = None) -> SyncReport:
+        """Sync once (blocking); ``full_scan`` overrides the schedule"""
+        report = SyncReport(str(self.source), str(self.destination))
+        if not self.source.is_dir():
+            report.errors.append(f"Source {self.source} does not exist")
+            return report
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.state_path))
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+            if full_scan is None:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'last_full_scan'").fetchone()
+                full_scan = row is None or time.time() - float(row[0]) >= self.full_scan_interval
+            report.full_scan = full_scan
+
+            started = time.monotonic()
+            changed, dir_mtimes, removed = self._scan(conn, full_scan, report)
+            report.scan_seconds = time.monotonic() - started
+
+            started = time.monotonic()
+            failed_dirs = self._copy_changed(conn, changed, report)
+            report.copy_seconds = time.monotonic() - started
+
+            with conn:
+                conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in removed])
+                report.files_removed_from_snapshot = len(removed)
+                # Directories are only marked clean once all their changes landed
+                conn.execute("DELETE FROM dirs")
+                conn.executemany("INSERT INTO dirs VALUES (?, ?)",
+                                 [(path, mtime) for path, mtime in dir_mtimes.items() if path not in failed_dirs])
+                if full_scan and report.success:
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_full_scan', ?)", (str(time.time()),))
+        finally:
+            conn.close()
+
+        logger.info(f"🔄 Sync {self.source} -> {self.destination}: {report.files_copied} files, "
+                    f"{report.bytes_copied / 1e6:.1f} MB at {report.bytes_per_second / 1e6:.1f} MB/s "
+                    f"({report.files_stat_skipped}/{report.files_seen} files not stat'ed, "
+                    f"{len(report.errors)} errors)")
+        return report
+
+    def _nested_destination(self) -> Optional[str]:
+        """Destination path relative to the source if it lies inside it"""
+        try:
+            return self.destination.resolve().relative_to(self.source.resolve()).as_posix()
+        except ValueError:
+            return None
+
+    def _excluded(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.exclude_patterns)
+
+    def _append_only(self, name: str) -> bool:
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.append_only_patterns)
+
+    def _scan(self, conn: sqlite3.Connection, full_scan: bool,
+              report: SyncReport) -> Tuple[List[Tuple[str, int, int]], Dict[str, int], List[str]]:
+        """Walk the source; returns (changed files, directory mtimes, removed paths)"""
+        known_files = {path: (size, mtime) for path, size, mtime in
+                       conn.execute("SELECT path, size, mtime_ns FROM files")}
+        known_dirs = dict(conn.execute("SELECT path, mtime_ns FROM dirs"))
+        nested_destination = self._nested_destination()
+
+        changed: List[Tuple[str, int, int]] = []
+        dir_mtimes: Dict[str, int] = {}
+        seen = set()
+        stack = ['']
+
+        while stack:
+            rel_dir = stack.pop()
+            dir_path = self.source / rel_dir if rel_dir else self.source
+            try:
+                dir_mtime = os.stat(dir_path).st_mtime_ns
+                entries = list(os.scandir(dir_path))
+            except OSError as e:
+                report.errors.append(f"{rel_dir or '.'}: {e}")
+                continue
+
+            dir_mtimes[rel_dir] = dir_mtime
+            report.directories_scanned += 1
+            unchanged = not full_scan and known_dirs.get(rel_dir) == dir_mtime
+            if unchanged:
+                report.directories_unchanged += 1
+
+            for entry in entries:
+                if self._excluded(entry.name):
+                    continue
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if rel_path != nested_destination:
+                        stack.append(rel_path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+
+                report.files_seen += 1
+                seen.add(rel_path)
+                known = known_files.get(rel_path)
+                if unchanged and known is not None and not self._append_only(entry.name):
+                    report.files_stat_skipped += 1
+                    continue
+
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError as e:
+                    report.errors.append(f"{rel_path}: {e}")
+                    continue
+                if known != (stat.st_size, stat.st_mtime_ns):
+                    changed.append((rel_path, stat.st_size, stat.st_mtime_ns))
+
+        removed = [path for path in known_files if path not in seen]
+        return changed, dir_mtimes, removed
+
+    def _copy_changed(self, conn: sqlite3.Connection, changed: List[Tuple[str, int, int]],
+                      report: SyncReport) -> set:
+        """Copy changed files in parallel; returns directories with failures"""
+        failed_dirs = set()
+        if not changed:
+            return failed_dirs
+
+        done = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="storage-sync") as pool:
+            futures = {pool.submit(self._copy_one, *item): item for item in changed}
+            for future in as_completed(futures):
+                rel_path = futures[future][0]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    row = None
+                    report.errors.append(f"{rel_path}: {e}")
+
+                if row is None:
+                    failed_dirs.add(os.path.dirname(rel_path))
+                    continue
+
+                report.files_copied += 1
+                report.bytes_copied += row[1]
+                done.append(row)
+                if len(done) >= self.commit_every:
+                    self._commit_files(conn, done)
+
+        self._commit_files(conn, done)
+        return failed_dirs
+
+    @staticmethod
+    def _commit_files(conn: sqlite3.Connection, rows: list):
+        if rows:
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", rows)
+            rows.clear()
+
+    def _copy_one(self, rel_path: str, size: int, mtime_ns: int) -> Optional[tuple]:
+        """Copy one file via a temporary name; None if it changed mid-copy"""
+        source_file = self.source / rel_path
+        dest_file = self.destination / rel_path
+        tmp_file = dest_file.with_name(dest_file.name + '.partial')
+
+        result = copy_file_hashed(source_file, tmp_file)
+        shutil.copystat(source_file, tmp_file)
+
+        after = source_file.stat()
+        if (after.st_size, after.st_mtime_ns) != (size, mtime_ns):
+            # Still being written; pick it up on the next sync
+            tmp_file.unlink()
+            return None
+
+        os.replace(tmp_file, dest_file)
+        return (rel_path, size, mtime_ns, result.checksum)
@@ -0,0 +1,253 @@
+"""
+Storage Integrity
+
+SHA-256 is computed while data streams to disk instead of in a separate
+pass afterwards. The file's size and mtime at hashing time are recorded
+next to the checksum, so a later read can skip re-hashing unless the file
+has changed on disk.
+
+IntegrityScrubber re-verifies stored files in the background at a fixed
+I/O budget (bytes per second) on its own thread. It pauses while a scan
+session is writing, so it never competes with the capture path.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_ALGORITHM = 'sha256'
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class HashResult:
+    """Checksum plus the file state it was computed for"""
+    checksum: str
+    size: int
+    mtime_ns: int
+
+    def to_record(self) -> Dict[str, Any]:
+        """Manifest fields for this result"""
+        return {
+            'checksum': self.checksum,
+            'checksum_algorithm': CHECKSUM_ALGORITHM,
+            'file_size_bytes': self.size,
+            'verified_size': self.size,
+            'verified_mtime_ns': self.mtime_ns,
+            'verified_at': time.time()
+        }
+
+
+def write_bytes_hashed(path: Path, data: bytes, chunk_size: int = CHUNK_SIZE) -> HashResult:
+    """Write data in chunks, hashing each chunk as it goes out"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    view = memoryview(data)
+
+    with open(path, 'wb') as f:
+        for offset in range(0, len(view), chunk_size):
+            chunk = view[offset:offset + chunk_size]
+            digest.update(chunk)
+            f.write(chunk)
+
+    stat = path.stat()
+    return HashResult(digest.hexdigest(), stat.st_size, stat.st_mtime_ns)
+
+
+def copy_file_hashed(source: Path, destination: Path, chunk_size: int = CHUNK_SIZE) -> HashResult:
+    """Stream-copy a file, hashing it on the way through"""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+
+    with open(source, 'rb') as src, open(destination, 'wb') as dst:
+        while True:
+            chunk = src.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            dst.write(chunk)
+
+    stat = destination.stat()
+    return HashResult(digest.hexdigest(), stat.st_size, stat.st_mtime_ns)
+
+
+def hash_file(path: Path, chunk_size: int = CHUNK_SIZE,
+              throttle: Optional[Callable[[int], None]] = None) -> HashResult:
+    """Hash a file from disk (``throttle(bytes_read)`` is called per chunk)"""
+    digest = hashlib.sha256()
+    stat = path.stat()
+
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+            if throttle:
+                throttle(len(chunk))
+
+    return HashResult(digest.hexdigest(), stat.st_size, stat.st_mtime_ns)
+
+
+def hash_bytes(data: bytes) -> str:
+    """Checksum of in-memory data"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def unchanged_since_verified(record: Dict[str, Any], stat: os.stat_result) -> bool:
+    """True if the file still has the size and mtime recorded when it was hashed"""
+    return (record.get('verified_mtime_ns') == stat.st_mtime_ns and
+            record.get('verified_size') == stat.st_size)
+
+
+class IOBudget:
+    """Blocking token bucket limiting bytes per second"""
+
+    def __init__(self, bytes_per_second: float):
+        self.bytes_per_second = bytes_per_second
+        self._window_start = time.monotonic()
+        self._window_bytes = 0
+
+    def __call__(self, byte_count: int):
+        if self.bytes_per_second <= 0:
+            return
+        self._window_bytes += byte_count
+        expected = self._window_bytes / self.bytes_per_second
+        elapsed = time.monotonic() - self._window_start
+        if expected > elapsed:
+            time.sleep(expected - elapsed)
+        if elapsed > 1.0:
+            self._window_start = time.monotonic()
+            self._window_bytes = 0
+
+
+@dataclass
+class ScrubStats:
+    """Background verification counters"""
+    passes: int = 0
+    files_verified: int = 0
+    bytes_verified: int = 0
+    corrupt_files: list = field(default_factory=list)
+    missing_files: list = field(default_factory=list)
+    last_pass_time: Optional[float] = None
+
+
+class IntegrityScrubber:
+    """
+    Low-priority background verification of stored files
+
+    Args:
+        storage: SessionManager to scrub
+        bytes_per_second: Read budget for verification I/O
+        interval: Seconds between full passes
+        idle_check: Seconds to wait while a session is active before retrying
+    """
+
+    def __init__(self, storage, bytes_per_second: float = 5 * 1024 * 1024,
+                 interval: float = 24 * 3600, idle_check: float = 30.0):
+        self.storage = storage
+        self.bytes_per_second = bytes_per_second
+        self.interval = interval
+        self.idle_check = idle_check
+
+        self.stats = ScrubStats()
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start periodic scrubbing"""
+        if self.is_running():
+            return
+        self._stop = asyncio.Event()
+        if self._executor is None:
+            # Single dedicated thread so scrubbing never occupies the storage pool
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage-scrub")
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"🔍 Integrity scrubber started ({self.bytes_per_second / 1e6:.1f} MB/s budget)")
+
+    async def stop(self):
+        """Stop scrubbing (the file being hashed finishes first)"""
+        if self._stop:
+            self._stop.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=10.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            self._task = None
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run(self):
+        while not self._stop.is_set():
+            try:
+                await self.scrub_pass()
+            except Exception as e:
+                logger.error(f"Integrity scrub pass failed: {e}")
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _wait_until_idle(self) -> bool:
+        """Hold off while a scan session is writing; False if stopping"""
+        while self.storage.active_session_id and not self._stopping():
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.idle_check)
+            except asyncio.TimeoutError:
+                pass
+        return not self._stopping()
+
+    def _stopping(self) -> bool:
+        return self._stop is not None and self._stop.is_set()
+
+    async def scrub_pass(self) -> ScrubStats:
+        """Verify every file of every session once"""
+        if self._stop is None:
+            self._stop = asyncio.Event()
+        budget = IOBudget(self.bytes_per_second)
+        loop = asyncio.get_running_loop()
+        executor = self._executor or self.storage.io._executor
+
+        for session_id in await self.storage.io.run(self.storage.session_catalog.ids):
+            manifest = await self.storage._get_manifest(session_id)
+
+            for record in manifest.records():
+                if not await self._wait_until_idle():
+                    return self.stats
+
+                file_path = Path(record['file_path'])
+                if not file_path.exists():
+                    self.stats.missing_files.append(record['file_id'])
+                    logger.error(f"❌ Scrub: file {record['file_id']} missing at {file_path}")
+                    continue
+
+                result = await loop.run_in_executor(executor, hash_file, file_path, CHUNK_SIZE, budget)
+                self.stats.files_verified += 1
+                self.stats.bytes_verified += result.size
+
+                if not await self.storage._record_verification(record, result):
+                    self.stats.corrupt_files.append(record['file_id'])
+
+        self.stats.passes += 1
+        self.stats.last_pass_time = time.time()
+        logger.info(f"🔍 Integrity scrub pass complete: {self.stats.files_verified} files, "
+                    f"{len(self.stats.corrupt_files)} corrupt")
+        return self.stats
@@ -0,0 +1,137 @@
+"""
+Storage I/O Executor
+
+Runs blocking file-system work (open/write/json/shutil/hashing) for the
+storage layer on a small dedicated thread pool so that coroutines in
+SessionManager truly yield to the event loop. Motion status handling and
+the web bridge keep running while images are written.
+
+The number of operations queued on the pool is bounded; callers awaiting
+``run`` wait for a free slot instead of piling up unbounded work (and
+memory) when the SD card is slow.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class StorageIOExecutor:
+    """
+    Bounded thread-pool executor for blocking storage I/O
+
+    Args:
+        max_workers: Concurrent I/O threads (several images can be written at once)
+        max_pending: Maximum operations submitted but not yet finished
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {
+            'operations': 0,
+            'errors': 0,
+            'busy_time': 0.0,     # Total time spent in worker threads
+            'wait_time': 0.0      # Time callers waited for a free slot
+        }
+
+    def _ensure_started(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="storage-io")
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._slots_loop = loop
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run a blocking function in the storage pool and await its result"""
+        self._ensure_started()
+        assert self._slots is not None
+
+        wait_start = time.time()
+        async with self._slots:
+            self.stats['wait_time'] += time.time() - wait_start
+
+            loop = asyncio.get_running_loop()
+            call = partial(func, *args, **kwargs) if kwargs else partial(func, *args)
+            start = time.time()
+            try:
+                return await loop.run_in_executor(self._executor, call)
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                self.stats['operations'] += 1
+                self.stats['busy_time'] += time.time() - start
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker threads (pending operations finish first if wait=True)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        self._slots = None
+        self._slots_loop = None
+
+    def get_stats(self):
+        """Get executor statistics"""
+        return self.stats.copy()
+
+
+# Blocking helpers - run these through StorageIOExecutor.run
+
+def write_bytes(path: Path, data: bytes) -> int:
+    """Write binary data, creating parent directories"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2):
+    """Write JSON to a temporary file and rename it over the target"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_path, path)
+
+
+def read_json(path: Path) -> Any:
+    """Load a JSON file"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def read_bytes(path: Path) -> bytes:
+    """Read a whole binary file"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def copy_file(source: Path, destination: Path) -> Path:
+    """Copy a file with metadata, creating parent directories"""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(source, destination)
+    return destination
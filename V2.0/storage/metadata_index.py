@@ -0,0 +1,298 @@
+"""
+Metadata Index
+
+Global SQLite (WAL mode) index over the file records of every session.
+Session manifests remain the per-session source of truth; this index makes
+cross-session lookups and ``search_files`` indexed queries instead of
+parsing every metadata file on disk.
+
+Indexed columns: session_id, data_type, camera_id, scan_point_id,
+creation_time, tags and position (x/y/z/c) for range queries.
+
+Search criteria values:
+    scalar        equality                 {'camera_id': 0}
+    list / set    any of                   {'data_type': ['scan_image', 'raw_image']}
+    tuple (lo,hi) inclusive range, None    {'creation_time': (t0, None)}
+                  for an open end          {'position': {'x': (10.0, 20.0)}}
+Other keys are matched against the stored record.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    file_id TEXT PRIMARY KEY,
+    session_id TEXT,
+    data_type TEXT,
+    camera_id TEXT,
+    scan_point_id TEXT,
+    creation_time REAL,
+    original_filename TEXT,
+    file_size_bytes INTEGER,
+    pos_x REAL,
+    pos_y REAL,
+    pos_z REAL,
+    pos_c REAL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS file_tags (
+    file_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (file_id, tag)
+);
+CREATE INDEX IF NOT EXISTS idx_files_session ON files(session_id);
+CREATE INDEX IF NOT EXISTS idx_files_data_type ON files(data_type);
+CREATE INDEX IF NOT EXISTS idx_files_camera ON files(camera_id);
+CREATE INDEX IF NOT EXISTS idx_files_scan_point ON files(scan_point_id);
+CREATE INDEX IF NOT EXISTS idx_files_creation ON files(creation_time);
+CREATE INDEX IF NOT EXISTS idx_files_position ON files(pos_x, pos_y, pos_z, pos_c);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON file_tags(tag);
+"""
+
+# Criteria key -> column
+COLUMNS = {
+    'file_id': 'file_id',
+    'session_id': 'session_id',
+    'scan_session_id': 'session_id',
+    'data_type': 'data_type',
+    'camera_id': 'camera_id',
+    'scan_point_id': 'scan_point_id',
+    'creation_time': 'creation_time',
+    'original_filename': 'original_filename',
+    'file_size_bytes': 'file_size_bytes'
+}
+POSITION_COLUMNS = {'x': 'pos_x', 'y': 'pos_y', 'z': 'pos_z', 'c': 'pos_c'}
+
+# Identifiers are stored as text so 0 and "0" match the same camera
+TEXT_COLUMNS = {'camera_id', 'scan_point_id'}
+
+
+def _text(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _plain(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+class MetadataIndex:
+    """
+    SQLite index of file records
+
+    All methods are blocking and thread-safe; SessionManager calls them on
+    the storage I/O executor.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> 'MetadataIndex':
+        """Open (and create) the database"""
+        with self._lock:
+            if self._conn is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(SCHEMA)
+                self._conn = conn
+        return self
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.open()
+        return self._conn
+
+    # Writes
+
+    def upsert(self, record: Dict[str, Any]):
+        """Insert or replace one file record"""
+        self.upsert_many([record])
+
+    def upsert_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace many records in one transaction"""
+        conn = self._connection()
+        count = 0
+        with self._lock, conn:
+            for record in records:
+                self._write(conn, record)
+                count += 1
+        return count
+
+    def update(self, file_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Merge changes into a stored record, returning the new record"""
+        conn = self._connection()
+        with self._lock, conn:
+            row = conn.execute("SELECT record FROM files WHERE file_id = ?", (file_id,)).fetchone()
+            if row is None:
+                return None
+            record = json.loads(row[0])
+            record.update(changes)
+            self._write(conn, record)
+            return record
+
+    def delete(self, file_id: str) -> bool:
+        """Remove a record"""
+        conn = self._connection()
+        with self._lock, conn:
+            conn.execute("DELETE FROM file_tags WHERE file_id = ?", (file_id,))
+            return conn.execute("DELETE FROM files WHERE file_id = ?", (file_id,)).rowcount > 0
+
+    def delete_session(self, session_id: str) -> List[Tuple[str, int, int]]:
+        """Remove every record of a session, returning (data_type, file count, bytes) removed"""
+        conn = self._connection()
+        with self._lock, conn:
+            removed = conn.execute("SELECT data_type, COUNT(*), COALESCE(SUM(file_size_bytes), 0) "
+                                   "FROM files WHERE session_id = ? GROUP BY data_type", (session_id,)).fetchall()
+            conn.execute("DELETE FROM file_tags WHERE file_id IN "
+                         "(SELECT file_id FROM files WHERE session_id = ?)", (session_id,))
+            conn.execute("DELETE FROM files WHERE session_id = ?", (session_id,))
+        return removed
+
+    def relocate_session(self, session_id: str, old_root: Path, new_root: Path) -> int:
+        """Point a session's file_path values at new_root after its directory moved"""
+        old_root, new_root = Path(old_root), Path(new_root)
+        conn = self._connection()
+        moved = 0
+        with self._lock, conn:
+            rows = conn.execute("SELECT record FROM files WHERE session_id = ?", (session_id,)).fetchall()
+            for (record_json,) in rows:
+                record = json.loads(record_json)
+                try:
+                    relative = Path(record.get('file_path', '')).relative_to(old_root)
+                except ValueError:
+                    continue
+                record['file_path'] = str(new_root / relative)
+                self._write(conn, record)
+                moved += 1
+        return moved
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, record: Dict[str, Any]):
+        position = record.get('position_data') or {}
+        file_id = record['file_id']
+        conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                file_id,
+                record.get('scan_session_id') or record.get('session_id'),
+                _plain(record.get('data_type')),
+                _text(record.get('camera_id')),
+                _text(record.get('scan_point_id')),
+                record.get('creation_time'),
+                record.get('original_filename'),
+                record.get('file_size_bytes', record.get('file_size')),
+                position.get('x'), position.get('y'), position.get('z'), position.get('c'),
+                json.dumps(record, default=str)
+            )
+        )
+        conn.execute("DELETE FROM file_tags WHERE file_id = ?", (file_id,))
+        conn.executemany("INSERT OR IGNORE INTO file_tags VALUES (?, ?)",
+                         [(file_id, str(tag)) for tag in record.get('tags') or []])
+
+    # Reads
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Stored record for a file ID"""
+        conn = self._connection()
+        with self._lock:
+            row = conn.execute("SELECT record FROM files WHERE file_id = ?", (file_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        """Number of indexed files"""
+        conn = self._connection()
+        with self._lock:
+            return conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def usage_totals(self) -> List[Tuple[str, str, int, int]]:
+        """(session_id, data_type, file count, bytes) for every session and type"""
+        conn = self._connection()
+        with self._lock:
+            return conn.execute("SELECT session_id, data_type, COUNT(*), COALESCE(SUM(file_size_bytes), 0) "
+                                "FROM files GROUP BY session_id, data_type").fetchall()
+
+    def search(self, criteria: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+        """File IDs matching all criteria, oldest first"""
+        clauses: List[str] = []
+        params: List[Any] = []
+        extra: Dict[str, Any] = {}
+
+        for key, value in criteria.items():
+            if key in COLUMNS:
+                self._add_clause(COLUMNS[key], value, clauses, params)
+            elif key == 'position' and isinstance(value, dict):
+                for axis, axis_value in value.items():
+                    if axis.lower() not in POSITION_COLUMNS:
+                        raise ValueError(f"Unknown position axis: {axis}")
+                    self._add_clause(POSITION_COLUMNS[axis.lower()], axis_value, clauses, params)
+            elif key == 'tags':
+                tags = [value] if isinstance(value, str) else list(value)
+                clauses.append(f"file_id IN (SELECT file_id FROM file_tags WHERE tag IN ({','.join('?' * len(tags))}))")
+                params.extend(str(tag) for tag in tags)
+            else:
+                extra[key] = value
+
+        sql = "SELECT file_id, record FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY creation_time, file_id"
+        if limit is not None and not extra:
+            sql += f" LIMIT {int(limit)}"
+
+        conn = self._connection()
+        with self._lock:
+            rows = conn.execute(sql, params).fetchall()
+
+        if not extra:
+            return [file_id for file_id, _ in rows]
+
+        matches = []
+        for file_id, record_json in rows:
+            record = json.loads(record_json)
+            if all(key in record and str(record[key]) == str(_plain(value)) for key, value in extra.items()):
+                matches.append(file_id)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    @staticmethod
+    def _add_clause(column: str, value: Any, clauses: List[str], params: List[Any]):
+        convert = _text if column in TEXT_COLUMNS else _plain
+        if isinstance(value, tuple):
+            low, high = value
+            if low is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(convert(low))
+            if high is not None:
+                clauses.append(f"{column} <= ?")
+                params.append(convert(high))
+        elif isinstance(value, (list, set, frozenset)):
+            values = [convert(v) for v in value]
+            clauses.append(f"{column} IN ({','.join('?' * len(values))})")
+            params.extend(values)
+        elif value is None:
+            clauses.append(f"{column} IS NULL")
+        else:
+            clauses.append(f"{column} = ?")
+            params.append(convert(value))
@@ -0,0 +1,199 @@
+"""
+Session Catalog
+
+SQLite (WAL mode) catalog of scan sessions. Each create/finalize/archive
+updates a single row in its own transaction, so a crash never leaves a
+half-written index, and startup no longer parses every historical session.
+Sessions are loaded on demand and ``list_sessions`` pages with
+LIMIT/OFFSET instead of materializing every ScanSession.
+
+A legacy ``sessions_index.json`` is imported once when the catalog is empty.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+
+from storage.base import ScanSession
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    start_time REAL NOT NULL,
+    end_time REAL,
+    scan_name TEXT,
+    description TEXT,
+    operator TEXT,
+    total_files INTEGER DEFAULT 0,
+    total_size_bytes INTEGER DEFAULT 0,
+    scan_parameters TEXT,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions(start_time);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status, start_time);
+"""
+
+COLUMNS = ('session_id', 'start_time', 'end_time', 'scan_name', 'description', 'operator',
+           'total_files', 'total_size_bytes', 'scan_parameters', 'status')
+
+
+def _row_to_session(row) -> ScanSession:
+    values = dict(zip(COLUMNS, row))
+    values['scan_parameters'] = json.loads(values['scan_parameters']) if values['scan_parameters'] else {}
+    return ScanSession(**values)
+
+
+def _session_to_row(session: ScanSession) -> tuple:
+    return (session.session_id, float(session.start_time), session.end_time, session.scan_name,
+            session.description, session.operator, session.total_files, session.total_size_bytes,
+            json.dumps(session.scan_parameters or {}, default=str), session.status)
+
+
+class SessionCatalog:
+    """
+    Row-per-session store
+
+    All methods are blocking and thread-safe; SessionManager calls them on
+    the storage I/O executor.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def open(self) -> 'SessionCatalog':
+        """Open (and create) the database"""
+        with self._lock:
+            if self._conn is None:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(SCHEMA)
+                self._conn = conn
+        return self
+
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.open()
+        return self._conn
+
+    # Writes
+
+    def put(self, session: ScanSession):
+        """Insert or update one session"""
+        self.put_many([session])
+
+    def put_many(self, sessions: Iterable[ScanSession]) -> int:
+        """Insert or update sessions in one transaction"""
+        rows = [_session_to_row(session) for session in sessions]
+        conn = self._connection()
+        with self._lock, conn:
+            conn.executemany(f"INSERT OR REPLACE INTO sessions VALUES ({','.join('?' * len(COLUMNS))})", rows)
+        return len(rows)
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a session"""
+        conn = self._connection()
+        with self._lock, conn:
+            return conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+
+    # Reads
+
+    def get(self, session_id: str) -> Optional[ScanSession]:
+        """Load one session"""
+        conn = self._connection()
+        with self._lock:
+            row = conn.execute(f"SELECT {','.join(COLUMNS)} FROM sessions WHERE session_id = ?",
+                               (session_id,)).fetchone()
+        return _row_to_session(row) if row else None
+
+    def count(self, status: Optional[str] = None) -> int:
+        """Number of sessions (optionally with a given status)"""
+        conn = self._connection()
+        with self._lock:
+            if status is None:
+                return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM sessions WHERE status = ?", (status,)).fetchone()[0]
+
+    def list(self, limit: int = 100, offset: int = 0, status: Optional[str] = None,
+             started_before: Optional[float] = None) -> List[ScanSession]:
+        """One page of sessions, most recent first"""
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if started_before is not None:
+            clauses.append("start_time < ?")
+            params.append(started_before)
+
+        sql = f"SELECT {','.join(COLUMNS)} FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start_time DESC LIMIT ? OFFSET ?"
+        params.extend([int(limit), int(offset)])
+
+        conn = self._connection()
+        with self._lock:
+            rows = conn.execute(sql, params).fetchall()
+        return [_row_to_session(row) for row in rows]
+
+    def ids(self) -> List[str]:
+        """All session IDs, most recent first (no rows materialized)"""
+        conn = self._connection()
+        with self._lock:
+            return [row[0] for row in conn.execute("SELECT session_id FROM sessions ORDER BY start_time DESC")]
+
+    # Migration
+
+    def import_legacy_index(self, index_file: Path) -> int:
+        """Import a legacy sessions_index.json and rename it out of the way"""
+        if not index_file.exists():
+            return 0
+
+        with open(index_file, 'r') as f:
+            index_data = json.load(f)
+
+        sessions = []
+        for session_id, data in index_data.items():
+            sessions.append(ScanSession(
+                session_id=data.get('session_id', session_id),
+                start_time=_timestamp(data.get('start_time', 0.0)),
+                end_time=data.get('end_time'),
+                scan_name=data.get('scan_name', 'Untitled Scan'),
+                description=data.get('description', ''),
+                operator=data.get('operator', 'Unknown'),
+                total_files=data.get('total_files', 0),
+                total_size_bytes=data.get('total_size_bytes', 0),
+                scan_parameters=data.get('scan_parameters', {}),
+                status=data.get('status', 'active')
+            ))
+
+        imported = self.put_many(sessions)
+        index_file.replace(index_file.with_name(index_file.name + '.migrated'))
+        logger.info(f"📋 Imported {imported} sessions from {index_file}")
+        return imported
+
+
+def _timestamp(value: Any) -> float:
+    """Session start times were sometimes stored as ISO strings"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
@@ -15,23 +15,51 @@ import asyncio
 import logging
 import time
 import json
-import hashlib
 import shutil
-import zipfile
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple, Union, BinaryIO
+from typing import Optional, Dict, Any, List, Tuple, Union, BinaryIO, Callable, Iterator
+from functools import partial
 import uuid
 
 from storage.base import (
     StorageManager, StorageStatus, DataType, CompressionType,
     StorageLocation, StorageMetadata, ScanSession, StorageStats
 )
+from storage.io_executor import (
+    StorageIOExecutor, write_bytes, write_json_atomic, read_json, read_bytes,
+    copy_file
+)
+from storage.session_manifest import SessionManifest
+from storage.metadata_index import MetadataIndex
+from storage.session_catalog import SessionCatalog
+from storage.integrity import (
+    HashResult, IntegrityScrubber, write_bytes_hashed, copy_file_hashed, hash_file,
+    hash_bytes, unchanged_since_verified
+)
+from storage.backup_store import ContentAddressedStore, BackupQueue
+from storage.delta_sync import DeltaSync, SyncReport
+from storage.storage_stats import StatsTracker, location_usage
+from storage.compression import (
+    CompressionPool, Codec, DEFAULT_COMPRESSED_TYPES, get_codec, write_bytes_compressed, copy_file_compressed
+)
+from storage.zip_export import ZipExporter, session_entries
 from core.exceptions import StorageError, ConfigurationError
 from core.events import EventBus, EventPriority
 
 logger = logging.getLogger(__name__)
 
+# Data types stored under the session's images/ directory
+IMAGE_DATA_TYPES = {DataType.RAW_IMAGE, DataType.PROCESSED_IMAGE, DataType.SCAN_IMAGE}
+
+GB = 1024 ** 3
+
+
+def _plain(value: Any) -> Any:
+    """Enum member -> its value (records hold either form)"""
+    return getattr(value, 'value', value)
+
 
 class SessionManager(StorageManager):
     """
@@ -52,20 +80,54 @@ class SessionManager(StorageManager):
         self.base_storage_path = Path(config.get('base_path', '/home/pi/scanner_data'))
         self.backup_enabled = config.get('backup_enabled', True)
         self.compression_enabled = config.get('compression_enabled', False)
+        self.compression_config = config.get('compression', {})
+        self.compressor: Optional[CompressionPool] = None
+        if self.compression_enabled:
+            self.compressor = CompressionPool(
+                compression=self.compression_config.get('codec', 'zstd'),
+                level=self.compression_config.get('level'),
+                data_types=self.compression_config.get('data_types', DEFAULT_COMPRESSED_TYPES),
+                workers=self.compression_config.get('workers', 2)
+            )
         self.integrity_checking = config.get('integrity_checking', True)
+        self.scrub_config = config.get('integrity_scrub', {})
+        self.scrubber: Optional[IntegrityScrubber] = None
+        self.backup_config = config.get('backup', {})
+        self.backup_queue: Optional[BackupQueue] = None
+        self.export_config = config.get('export', {})
+        self.sync_config = config.get('sync', {})
+        self.last_sync_report: Optional[SyncReport] = None
+        self.stats_config = config.get('stats', {})
+        self.stats_tracker = StatsTracker()
+        self._stats_task: Optional[asyncio.Task] = None
         
-        # Session management
+        # Session management - the catalog holds every session; sessions_index
+        # caches the ones loaded or created during this run
+        self.session_catalog = SessionCatalog(self.base_storage_path / 'metadata' / 'sessions.sqlite3')
         self.sessions_index: Dict[str, ScanSession] = {}
         self.active_session_id: Optional[str] = None
         
         # Storage state
         self.status = StorageStatus.DISCONNECTED
         self.storage_locations = {}
-        self._file_cache = {}
+        # file_id -> record for recently stored/looked-up files; the metadata index has the rest
+        self._file_cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self.file_cache_size = config.get('file_cache_size', 10000)
+        self._manifests: Dict[str, SessionManifest] = {}
+        
+        # Global indexed metadata store shared by lookups and search
+        self.metadata_index = MetadataIndex(self.base_storage_path / 'metadata' / 'file_index.sqlite3')
         
         # Event system
         self.event_bus = EventBus()
         
+        # Blocking file I/O runs here so coroutines never stall the event loop
+        self.io = StorageIOExecutor(
+            max_workers=config.get('io_workers', 4),
+            max_pending=config.get('io_max_pending', 32)
+        )
+        self._index_lock = asyncio.Lock()
+        
         # Initialize storage structure
         self._initialize_storage_structure()
         
@@ -86,12 +148,6 @@ class SessionManager(StorageManager):
             
             for directory in directories:
                 directory.mkdir(parents=True, exist_ok=True)
-                
-            # Create sessions index file if it doesn't exist
-            index_file = self.base_storage_path / 'metadata' / 'sessions_index.json'
-            if not index_file.exists():
-                with open(index_file, 'w') as f:
-                    json.dump({}, f, indent=2)
                     
             logger.info("Storage directory structure initialized")
             
@@ -105,14 +161,18 @@ class SessionManager(StorageManager):
             # Load sessions index
             await self._load_sessions_index()
             
+            # Open the metadata index (rebuilt from manifests if it is new)
+            await self.io.run(self.metadata_index.open)
+            if await self.io.run(self.session_catalog.count) and await self.io.run(self.metadata_index.count) == 0:
+                await self.rebuild_metadata_index()
+            
             # Setup default storage location
             default_location = StorageLocation(
                 name="primary",
-                path=str(self.base_storage_path),
-                location_type="local",
+                path=self.base_storage_path,
+                capacity_gb=100.0,
                 is_primary=True,
-                max_size_gb=100.0,
-                backup_enabled=self.backup_enabled
+                auto_backup=self.backup_enabled
             )
             self.storage_locations["primary"] = default_location
             
@@ -121,18 +181,35 @@ class SessionManager(StorageManager):
                 backup_path = self.base_storage_path / 'backups'
                 backup_location = StorageLocation(
                     name="backup",
-                    path=str(backup_path),
-                    location_type="backup",
+                    path=backup_path,
+                    capacity_gb=50.0,
                     is_primary=False,
-                    max_size_gb=50.0,
-                    backup_enabled=False
+                    auto_backup=False
                 )
                 self.storage_locations["backup"] = backup_location
+                
+                # Content-addressed blobs, filled in the background after capture
+                defer_during_scan = self.backup_config.get('defer_during_scan', True)
+                self.backup_queue = BackupQueue(
+                    ContentAddressedStore(backup_path, self.backup_config.get('link_mode', 'auto')),
+                    is_busy=lambda: defer_during_scan and self.active_session_id is not None,
+                    bytes_per_second=self.backup_config.get('bytes_per_second', 10 * 1024 * 1024),
+                    on_complete=self._on_backup_complete
+                )
+            
+            # Usage counters: seeded from the index, locations reconciled in the background
+            for name, location in self.storage_locations.items():
+                self.stats_tracker.add_location(name, location.path)
+            self.stats_tracker.load_totals(await self.io.run(self.metadata_index.usage_totals))
+            self._stats_task = asyncio.create_task(self._stats_reconcile_loop())
             
             self.status = StorageStatus.READY
             
+            if self.scrub_config.get('enabled', False):
+                self.start_integrity_scrubber()
+            
             # Publish initialization event
-            await self.event_bus.publish(
+            self.event_bus.publish(
                 "storage_initialized",
                 {"locations": list(self.storage_locations.keys())},
                 "storage",
@@ -162,10 +239,36 @@ class SessionManager(StorageManager):
             
             self.status = StorageStatus.DISCONNECTED
             
+            if self._stats_task:
+                self._stats_task.cancel()
+                try:
+                    await self._stats_task
+                except asyncio.CancelledError:
+                    pass
+                self._stats_task = None
+            
+            if self.scrubber:
+                await self.scrubber.stop()
+                self.scrubber = None
+            
+            # Finish queued backups now that capture has stopped
+            if self.backup_queue:
+                await self.backup_queue.stop(drain=True)
+            
+            # Let queued writes finish before stopping the I/O threads
+            for manifest in self._manifests.values():
+                await self.io.run(manifest.close)
+            sessions_count = await self.io.run(self.session_catalog.count)
+            await self.io.run(self.metadata_index.close)
+            await self.io.run(self.session_catalog.close)
+            self.io.shutdown(wait=True)
+            if self.compressor:
+                self.compressor.shutdown(wait=True)
+            
             # Publish shutdown event
-            await self.event_bus.publish(
+            self.event_bus.publish(
                 "storage_shutdown",
-                {"sessions_count": len(self.sessions_index)},
+                {"sessions_count": sessions_count},
                 "storage",
                 EventPriority.NORMAL
             )
@@ -182,60 +285,32 @@ class SessionManager(StorageManager):
         return self.status in [StorageStatus.READY, StorageStatus.STORING]
     
     async def _load_sessions_index(self):
-        """Load sessions index from disk"""
+        """Open the session catalog (sessions themselves load on demand)"""
         try:
-            index_file = self.base_storage_path / 'metadata' / 'sessions_index.json'
+            await self.io.run(self.session_catalog.open)
             
-            if index_file.exists():
-                with open(index_file, 'r') as f:
-                    index_data = json.load(f)
-                
-                # Convert to ScanSession objects
-                for session_id, session_data in index_data.items():
-                    session = ScanSession(
-                        session_id=session_data['session_id'],
-                        start_time=session_data['start_time'],
-                        end_time=session_data.get('end_time'),
-                        scan_name=session_data.get('scan_name', 'Untitled Scan'),
-                        description=session_data.get('description', ''),
-                        operator=session_data.get('operator', 'Unknown'),
-                        total_files=session_data.get('total_files', 0),
-                        total_size_bytes=session_data.get('total_size_bytes', 0),
-                        scan_parameters=session_data.get('scan_parameters', {}),
-                        status=session_data.get('status', 'active')
-                    )
-                    self.sessions_index[session_id] = session
-                    
-            logger.info(f"Loaded {len(self.sessions_index)} sessions from index")
+            # One-time import of the old whole-file JSON index
+            legacy_index = self.base_storage_path / 'metadata' / 'sessions_index.json'
+            if legacy_index.exists() and await self.io.run(self.session_catalog.count) == 0:
+                await self.io.run(self.session_catalog.import_legacy_index, legacy_index)
+            
+            session_count = await self.io.run(self.session_catalog.count)
+            logger.info(f"Session catalog ready with {session_count} sessions")
             
         except Exception as e:
             logger.error(f"Failed to load sessions index: {e}")
-            self.sessions_index = {}
+            raise
+    
+    async def _save_session(self, session: ScanSession):
+        """Persist one session (a single-row transaction)"""
+        await self.io.run(self.session_catalog.put, session)
     
     async def _save_sessions_index(self):
-        """Save sessions index to disk"""
+        """Persist every session loaded during this run"""
         try:
-            index_file = self.base_storage_path / 'metadata' / 'sessions_index.json'
-            
-            # Convert ScanSession objects to dict
-            index_data = {}
-            for session_id, session in self.sessions_index.items():
-                index_data[session_id] = {
-                    'session_id': session.session_id,
-                    'start_time': session.start_time,
-                    'end_time': session.end_time,
-                    'scan_name': session.scan_name,
-                    'description': session.description,
-                    'operator': session.operator,
-                    'total_files': session.total_files,
-                    'total_size_bytes': session.total_size_bytes,
-                    'scan_parameters': session.scan_parameters,
-                    'status': session.status
-                }
-            
-            with open(index_file, 'w') as f:
-                json.dump(index_data, f, indent=2)
-                
+            sessions = list(self.sessions_index.values())
+            if sessions:
+                await self.io.run(self.session_catalog.put_many, sessions)
             logger.debug("Sessions index saved to disk")
             
         except Exception as e:
@@ -259,26 +334,21 @@ class SessionManager(StorageManager):
                 scan_parameters=session_metadata.get('scan_parameters', {})
             )
             
-            # Create session directory
+            # Create session directory with subdirectories
             session_path = self.base_storage_path / 'sessions' / session_id
-            session_path.mkdir(parents=True, exist_ok=True)
-            
-            # Create subdirectories
-            (session_path / 'images').mkdir(exist_ok=True)
-            (session_path / 'metadata').mkdir(exist_ok=True)
-            (session_path / 'exports').mkdir(exist_ok=True)
+            await self.io.run(self._create_session_directories, session_path)
             
             # Save session metadata
             metadata_file = session_path / 'metadata' / 'session.json'
-            with open(metadata_file, 'w') as f:
-                json.dump({
-                    'session_id': session_id,
-                    'scan_name': session.scan_name,
-                    'description': session.description,
-                    'operator': session.operator,
-                    'start_time': timestamp,
-                    'scan_parameters': session.scan_parameters
-                }, f, indent=2)
+            await self.io.run(write_json_atomic, metadata_file, {
+                'session_id': session_id,
+                'scan_name': session.scan_name,
+                'description': session.description,
+                'operator': session.operator,
+                'start_time': timestamp,
+                'scan_parameters': session.scan_parameters
+            })
+            await self._get_manifest(session_id)
             
             # Add to index
             self.sessions_index[session_id] = session
@@ -286,7 +356,7 @@ class SessionManager(StorageManager):
             self.active_session_id = session_id
             
             # Save index
-            await self._save_sessions_index()
+            await self._save_session(session)
             
             # Publish event
             if hasattr(self.event_bus, 'publish'):
@@ -303,47 +373,143 @@ class SessionManager(StorageManager):
             logger.error(f"Failed to create session: {e}")
             raise StorageError(f"Session creation failed: {e}")
     
+    @staticmethod
+    def _create_session_directories(session_path: Path):
+        """Create the session directory layout (runs in the I/O executor)"""
+        for subdirectory in ('images', 'metadata', 'exports'):
+            (session_path / subdirectory).mkdir(parents=True, exist_ok=True)
+    
+    def _session_dir(self, session_id: str) -> Path:
+        """Directory holding a session's files (under archive/ once archived)"""
+        session_path = self.base_storage_path / 'sessions' / session_id
+        archived_path = self.base_storage_path / 'archive' / session_id
+        if not session_path.exists() and archived_path.exists():
+            return archived_path
+        return session_path
+    
+    async def _get_manifest(self, session_id: str) -> SessionManifest:
+        """Session manifest, loaded from disk on first use"""
+        manifest = self._manifests.get(session_id)
+        if manifest is None:
+            metadata_dir = self._session_dir(session_id) / 'metadata'
+            manifest = self._manifests.setdefault(session_id, SessionManifest(session_id, metadata_dir))
+        
+        if not manifest.loaded:
+            await self.io.run(manifest.load)
+        return manifest
+    
+    async def _drop_session_state(self, session_id: str):
+        """Close the session's manifest and forget its cached records"""
+        manifest = self._manifests.pop(session_id, None)
+        if manifest is not None:
+            await self.io.run(manifest.close)
+        for file_id in [f for f, record in self._file_cache.items() if record.get('session_id') == session_id]:
+            del self._file_cache[file_id]
+    
+    def _cache_file_record(self, record: Dict[str, Any]):
+        """Remember a record, evicting the least recently used past file_cache_size"""
+        self._file_cache[record['file_id']] = record
+        self._file_cache.move_to_end(record['file_id'])
+        while len(self._file_cache) > self.file_cache_size:
+            self._file_cache.popitem(last=False)
+    
+    async def _find_file_record(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Record for a file from the cache or the metadata index
+        
+        The index holds every stored file (it is rebuilt from the manifests
+        when missing), so a miss there means the file does not exist.
+        """
+        record = self._file_cache.get(file_id)
+        if record is not None:
+            self._file_cache.move_to_end(file_id)
+            return record
+        
+        record = await self.io.run(self.metadata_index.get, file_id)
+        if record is not None:
+            self._cache_file_record(record)
+        return record
+    
+    @staticmethod
+    def _record_to_metadata(record: Dict[str, Any]) -> StorageMetadata:
+        """Convert a manifest record back to StorageMetadata"""
+        return StorageMetadata(
+            file_id=record['file_id'],
+            original_filename=record.get('original_filename', record.get('filename', '')),
+            data_type=DataType(record['data_type']),
+            file_size_bytes=record.get('file_size_bytes', record.get('file_size', 0)),
+            checksum=record.get('checksum') or '',
+            creation_time=record.get('creation_time', 0.0),
+            scan_session_id=record.get('scan_session_id', record.get('session_id')),
+            sequence_number=record.get('sequence_number'),
+            position_data=record.get('position_data'),
+            camera_settings=record.get('camera_settings'),
+            lighting_settings=record.get('lighting_settings'),
+            tags=record.get('tags', [])
+        )
+    
+    async def rebuild_metadata_index(self) -> int:
+        """Re-index every session manifest into the metadata index"""
+        indexed = 0
+        session_ids = await self.io.run(self.session_catalog.ids)
+        for session_id in session_ids:
+            manifest = await self._get_manifest(session_id)
+            indexed += await self.io.run(self.metadata_index.upsert_many, list(manifest.records()))
+            session_dir = self._session_dir(session_id)
+            if session_dir.parent.name == 'archive':
+                # Manifest paths still name the directory the files were written to
+                await self.io.run(self.metadata_index.relocate_session, session_id,
+                                  self.base_storage_path / 'sessions' / session_id, session_dir)
+        
+        logger.info(f"Indexed {indexed} files from {len(session_ids)} sessions")
+        return indexed
+    
+    async def find_session_files(self, session_id: str, scan_point_id: Any = None,
+                                 camera_id: Any = None,
+                                 data_type: Optional[DataType] = None) -> List[Dict[str, Any]]:
+        """Look up a session's file records by scan point, camera and/or data type"""
+        manifest = await self._get_manifest(session_id)
+        return manifest.find(scan_point_id=scan_point_id, camera_id=camera_id,
+                             data_type=data_type.value if data_type else None)
+    
     async def finalize_session(self, session_id: str) -> bool:
         """Finalize scan session"""
         try:
-            if session_id not in self.sessions_index:
+            session = await self.get_session(session_id)
+            if session is None:
                 raise StorageError(f"Session {session_id} not found")
             
-            session = self.sessions_index[session_id]
             session.end_time = time.time()
             session.status = 'completed'
             
-            # Calculate final statistics
+            # Final statistics from the running counters
             session_path = self.base_storage_path / 'sessions' / session_id
-            total_size = 0
-            file_count = 0
-            
-            for file_path in session_path.rglob('*'):
-                if file_path.is_file():
-                    file_count += 1
-                    total_size += file_path.stat().st_size
+            usage = self.stats_tracker.session(session_id)
+            file_count, total_size = usage.files, usage.bytes
             
             session.total_files = file_count
             session.total_size_bytes = total_size
             
             # Update session metadata file
             metadata_file = session_path / 'metadata' / 'session.json'
-            with open(metadata_file, 'w') as f:
-                json.dump({
-                    'session_id': session_id,
-                    'scan_name': session.scan_name,
-                    'description': session.description,
-                    'operator': session.operator,
-                    'start_time': session.start_time,
-                    'end_time': session.end_time,
-                    'scan_parameters': session.scan_parameters,
-                    'total_files': session.total_files,
-                    'total_size_bytes': session.total_size_bytes,
-                    'status': session.status
-                }, f, indent=2)
+            await self.io.run(write_json_atomic, metadata_file, {
+                'session_id': session_id,
+                'scan_name': session.scan_name,
+                'description': session.description,
+                'operator': session.operator,
+                'start_time': session.start_time,
+                'end_time': session.end_time,
+                'scan_parameters': session.scan_parameters,
+                'total_files': session.total_files,
+                'total_size_bytes': session.total_size_bytes,
+                'status': session.status
+            })
             
             # Save index
-            await self._save_sessions_index()
+            await self._save_session(session)
+            
+            if session_id in self._manifests:
+                await self.io.run(self._manifests[session_id].close)
             
             # Clear active session
             if self.active_session_id == session_id:
@@ -371,68 +537,99 @@ class SessionManager(StorageManager):
     
     async def get_session(self, session_id: str) -> Optional[ScanSession]:
         """Get session information"""
-        return self.sessions_index.get(session_id)
+        return await self._load_session(session_id)
+    
+    async def _load_session(self, session_id: str) -> Optional[ScanSession]:
+        """Session from this run's cache, else from the catalog"""
+        session = self.sessions_index.get(session_id)
+        if session is None:
+            session = await self.io.run(self.session_catalog.get, session_id)
+            if session is not None:
+                self.sessions_index[session_id] = session
+        return session
     
-    async def list_sessions(self, limit: int = 100) -> List[ScanSession]:
-        """List scan sessions (most recent first)"""
-        sessions = list(self.sessions_index.values())
-        sessions.sort(key=lambda s: s.start_time, reverse=True)
-        return sessions[:limit]
+    async def list_sessions(self, limit: int = 100, offset: int = 0) -> List[ScanSession]:
+        """List scan sessions (most recent first), one page at a time"""
+        sessions = await self.io.run(self.session_catalog.list, limit, offset)
+        # Hand back the live object for sessions already loaded this run
+        return [self.sessions_index.get(session.session_id, session) for session in sessions]
     
     # File Storage Operations
     async def store_file(self, file_data: bytes, metadata: StorageMetadata, 
                         location_name: Optional[str] = None) -> str:
         """Store file data with metadata"""
+        codec = self._codec_for(metadata.data_type)
+        if codec:
+            writer = partial(write_bytes_compressed, data=file_data, codec=codec, level=self.compressor.level)
+        elif self.integrity_checking:
+            writer = partial(write_bytes_hashed, data=file_data)
+        else:
+            writer = partial(write_bytes, data=file_data)
+        return await self._store(metadata, len(file_data), writer, codec)
+    
+    def _codec_for(self, data_type: DataType) -> Optional[Codec]:
+        """Codec to store a data type with (None when compression is off or not worthwhile)"""
+        return self.compressor.codec_for(data_type) if self.compressor else None
+    
+    async def _store(self, metadata: StorageMetadata, file_size: int,
+                     writer: Callable[[Path], Any], codec: Optional[Codec] = None) -> str:
+        """
+        Place a file in the active session; ``writer(path)`` produces its content
+        
+        Compressed files are written on the compression pool so codec work
+        never holds up image writes on the I/O executor.
+        """
         try:
             if not self.active_session_id:
                 raise StorageError("No active session for file storage")
             
             # Generate file ID and path
-            file_id = str(uuid.uuid4())
-            file_extension = metadata.file_extension or '.dat'
-            filename = f"{metadata.filename or file_id}{file_extension}"
+            file_id = metadata.file_id or str(uuid.uuid4())
+            original = Path(metadata.original_filename or file_id)
+            filename = f"{original.stem}{original.suffix or '.dat'}"
+            if codec:
+                filename += codec.suffix
+            session_id = self.active_session_id
             
-            session_path = self.base_storage_path / 'sessions' / self.active_session_id
+            session_path = self.base_storage_path / 'sessions' / session_id
             
             # Determine storage subdirectory based on data type
-            if metadata.data_type == DataType.IMAGE:
+            if metadata.data_type in IMAGE_DATA_TYPES:
                 file_path = session_path / 'images' / filename
             else:
                 file_path = session_path / 'metadata' / filename
             
-            # Ensure directory exists
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Write file data
-            with open(file_path, 'wb') as f:
-                f.write(file_data)
-            
-            # Calculate checksum if integrity checking enabled
-            checksum = None
-            if self.integrity_checking:
-                checksum = hashlib.sha256(file_data).hexdigest()
-            
-            # Store metadata
-            metadata_dict = {
+            camera_settings = metadata.camera_settings or {}
+            metadata_dict = metadata.to_dict()
+            metadata_dict.update({
                 'file_id': file_id,
                 'filename': filename,
                 'file_path': str(file_path),
-                'session_id': self.active_session_id,
-                'data_type': metadata.data_type.value,
-                'file_size': len(file_data),
-                'checksum': checksum,
-                'created_at': datetime.now().isoformat(),
-                'scan_point_id': metadata.scan_point_id,
-                'camera_id': metadata.camera_id,
-                'metadata': metadata.metadata
-            }
-            
-            metadata_file = session_path / 'metadata' / f"{file_id}_metadata.json"
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata_dict, f, indent=2)
+                'session_id': session_id,
+                'scan_session_id': metadata.scan_session_id or session_id,
+                'scan_point_id': getattr(metadata, 'scan_point_id', None) or metadata.sequence_number,
+                'camera_id': getattr(metadata, 'camera_id', None) or camera_settings.get('camera_id'),
+                'file_size': file_size,
+                'file_size_bytes': file_size,
+                'checksum': None,
+                'created_at': datetime.now().isoformat()
+            })
+            if codec:
+                metadata_dict['compression'] = codec.name
+                metadata_dict['uncompressed_size'] = file_size
+            manifest = await self._get_manifest(session_id)
+            
+            # Write data (hashing as it streams) and the manifest line in one executor hop
+            run = self.compressor.run if codec else self.io.run
+            metadata_dict = await run(
+                self._write_file_with_metadata, file_path, writer,
+                manifest, self.metadata_index, metadata_dict
+            )
             
             # Cache file info
-            self._file_cache[file_id] = metadata_dict
+            self._cache_file_record(metadata_dict)
+            self.stats_tracker.record_file(session_id, _plain(metadata.data_type), file_path,
+                                           metadata_dict['file_size'])
             
             # Backup if enabled
             if self.backup_enabled and "backup" in self.storage_locations:
@@ -445,88 +642,134 @@ class SessionManager(StorageManager):
             logger.error(f"Failed to store file: {e}")
             raise StorageError(f"File storage failed: {e}")
     
+    @staticmethod
+    def _write_file_with_metadata(file_path: Path, writer: Callable[[Path], Any],
+                                  manifest: SessionManifest, index: MetadataIndex,
+                                  metadata_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a file, append its manifest record and index it (runs in the I/O executor)"""
+        result = writer(file_path)
+        
+        # Checksum and verified size/mtime when integrity checking is enabled
+        if isinstance(result, HashResult):
+            metadata_dict.update(result.to_record())
+            metadata_dict['file_size'] = result.size
+        manifest.append(metadata_dict)
+        index.upsert(metadata_dict)
+        return metadata_dict
+    
+    async def _update_file_record(self, record: Dict[str, Any], changes: Dict[str, Any]) -> bool:
+        """Merge changes into a file's manifest entry, index row and cached record"""
+        file_id = record['file_id']
+        manifest = await self._get_manifest(record['session_id'])
+        in_manifest = await self.io.run(manifest.update, file_id, changes)
+        # Merge into the index row instead of copying the manifest record: the
+        # manifest keeps the original file_path after a session is archived
+        updated = await self.io.run(self.metadata_index.update, file_id, changes)
+        if updated is not None and file_id in self._file_cache:
+            self._cache_file_record(updated)
+        return in_manifest or updated is not None
+    
+    async def _record_verification(self, record: Dict[str, Any], result: HashResult) -> bool:
+        """Store a verification result for a file record; False if the content changed"""
+        file_id = record['file_id']
+        
+        if record.get('checksum') and result.checksum != record['checksum']:
+            logger.error(f"❌ Integrity check failed for file {file_id}")
+            await self._update_file_record(record, {'integrity_status': 'corrupt', 'verified_at': time.time()})
+            self.event_bus.publish(
+                "storage_integrity_error",
+                {"file_id": file_id, "file_path": record.get('file_path')},
+                "storage",
+                EventPriority.HIGH
+            )
+            return False
+        
+        changes = result.to_record()
+        changes['integrity_status'] = 'ok'
+        await self._update_file_record(record, changes)
+        return True
+    
+    def start_integrity_scrubber(self) -> IntegrityScrubber:
+        """Start background verification at the configured I/O budget"""
+        if self.scrubber is None:
+            self.scrubber = IntegrityScrubber(
+                self,
+                bytes_per_second=self.scrub_config.get('bytes_per_second', 5 * 1024 * 1024),
+                interval=self.scrub_config.get('interval_hours', 24) * 3600
+            )
+        self.scrubber.start()
+        return self.scrubber
+    
     async def retrieve_file(self, file_id: str) -> Tuple[bytes, StorageMetadata]:
         """Retrieve file data and metadata by ID"""
         try:
-            # Get metadata first
-            metadata = await self.get_metadata(file_id)
-            if not metadata:
+            file_info = await self._find_file_record(file_id)
+            if not file_info:
                 raise StorageError(f"File {file_id} not found")
             
-            # Check cache first
-            if file_id in self._file_cache:
-                file_info = self._file_cache[file_id]
-                file_path = Path(file_info['file_path'])
-                
-                if file_path.exists():
-                    with open(file_path, 'rb') as f:
-                        data = f.read()
-                    
-                    # Verify integrity if enabled
-                    if self.integrity_checking and file_info.get('checksum'):
-                        calculated_checksum = hashlib.sha256(data).hexdigest()
-                        if calculated_checksum != file_info['checksum']:
-                            logger.error(f"Integrity check failed for file {file_id}")
-                            raise StorageError(f"File integrity check failed: {file_id}")
-                    
-                    return data, metadata
+            file_path = Path(file_info['file_path'])
+            if not file_path.exists():
+                raise StorageError(f"File {file_id} missing at {file_path}")
             
-            # Search for file if not in cache
-            for session_id in self.sessions_index:
-                session_path = self.base_storage_path / 'sessions' / session_id
-                metadata_file = session_path / 'metadata' / f"{file_id}_metadata.json"
-                
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        file_info = json.load(f)
-                    
-                    file_path = Path(file_info['file_path'])
-                    if file_path.exists():
-                        with open(file_path, 'rb') as f:
-                            return f.read()
+            data, stat = await self.io.run(self._read_with_stat, file_path)
             
-            logger.warning(f"File {file_id} not found")
-            return None
+            # Re-hash only if the file changed since it was last verified
+            if (self.integrity_checking and file_info.get('checksum')
+                    and not unchanged_since_verified(file_info, stat)):
+                result = HashResult(await self.io.run(hash_bytes, data), stat.st_size, stat.st_mtime_ns)
+                if not await self._record_verification(file_info, result):
+                    raise StorageError(f"File integrity check failed: {file_id}")
+            
+            if file_info.get('compression'):
+                data = await self._decompress(file_info['compression'], data)
+            
+            return data, self._record_to_metadata(file_info)
             
         except Exception as e:
             logger.error(f"Failed to retrieve file {file_id}: {e}")
             return None
     
+    async def _decompress(self, compression: str, data: bytes) -> bytes:
+        """Decompress stored data (works when compression has since been disabled)"""
+        if self.compressor:
+            return await self.compressor.decompress(compression, data)
+        return await self.io.run(get_codec(compression).decompress, data)
+    
+    @staticmethod
+    def _read_with_stat(file_path: Path):
+        """Read a file and the stat it was read at (runs in the I/O executor)"""
+        stat = file_path.stat()
+        return read_bytes(file_path), stat
+    
     async def delete_file(self, file_id: str) -> bool:
         """Delete file by ID"""
         try:
-            # Find and delete file
-            for session_id in self.sessions_index:
-                session_path = self.base_storage_path / 'sessions' / session_id
-                metadata_file = session_path / 'metadata' / f"{file_id}_metadata.json"
-                
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        file_info = json.load(f)
-                    
-                    # Delete actual file
-                    file_path = Path(file_info['file_path'])
-                    if file_path.exists():
-                        file_path.unlink()
-                    
-                    # Delete metadata
-                    metadata_file.unlink()
-                    
-                    # Remove from cache
-                    if file_id in self._file_cache:
-                        del self._file_cache[file_id]
-                    
-                    logger.info(f"Deleted file {file_id}")
-                    return True
+            file_info = await self._find_file_record(file_id)
+            if not file_info:
+                logger.warning(f"File {file_id} not found for deletion")
+                return False
             
-            logger.warning(f"File {file_id} not found for deletion")
-            return False
+            manifest = await self._get_manifest(file_info['session_id'])
+            await self.io.run(manifest.delete, file_id)
+            await self.io.run(self.metadata_index.delete, file_id)
+            self._file_cache.pop(file_id, None)
+            
+            # Delete actual file
+            file_path = Path(file_info['file_path'])
+            if file_path.exists():
+                await self.io.run(file_path.unlink)
+                self.stats_tracker.record_file(
+                    file_info.get('session_id'), _plain(file_info.get('data_type')), file_path,
+                    -int(file_info.get('file_size_bytes') or 0), -1
+                )
+            
+            logger.info(f"Deleted file {file_id}")
+            return True
             
         except Exception as e:
             logger.error(f"Failed to delete file {file_id}: {e}")
             return False
     
-    # Storage Location Management
     async def add_storage_location(self, location: StorageLocation) -> bool:
         """Add storage location"""
         try:
@@ -554,7 +797,7 @@ class SessionManager(StorageManager):
         return list(self.storage_locations.keys())
     
     async def get_storage_stats(self, location_name: Optional[str] = None) -> Union[StorageStats, Dict[str, StorageStats]]:
-        """Get storage statistics"""
+        """Get storage statistics from the running counters (no directory walk)"""
         try:
             if location_name:
                 if location_name not in self.storage_locations:
@@ -562,27 +805,19 @@ class SessionManager(StorageManager):
                 
                 location = self.storage_locations[location_name]
                 path = Path(location.path)
+                usage = self.stats_tracker.location(location_name)
                 
-                # Calculate usage
-                total_size = 0
-                file_count = 0
-                for file_path in path.rglob('*'):
-                    if file_path.is_file():
-                        file_count += 1
-                        total_size += file_path.stat().st_size
-                
-                # Get available space
-                stat = path.stat() if path.exists() else None
-                available_space = shutil.disk_usage(path).free if stat else 0
+                # Free space is a single statvfs call
+                disk = shutil.disk_usage(path) if path.exists() else None
+                total_gb = location.capacity_gb or (disk.total / GB if disk else 0.0)
                 
                 return StorageStats(
-                    location_name=location_name,
-                    total_size_bytes=total_size,
-                    available_space_bytes=available_space,
-                    file_count=file_count,
-                    session_count=len(self.sessions_index),
-                    last_backup=None,  # TODO: Track last backup time
-                    health_status="healthy"
+                    total_capacity_gb=total_gb,
+                    used_space_gb=usage.bytes / GB,
+                    available_space_gb=disk.free / GB if disk else 0.0,
+                    file_count=usage.files,
+                    session_count=await self.io.run(self.session_catalog.count),
+                    last_backup_time=self.stats_tracker.last_backup_time
                 )
             else:
                 # Return stats for all locations
@@ -594,72 +829,75 @@ class SessionManager(StorageManager):
         except Exception as e:
             logger.error(f"Failed to get storage stats: {e}")
             return StorageStats(
-                location_name=location_name or "unknown",
-                total_size_bytes=0,
-                available_space_bytes=0,
+                total_capacity_gb=0.0,
+                used_space_gb=0.0,
+                available_space_gb=0.0,
                 file_count=0,
-                session_count=0,
-                health_status="error"
+                session_count=0
             )
     
-    # Export and Backup Operations
-    async def export_session(self, session_id: str, export_path: Path, 
-                           format: str = "zip") -> Path:
-        """Export session data"""
-        try:
-            if session_id not in self.sessions_index:
-                raise StorageError(f"Session {session_id} not found")
-            
-            session = self.sessions_index[session_id]
-            session_path = self.base_storage_path / 'sessions' / session_id
-            
-            if format.lower() == "zip":
-                # Create ZIP export
-                export_file = export_path / f"{session.scan_name}_{session_id}.zip"
-                export_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                with zipfile.ZipFile(export_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for file_path in session_path.rglob('*'):
-                        if file_path.is_file():
-                            arcname = file_path.relative_to(session_path)
-                            zipf.write(file_path, arcname)
-                
-                logger.info(f"Exported session {session_id} to {export_file}")
-                return export_file
-            
-            elif format.lower() == "directory":
-                # Create directory export
-                export_dir = export_path / f"{session.scan_name}_{session_id}"
-                shutil.copytree(session_path, export_dir, dirs_exist_ok=True)
-                
-                logger.info(f"Exported session {session_id} to {export_dir}")
-                return export_dir
-            
-            else:
-                raise StorageError(f"Unsupported export format: {format}")
-                
-        except Exception as e:
-            logger.error(f"Failed to export session {session_id}: {e}")
-            raise StorageError(f"Session export failed: {e}")
+    def get_usage_counters(self) -> Dict[str, Any]:
+        """File and byte counters per session, data type and location"""
+        return self.stats_tracker.snapshot()
     
+    async def reconcile_storage_stats(self) -> Dict[str, Any]:
+        """Recount locations from disk and session/data-type totals from the index"""
+        names = list(self.storage_locations)
+        roots = [Path(self.storage_locations[name].path) for name in names]
+        for name, (files, size) in zip(names, await self.io.run(location_usage, roots)):
+            self.stats_tracker.set_location(name, files, size)
+        self.stats_tracker.load_totals(await self.io.run(self.metadata_index.usage_totals))
+        return self.get_usage_counters()
+    
+    async def _stats_reconcile_loop(self):
+        """Periodic reconciliation; waits while a scan session is writing"""
+        interval = self.stats_config.get('reconcile_interval_minutes', 60) * 60
+        while True:
+            if self.active_session_id:
+                await asyncio.sleep(min(interval, 30))
+                continue
+            try:
+                await self.reconcile_storage_stats()
+            except Exception as e:
+                logger.warning(f"Storage stats reconciliation failed: {e}")
+            await asyncio.sleep(interval)
+    
+    # Export and Backup Operations
     async def _backup_file(self, file_path: Path, file_id: str) -> bool:
-        """Backup file to backup location"""
+        """Queue a file for the content-addressed backup store"""
         try:
-            if "backup" not in self.storage_locations:
+            if self.backup_queue is None:
                 return False
             
-            backup_location = self.storage_locations["backup"]
-            backup_path = Path(backup_location.path) / 'files' / f"{file_id}{file_path.suffix}"
-            backup_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            shutil.copy2(file_path, backup_path)
-            logger.debug(f"Backed up file {file_id} to {backup_path}")
+            record = self._file_cache.get(file_id) or {}
+            self.backup_queue.submit(file_id, file_path, record.get('checksum'))
             return True
             
         except Exception as e:
             logger.error(f"Failed to backup file {file_id}: {e}")
             return False
     
+    async def _on_backup_complete(self, file_id: str, checksum: str, method: str):
+        """Remember which blob backs a file"""
+        record = await self._find_file_record(file_id)
+        if record is None:
+            return
+        self.stats_tracker.last_backup_time = time.time()
+        if method != 'exists':
+            self.stats_tracker.record_location_bytes(
+                self.backup_queue.store.blob_path(checksum), int(record.get('file_size_bytes') or 0))
+        
+        await self._update_file_record(record, {'backup_blob': checksum})
+    
+    async def restore_from_backup(self, file_id: str, destination: Optional[Path] = None) -> Path:
+        """Copy a file's backup blob back to its original (or another) path"""
+        record = await self._find_file_record(file_id)
+        if not record or not record.get('backup_blob') or self.backup_queue is None:
+            raise StorageError(f"No backup available for file {file_id}")
+        
+        target = destination or Path(record['file_path'])
+        return await self.io.run(self.backup_queue.store.restore, record['backup_blob'], target)
+    
     async def backup_session(self, session_id: str, backup_location: str) -> bool:
         """Backup session data to specified location"""
         try:
@@ -678,99 +916,28 @@ class SessionManager(StorageManager):
             logger.error(f"Failed to backup session {session_id}: {e}")
             return False
     
-    async def sync_locations(self, source: str, destination: str) -> bool:
-        """Synchronize data between storage locations"""
-        try:
-            if source not in self.storage_locations or destination not in self.storage_locations:
-                raise StorageError("Source or destination location not found")
-            
-            source_path = Path(self.storage_locations[source].path)
-            dest_path = Path(self.storage_locations[destination].path)
-            
-            # Simple sync implementation - copy newer files
-            for file_path in source_path.rglob('*'):
-                if file_path.is_file():
-                    rel_path = file_path.relative_to(source_path)
-                    dest_file = dest_path / rel_path
-                    
-                    if not dest_file.exists() or file_path.stat().st_mtime > dest_file.stat().st_mtime:
-                        dest_file.parent.mkdir(parents=True, exist_ok=True)
-                        shutil.copy2(file_path, dest_file)
-            
-            logger.info(f"Synchronized {source} to {destination}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to sync {source} to {destination}: {e}")
-            return False
-    
-    async def verify_integrity(self, file_id: str) -> bool:
-        """Verify file integrity using checksum"""
-        try:
-            if file_id not in self._file_cache:
-                logger.warning(f"File {file_id} not in cache for integrity check")
-                return False
-            
-            file_info = self._file_cache[file_id]
-            if not file_info.get('checksum'):
-                logger.warning(f"No checksum available for file {file_id}")
-                return True  # No checksum to verify against
-            
-            file_path = Path(file_info['file_path'])
-            if not file_path.exists():
-                logger.error(f"File {file_id} not found at {file_path}")
-                return False
-            
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            calculated_checksum = hashlib.sha256(data).hexdigest()
-            stored_checksum = file_info['checksum']
-            
-            if calculated_checksum == stored_checksum:
-                logger.debug(f"Integrity check passed for file {file_id}")
-                return True
-            else:
-                logger.error(f"Integrity check failed for file {file_id}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Integrity check failed for file {file_id}: {e}")
-            return False
-    
-    async def generate_report(self, session_id: str) -> Dict[str, Any]:
-        """Generate session report"""
+    async def _generate_session_report(self, session_id: str) -> Dict[str, Any]:
+        """Generate session report from the session manifest"""
         try:
-            if session_id not in self.sessions_index:
+            session = await self.get_session(session_id)
+            if session is None:
                 raise StorageError(f"Session {session_id} not found")
             
-            session = self.sessions_index[session_id]
-            session_path = self.base_storage_path / 'sessions' / session_id
+            manifest = await self._get_manifest(session_id)
             
             # Collect file statistics
             file_stats = {}
-            total_size = 0
-            
             for data_type in DataType:
                 file_stats[data_type.value] = {
                     'count': 0,
                     'total_size': 0
                 }
             
-            # Scan session files
-            for metadata_file in (session_path / 'metadata').glob('*_metadata.json'):
-                if metadata_file.name != 'session.json':
-                    with open(metadata_file, 'r') as f:
-                        file_info = json.load(f)
-                    
-                    data_type = file_info.get('data_type', 'unknown')
-                    file_size = file_info.get('file_size', 0)
-                    
-                    if data_type in file_stats:
-                        file_stats[data_type]['count'] += 1
-                        file_stats[data_type]['total_size'] += file_size
-                    
-                    total_size += file_size
+            for data_type, stats in manifest.summary().items():
+                if data_type in file_stats:
+                    file_stats[data_type] = stats
+            
+            total_size = sum(stats['total_size'] for stats in file_stats.values())
             
             report = {
                 'session_id': session_id,
@@ -829,6 +996,7 @@ class SessionManager(StorageManager):
                         loc.is_primary = False
                 self.base_storage_path = path
             
+            self.stats_tracker.add_location(name, path)
             await self._save_storage_config()
             logger.info(f"Added storage location: {name} at {path}")
             return True
@@ -842,6 +1010,7 @@ class SessionManager(StorageManager):
         try:
             if name in self.storage_locations:
                 del self.storage_locations[name]
+                self.stats_tracker.remove_location(name)
                 await self._save_storage_config()
                 logger.info(f"Removed storage location: {name}")
                 return True
@@ -857,32 +1026,21 @@ class SessionManager(StorageManager):
     # File Path Operations
     async def store_file_from_path(self, file_path: Path, metadata: StorageMetadata,
                                   location_name: Optional[str] = None) -> str:
-        """Store file from filesystem path"""
+        """Store file from filesystem path (streamed, never fully loaded into memory)"""
         try:
-            with open(file_path, 'rb') as f:
-                file_data = f.read()
-            
-            # Update metadata with actual file size
-            actual_metadata = StorageMetadata(
-                file_id=metadata.file_id,
-                original_filename=metadata.original_filename,
-                data_type=metadata.data_type,
-                file_size_bytes=len(file_data),
-                checksum=metadata.checksum,
-                creation_time=metadata.creation_time,
-                scan_session_id=metadata.scan_session_id,
-                sequence_number=metadata.sequence_number,
-                position_data=metadata.position_data,
-                camera_settings=metadata.camera_settings,
-                lighting_settings=metadata.lighting_settings,
-                tags=metadata.tags
-            )
-            
-            return await self.store_file(file_data, actual_metadata, location_name)
-            
-        except Exception as e:
+            file_size = (await self.io.run(file_path.stat)).st_size
+        except OSError as e:
             logger.error(f"Failed to store file from path {file_path}: {e}")
             raise StorageError(f"File storage failed: {e}")
+        
+        codec = self._codec_for(metadata.data_type)
+        if codec:
+            writer = partial(copy_file_compressed, file_path, codec=codec, level=self.compressor.level)
+        elif self.integrity_checking:
+            writer = partial(copy_file_hashed, file_path)
+        else:
+            writer = partial(copy_file, file_path)
+        return await self._store(metadata, file_size, writer, codec)
     
     async def retrieve_file_to_path(self, file_id: str, output_path: Path) -> StorageMetadata:
         """Retrieve file to filesystem path"""
@@ -914,16 +1072,16 @@ class SessionManager(StorageManager):
     
     async def get_session(self, session_id: str) -> Optional[ScanSession]:
         """Get scan session information"""
-        return self.sessions_index.get(session_id)
+        return await self._load_session(session_id)
 
     # Additional Abstract Methods
     async def store_scan_batch(self, files: List[Tuple[bytes, StorageMetadata]]) -> List[str]:
         """Store multiple files in batch"""
-        file_ids = []
         try:
-            for file_data, metadata in files:
-                file_id = await self.store_file(file_data, metadata)
-                file_ids.append(file_id)
+            # Writes overlap on the I/O executor; results keep the input order
+            file_ids = list(await asyncio.gather(
+                *(self.store_file(file_data, metadata) for file_data, metadata in files)
+            ))
             
             logger.info(f"Stored batch of {len(files)} files")
             return file_ids
@@ -933,29 +1091,15 @@ class SessionManager(StorageManager):
             raise StorageError(f"Batch storage failed: {e}")
     
     async def retrieve_session_files(self, session_id: str, data_type: Optional[DataType] = None) -> Dict[str, bytes]:
-        """Retrieve all files from a session"""
+        """Retrieve all files from a session (decompressed)"""
         try:
-            session_path = self.base_storage_path / 'sessions' / session_id / 'files'
+            manifest = await self._get_manifest(session_id)
             files_data = {}
             
-            if not session_path.exists():
-                return files_data
-            
-            for file_path in session_path.rglob('*'):
-                if file_path.is_file():
-                    file_id = file_path.stem
-                    
-                    # Check data type filter if specified
-                    if data_type:
-                        metadata_path = session_path.parent / 'metadata' / f"{file_id}.json"
-                        if metadata_path.exists():
-                            with open(metadata_path, 'r') as f:
-                                meta_data = json.load(f)
-                                if meta_data.get('data_type') != data_type.value:
-                                    continue
-                    
-                    with open(file_path, 'rb') as f:
-                        files_data[file_id] = f.read()
+            for record in manifest.find(data_type=data_type.value if data_type else None):
+                result = await self.retrieve_file(record['file_id'])
+                if result is not None:
+                    files_data[record['file_id']] = result[0]
             
             return files_data
             
@@ -974,7 +1118,7 @@ class SessionManager(StorageManager):
                 return False
             
             # Copy session directory to backup location
-            shutil.copytree(session_path, backup_path, dirs_exist_ok=True)
+            await self.io.run(self._copy_tree, session_path, backup_path)
             
             logger.info(f"Backed up session {session_id} to {backup_location}")
             return True
@@ -993,12 +1137,12 @@ class SessionManager(StorageManager):
             target_location = self.storage_locations[location_name]
             
             # Sync all sessions
-            for session_id in self.sessions_index:
+            for session_id in await self.io.run(self.session_catalog.ids):
                 session_path = self.base_storage_path / 'sessions' / session_id
                 target_path = target_location.path / 'sessions' / session_id
                 
                 if session_path.exists():
-                    shutil.copytree(session_path, target_path, dirs_exist_ok=True)
+                    await self.io.run(self._copy_tree, session_path, target_path)
             
             logger.info(f"Synced data to location: {location_name}")
             return True
@@ -1023,33 +1167,26 @@ class SessionManager(StorageManager):
                 
         except Exception as e:
             logger.error(f"Failed to save storage config: {e}")
+    
+    async def cleanup_old_sessions(self, days_old: int = 30) -> bool:
         """Clean up sessions older than specified days"""
         try:
             cutoff_date = datetime.now().timestamp() - (days_old * 24 * 3600)
-            cleaned_count = 0
-            
-            for session_id, session in list(self.sessions_index.items()):
-                # Convert start_time to timestamp if it's a string
-                session_time = session.start_time
-                if isinstance(session_time, str):
-                    session_time = datetime.fromisoformat(session_time).timestamp()
-                elif isinstance(session_time, datetime):
-                    session_time = session_time.timestamp()
-                else:
-                    session_time = float(session_time)  # Assume it's already a timestamp
-                
-                if session_time < cutoff_date and session.status == 'completed':
-                    session_path = self.base_storage_path / 'sessions' / session_id
-                    if session_path.exists():
-                        shutil.rmtree(session_path)
-                    
-                    del self.sessions_index[session_id]
-                    cleaned_count += 1
+            sessions = await self.io.run(self.session_catalog.list, -1, 0, 'completed', cutoff_date)
             
-            if cleaned_count > 0:
-                await self._save_sessions_index()
+            for session in sessions:
+                session_path = self.base_storage_path / 'sessions' / session.session_id
+                await self._drop_session_state(session.session_id)
+                removed = await self.io.run(self.metadata_index.delete_session, session.session_id)
+                usage = self.stats_tracker.remove_session(session.session_id, removed)
+                if session_path.exists():
+                    await self.io.run(shutil.rmtree, session_path)
+                    self.stats_tracker.record_location_bytes(session_path, -usage.bytes, -usage.files)
+                
+                await self.io.run(self.session_catalog.delete, session.session_id)
+                self.sessions_index.pop(session.session_id, None)
             
-            logger.info(f"Cleaned up {cleaned_count} old sessions")
+            logger.info(f"Cleaned up {len(sessions)} old sessions")
             return True
             
         except Exception as e:
@@ -1060,27 +1197,18 @@ class SessionManager(StorageManager):
     async def file_exists(self, file_id: str) -> bool:
         """Check if file exists"""
         try:
-            metadata_file = self.base_storage_path / 'files' / 'metadata' / f"{file_id}.json"
-            return metadata_file.exists()
+            return await self._find_file_record(file_id) is not None
         except Exception:
             return False
     
     async def update_metadata(self, file_id: str, updates: Dict[str, Any]) -> bool:
         """Update file metadata"""
         try:
-            metadata_file = self.base_storage_path / 'files' / 'metadata' / f"{file_id}.json"
-            if not metadata_file.exists():
+            record = await self._find_file_record(file_id)
+            if record is None:
                 return False
             
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
-            
-            metadata.update(updates)
-            
-            with open(metadata_file, 'w') as f:
-                json.dump(metadata, f, indent=2)
-            
-            return True
+            return await self._update_file_record(record, updates)
         except Exception as e:
             logger.error(f"Failed to update metadata for {file_id}: {e}")
             return False
@@ -1088,71 +1216,16 @@ class SessionManager(StorageManager):
     async def get_metadata(self, file_id: str) -> Optional[StorageMetadata]:
         """Get file metadata"""
         try:
-            metadata_file = self.base_storage_path / 'files' / 'metadata' / f"{file_id}.json"
-            if not metadata_file.exists():
-                return None
-            
-            with open(metadata_file, 'r') as f:
-                metadata_data = json.load(f)
-            
-            # Convert back to StorageMetadata object
-            return StorageMetadata(
-                file_id=metadata_data['file_id'],
-                original_filename=metadata_data['original_filename'],
-                data_type=DataType(metadata_data['data_type']),
-                file_size_bytes=metadata_data['file_size_bytes'],
-                checksum=metadata_data['checksum'],
-                creation_time=metadata_data['creation_time'],
-                scan_session_id=metadata_data.get('scan_session_id'),
-                sequence_number=metadata_data.get('sequence_number'),
-                position_data=metadata_data.get('position_data'),
-                camera_settings=metadata_data.get('camera_settings'),
-                lighting_settings=metadata_data.get('lighting_settings'),
-                tags=metadata_data.get('tags', [])
-            )
+            record = await self._find_file_record(file_id)
+            return self._record_to_metadata(record) if record is not None else None
         except Exception as e:
             logger.error(f"Failed to get metadata for {file_id}: {e}")
             return None
     
     async def search_files(self, criteria: Dict[str, Any]) -> List[str]:
-        """Search files by metadata criteria"""
+        """Search files by metadata criteria (see storage.metadata_index for the syntax)"""
         try:
-            matching_files = []
-            metadata_dir = self.base_storage_path / 'files' / 'metadata'
-            
-            if not metadata_dir.exists():
-                return matching_files
-            
-            for metadata_file in metadata_dir.glob('*.json'):
-                try:
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                    
-                    # Check if metadata matches all criteria
-                    matches = True
-                    for key, value in criteria.items():
-                        if key not in metadata:
-                            matches = False
-                            break
-                        
-                        metadata_value = metadata[key]
-                        if isinstance(value, list):
-                            # For list criteria, check if any item matches
-                            if not any(v in str(metadata_value) for v in value):
-                                matches = False
-                                break
-                        elif str(metadata_value) != str(value):
-                            matches = False
-                            break
-                    
-                    if matches:
-                        matching_files.append(metadata['file_id'])
-                        
-                except Exception:
-                    continue  # Skip invalid metadata files
-            
-            return matching_files
-            
+            return await self.io.run(self.metadata_index.search, criteria)
         except Exception as e:
             logger.error(f"File search failed: {e}")
             return []
@@ -1164,32 +1237,25 @@ class SessionManager(StorageManager):
             archived_count = 0
             
             archive_path = self.base_storage_path / 'archive'
-            archive_path.mkdir(exist_ok=True)
-            
-            for session_id, session in list(self.sessions_index.items()):
-                # Convert start_time to timestamp if it's a string
-                session_time = session.start_time
-                if isinstance(session_time, str):
-                    session_time = datetime.fromisoformat(session_time).timestamp()
-                elif isinstance(session_time, datetime):
-                    session_time = session_time.timestamp()
-                else:
-                    session_time = float(session_time)
+            await self.io.run(archive_path.mkdir, exist_ok=True)
+            
+            for session in await self.io.run(self.session_catalog.list, -1, 0, 'completed', cutoff_date):
+                session_id = session.session_id
+                session_path = self.base_storage_path / 'sessions' / session_id
+                archive_session_path = archive_path / session_id
                 
-                if session_time < cutoff_date and session.status == 'completed':
-                    session_path = self.base_storage_path / 'sessions' / session_id
-                    archive_session_path = archive_path / session_id
+                if session_path.exists():
+                    # Move session to archive; its manifest reopens from there on next use
+                    await self._drop_session_state(session_id)
+                    await self.io.run(shutil.move, str(session_path), str(archive_session_path))
+                    await self.io.run(self.metadata_index.relocate_session, session_id,
+                                      session_path, archive_session_path)
                     
-                    if session_path.exists():
-                        # Move session to archive
-                        shutil.move(str(session_path), str(archive_session_path))
-                        
-                        # Update session status in index
-                        session.status = 'archived'
-                        archived_count += 1
-            
-            if archived_count > 0:
-                await self._save_sessions_index()
+                    # Update session status in index
+                    session = self.sessions_index.get(session_id, session)
+                    session.status = 'archived'
+                    await self._save_session(session)
+                    archived_count += 1
             
             logger.info(f"Archived {archived_count} old sessions")
             return archived_count
@@ -1199,47 +1265,59 @@ class SessionManager(StorageManager):
             return 0
 
     # Additional missing abstract methods
-    async def sync_locations(self, source: str, destination: str) -> bool:
-        """Synchronize data between storage locations"""
+    async def sync_locations(self, source: str, destination: str, full_scan: Optional[bool] = None) -> bool:
+        """
+        Synchronize data between storage locations
+        
+        Only files changed since the last sync are copied (see DeltaSync);
+        the run's SyncReport is kept in ``last_sync_report``.
+        """
         try:
             if source not in self.storage_locations or destination not in self.storage_locations:
                 logger.error(f"Storage locations not found: {source} or {destination}")
                 return False
             
-            source_path = self.storage_locations[source].path
-            dest_path = self.storage_locations[destination].path
+            engine = DeltaSync(
+                Path(self.storage_locations[source].path),
+                Path(self.storage_locations[destination].path),
+                name=source,
+                workers=self.sync_config.get('workers', 4),
+                full_scan_interval=self.sync_config.get('full_scan_interval_hours', 168) * 3600
+            )
+            report = await self.io.run(engine.run, full_scan)
+            self.last_sync_report = report
             
-            # Simple sync implementation - copy all files
-            for item in source_path.rglob('*'):
-                if item.is_file():
-                    relative_path = item.relative_to(source_path)
-                    dest_file = dest_path / relative_path
-                    dest_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(item, dest_file)
+            self.event_bus.publish(
+                "storage_synced",
+                report.to_dict(),
+                "storage"
+            )
             
-            logger.info(f"Synced data from {source} to {destination}")
-            return True
+            if not report.success:
+                logger.error(f"Sync from {source} to {destination} had {len(report.errors)} errors: "
+                             f"{report.errors[:3]}")
+            return report.success
             
         except Exception as e:
             logger.error(f"Sync failed: {e}")
             return False
     
     async def verify_integrity(self, file_id: str) -> bool:
-        """Verify file integrity using checksum"""
+        """Verify file integrity by re-hashing it from disk (SHA-256)"""
         try:
-            metadata = await self.get_metadata(file_id)
-            if not metadata:
+            record = await self._find_file_record(file_id)
+            if not record:
                 return False
             
-            file_data, _ = await self.retrieve_file(file_id)
-            if not file_data:
+            file_path = Path(record['file_path'])
+            if not file_path.exists():
+                logger.error(f"File {file_id} not found at {file_path}")
                 return False
             
-            # Calculate current checksum
-            import hashlib
-            current_checksum = hashlib.md5(file_data).hexdigest()
-            
-            return current_checksum == metadata.checksum
+            result = await self.io.run(hash_file, file_path)
+            if not record.get('checksum'):
+                logger.warning(f"No checksum available for file {file_id}")
+            return await self._record_verification(record, result)
             
         except Exception as e:
             logger.error(f"Integrity verification failed for {file_id}: {e}")
@@ -1253,27 +1331,69 @@ class SessionManager(StorageManager):
             if not session:
                 raise StorageError(f"Session {session_id} not found")
             
+            session_path = await self.io.run(self._export_session_dir, session_id)
+            
             if format == "zip":
                 export_file = export_path / f"{session.scan_name}_{session_id}.zip"
-                # This would typically be implemented with the backup logic
-                await self.backup_session(session_id, str(export_path))
+                await self.io.run(self._write_zip_export, session_path, export_file)
+                
+                logger.info(f"Exported session {session_id} to {export_file}")
                 return export_file
             else:
                 # Directory export
                 export_dir = export_path / f"{session.scan_name}_{session_id}"
-                export_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Copy session files
-                session_path = self.base_storage_path / 'sessions' / session_id
-                if session_path.exists():
-                    shutil.copytree(session_path, export_dir, dirs_exist_ok=True)
+                await self.io.run(self._copy_tree, session_path, export_dir)
                 
+                logger.info(f"Exported session {session_id} to {export_dir}")
                 return export_dir
                 
         except Exception as e:
             logger.error(f"Export failed for session {session_id}: {e}")
             raise StorageError(f"Export failed: {e}")
     
+    def _zip_exporter(self) -> ZipExporter:
+        return ZipExporter(
+            read_workers=self.export_config.get('read_workers', 4),
+            prefetch=self.export_config.get('prefetch_files', 8),
+            compresslevel=self.export_config.get('compresslevel', 6)
+        )
+    
+    def _write_zip_export(self, session_path: Path, export_file: Path):
+        """Write a session directory into a ZIP archive (runs in the I/O executor)"""
+        self._zip_exporter().write_to_file(session_entries(session_path), export_file)
+    
+    def stream_session_zip(self, session_id: str) -> Iterator[bytes]:
+        """
+        Session archive as a stream of byte chunks
+        
+        Blocking generator for web responses: files are read and packed as
+        the consumer pulls chunks, so no temporary archive is written.
+        """
+        return self._zip_exporter().stream(session_entries(self._export_session_dir(session_id)))
+    
+    def _export_session_dir(self, session_id: str) -> Path:
+        """
+        Directory of a cataloged session, for IDs that come from outside
+        
+        The ID must name a known session and resolve to a directory directly
+        under sessions/, so '..' or an absolute path can never select
+        anything else for export.
+        """
+        if self.session_catalog.get(session_id) is None:
+            raise StorageError(f"Session {session_id} not found")
+        sessions_root = (self.base_storage_path / 'sessions').resolve()
+        session_path = (sessions_root / session_id).resolve()
+        if session_path.parent != sessions_root or not session_path.is_dir():
+            raise StorageError(f"Session {session_id} not found")
+        return session_path
+    
+    @staticmethod
+    def _copy_tree(source: Path, destination: Path):
+        """Copy a directory tree (runs in the I/O executor)"""
+        destination.mkdir(parents=True, exist_ok=True)
+        if source.exists():
+            shutil.copytree(source, destination, dirs_exist_ok=True)
+    
     async def generate_report(self, session_id: str) -> Dict[str, Any]:
         """Generate scan session report"""
         # This is already implemented above in the SessionManager
@@ -1284,8 +1404,8 @@ class SessionManager(StorageManager):
         try:
             temp_path = self.base_storage_path / 'temp'
             if temp_path.exists():
-                shutil.rmtree(temp_path)
-                temp_path.mkdir(exist_ok=True)
+                await self.io.run(shutil.rmtree, temp_path)
+                await self.io.run(temp_path.mkdir, exist_ok=True)
             
             logger.info("Cleaned up temporary files")
             return True
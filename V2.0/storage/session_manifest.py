@@ -0,0 +1,232 @@
+"""
+Session Manifest
+
+Append-only JSON Lines manifest holding the metadata record of every file
+in one scan session (``<session>/metadata/manifest.jsonl``). Storing a file
+appends a single line instead of writing a pretty-printed sidecar per image,
+and the manifest is read once to build in-memory indexes by file ID, scan
+point and camera. Lookups and reports then need no file-system access.
+
+Each line is one operation:
+    {"op": "put", "record": {...}}                       add/replace a file record
+    {"op": "update", "file_id": "...", "changes": {...}} merge changes into a record
+    {"op": "delete", "file_id": "..."}                   remove a record
+
+A torn last line (power loss mid-append) is ignored on load.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+import logging
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'manifest.jsonl'
+LEGACY_SIDECAR_PATTERN = '*_metadata.json'
+
+
+class SessionManifest:
+    """
+    In-memory indexed view of one session's append-only manifest
+
+    Methods that touch the file (load/append/update/delete/close) are
+    blocking and are meant to run on the storage I/O executor; they are
+    thread-safe so several files can be stored concurrently.
+    """
+
+    def __init__(self, session_id: str, metadata_dir: Path):
+        self.session_id = session_id
+        self.path = metadata_dir / MANIFEST_FILENAME
+
+        self._lock = threading.Lock()
+        self._handle = None
+        self._loaded = False
+        self._torn_tail = False  # Last line has no newline (interrupted append)
+
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._by_scan_point: Dict[Any, Set[str]] = defaultdict(set)
+        self._by_camera: Dict[Any, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._records
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    # Loading
+
+    def load(self) -> 'SessionManifest':
+        """Read the manifest (importing legacy sidecars once if there is none)"""
+        with self._lock:
+            if self._loaded:
+                return self
+
+            if self.path.exists():
+                self._replay()
+            else:
+                self._import_legacy_sidecars()
+
+            self._loaded = True
+            return self
+
+    def _replay(self):
+        skipped = 0
+        with open(self.path, 'r') as f:
+            for line in f:
+                self._torn_tail = not line.endswith('\n')
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1
+
+        if skipped:
+            logger.warning(f"⚠️ Skipped {skipped} unreadable manifest lines in {self.path}")
+
+    def _import_legacy_sidecars(self):
+        """Fold per-file ``<file_id>_metadata.json`` sidecars into a new manifest"""
+        metadata_dir = self.path.parent
+        if not metadata_dir.exists():
+            return
+
+        sidecars = sorted(metadata_dir.glob(LEGACY_SIDECAR_PATTERN))
+        for sidecar in sidecars:
+            try:
+                with open(sidecar, 'r') as f:
+                    record = json.load(f)
+                if 'file_id' in record:
+                    self._write_line({'op': 'put', 'record': record})
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Could not import legacy metadata {sidecar}: {e}")
+
+        if sidecars:
+            logger.info(f"📋 Imported {len(sidecars)} legacy metadata files into {self.path}")
+
+    # Writing
+
+    def append(self, record: Dict[str, Any]):
+        """Add (or replace) a file record with a single appended line"""
+        with self._lock:
+            self._write_line({'op': 'put', 'record': record})
+
+    def update(self, file_id: str, changes: Dict[str, Any]) -> bool:
+        """Merge changes into an existing record"""
+        with self._lock:
+            if file_id not in self._records:
+                return False
+            self._write_line({'op': 'update', 'file_id': file_id, 'changes': changes})
+            return True
+
+    def delete(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a record, returning it"""
+        with self._lock:
+            record = self._records.get(file_id)
+            if record is not None:
+                self._write_line({'op': 'delete', 'file_id': file_id})
+            return record
+
+    def close(self):
+        """Close the append handle (reopened on the next write)"""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _write_line(self, entry: Dict[str, Any]):
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(self.path, 'a')
+            if self._torn_tail:
+                # Terminate the partial line so the next entry starts cleanly
+                self._handle.write('\n')
+                self._torn_tail = False
+        self._handle.write(json.dumps(entry, separators=(',', ':'), default=str) + '\n')
+        self._handle.flush()
+        self._apply(entry)
+
+    # In-memory state
+
+    def _apply(self, entry: Dict[str, Any]):
+        op = entry['op']
+        if op == 'put':
+            record = entry['record']
+            self._unindex(record['file_id'])
+            self._records[record['file_id']] = record
+            self._index(record)
+        elif op == 'update':
+            record = self._records.get(entry['file_id'])
+            if record is not None:
+                self._unindex(entry['file_id'])
+                record.update(entry['changes'])
+                self._index(record)
+        elif op == 'delete':
+            self._unindex(entry['file_id'])
+            self._records.pop(entry['file_id'], None)
+
+    def _index(self, record: Dict[str, Any]):
+        file_id = record['file_id']
+        if record.get('scan_point_id') is not None:
+            self._by_scan_point[record['scan_point_id']].add(file_id)
+        if record.get('camera_id') is not None:
+            self._by_camera[record['camera_id']].add(file_id)
+
+    def _unindex(self, file_id: str):
+        record = self._records.get(file_id)
+        if record is None:
+            return
+        for index, key in ((self._by_scan_point, record.get('scan_point_id')),
+                           (self._by_camera, record.get('camera_id'))):
+            if key is not None and key in index:
+                index[key].discard(file_id)
+                if not index[key]:
+                    del index[key]
+
+    # Queries (in memory only)
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        """Record for a file ID"""
+        return self._records.get(file_id)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """All records in insertion order"""
+        return iter(list(self._records.values()))
+
+    def find(self, scan_point_id: Any = None, camera_id: Any = None,
+             data_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Records matching all given keys"""
+        candidates: Optional[Set[str]] = None
+        if scan_point_id is not None:
+            candidates = set(self._by_scan_point.get(scan_point_id, ()))
+        if camera_id is not None:
+            camera_files = self._by_camera.get(camera_id, set())
+            candidates = set(camera_files) if candidates is None else candidates & camera_files
+
+        if candidates is None:
+            matches = list(self._records.values())
+        else:
+            matches = [self._records[file_id] for file_id in self._records if file_id in candidates]
+
+        if data_type is not None:
+            matches = [record for record in matches if record.get('data_type') == data_type]
+        return matches
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """File count and size per data type"""
+        stats: Dict[str, Dict[str, int]] = {}
+        for record in self._records.values():
+            entry = stats.setdefault(record.get('data_type', 'unknown'), {'count': 0, 'total_size': 0})
+            entry['count'] += 1
+            entry['total_size'] += record.get('file_size_bytes', record.get('file_size', 0)) or 0
+        return stats
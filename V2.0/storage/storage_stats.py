@@ -0,0 +1,139 @@
+"""
+Storage Statistics
+
+Running file/byte counters per session, data type and storage location,
+updated as files are stored and deleted so status queries never walk the
+archive. Session and data-type counters are seeded from the metadata index
+with one aggregate query at startup. Location counters cover everything on
+disk below a location (manifests, backups, exports), so they are set by a
+periodic reconciliation walk and adjusted by store/delete deltas between
+walks.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class UsageCounter:
+    """File count and bytes"""
+    files: int = 0
+    bytes: int = 0
+
+    def add(self, size: int, files: int = 1):
+        self.files = max(self.files + files, 0)
+        self.bytes = max(self.bytes + size, 0)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {'files': self.files, 'bytes': self.bytes}
+
+
+class StatsTracker:
+    """
+    Incrementally maintained usage counters
+
+    Mutated only from the event loop; every read is O(1).
+    """
+
+    def __init__(self):
+        self.sessions: Dict[str, UsageCounter] = {}
+        self.data_types: Dict[str, UsageCounter] = {}
+        self.locations: Dict[str, UsageCounter] = {}
+        self.location_paths: Dict[str, Path] = {}
+        self.last_reconciled: Dict[str, float] = {}
+        self.last_backup_time: Optional[float] = None
+
+    def add_location(self, name: str, path: Path):
+        self.location_paths[name] = Path(path)
+        self.locations.setdefault(name, UsageCounter())
+
+    def remove_location(self, name: str):
+        self.location_paths.pop(name, None)
+        self.locations.pop(name, None)
+        self.last_reconciled.pop(name, None)
+
+    def load_totals(self, rows: Iterable[Tuple[str, str, int, int]]):
+        """Seed session/data-type counters from (session_id, data_type, files, bytes) rows"""
+        self.sessions.clear()
+        self.data_types.clear()
+        for session_id, data_type, files, size in rows:
+            self.sessions.setdefault(session_id, UsageCounter()).add(size or 0, files)
+            self.data_types.setdefault(data_type, UsageCounter()).add(size or 0, files)
+
+    def record_file(self, session_id: Optional[str], data_type: Optional[str], file_path: Path,
+                    size: int, files: int = 1):
+        """Count a stored file (negative ``size``/``files`` for a deletion)"""
+        if session_id:
+            self.sessions.setdefault(session_id, UsageCounter()).add(size, files)
+        if data_type:
+            self.data_types.setdefault(data_type, UsageCounter()).add(size, files)
+        self.record_location_bytes(file_path, size, files)
+
+    def record_location_bytes(self, file_path: Path, size: int, files: int = 1):
+        """Adjust every location containing ``file_path``"""
+        for name, root in self.location_paths.items():
+            if _is_within(file_path, root):
+                self.locations[name].add(size, files)
+
+    def set_location(self, name: str, files: int, size: int):
+        """Replace a location's counters with a reconciled walk result"""
+        self.locations[name] = UsageCounter(files, size)
+        self.last_reconciled[name] = time.time()
+
+    def remove_session(self, session_id: str, removed: Iterable[Tuple[str, int, int]]) -> UsageCounter:
+        """Drop a deleted session, subtracting its (data_type, files, bytes) rows; returns its counter"""
+        for data_type, files, size in removed:
+            if data_type in self.data_types:
+                self.data_types[data_type].add(-(size or 0), -files)
+        return self.sessions.pop(session_id, None) or UsageCounter()
+
+    def session(self, session_id: str) -> UsageCounter:
+        return self.sessions.get(session_id) or UsageCounter()
+
+    def location(self, name: str) -> UsageCounter:
+        return self.locations.get(name) or UsageCounter()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """All counters as plain data"""
+        return {
+            'sessions': {key: value.to_dict() for key, value in self.sessions.items()},
+            'data_types': {key: value.to_dict() for key, value in self.data_types.items()},
+            'locations': {key: value.to_dict() for key, value in self.locations.items()},
+            'last_reconciled': dict(self.last_reconciled),
+            'last_backup_time': self.last_backup_time
+        }
+
+
+def _is_within(path: Path, root: Path) -> bool:
+    try:
+        Path(path).relative_to(root)
+        return True
+    except ValueError:
+        return False
+
+
+def location_usage(roots: List[Path]) -> List[Tuple[int, int]]:
+    """Walk each root once with scandir; returns [(files, bytes)] (blocking)"""
+    results = []
+    for root in roots:
+        files = size = 0
+        stack = [str(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            files += 1
+                            size += entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+        results.append((files, size))
+    return results
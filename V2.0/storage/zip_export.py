@@ -0,0 +1,154 @@
+"""
+Session ZIP Export
+
+Builds session archives with per-file compression chosen by type: JPEG and
+other already-compressed formats are stored as-is (deflating them costs
+CPU for ~0% gain), text formats such as JSON are deflated (or Zstandard
+where the Python zipfile module supports it).
+
+File contents are read ahead in parallel by a small thread pool while the
+archive is written sequentially. The writer only needs a write() method,
+so the same code produces a file on disk or a stream of chunks for an
+HTTP response without a temporary file.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import io
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Already-compressed formats: store without recompressing
+STORED_SUFFIXES = {'.jpg', '.jpeg', '.png', '.webp', '.heic', '.mp4', '.h264', '.mjpeg',
+                   '.zip', '.gz', '.xz', '.zst', '.7z', '.npz'}
+
+# Text compression: Zstandard when zipfile supports it (Python 3.14+), else deflate
+TEXT_COMPRESSION = getattr(zipfile, 'ZIP_ZSTANDARD', zipfile.ZIP_DEFLATED)
+
+Entry = Tuple[Path, str]  # (file path, archive name)
+
+
+def compression_for(path: Path) -> int:
+    """ZIP compression method for a file"""
+    return zipfile.ZIP_STORED if path.suffix.lower() in STORED_SUFFIXES else TEXT_COMPRESSION
+
+
+def session_entries(session_path: Path) -> List[Entry]:
+    """Every file below a session directory with its archive name"""
+    return [(path, path.relative_to(session_path).as_posix())
+            for path in sorted(session_path.rglob('*')) if path.is_file()]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink that collects bytes for streaming"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipExporter:
+    """
+    Parallel-read, sequential-write ZIP builder
+
+    Args:
+        read_workers: Threads reading file contents ahead of the writer
+        prefetch: Files read ahead (bounds memory use)
+        large_file_bytes: Files above this size are streamed in chunks
+            instead of being read ahead whole
+        compresslevel: Level for deflate/zstd entries
+    """
+
+    def __init__(self, read_workers: int = 4, prefetch: int = 8,
+                 large_file_bytes: int = 32 * 1024 * 1024, compresslevel: Optional[int] = 6):
+        self.read_workers = read_workers
+        self.prefetch = max(prefetch, read_workers)
+        self.large_file_bytes = large_file_bytes
+        self.compresslevel = compresslevel
+        self.stats = {'files': 0, 'stored': 0, 'compressed': 0, 'bytes_in': 0}
+
+    def write_to_file(self, entries: Iterable[Entry], export_file: Path) -> Path:
+        """Write an archive to disk (atomically via a temporary name)"""
+        export_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = export_file.with_name(f".{export_file.name}.tmp")
+
+        with open(tmp_file, 'wb') as f:
+            for _ in self._write(entries, f):
+                pass
+        os.replace(tmp_file, export_file)
+        return export_file
+
+    def stream(self, entries: Iterable[Entry]) -> Iterator[bytes]:
+        """Yield the archive as byte chunks (one or more per file)"""
+        sink = _ChunkSink()
+        for _ in self._write(entries, sink):
+            data = sink.take()
+            if data:
+                yield data
+        data = sink.take()
+        if data:
+            yield data
+
+    def _write(self, entries: Iterable[Entry], fileobj) -> Iterator[str]:
+        """Write entries to fileobj, yielding after each file"""
+        with ThreadPoolExecutor(max_workers=self.read_workers, thread_name_prefix="zip-read") as pool, \
+                zipfile.ZipFile(fileobj, 'w', allowZip64=True) as archive:
+            pending = deque()
+            entry_iter = iter(entries)
+
+            def schedule():
+                for path, arcname in entry_iter:
+                    size = path.stat().st_size
+                    future = None if size > self.large_file_bytes else pool.submit(path.read_bytes)
+                    pending.append((path, arcname, future))
+                    if len(pending) >= self.prefetch:
+                        return
+
+            schedule()
+            while pending:
+                path, arcname, future = pending.popleft()
+                schedule()
+                self._add(archive, path, arcname, future.result() if future else None)
+                yield arcname
+
+        yield ''  # Central directory written on close
+
+    def _add(self, archive: zipfile.ZipFile, path: Path, arcname: str, data: Optional[bytes]):
+        compress_type = compression_for(path)
+        info = zipfile.ZipInfo.from_file(path, arcname)
+        info.compress_type = compress_type
+        level = None if compress_type == zipfile.ZIP_STORED else self.compresslevel
+        info._compresslevel = level  # Used by archive.open(); writestr takes it directly
+
+        if data is not None:
+            archive.writestr(info, data, compresslevel=level)
+            self.stats['bytes_in'] += len(data)
+        else:
+            # Large file: stream it through without holding it in memory
+            with open(path, 'rb') as src, archive.open(info, 'w', force_zip64=True) as dst:
+                while True:
+                    chunk = src.read(1024 * 1024)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    self.stats['bytes_in'] += len(chunk)
+
+        self.stats['files'] += 1
+        self.stats['stored' if compress_type == zipfile.ZIP_STORED else 'compressed'] += 1
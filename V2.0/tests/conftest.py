@@ -0,0 +1,268 @@
+"""
+Shared Test Fixtures
+
+Fakes and factories used by several test modules: storage metadata and
+SessionManager instances on a temporary base path, a serial port that
+answers like FluidNC, and a Picamera2-like camera controller.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from storage.base import DataType, StorageMetadata
+from storage.session_manager import SessionManager
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def storage_metadata():
+    """Factory for the metadata of a file about to be stored"""
+
+    def factory(file_id, data_type=DataType.SCAN_IMAGE, filename=None, **fields):
+        return StorageMetadata(
+            file_id=file_id,
+            original_filename=filename or f"{file_id}.jpg",
+            data_type=data_type,
+            file_size_bytes=0,
+            checksum="",
+            creation_time=time.time(),
+            **fields
+        )
+
+    return factory
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    """Factory for initialized SessionManagers (base path defaults to tmp_path)"""
+
+    async def factory(base_path=None, **config):
+        settings = {'base_path': str(base_path or tmp_path), 'backup_enabled': False}
+        settings.update(config)
+        manager = SessionManager(settings)
+        assert await manager.initialize()
+        return manager
+
+    return factory
+
+
+# ---------------------------------------------------------------------------
+# FluidNC
+# ---------------------------------------------------------------------------
+
+class FakeFluidNCSerial:
+    """
+    Serial port stand-in answering like FluidNC
+
+    With ``replies=False`` the port only records what the host writes and
+    the test scripts the controller's side with ``push``.
+    """
+
+    def __init__(self, supports_auto_report=True, move_time=0.15, replies=True):
+        self.supports_auto_report = supports_auto_report
+        self.replies = replies
+        self.move_time = move_time
+        self.timeout = 1.0
+        self.is_open = True
+        self.state = 'Idle'
+        self.interval_ms = 0
+        self.settings = []
+        self.queries = 0
+        self.resets = 0
+        self.feed_holds = 0
+        self.lines = []
+        self._output = bytearray()
+        self._line = bytearray()
+        self._cond = threading.Condition()
+        threading.Thread(target=self._push_reports, daemon=True).start()
+
+    @property
+    def in_waiting(self):
+        with self._cond:
+            return len(self._output)
+
+    def read(self, size=1):
+        with self._cond:
+            if not self._output:
+                self._cond.wait(self.timeout)
+            data = bytes(self._output[:size])
+            del self._output[:size]
+            return data
+
+    def readline(self):
+        data = bytearray()
+        while not data.endswith(b'\n'):
+            chunk = self.read(1)
+            if not chunk:
+                break
+            data.extend(chunk)
+        return bytes(data)
+
+    def write(self, data):
+        for byte in data:
+            if byte == ord('?'):
+                self.queries += 1
+                if self.replies:
+                    self._emit_status()
+            elif byte == 0x18:
+                self.resets += 1
+                if self.replies:
+                    self._reset()
+            elif byte == ord('!'):
+                self.feed_holds += 1
+            elif byte == ord('~'):
+                pass
+            elif byte == ord('\n'):
+                self.lines.append(self._line.decode())
+                if self.replies:
+                    self._handle_line(self._line.decode())
+                self._line.clear()
+            else:
+                self._line.append(byte)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        with self._cond:
+            self._output.clear()
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+    def push(self, line):
+        """Send a line from the controller side"""
+        self._emit(line)
+
+    def _emit(self, line):
+        with self._cond:
+            self._output.extend(f"{line}\n".encode())
+            self._cond.notify_all()
+
+    def _emit_status(self):
+        self._emit(f"<{self.state}|MPos:1.000,2.000,3.000,4.000|FS:0,0>")
+
+    def _set_state(self, state):
+        self.state = state
+        if self.interval_ms:
+            self._emit_status()  # FluidNC reports state changes immediately
+
+    def _reset(self):
+        # Soft reset: line buffer and report interval are lost, banner follows
+        self._line.clear()
+        self.interval_ms = 0
+        self.state = 'Idle'
+        self._emit("Grbl 3.7 [FluidNC v3.7.8 (fake) '$' for help]")
+
+    def _handle_line(self, line):
+        if line.startswith('$Report/Interval='):
+            if not self.supports_auto_report:
+                self._emit('error:3')
+                return
+            self.interval_ms = int(line.split('=')[1])
+            self.settings.append(self.interval_ms)
+            self._emit('ok')
+        elif line.startswith('$H'):
+            self._emit('[MSG:DBG: Homing done]')
+            self._emit('ok')
+        elif {'G0', 'G1'} & set(line.split()):
+            self._emit('ok')
+            self._set_state('Run')
+            threading.Timer(self.move_time, self._set_state, ('Idle',)).start()
+        else:
+            self._emit('ok')
+
+    def _push_reports(self):
+        while self.is_open:
+            if self.interval_ms:
+                self._emit_status()
+                time.sleep(self.interval_ms / 1000)
+            else:
+                time.sleep(0.01)
+
+
+@pytest.fixture
+def fluidnc():
+    """Factory for fake FluidNC ports, closed after the test"""
+    ports = []
+
+    def factory(**kwargs):
+        port = FakeFluidNCSerial(**kwargs)
+        ports.append(port)
+        return port
+
+    yield factory
+    for port in ports:
+        port.close()
+
+
+# ---------------------------------------------------------------------------
+# Camera
+# ---------------------------------------------------------------------------
+
+class FakePicamera:
+    """Records configure/autofocus calls like a Picamera2 instance"""
+
+    def __init__(self):
+        self.configured = []
+        self.autofocus_cycles = 0
+
+    def create_video_configuration(self, **kwargs):
+        return ('video', kwargs)
+
+    def create_still_configuration(self, **kwargs):
+        return ('still', kwargs)
+
+    def configure(self, config):
+        self.configured.append(config[0])
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def autofocus_cycle(self):
+        self.autofocus_cycles += 1
+        return True
+
+    def capture_array(self, stream="main"):
+        if stream == "lores":
+            return np.zeros((720, 640), dtype=np.uint8)  # 640x480 I420
+        return np.zeros((8, 8, 3), dtype=np.uint8)
+
+
+class FakeCameraController:
+    def __init__(self):
+        self.cameras = {0: FakePicamera()}
+
+    async def initialize(self):
+        return True
+
+
+@pytest.fixture
+def camera_controller():
+    return FakeCameraController()
+
+
+@pytest.fixture
+def point_metadata():
+    """Factory for the scan point metadata passed to capture_frames"""
+
+    def factory(x, c):
+        return {'position': {'x': x, 'y': 50.0, 'z': 0.0}, 'rotation': c}
+
+    return factory
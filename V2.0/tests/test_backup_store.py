@@ -0,0 +1,57 @@
+"""
+Test Content-Addressed Backup Store
+
+Checks deferred backups after capture, deduplication by checksum,
+hard-link mode and restoring a file from its backup blob.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import hashlib
+
+import pytest
+
+from storage.backup_store import ContentAddressedStore
+
+
+@pytest.mark.asyncio
+async def test_backups_deferred_until_session_ends(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager(backup_enabled=True, backup={'bytes_per_second': 0})
+    manager.backup_queue.idle_check = 0.01
+
+    session_id = await manager.create_session({'name': 'backup'})
+    await manager.store_file(b'same bytes', storage_metadata('a'))
+    await manager.store_file(b'same bytes', storage_metadata('b'))
+    await manager.store_file(b'other bytes', storage_metadata('c'))
+
+    store = manager.backup_queue.store
+    assert store.stats['stored'] == 0  # Nothing copied during capture
+
+    await manager.finalize_session(session_id)
+    await manager.backup_queue.drain()
+
+    assert store.stats['stored'] == 2
+    assert store.stats['deduplicated'] == 1
+    record = await manager._find_file_record('a')
+    assert record['backup_blob'] == hashlib.sha256(b'same bytes').hexdigest()
+
+    restored = await manager.restore_from_backup('c', tmp_path / 'restored.jpg')
+    assert restored.read_bytes() == b'other bytes'
+    await manager.shutdown()
+
+
+def test_hardlink_mode_and_checksum_guard(tmp_path):
+    source = tmp_path / 'image.jpg'
+    source.write_bytes(b'jpeg data')
+    checksum = hashlib.sha256(b'jpeg data').hexdigest()
+
+    store = ContentAddressedStore(tmp_path / 'store', link_mode='hardlink')
+    assert store.put_file(source, checksum) == (checksum, 'hardlink')
+    assert store.blob_path(checksum).stat().st_ino == source.stat().st_ino
+    assert store.put_file(source, checksum)[1] == 'exists'
+
+    copy_store = ContentAddressedStore(tmp_path / 'copies', link_mode='copy')
+    with pytest.raises(ValueError):
+        copy_store.put_file(source, 'f' * 64)
+    assert not list((tmp_path / 'copies' / 'tmp').iterdir())
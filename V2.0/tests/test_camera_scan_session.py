@@ -0,0 +1,73 @@
+"""
+Test Camera Scan Session
+
+Checks that the camera adapter holds the still configuration for a whole
+scan and only refocuses when the camera distance or tilt changes.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import pytest
+
+from scanning.scan_orchestrator import CameraManagerAdapter
+
+
+async def make_adapter(controller):
+    adapter = CameraManagerAdapter(controller, None)
+    await adapter.initialize()
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_session_configures_still_mode_once(tmp_path, camera_controller, point_metadata):
+    adapter = await make_adapter(camera_controller)
+    camera = adapter.controller.cameras[0]
+    assert await adapter.begin_scan_session()
+
+    for index in range(4):
+        frames = await adapter.capture_frames(tmp_path, f"point_{index}", point_metadata(100.0, 0.0))
+        assert frames[0]['image'] is not None
+
+    assert camera.configured == ['video', 'still']
+
+    await adapter.end_scan_session()
+    assert camera.configured == ['video', 'still', 'video']
+
+
+@pytest.mark.asyncio
+async def test_focus_only_when_geometry_changes(tmp_path, camera_controller, point_metadata):
+    adapter = await make_adapter(camera_controller)
+    camera = adapter.controller.cameras[0]
+    await adapter.begin_scan_session()
+
+    for z_point in range(3):
+        await adapter.capture_frames(tmp_path, f"a_{z_point}", point_metadata(100.0, 0.0))
+    assert camera.autofocus_cycles == 1
+
+    await adapter.capture_frames(tmp_path, "tilted", point_metadata(100.0, 15.0))
+    await adapter.capture_frames(tmp_path, "closer", point_metadata(80.0, 15.0))
+    assert camera.autofocus_cycles == 3
+
+    await adapter.end_scan_session()
+
+
+@pytest.mark.asyncio
+async def test_preview_uses_lores_during_session(camera_controller):
+    adapter = await make_adapter(camera_controller)
+    await adapter.begin_scan_session()
+
+    frame = adapter.get_preview_frame('camera_1')
+
+    assert frame.shape == (480, 640, 3)
+    await adapter.end_scan_session()
+
+
+@pytest.mark.asyncio
+async def test_preview_jpeg_from_lores_stream(camera_controller):
+    adapter = await make_adapter(camera_controller)
+
+    jpeg = adapter.get_preview_jpeg('camera_1')
+
+    assert jpeg[:2] == b'\xff\xd8'
+    assert adapter.get_preview_jpeg('camera_2') is None
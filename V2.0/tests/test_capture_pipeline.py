@@ -0,0 +1,82 @@
+"""
+Test Capture Pipeline
+
+Checks that encode/save work runs off the scan loop with bounded
+queueing and that every frame result is reported.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from scanning.capture_pipeline import CapturePipeline, CaptureJob
+
+
+def slow_save(frame):
+    """Stand-in for a blocking JPEG encode + write"""
+    time.sleep(0.05)
+    if frame.get('fail'):
+        return {'camera_id': frame['camera_id'], 'success': False, 'error': 'write failed'}
+    return {'camera_id': frame['camera_id'], 'success': True, 'thread': threading.current_thread().name}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reports_all_results():
+    results = {}
+    pipeline = CapturePipeline(slow_save, max_queue=2, workers=2,
+                               on_result=lambda index, res: results.setdefault(index, res))
+    await pipeline.start()
+
+    for index in range(6):
+        await pipeline.submit(CaptureJob(point_index=index, frames=[{'camera_id': 'camera_1'}]))
+    await pipeline.stop()
+
+    assert sorted(results) == list(range(6))
+    assert all(r[0]['success'] for r in results.values())
+    assert all(r[0]['thread'].startswith('capture-encode') for r in results.values())
+    assert pipeline.stats['frames_saved'] == 6
+    assert not pipeline.running
+
+
+@pytest.mark.asyncio
+async def test_submit_does_not_block_event_loop():
+    pipeline = CapturePipeline(slow_save, max_queue=4, workers=1)
+    await pipeline.start()
+
+    start = time.time()
+    await pipeline.submit(CaptureJob(point_index=0, frames=[{'camera_id': 'camera_1'}]))
+    submit_time = time.time() - start
+    await pipeline.stop()
+
+    # Submitting returns immediately while the encode runs in the pool
+    assert submit_time < 0.05
+
+
+@pytest.mark.asyncio
+async def test_backpressure_when_encoders_fall_behind():
+    pipeline = CapturePipeline(slow_save, max_queue=1, workers=1)
+    await pipeline.start()
+
+    for index in range(4):
+        await pipeline.submit(CaptureJob(point_index=index, frames=[{'camera_id': 'camera_1'}]))
+    await pipeline.stop()
+
+    assert pipeline.stats['backpressure_time'] > 0.05
+    assert pipeline.stats['jobs_completed'] == 4
+
+
+@pytest.mark.asyncio
+async def test_failed_frames_counted():
+    pipeline = CapturePipeline(slow_save, max_queue=2, workers=1)
+    await pipeline.start()
+
+    await pipeline.submit(CaptureJob(point_index=0, frames=[{'camera_id': 'camera_1', 'fail': True}]))
+    await pipeline.stop()
+
+    assert pipeline.stats['frames_failed'] == 1
+    assert pipeline.stats['frames_saved'] == 0
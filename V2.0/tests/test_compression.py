@@ -0,0 +1,65 @@
+"""
+Test Storage Compression
+
+Checks codec round trips, streaming compression, and SessionManager
+storing eligible payloads compressed (recorded in the manifest) while
+retrieve_file returns the original bytes.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+
+import pytest
+
+from storage.base import CompressionType, DataType
+from storage.compression import available_codecs, copy_file_compressed, get_codec
+
+
+@pytest.mark.parametrize('compression', available_codecs())
+def test_codec_round_trip(tmp_path, compression):
+    codec = get_codec(compression)
+    data = json.dumps([{'x': i, 'y': i * 2} for i in range(2000)]).encode()
+    assert codec.decompress(codec.compress(data, codec.default_level)) == data
+
+    source = tmp_path / 'points.json'
+    source.write_bytes(data)
+    result = copy_file_compressed(source, tmp_path / f"points.json{codec.suffix}", codec, codec.default_level)
+    assert result.size < len(data)
+    assert codec.decompress((tmp_path / f"points.json{codec.suffix}").read_bytes()) == data
+
+
+def test_unknown_codec_rejected():
+    with pytest.raises(ValueError):
+        get_codec('brotli')
+
+
+@pytest.mark.asyncio
+async def test_payloads_compressed_transparently(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager(compression_enabled=True, compression={'codec': 'gzip'})
+    session_id = await manager.create_session({'name': 'compress'})
+    payload = json.dumps({'points': list(range(5000))}).encode()
+    jpeg = b'\xff\xd8' + bytes(range(256)) * 20
+
+    await manager.store_file(payload, storage_metadata('cloud', DataType.POINT_CLOUD, 'cloud.json'))
+    await manager.store_file(jpeg, storage_metadata('img'))
+
+    cloud = await manager._find_file_record('cloud')
+    assert cloud['compression'] == CompressionType.GZIP.value
+    assert cloud['uncompressed_size'] == len(payload)
+    assert cloud['file_path'].endswith('cloud.json.gz')
+    assert cloud['file_size_bytes'] < len(payload)
+    assert 'compression' not in await manager._find_file_record('img')
+
+    data, _ = await manager.retrieve_file('cloud')
+    assert data == payload
+    assert await manager.verify_integrity('cloud')
+    assert (await manager.retrieve_session_files(session_id, DataType.POINT_CLOUD)) == {'cloud': payload}
+    await manager.shutdown()
+
+    # Still readable after compression is switched off
+    restarted = await make_manager(compression_enabled=False)
+    data, _ = await restarted.retrieve_file('cloud')
+    assert data == payload
+    await restarted.shutdown()
@@ -0,0 +1,96 @@
+"""
+Test Delta Sync
+
+Checks snapshot-based location sync: only changed files are copied,
+unchanged directories are not stat'ed, append-only files are still picked
+up, interrupted syncs resume, and SessionManager.sync_locations uses it.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import os
+
+import pytest
+
+from storage.base import StorageLocation
+from storage.delta_sync import DeltaSync
+from storage.session_manager import SessionManager
+
+
+def make_tree(root):
+    for session in ('s1', 's2'):
+        (root / session / 'images').mkdir(parents=True)
+        for index in range(3):
+            (root / session / 'images' / f"img{index}.jpg").write_bytes(os.urandom(1000))
+        (root / session / 'metadata').mkdir()
+        (root / session / 'metadata' / 'manifest.jsonl').write_text('{"op": "put"}\n')
+
+
+def test_only_changes_are_copied(tmp_path):
+    source, destination = tmp_path / 'src', tmp_path / 'dst'
+    make_tree(source)
+    engine = DeltaSync(source, destination, workers=2, full_scan_interval=3600)
+
+    first = engine.run()
+    assert first.success and first.full_scan
+    assert first.files_copied == 8
+    assert (destination / 's1' / 'images' / 'img0.jpg').read_bytes() == (source / 's1' / 'images' / 'img0.jpg').read_bytes()
+
+    second = engine.run()
+    assert not second.full_scan
+    assert second.files_copied == 0
+    assert second.directories_unchanged == second.directories_scanned
+    assert second.files_stat_skipped == 6  # Manifests are always stat'ed
+
+    # In-place append and a new file
+    with open(source / 's2' / 'metadata' / 'manifest.jsonl', 'a') as f:
+        f.write('{"op": "update"}\n')
+    (source / 's2' / 'images' / 'img3.jpg').write_bytes(b'new')
+
+    third = engine.run()
+    assert third.files_copied == 2
+    assert (destination / 's2' / 'metadata' / 'manifest.jsonl').read_text().count('\n') == 2
+    assert (destination / 's2' / 'images' / 'img3.jpg').read_bytes() == b'new'
+
+
+def test_interrupted_sync_resumes(tmp_path):
+    source, destination = tmp_path / 'src', tmp_path / 'dst'
+    make_tree(source)
+    engine = DeltaSync(source, destination, workers=1, commit_every=1)
+
+    real_copy = engine._copy_one
+    copied = []
+
+    def flaky_copy(rel_path, size, mtime_ns):
+        if len(copied) >= 3:
+            raise OSError("destination unplugged")
+        copied.append(rel_path)
+        return real_copy(rel_path, size, mtime_ns)
+
+    engine._copy_one = flaky_copy
+    interrupted = engine.run()
+    assert not interrupted.success
+    assert interrupted.files_copied == 3
+
+    engine._copy_one = real_copy
+    resumed = engine.run()
+    assert resumed.success
+    assert resumed.files_copied == 5
+
+
+@pytest.mark.asyncio
+async def test_sync_locations_skips_nested_destination(tmp_path):
+    manager = SessionManager({'base_path': str(tmp_path / 'data'), 'backup_enabled': True})
+    assert await manager.initialize()
+    await manager.create_session({'name': 'sync'})
+
+    await manager.add_storage_location('archive', tmp_path / 'data' / 'archive')
+    assert await manager.sync_locations('primary', 'archive')
+    report = manager.last_sync_report
+    assert report.files_copied > 0
+    assert not (tmp_path / 'data' / 'archive' / 'archive').exists()
+
+    assert await manager.sync_locations('primary', 'archive')
+    assert manager.last_sync_report.files_copied == 0
+    await manager.shutdown()
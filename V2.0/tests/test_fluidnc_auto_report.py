@@ -0,0 +1,90 @@
+"""
+Test FluidNC Auto-Reporting
+
+Runs the protocol reader against a fake serial port that behaves like
+FluidNC's $Report/Interval: status is pushed on the interval and on every
+state change, and the host stops sending '?' once auto-reporting is on.
+Also checks the YAML settings reach the engine through the orchestrator.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import time
+
+import pytest
+import yaml
+
+from motion.fluidnc_engine import FluidNCEngine
+from motion.simplified_fluidnc_controller_fixed import SimplifiedFluidNCControllerFixed
+from scanning.scan_orchestrator import ScanOrchestrator
+
+MOTION_YAML = """
+controller:
+  port: /dev/ttyUSB1
+  status_reports:
+    auto_report: false
+    idle_interval_ms: 250
+    motion_interval_ms: 20
+"""
+
+
+def make_protocol(serial_port, **kwargs):
+    protocol = FluidNCEngine(command_timeout=2.0, **kwargs)
+    protocol.serial_connection = serial_port
+    protocol.connected = True
+    protocol._start_status_monitoring()
+    protocol._enable_auto_report()
+    return protocol
+
+
+def test_auto_report_replaces_polling(fluidnc):
+    port = fluidnc()
+    protocol = make_protocol(port, report_interval_ms=100)
+    queries = port.queries
+
+    time.sleep(0.4)
+
+    assert protocol.auto_reporting
+    assert port.queries == queries
+    assert protocol.stats['status_reports'] >= 3
+    assert protocol.current_status.position['y'] == 2.0
+    protocol._stop_status_monitoring()
+
+
+def test_interval_shortened_during_motion(fluidnc):
+    port = fluidnc()
+    protocol = make_protocol(port, report_interval_ms=200, motion_report_interval_ms=20)
+    queries = port.queries
+
+    success, response = protocol.send_command_with_motion_wait('G1 X10 F1000')
+
+    assert success and response == 'ok'
+    assert protocol.current_status.state == 'Idle'
+    assert port.settings == [200, 20, 200]
+    assert port.queries == queries
+    protocol._stop_status_monitoring()
+
+
+def test_falls_back_to_polling_when_refused(fluidnc):
+    port = fluidnc(supports_auto_report=False)
+    protocol = make_protocol(port)
+    protocol.status_interval = 0.05
+
+    time.sleep(0.3)
+
+    assert not protocol.auto_reporting
+    assert port.queries >= 3
+    success, _ = protocol.send_command_with_motion_wait('G1 X10 F1000')
+    assert success
+    protocol._stop_status_monitoring()
+
+
+def test_orchestrator_passes_status_report_settings():
+    config = ScanOrchestrator._motion_controller_config(yaml.safe_load(MOTION_YAML))
+    engine = SimplifiedFluidNCControllerFixed(config).protocol
+
+    assert engine.port == '/dev/ttyUSB1'
+    assert not engine.auto_report
+    assert engine.report_interval_ms == 250
+    assert engine.motion_report_interval_ms == 20
@@ -0,0 +1,81 @@
+"""
+Test FluidNC Engine
+
+Checks the asyncio API of the shared FluidNC engine on a fake FluidNC port
+and that the deprecated controller/protocol modules now resolve to it.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import asyncio
+import importlib
+import warnings
+
+import pytest
+
+from motion.fluidnc_engine import FluidNCEngine
+from motion.simplified_fluidnc_controller_fixed import SimplifiedFluidNCControllerFixed
+
+
+@pytest.fixture
+def engine(fluidnc):
+    engine = FluidNCEngine(command_timeout=2.0, report_interval_ms=50)
+    assert engine.attach(fluidnc(move_time=0.1))
+    yield engine
+    engine.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_execute_waits_for_motion(engine):
+    assert engine.auto_reporting
+
+    success, response = await engine.execute('G1 X10 F1000')
+
+    assert success and response == 'ok'
+    assert engine.current_status.state == 'Idle'
+    assert engine.current_status.position['x'] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_status_updates_stream_reports(engine):
+    seen = []
+
+    async def collect():
+        async for status in engine.status_updates():
+            seen.append(status.state)
+            if len(seen) == 3:
+                break
+
+    await asyncio.wait_for(collect(), timeout=2.0)
+
+    assert seen == ['Idle'] * 3
+    assert not engine.status_callbacks  # Iterator unregisters itself
+    assert (await engine.next_status(timeout=1.0)).state == 'Idle'
+
+
+@pytest.mark.parametrize('module, name', [
+    ('motion.simplified_fluidnc_controller', 'SimplifiedFluidNCController'),
+    ('motion.enhanced_fluidnc_controller', 'EnhancedFluidNCController'),
+    ('motion.protocol_bridge', 'ProtocolBridgeController'),
+    ('motion.fixed_fluidnc_controller', 'FixedFluidNCController'),
+    ('motion.fallback_fluidnc_controller', 'FallbackFluidNCController'),
+    ('motion.consolidate_fluidnc_controller', 'ConsolidatedFluidNCController'),
+    ('motion.fluidnc_controller', 'FluidNCController'),
+])
+def test_legacy_controllers_wrap_engine(module, name):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        controller_class = getattr(importlib.import_module(module), name)
+    assert issubclass(controller_class, SimplifiedFluidNCControllerFixed)
+
+
+@pytest.mark.parametrize('module, name', [
+    ('motion.simplified_fluidnc_protocol_fixed', 'SimplifiedFluidNCProtocolFixed'),
+    ('motion.simplified_fluidnc_protocol', 'SimplifiedFluidNCProtocol'),
+    ('motion.fixed_fluidnc_protocol', 'FixedFluidNCProtocol'),
+])
+def test_legacy_protocols_are_engine(module, name):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        assert getattr(importlib.import_module(module), name) is FluidNCEngine
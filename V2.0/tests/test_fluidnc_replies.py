@@ -0,0 +1,147 @@
+"""
+Test FluidNC Reply Handling
+
+Scripts the controller side of a fake serial port line by line to check
+the engine's reader thread: ok/error replies resolve waiters in the order
+lines were sent, motion waits only count status reports that arrive after
+the command's ok, and a reset or controller banner releases every waiter.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import threading
+
+import pytest
+
+from motion.fluidnc_engine import FluidNCEngine
+
+IDLE = "<Idle|MPos:0.000,0.000,0.000,0.000|FS:0,0>"
+RUN = "<Run|MPos:5.000,0.000,0.000,0.000|FS:1000,0>"
+
+
+@pytest.fixture
+def port(fluidnc):
+    return fluidnc(replies=False)
+
+
+@pytest.fixture
+def engine(port):
+    engine = FluidNCEngine(command_timeout=2.0, auto_report=False)
+    engine.status_interval = 60.0  # Only scripted reports
+    engine.motion_timeout = 2.0
+    engine.serial_connection = port
+    engine.connected = True
+    engine._start_status_monitoring()
+    yield engine
+    engine.disconnect()
+
+
+def in_thread(target, *args):
+    """Run a blocking call; returns (finished event, result list)"""
+    finished, result = threading.Event(), []
+
+    def run():
+        result.append(target(*args))
+        finished.set()
+
+    threading.Thread(target=run, daemon=True).start()
+    return finished, result
+
+
+def push_status(engine, line):
+    """Push a report and wait until the reader has parsed it"""
+    with engine.state_condition:
+        sequence = engine.status_sequence
+        engine.serial_connection.push(line)
+        assert engine.state_condition.wait_for(lambda: engine.status_sequence == sequence + 1, 1.0)
+
+
+def test_replies_resolve_in_send_order(engine, port):
+    first = engine.send_line_nowait('G1 X1')
+    second = engine.send_line_nowait('G1 X2')
+    third = engine.send_line_nowait('$X')
+    assert port.lines == ['G1 X1', 'G1 X2', '$X']
+
+    port.push('ok')
+    push_status(engine, IDLE)
+    port.push('error:9')
+    port.push('ok')
+
+    assert first.wait(1.0) == 'ok'
+    assert second.wait(1.0) == 'error:9'
+    assert third.wait(1.0) == 'ok'
+    # Each reply records how many reports had been seen when it arrived
+    assert (first.status_sequence, second.status_sequence, third.status_sequence) == (0, 1, 1)
+
+    # A stray ok with nothing outstanding is dropped, not carried over
+    port.push('ok')
+    push_status(engine, IDLE)  # Lines are handled in order, so the ok is gone
+    fourth = engine.send_line_nowait('G90')
+    assert fourth.wait(0.2) is None
+    port.push('ok')
+    assert fourth.wait(1.0) == 'ok'
+
+
+def test_motion_wait_ignores_reports_before_ok(engine):
+    push_status(engine, IDLE)  # Arrived before the move was acknowledged
+    since = engine.status_sequence
+
+    finished, result = in_thread(engine.wait_for_idle, since)
+    assert not finished.wait(0.2)  # Stale Idle does not count
+
+    push_status(engine, RUN)
+    assert not finished.wait(0.1)
+    push_status(engine, IDLE)
+
+    assert finished.wait(1.0)
+    assert result == [True]
+
+
+def test_idle_without_run_needs_confirmations(engine):
+    engine.idle_confirmations = 2
+    finished, result = in_thread(engine.wait_for_idle, engine.status_sequence)
+
+    push_status(engine, IDLE)
+    assert not finished.wait(0.2)  # One Idle may predate the move starting
+    push_status(engine, IDLE)
+
+    assert finished.wait(1.0)
+    assert result == [True]
+
+
+def test_alarm_ends_motion_wait(engine):
+    finished, result = in_thread(engine.wait_for_idle, engine.status_sequence)
+    push_status(engine, "<Alarm|MPos:0.000,0.000,0.000,0.000|FS:0,0>")
+
+    assert finished.wait(1.0)
+    assert result == [False]
+
+
+def test_banner_fails_pending_waiters(engine, port):
+    finished, result = in_thread(engine.send_command, 'G1 X10 F1000')
+    queued = engine.send_line_nowait('G1 X20')
+    while len(port.lines) < 2:
+        assert not finished.wait(0.01)
+
+    port.push("Grbl 3.7 [FluidNC v3.7.8 (fake) '$' for help]")
+
+    assert finished.wait(1.0)  # Released at once, not after command_timeout
+    assert result == [(False, 'error:controller reset')]
+    assert queued.wait(0) == 'error:controller reset'
+    assert not engine.pending_responses
+
+    # Replies after the restart belong to new commands only
+    fresh = engine.send_line_nowait('$X')
+    port.push('ok')
+    assert fresh.wait(1.0) == 'ok'
+
+
+def test_soft_reset_fails_pending_waiters(engine, port):
+    pending = engine.send_line_nowait('G1 X10')
+
+    assert engine.send_immediate_command('reset')
+
+    assert port.resets == 1
+    assert pending.wait(0) == 'error:reset'
+    assert not engine.pending_responses
@@ -0,0 +1,169 @@
+"""
+Test FluidNC Simulator
+
+Drives the pty simulator with the real FluidNCEngine over pyserial, the
+same way the scanner talks to the board, with machine time sped up so
+moves and homing finish quickly.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import os
+import time
+
+import pytest
+
+from motion.fluidnc_engine import FluidNCEngine
+from motion.fluidnc_simulator import FluidNCSimulator, plan_move, axes_from_config, trapezoid_time
+from motion.fluidnc_streamer import CharacterCountingStreamer
+
+MOTION_CONFIG = {
+    'controller': {'streaming': {'rx_buffer_size': 128}},
+    'axes': {
+        'x_axis': {'min_limit': 0.0, 'max_limit': 200.0, 'home_position': 0.0, 'max_feedrate': 1000,
+                   'acceleration': 25.0, 'homing_required': True},
+        'y_axis': {'min_limit': 0.0, 'max_limit': 200.0, 'home_position': 200.0, 'max_feedrate': 1000,
+                   'acceleration': 25.0, 'homing_required': True},
+        'z_axis': {'min_limit': -180.0, 'max_limit': 180.0, 'max_feedrate': 800, 'continuous': True},
+        'c_axis': {'min_limit': -90.0, 'max_limit': 90.0, 'max_feedrate': 5000},
+    },
+    'homing': {'seek_rate': 500, 'feed_rate': 100, 'pulloff_distance': 5.0,
+               'sequence': [{'axis': 'y'}, {'axis': 'x'}]},
+    'safety': {'must_home': True},
+}
+
+
+def read_lines(fd, count, timeout=2.0):
+    """Read ``count`` lines straight from the simulator port"""
+    data = b''
+    deadline = time.time() + timeout
+    while data.count(b'\n') < count and time.time() < deadline:
+        try:
+            data += os.read(fd, 4096)
+        except BlockingIOError:
+            time.sleep(0.01)
+    return [line.strip().decode() for line in data.splitlines() if line.strip()]
+
+
+@pytest.fixture
+def simulator():
+    sim = FluidNCSimulator(MOTION_CONFIG, time_scale=20.0)
+    sim.start()
+    yield sim
+    sim.stop()
+
+
+@pytest.fixture
+def port(simulator):
+    fd = os.open(simulator.port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    yield fd
+    os.close(fd)
+
+
+@pytest.fixture
+def engine(simulator):
+    fluidnc = FluidNCEngine(port=simulator.port, command_timeout=5.0)
+    assert fluidnc.connect()
+    yield fluidnc
+    fluidnc.disconnect()
+
+
+def test_trapezoid_and_triangle_profiles():
+    # 100 mm at 1000 mm/min, 25 mm/s²: 0.67 s ramps + cruise
+    assert trapezoid_time(100.0, 1000.0, 25.0) == pytest.approx(100 / (1000 / 60) + (1000 / 60) / 25)
+    # 1 mm never reaches cruise speed
+    assert trapezoid_time(1.0, 1000.0, 25.0) == pytest.approx(2 * (1 / 25) ** 0.5)
+    assert trapezoid_time(0.0, 1000.0, 25.0) == 0.0
+
+
+def test_coordinated_move_limited_by_slowest_axis():
+    axes = axes_from_config(MOTION_CONFIG)
+    # Rapid on X alone runs at X's max rate; adding Z (800 deg/min) slows the path
+    x_only = plan_move((0, 0, 0, 0), (100, 0, 0, 0), None, axes)
+    with_z = plan_move((0, 0, 0, 0), (100, 0, 100, 0), None, axes)
+    assert x_only.duration == pytest.approx(trapezoid_time(100, 1000, 25))
+    assert with_z.duration > x_only.duration
+    assert with_z.speed <= 800 / 60 / (100 / with_z.length) + 1e-9
+
+
+def test_alarm_until_homed_and_homing_messages(simulator, port):
+    os.write(port, b'G1 X10 F1000\n$H\n')
+    lines = read_lines(port, 5)
+
+    assert lines[0] == 'error:9'
+    assert lines[1:] == ['[MSG:DBG: Homing Cycle Y]', '[MSG:DBG: Homing Cycle X]',
+                         '[MSG:DBG: Homing done]', 'ok']
+    assert simulator.homed
+    assert simulator.machine_position['y'] == 200.0
+
+
+def test_realtime_status_hold_and_reset(simulator, port):
+    os.write(port, b'$X\nG1 X100 F1000\n')
+    assert read_lines(port, 3) == ['[MSG:Caution: Unlocked]', 'ok', 'ok']
+
+    os.write(port, b'!')
+    time.sleep(0.05)
+    os.write(port, b'?')
+    held = read_lines(port, 1)[0]
+    assert held.startswith('<Hold:0|MPos:')
+
+    os.write(port, b'~?')
+    assert read_lines(port, 1)[0].startswith('<Run|')
+
+    os.write(port, b'\x18')
+    lines = read_lines(port, 3)
+    assert lines[0].startswith('Grbl 3.7 [FluidNC')
+    assert lines[1] == 'ALARM:3'  # Motion aborted: position no longer trusted
+    assert simulator.state == 'Alarm'
+
+
+def test_soft_limit_alarm(simulator, port):
+    os.write(port, b'$X\nG0 X250\n')
+    assert read_lines(port, 4)[2:] == ['ALARM:2', 'ok']
+    assert simulator.state == 'Alarm'
+
+
+def test_rx_buffer_back_pressure(simulator, port):
+    simulator.planner_blocks = 2
+    os.write(port, b'$X\n' + b''.join(b'G1 X%d F1000\n' % (i * 40) for i in range(1, 6)))
+    time.sleep(0.05)
+
+    # Only as many moves as the planner holds have been acknowledged
+    assert read_lines(port, 4, timeout=0.1)[1:] == ['ok', 'ok', 'ok']
+    assert simulator.planner_depth == 2
+
+
+def test_engine_move_timing(simulator, engine):
+    assert engine.auto_reporting
+    engine.send_command('$X')
+
+    expected = simulator.move_time({'x': 0.0}, {'x': 50.0}, 1000) / simulator.time_scale
+    start = time.time()
+    success, response = engine.send_command_with_motion_wait('G1 X50 F1000')
+    elapsed = time.time() - start
+
+    assert success and response == 'ok'
+    assert engine.current_status.state == 'Idle'
+    assert engine.current_status.machine_position['x'] == pytest.approx(50.0)
+    assert expected <= elapsed < expected + 0.5
+
+
+def test_engine_homing(simulator, engine):
+    assert engine.send_homing_command()[0]
+    success, _ = engine._monitor_homing_completion()
+
+    assert success
+    assert engine.current_status.machine_position['y'] == pytest.approx(200.0)
+
+
+def test_streamer_against_planner(simulator, engine):
+    engine.send_command('$X')
+    lines = [f"G1 X{i} Y{i} F1000" for i in range(1, 41)]
+
+    result = CharacterCountingStreamer(engine, rx_buffer_size=simulator.rx_buffer_size).stream(lines)
+
+    assert result.success and result.lines_acknowledged == 40
+    assert simulator.stats['rx_overflows'] == 0
+    assert simulator.stats['max_planner_depth'] > 1
+    assert simulator.machine_position['x'] == pytest.approx(40.0)
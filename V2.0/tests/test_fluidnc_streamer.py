@@ -0,0 +1,104 @@
+"""
+Test Character-Counting Streamer
+
+Runs the streamer against a fake protocol that acknowledges lines
+from a background thread, like the real reader thread does.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import threading
+import time
+from collections import deque
+
+import pytest
+
+from motion.fluidnc_streamer import CharacterCountingStreamer
+from motion.fluidnc_engine import PendingResponse
+
+
+class FakeProtocol:
+    """Acknowledges lines in order after a short planner delay"""
+
+    def __init__(self, rx_buffer_size=64, error_on=None):
+        self.command_lock = threading.RLock()
+        self.command_timeout = 2.0
+        self.rx_buffer_size = rx_buffer_size
+        self.error_on = error_on
+        self.sent = []
+        self.buffered = 0
+        self.max_buffered = 0
+        self.queue = deque()
+        self.lock = threading.Lock()
+        self.idle_waits = 0
+
+    def is_connected(self):
+        return True
+
+    def send_line_nowait(self, command, callback=None):
+        pending = PendingResponse(command=command, callback=callback)
+        with self.lock:
+            self.sent.append(command)
+            self.buffered += len(command) + 1
+            self.max_buffered = max(self.max_buffered, self.buffered)
+            self.queue.append(pending)
+        threading.Timer(0.005, self._ack).start()
+        return pending
+
+    def _ack(self):
+        with self.lock:
+            pending = self.queue.popleft()
+            self.buffered -= len(pending.command) + 1
+        response = "error:22" if pending.command == self.error_on else "ok"
+        pending.resolve(response, 0)
+
+    def wait_for_idle(self, since_sequence=0):
+        self.idle_waits += 1
+        return True
+
+
+def test_stream_respects_rx_buffer():
+    protocol = FakeProtocol(rx_buffer_size=64)
+    streamer = CharacterCountingStreamer(protocol, rx_buffer_size=64)
+    lines = [f"G1 X{i}.000 Y{i}.000" for i in range(20)]
+    acknowledged = []
+
+    result = streamer.stream(lines, on_line_complete=lambda i, line, resp: acknowledged.append(i))
+
+    assert result.success
+    assert result.lines_sent == 20
+    assert result.lines_acknowledged == 20
+    assert protocol.sent == lines
+    assert protocol.max_buffered <= 64
+    assert sorted(acknowledged) == list(range(20))
+    assert streamer.get_stats()['max_lines_in_flight'] > 1
+    assert protocol.idle_waits == 1
+
+
+def test_stream_stops_on_error():
+    lines = [f"G1 X{i}" for i in range(10)]
+    protocol = FakeProtocol(rx_buffer_size=16, error_on="G1 X3")
+    streamer = CharacterCountingStreamer(protocol, rx_buffer_size=16)
+
+    result = streamer.stream(lines)
+
+    assert not result.success
+    assert result.errors[0][:2] == (3, "G1 X3")
+    assert len(protocol.sent) < len(lines)
+    assert protocol.idle_waits == 0
+
+
+def test_line_larger_than_buffer_rejected():
+    protocol = FakeProtocol()
+    streamer = CharacterCountingStreamer(protocol, rx_buffer_size=8)
+
+    result = streamer.stream(["G1 X100.000 Y100.000"])
+
+    assert not result.success
+    assert protocol.sent == []
+
+
+def test_invalid_buffer_size():
+    with pytest.raises(ValueError):
+        CharacterCountingStreamer(FakeProtocol(), rx_buffer_size=0)
@@ -0,0 +1,103 @@
+"""
+Test Frame Broadcaster
+
+Checks that several MJPEG clients share one capture/encode producer and
+that a slow client drops frames instead of stalling the others.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from web.frame_broadcaster import FrameBroadcaster
+
+
+class CountingSource:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return np.full((48, 64, 3), self.calls % 255, dtype=np.uint8)
+
+
+def consume(broadcaster, count, delay=0.0, received=None):
+    stream = broadcaster.subscribe()
+    for _ in range(count):
+        part = next(stream)
+        assert part.startswith(b'--frame\r\n')
+        if received is not None:
+            received.append(time.time())
+        time.sleep(delay)
+    stream.close()
+
+
+def test_clients_share_one_producer():
+    source = CountingSource()
+    broadcaster = FrameBroadcaster('camera_1', source, fps=50, idle_timeout=0.2)
+
+    clients = [threading.Thread(target=consume, args=(broadcaster, 10)) for _ in range(3)]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join(timeout=5)
+
+    # Three clients x 10 frames, but each frame captured and encoded once
+    assert source.calls < 20
+    assert broadcaster.stats['frames_encoded'] == source.calls
+    assert broadcaster.subscriber_count == 0
+    broadcaster.stop()
+
+
+def test_slow_client_does_not_stall_fast_client():
+    broadcaster = FrameBroadcaster('camera_1', CountingSource(), fps=50, idle_timeout=0.2)
+    fast_times = []
+
+    slow = threading.Thread(target=consume, args=(broadcaster, 3, 0.3))
+    fast = threading.Thread(target=consume, args=(broadcaster, 20, 0.0, fast_times))
+    slow.start()
+    fast.start()
+    fast.join(timeout=5)
+
+    assert len(fast_times) == 20
+    assert fast_times[-1] - fast_times[0] < 0.9  # Not paced by the slow client
+    slow.join(timeout=5)
+    assert broadcaster.stats['frames_dropped'] > 0
+    broadcaster.stop()
+
+
+def test_fallback_frame_when_camera_unavailable():
+    broadcaster = FrameBroadcaster('camera_2', lambda: None,
+                                   fallback_source=lambda: np.zeros((36, 64, 3), dtype=np.uint8),
+                                   fps=50)
+    consume(broadcaster, 2)
+
+    assert broadcaster.stats['fallback_frames'] >= 2
+    broadcaster.stop()
+
+
+def test_producer_stops_when_idle():
+    broadcaster = FrameBroadcaster('camera_1', CountingSource(), fps=50, idle_timeout=0.1)
+    consume(broadcaster, 1)
+
+    deadline = time.time() + 2
+    while broadcaster.is_running() and time.time() < deadline:
+        time.sleep(0.02)
+    assert not broadcaster.is_running()
+
+
+def test_preencoded_jpeg_served_without_encoding():
+    source = CountingSource()
+    broadcaster = FrameBroadcaster('camera_1', source, jpeg_source=lambda: b'\xff\xd8jpeg\xff\xd9', fps=50)
+    stream = broadcaster.subscribe()
+    part = next(stream)
+    stream.close()
+
+    assert part.endswith(b'\xff\xd8jpeg\xff\xd9\r\n')
+    assert source.calls == 0
+    assert broadcaster.stats['frames_encoded'] == 0
+    broadcaster.stop()
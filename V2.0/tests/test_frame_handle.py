@@ -0,0 +1,106 @@
+"""
+Test Frame Handle
+
+Checks that frames are exposed read-only straight from the capture request,
+that buffers go back to the camera on release (and only once), and that
+the scan adapter falls back to plain arrays on cameras without
+capture_request.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from camera.frame_handle import FrameHandle, subsampled_brightness
+from scanning.scan_orchestrator import CameraManagerAdapter
+
+
+class FakeMappedArray:
+    def __init__(self, request, stream):
+        self.array = request.buffers[stream]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeRequest:
+    def __init__(self, main, lores=None):
+        self.buffers = {'main': main, 'lores': lores}
+        self.releases = 0
+
+    def get_metadata(self):
+        return {'ExposureTime': 1000}
+
+    def release(self):
+        self.releases += 1
+
+
+@pytest.fixture
+def fake_picamera2(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'picamera2', types.SimpleNamespace(MappedArray=FakeMappedArray))
+
+
+def test_handle_views_request_buffer_read_only(fake_picamera2):
+    buffer = np.full((16, 16, 3), 7, dtype=np.uint8)
+    request = FakeRequest(buffer, lores=np.full((24, 16), 40, dtype=np.uint8))
+    handle = FrameHandle(request)
+
+    assert np.shares_memory(handle.array, buffer)
+    assert not handle.array.flags.writeable
+    assert handle.metadata['ExposureTime'] == 1000
+    assert handle.brightness() == 40.0
+
+    handle.release()
+    handle.release()
+    assert request.releases == 1
+    assert not handle.held
+    with pytest.raises(ValueError):
+        handle.array
+
+
+def test_detach_copies_then_releases(fake_picamera2):
+    buffer = np.full((16, 16, 3), 9, dtype=np.uint8)
+    request = FakeRequest(buffer)
+    with FrameHandle(request) as handle:
+        detached = handle.detach()
+        assert request.releases == 1
+
+    buffer[:] = 0  # Camera reuses the buffer
+    assert detached[0, 0, 0] == 9
+    assert request.releases == 1
+
+    owned = np.ones((4, 4), dtype=np.uint8)
+    assert FrameHandle.from_array(owned).detach() is owned
+
+
+def test_subsampled_brightness():
+    image = np.zeros((64, 64), dtype=np.uint8)
+    image[::8, ::8] = 80
+    assert subsampled_brightness(image) == 80.0
+
+
+@pytest.mark.asyncio
+async def test_adapter_releases_handles_after_save(tmp_path, camera_controller, point_metadata):
+    adapter = CameraManagerAdapter(camera_controller, None)
+    await adapter.initialize()
+    assert await adapter.begin_scan_session()
+
+    frames = await adapter.capture_frames(tmp_path, "point_0", point_metadata(100.0, 0.0))
+    handle = frames[0]['handle']
+    assert not frames[0]['image'].flags.writeable
+
+    result = adapter.save_frame(frames[0])
+    assert result['success']
+    assert result['resolution'] == (8, 8, 3)
+    with pytest.raises(ValueError):
+        handle.array
+
+    await adapter.end_scan_session()
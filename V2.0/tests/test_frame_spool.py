@@ -0,0 +1,91 @@
+"""
+Test Frame Spool
+
+Checks raw frame spooling and the deferred batch encoder: frames round-trip
+through the memory-mapped spool, a spool survives reopening, and the spool
+is removed only when every frame encoded.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from scanning.frame_spool import FrameSpool, SpoolEncoder
+
+
+def make_frame(tmp_path, index):
+    image = np.full((48, 64, 3), index, dtype=np.uint8)
+    return {
+        'camera_id': 'camera_1',
+        'image': image,
+        'output_path': tmp_path / 'out' / f"point_{index:03d}.npy",
+        'metadata': {'point_index': index, 'position': {'x': float(index)}}
+    }
+
+
+def save_npy(frame):
+    """Stand-in for the JPEG encoder"""
+    frame['output_path'].parent.mkdir(parents=True, exist_ok=True)
+    np.save(frame['output_path'], np.asarray(frame['image']))
+    return {'camera_id': frame['camera_id'], 'success': True, 'thread': threading.current_thread().name}
+
+
+def test_spool_round_trip_and_reopen(tmp_path):
+    spool = FrameSpool(tmp_path / 'spool')
+    for index in range(3):
+        assert spool.write_frame(make_frame(tmp_path, index))['success']
+    spool.close()
+
+    reopened = FrameSpool.open(tmp_path / 'spool')
+    reopened.write_frame(make_frame(tmp_path, 3))
+    reopened.close()
+
+    frames = reopened.frames()
+    assert [frame['metadata']['point_index'] for frame in frames] == [0, 1, 2, 3]
+    assert all(int(frame['image'][0, 0, 0]) == index for index, frame in enumerate(frames))
+    assert frames[2]['image'].shape == (48, 64, 3)
+
+
+def test_torn_index_line_is_ignored(tmp_path):
+    spool = FrameSpool(tmp_path / 'spool')
+    spool.write_frame(make_frame(tmp_path, 0))
+    spool.close()
+    with open(tmp_path / 'spool' / 'index.jsonl', 'a') as f:
+        f.write('{"camera_id": "camera_1", "offs')
+
+    assert len(FrameSpool.open(tmp_path / 'spool').entries()) == 1
+
+
+@pytest.mark.asyncio
+async def test_encoder_writes_outputs_and_removes_spool(tmp_path):
+    spool = FrameSpool(tmp_path / 'spool')
+    for index in range(6):
+        spool.write_frame(make_frame(tmp_path, index))
+
+    results = []
+    encoder = SpoolEncoder(save_npy, workers=3, on_result=results.append)
+    await encoder.encode(spool)
+
+    assert len(results) == 6 and all(r['success'] for r in results)
+    assert np.load(tmp_path / 'out' / 'point_004.npy')[0, 0, 0] == 4
+    assert not (tmp_path / 'spool').exists()
+
+
+@pytest.mark.asyncio
+async def test_spool_kept_when_encoding_fails(tmp_path):
+    spool = FrameSpool(tmp_path / 'spool')
+    spool.write_frame(make_frame(tmp_path, 0))
+
+    def failing_save(frame):
+        raise OSError("disk full")
+
+    encoder = SpoolEncoder(failing_save, workers=1)
+    results = await encoder.encode(spool)
+
+    assert results[0]['success'] is False
+    assert encoder.stats['frames_failed'] == 1
+    assert (tmp_path / 'spool' / 'frames.raw').exists()
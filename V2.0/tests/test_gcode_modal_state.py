@@ -0,0 +1,90 @@
+"""
+Test G-code Modal State
+
+Checks the move lines the controller writes to FluidNC: G90 and F are only
+sent when they change, and are sent again after homing, a reset, raw
+G-code or a reconnect leave the controller's modal state unknown.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import pytest
+
+from motion.base import MotionStatus, Position4D
+from motion.simplified_fluidnc_controller_fixed import SimplifiedFluidNCControllerFixed
+
+
+@pytest.fixture
+def port(fluidnc):
+    return fluidnc(move_time=0.02)
+
+
+@pytest.fixture
+def controller(port):
+    controller = SimplifiedFluidNCControllerFixed({'port': 'fake'})
+    assert controller.protocol.attach(port)
+    controller.motion_status = MotionStatus.IDLE
+    yield controller
+    controller.protocol.disconnect()
+
+
+def move_lines(port):
+    return [line for line in port.lines if ' X' in line]
+
+
+async def move_twice(controller):
+    assert await controller.move_to_position(Position4D(10.0, 20.0, 0.0, 0.0), feedrate=500)
+    assert await controller.move_to_position(Position4D(15.0, 20.0, 0.0, 0.0), feedrate=500)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_modal_words_not_resent(controller, port):
+    await move_twice(controller)
+    assert await controller.move_to_position(Position4D(15.0, 25.0, 0.0, 0.0), feedrate=800)
+
+    assert move_lines(port) == [
+        'G90 G1 X10.000 Y20.000 Z0.000 A0.000 F500',
+        'G1 X15.000 Y20.000 Z0.000 A0.000',
+        'G1 X15.000 Y25.000 Z0.000 A0.000 F800',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_modal_words_resent_after_homing(controller, port):
+    await move_twice(controller)
+    assert await controller.home_axes()
+    await move_twice(controller)
+
+    lines = move_lines(port)
+    assert lines[2] == 'G90 G1 X10.000 Y20.000 Z0.000 A0.000 F500'
+    assert lines[3] == 'G1 X15.000 Y20.000 Z0.000 A0.000'
+
+
+@pytest.mark.asyncio
+async def test_modal_words_resent_after_reset_and_raw_gcode(controller, port):
+    await move_twice(controller)
+    assert await controller.reset_controller()
+    await move_twice(controller)
+    assert await controller.execute_gcode('G91')
+    await move_twice(controller)
+
+    lines = move_lines(port)
+    assert lines[2] == lines[4] == 'G90 G1 X10.000 Y20.000 Z0.000 A0.000 F500'
+    assert lines[3] == lines[5] == 'G1 X15.000 Y20.000 Z0.000 A0.000'
+
+
+@pytest.mark.asyncio
+async def test_modal_words_resent_after_reconnect(controller, port, fluidnc, monkeypatch):
+    await move_twice(controller)
+    assert await controller.disconnect()
+
+    new_port = fluidnc(move_time=0.02)
+    monkeypatch.setattr(controller.protocol, 'connect', lambda: controller.protocol.attach(new_port))
+    assert await controller.connect()
+    await move_twice(controller)
+
+    assert move_lines(new_port) == [
+        'G90 G1 X10.000 Y20.000 Z0.000 A0.000 F500',
+        'G1 X15.000 Y20.000 Z0.000 A0.000',
+    ]
@@ -0,0 +1,72 @@
+"""
+Test Storage Integrity
+
+Checks streaming checksums recorded at write time, skipping re-hashing on
+unchanged reads, detection of modified files and the background scrubber.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import hashlib
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from storage.integrity import IntegrityScrubber, write_bytes_hashed
+
+
+def test_streaming_hash_matches_full_hash(tmp_path):
+    data = os.urandom(3 * 1024 * 1024 + 17)
+    result = write_bytes_hashed(tmp_path / 'frame.jpg', data, chunk_size=64 * 1024)
+
+    assert result.checksum == hashlib.sha256(data).hexdigest()
+    assert result.size == len(data)
+    assert (tmp_path / 'frame.jpg').read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_retrieve_skips_rehash_until_file_changes(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    await manager.create_session({'name': 'integrity'})
+    await manager.store_file(b'original image', storage_metadata('img'))
+
+    record = await manager._find_file_record('img')
+    assert record['checksum'] == hashlib.sha256(b'original image').hexdigest()
+    assert record['verified_size'] == len(b'original image')
+
+    with patch('storage.session_manager.hash_bytes') as rehash:
+        data, _ = await manager.retrieve_file('img')
+    assert data == b'original image'
+    rehash.assert_not_called()
+
+    # Same size, new content and mtime: detected on the next read
+    path = tmp_path / 'sessions' / record['session_id'] / 'images' / 'img.jpg'
+    path.write_bytes(b'tampered image')
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10_000_000))
+
+    assert await manager.retrieve_file('img') is None
+    assert not await manager.verify_integrity('img')
+    assert (await manager._find_file_record('img'))['integrity_status'] == 'corrupt'
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_scrubber_reports_corrupt_files(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    session_id = await manager.create_session({'name': 'scrub'})
+    for name in ('a', 'b', 'c'):
+        await manager.store_file(name.encode() * 1000, storage_metadata(name))
+    await manager.finalize_session(session_id)
+
+    (tmp_path / 'sessions' / session_id / 'images' / 'b.jpg').write_bytes(b'x' * 1000)
+
+    scrubber = IntegrityScrubber(manager, bytes_per_second=0)
+    stats = await scrubber.scrub_pass()
+
+    assert stats.files_verified == 3
+    assert stats.corrupt_files == ['b']
+    assert await manager.verify_integrity('a')
+    await manager.shutdown()
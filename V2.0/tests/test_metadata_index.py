@@ -0,0 +1,141 @@
+"""
+Test Metadata Index
+
+Checks the SQLite metadata index behind SessionManager.search_files and
+get_metadata: indexed criteria, position ranges, tags, rebuilding the
+index from session manifests, and keeping it in step when old sessions
+are cleaned up or archived.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import pytest
+
+from storage.base import DataType
+from storage.metadata_index import MetadataIndex
+
+
+def placement(x, camera):
+    return {'position_data': {'x': x, 'y': 50.0, 'z': 0.0, 'c': 0.0}, 'camera_settings': {'camera_id': camera}}
+
+
+async def store_two_sessions(manager, storage_metadata):
+    first = await manager.create_session({'name': 'first'})
+    for index in range(4):
+        tags = ['calibration'] if index == 0 else []
+        await manager.store_file(b'img', storage_metadata(f"a{index}", tags=tags, **placement(10.0 * index, index % 2)))
+    await manager.finalize_session(first)
+
+    second = await manager.create_session({'name': 'second'})
+    await manager.store_file(b'img', storage_metadata('b0', **placement(15.0, 1)))
+    await manager.store_file(b'raw', storage_metadata('b1', DataType.RAW_IMAGE, **placement(25.0, 0)))
+    await manager.finalize_session(second)
+    return first, second
+
+
+@pytest.mark.asyncio
+async def test_search_files_uses_index(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    first, second = await store_two_sessions(manager, storage_metadata)
+
+    assert await manager.search_files({'session_id': second}) == ['b0', 'b1']
+    assert await manager.search_files({'session_id': first, 'camera_id': 1}) == ['a1', 'a3']
+    assert await manager.search_files({'data_type': DataType.RAW_IMAGE}) == ['b1']
+    assert await manager.search_files({'position': {'x': (10.0, 20.0)}}) == ['a1', 'a2', 'b0']
+    assert await manager.search_files({'tags': ['calibration']}) == ['a0']
+    assert await manager.search_files({'filename': 'a2.jpg'}) == ['a2']
+
+    metadata = await manager.get_metadata('b0')
+    assert metadata.position_data['x'] == 15.0
+    assert metadata.scan_session_id == second
+
+    assert await manager.update_metadata('a2', {'tags': ['reviewed']})
+    assert await manager.search_files({'tags': 'reviewed'}) == ['a2']
+    assert await manager.delete_file('a3')
+    assert await manager.search_files({'camera_id': 1}) == ['a1', 'b0']
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_index_rebuilt_from_manifests(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    _, second = await store_two_sessions(manager, storage_metadata)
+    await manager.shutdown()
+
+    for path in (tmp_path / 'metadata').glob('file_index.sqlite3*'):
+        path.unlink()
+
+    restarted = await make_manager()
+    assert await restarted.search_files({'session_id': second}) == ['b0', 'b1']
+    assert len(await restarted.search_files({})) == 6
+    await restarted.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_lookups_use_index_and_bounded_cache(make_manager, storage_metadata):
+    manager = await make_manager(file_cache_size=2)
+    first, _ = await store_two_sessions(manager, storage_metadata)
+    assert list(manager._file_cache) == ['b0', 'b1']
+
+    assert (await manager._find_file_record('a0'))['session_id'] == first
+    assert list(manager._file_cache) == ['b1', 'a0']
+
+    # A miss in the index is final - no manifests are loaded to look further
+    manager._manifests.clear()
+    assert await manager._find_file_record('missing') is None
+    assert not manager._manifests
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_removes_index_rows(make_manager, storage_metadata):
+    manager = await make_manager()
+    await store_two_sessions(manager, storage_metadata)
+    await manager.get_metadata('a0')
+    active = await manager.create_session({'name': 'active'})
+    await manager.store_file(b'img', storage_metadata('c0'))
+
+    assert await manager.cleanup_old_sessions(days_old=0)
+
+    assert await manager.search_files({}) == ['c0']
+    assert await manager.get_metadata('a0') is None
+    assert list(manager._manifests) == [active]
+    assert list(manager._file_cache) == ['c0']
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_archive_rewrites_file_paths(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    first, _ = await store_two_sessions(manager, storage_metadata)
+    await manager.get_metadata('a0')
+
+    assert await manager.archive_old_sessions(days_old=0) == 2
+    assert not manager._manifests and not manager._file_cache
+
+    archived = tmp_path / 'archive' / first / 'images'
+    assert (await manager._find_file_record('a0'))['file_path'] == str(archived / 'a0.jpg')
+    assert (await manager.retrieve_file('a0'))[0] == b'img'
+    # Updates keep the archived path and go to the manifest's new location
+    assert await manager.update_metadata('a1', {'tags': ['reviewed']})
+    assert (await manager._find_file_record('a1'))['file_path'] == str(archived / 'a1.jpg')
+    assert manager._manifests[first].path.parent.parent == tmp_path / 'archive' / first
+    await manager.shutdown()
+
+    for path in (tmp_path / 'metadata').glob('file_index.sqlite3*'):
+        path.unlink()
+    restarted = await make_manager()
+    assert await restarted.search_files({'tags': 'reviewed'}) == ['a1']
+    assert (await restarted.retrieve_file('b0'))[0] == b'img'
+    await restarted.shutdown()
+
+
+def test_index_range_with_open_end(tmp_path):
+    index = MetadataIndex(tmp_path / 'index.sqlite3').open()
+    index.upsert_many({'file_id': f"f{i}", 'session_id': 's', 'data_type': 'scan_image',
+                       'creation_time': float(i)} for i in range(10))
+
+    assert index.search({'creation_time': (7.0, None)}) == ['f7', 'f8', 'f9']
+    assert index.search({'session_id': 's'}, limit=2) == ['f0', 'f1']
+    index.close()
@@ -0,0 +1,125 @@
+"""
+Test Motion Time Estimation
+
+Checks the vectorized estimator against the single-move trapezoid formula
+and the FluidNC simulator's planner, and that settings read with $$
+replace the configured limits.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import math
+import time
+
+import numpy as np
+import pytest
+
+from core.types import Position4D
+from motion.fluidnc_engine import FluidNCEngine
+from motion.fluidnc_simulator import FluidNCSimulator, axes_from_config, plan_move
+from motion.motion_time import MotionTimeEstimator, trapezoid_time
+from scanning.scan_patterns import CylindricalPatternParameters, CylindricalScanPattern
+
+MOTION_CONFIG = {
+    'axes': {
+        'x_axis': {'max_feedrate': 1000, 'acceleration': 25.0, 'min_limit': 0.0, 'max_limit': 200.0},
+        'y_axis': {'max_feedrate': 1000, 'acceleration': 25.0, 'min_limit': 0.0, 'max_limit': 200.0},
+        'z_axis': {'max_feedrate': 800, 'acceleration': 50.0, 'continuous': True},
+        'c_axis': {'max_feedrate': 5000, 'acceleration': 100.0, 'min_limit': -90.0, 'max_limit': 90.0},
+    },
+    'feedrates': {'scanning_mode': {'x_axis': 850.0, 'y_axis': 850.0, 'z_axis': 650.0, 'c_axis': 4000.0}},
+}
+
+
+def random_points(count, seed=1):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 200, count), rng.uniform(0, 200, count),
+        rng.uniform(-180, 180, count), rng.uniform(-90, 90, count)
+    ])
+
+
+def test_single_axis_profiles():
+    estimator = MotionTimeEstimator.from_config(MOTION_CONFIG, mode=None)
+
+    # Long move reaches cruise speed, short move is triangular
+    assert estimator.move_time(Position4D(0, 0, 0, 0), Position4D(100, 0, 0, 0)) == \
+        pytest.approx(trapezoid_time(100, 1000, 25))
+    assert estimator.move_time(Position4D(0, 0, 0, 0), Position4D(0, 1, 0, 0)) == \
+        pytest.approx(2 * math.sqrt(1 / 25))
+    assert estimator.move_time(Position4D(5, 5, 5, 5), Position4D(5, 5, 5, 5)) == 0.0
+
+
+def test_coordinated_moves_match_simulator_planner():
+    estimator = MotionTimeEstimator.from_config(MOTION_CONFIG, mode=None)
+    axes = axes_from_config(MOTION_CONFIG)
+    points = random_points(200)
+
+    times = estimator.move_times(points)
+    expected = [plan_move(tuple(a), tuple(b), None, axes).duration for a, b in zip(points[:-1], points[1:])]
+
+    np.testing.assert_allclose(times, expected, rtol=1e-9)
+    # The limiting axis sets the pace: never faster than any single axis alone
+    for (a, b), t in zip(zip(points[:-1], points[1:]), times):
+        slowest = max(trapezoid_time(abs(d), rate, accel) for d, rate, accel in
+                      zip(b - a, estimator.max_rates, estimator.accelerations))
+        assert t >= slowest - 1e-9
+
+
+def test_per_axis_feed_uses_slowest_moving_axis():
+    estimator = MotionTimeEstimator.from_config(MOTION_CONFIG)
+    # X only: scanning feed 850; X and Z: the Z feed (650) applies to the whole move
+    x_only = estimator.move_time(Position4D(0, 0, 0, 0), Position4D(100, 0, 0, 0))
+    assert x_only == pytest.approx(trapezoid_time(100, 850, 25))
+    assert estimator.move_time(Position4D(0, 0, 0, 0), Position4D(100, 0, 10, 0)) > x_only
+    assert estimator.move_time(Position4D(0, 0, 0, 0), Position4D(100, 0, 0, 0), feed_rate=500) == \
+        pytest.approx(trapezoid_time(100, 500, 25))
+
+
+def test_large_pattern_is_fast():
+    estimator = MotionTimeEstimator.from_config(MOTION_CONFIG)
+    points = random_points(10000)
+
+    start = time.perf_counter()
+    total = estimator.path_time(points, start=Position4D(0, 200, 0, 0))
+    elapsed = time.perf_counter() - start
+
+    assert total > 0
+    assert elapsed < 0.5
+
+
+def test_settings_override_config():
+    fallback = MotionTimeEstimator.from_config(MOTION_CONFIG)
+    estimator = MotionTimeEstimator.from_settings({'$110': '2000.000', 120: 50.0, '$999': 'x'}, fallback)
+
+    assert estimator.max_rates.tolist() == [2000.0, 1000.0, 800.0, 5000.0]
+    assert estimator.accelerations.tolist() == [50.0, 25.0, 50.0, 100.0]
+    assert estimator.feed_rates is fallback.feed_rates
+
+
+def test_query_settings_from_controller():
+    with FluidNCSimulator(MOTION_CONFIG, must_home=False) as simulator:
+        engine = FluidNCEngine(port=simulator.port, command_timeout=5.0)
+        assert engine.connect()
+        try:
+            estimator = MotionTimeEstimator.from_controller(engine)
+        finally:
+            engine.disconnect()
+
+    assert engine.settings[112] == 800.0
+    assert estimator.accelerations.tolist() == [25.0, 25.0, 50.0, 100.0]
+
+
+def test_pattern_duration_uses_motion_time():
+    parameters = CylindricalPatternParameters(x_start=10.0, x_end=50.0, y_start=20.0, y_end=80.0,
+                                              x_step=20.0, y_step=30.0, z_rotations=[0.0, 90.0, 180.0],
+                                              c_angles=[0.0])
+    pattern = CylindricalScanPattern('test', parameters)
+    pattern.motion_time = MotionTimeEstimator.from_config(MOTION_CONFIG)
+    points = pattern.get_points()
+
+    motion = pattern.motion_time.path_time(points)
+    assert pattern.estimate_motion_time() == pytest.approx(motion)
+    assert pattern.estimate_duration() == pytest.approx(
+        motion + sum(p.dwell_time + 0.5 * p.capture_count for p in points))
@@ -0,0 +1,43 @@
+"""
+Test Scan Orchestrator Moves
+
+Checks the coordinated move the orchestrator issues for a scan point
+against the mock motion controller, including points that leave Z or C
+unspecified so those axes hold their current position.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from scanning.scan_orchestrator import ScanOrchestrator
+
+
+@pytest.fixture
+def orchestrator():
+    config_manager = Mock()
+    config_manager.get.side_effect = lambda key, default=None: key == 'system.simulation_mode' or default
+    return ScanOrchestrator(config_manager)
+
+
+def scan_point(x, y, z, c):
+    return SimpleNamespace(position=SimpleNamespace(x=x, y=y, z=z, c=c))
+
+
+@pytest.mark.asyncio
+async def test_move_coordinated_sends_all_axes(orchestrator):
+    await orchestrator._move_coordinated(scan_point(10.0, 20.0, 90.0, 15.0))
+
+    assert orchestrator.motion_controller._position == {'x': 10.0, 'y': 20.0, 'z': 90.0, 'rotation': 15.0}
+
+
+@pytest.mark.asyncio
+async def test_move_coordinated_holds_unspecified_axes(orchestrator):
+    await orchestrator._move_coordinated(scan_point(10.0, 20.0, 90.0, 15.0))
+    await orchestrator._move_coordinated(scan_point(30.0, 40.0, None, None))
+
+    assert orchestrator.motion_controller._position == {'x': 30.0, 'y': 40.0, 'z': 90.0, 'rotation': 15.0}
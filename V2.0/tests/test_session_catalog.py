@@ -0,0 +1,71 @@
+"""
+Test Session Catalog
+
+Checks the incremental session catalog: one row per session change,
+lazy loading after a restart, paged listing and the one-time import of a
+legacy sessions_index.json.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+
+import pytest
+
+from storage.base import ScanSession
+from storage.session_catalog import SessionCatalog
+
+
+@pytest.mark.asyncio
+async def test_sessions_load_lazily_after_restart(tmp_path, make_manager):
+    manager = await make_manager()
+    session_ids = []
+    for index in range(5):
+        session_id = await manager.create_session({'name': f"scan_{index}"})
+        await manager.finalize_session(session_id)
+        session_ids.append(session_id)
+    await manager.shutdown()
+
+    restarted = await make_manager()
+    assert restarted.sessions_index == {}
+
+    page = await restarted.list_sessions(limit=2)
+    assert [s.scan_name for s in page] == ['scan_4', 'scan_3']
+    page = await restarted.list_sessions(limit=2, offset=2)
+    assert [s.scan_name for s in page] == ['scan_2', 'scan_1']
+
+    session = await restarted.get_session(session_ids[0])
+    assert session.status == 'completed'
+    assert list(restarted.sessions_index) == [session_ids[0]]
+    await restarted.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_index_imported(tmp_path, make_manager):
+    legacy = {
+        'old-1': {'session_id': 'old-1', 'start_time': 100.0, 'scan_name': 'legacy',
+                  'status': 'completed', 'scan_parameters': {'pattern': 'grid'}}
+    }
+    (tmp_path / 'metadata').mkdir(parents=True)
+    (tmp_path / 'metadata' / 'sessions_index.json').write_text(json.dumps(legacy))
+
+    manager = await make_manager()
+    session = await manager.get_session('old-1')
+
+    assert session.scan_parameters == {'pattern': 'grid'}
+    assert not (tmp_path / 'metadata' / 'sessions_index.json').exists()
+    await manager.shutdown()
+
+
+def test_catalog_filters_by_status_and_age(tmp_path):
+    catalog = SessionCatalog(tmp_path / 'sessions.sqlite3').open()
+    catalog.put_many(ScanSession(session_id=f"s{i}", start_time=float(i),
+                                 status='completed' if i % 2 else 'active') for i in range(10))
+    catalog.put(ScanSession(session_id='s3', start_time=3.0, status='archived'))
+
+    old_completed = catalog.list(limit=-1, status='completed', started_before=6.0)
+    assert [s.session_id for s in old_completed] == ['s5', 's1']
+    assert catalog.count() == 10
+    assert catalog.delete('s0') and catalog.get('s0') is None
+    catalog.close()
@@ -0,0 +1,64 @@
+"""
+Test SessionManager I/O Executor
+
+Checks that session storage writes run on the storage executor: several
+images can be stored concurrently and the event loop keeps running while
+they are written.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from storage.io_executor import StorageIOExecutor
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_off_loop_thread():
+    io = StorageIOExecutor(max_workers=2)
+    thread_name = await io.run(lambda: threading.current_thread().name)
+    io.shutdown()
+
+    assert thread_name.startswith("storage-io")
+    assert io.get_stats()['operations'] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_store_keeps_loop_responsive(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    session_id = await manager.create_session({'name': 'io_test'})
+
+    ticks = 0
+    stop = asyncio.Event()
+
+    async def ticker():
+        nonlocal ticks
+        while not stop.is_set():
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker_task = asyncio.create_task(ticker())
+    files = [(bytes([index]) * 2_000_000, storage_metadata(f"image_{index:03d}", filename=f"point_{index:03d}.jpg", sequence_number=index)) for index in range(8)]
+    file_ids = await manager.store_scan_batch(files)
+    stop.set()
+    await ticker_task
+
+    assert file_ids == [f"image_{index:03d}" for index in range(8)]
+    assert ticks > 1
+
+    images = tmp_path / 'sessions' / session_id / 'images'
+    assert sorted(p.name for p in images.iterdir()) == [f"point_{index:03d}.jpg" for index in range(8)]
+
+    record = await manager._find_file_record('image_003')
+    assert record['file_size_bytes'] == 2_000_000
+    assert len(record['checksum']) == 64
+
+    assert await manager.finalize_session(session_id)
+    assert manager.sessions_index[session_id].total_files == 8
+    assert manager.sessions_index[session_id].total_size_bytes == 8 * 2_000_000
+    await manager.shutdown()
+
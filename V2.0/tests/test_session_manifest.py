@@ -0,0 +1,90 @@
+"""
+Test Session Manifest
+
+Checks the append-only per-session manifest: one line per stored file,
+indexed lookups by scan point and camera, recovery after a restart and a
+torn last line, and one-time import of legacy metadata sidecars.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+
+import pytest
+
+from storage.session_manifest import SessionManifest
+
+
+def point_image(storage_metadata, point, camera):
+    return storage_metadata(f"p{point}_c{camera}", filename=f"point_{point}_camera_{camera}.jpg",
+                            sequence_number=point, camera_settings={'camera_id': camera})
+
+
+@pytest.mark.asyncio
+async def test_store_appends_one_manifest_line(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    session_id = await manager.create_session({'name': 'manifest'})
+
+    for point in range(3):
+        for camera in (0, 1):
+            await manager.store_file(b'jpeg' * 10, point_image(storage_metadata, point, camera))
+
+    metadata_dir = tmp_path / 'sessions' / session_id / 'metadata'
+    lines = (metadata_dir / 'manifest.jsonl').read_text().splitlines()
+    assert len(lines) == 6
+    assert not list(metadata_dir.glob('*_metadata.json'))
+
+    by_point = await manager.find_session_files(session_id, scan_point_id=1)
+    assert sorted(r['file_id'] for r in by_point) == ['p1_c0', 'p1_c1']
+    by_camera = await manager.find_session_files(session_id, scan_point_id=2, camera_id=1)
+    assert [r['file_id'] for r in by_camera] == ['p2_c1']
+
+    report = await manager.generate_report(session_id)
+    assert report['total_files'] == 6
+    assert report['file_statistics']['scan_image']['total_size'] == 6 * 40
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_manifest_reloads_after_restart(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    session_id = await manager.create_session({'name': 'reload'})
+    await manager.store_file(b'first', point_image(storage_metadata, 0, 0))
+    await manager.store_file(b'second', point_image(storage_metadata, 1, 0))
+    assert await manager.update_metadata('p0_c0', {'tags': ['keep']})
+    assert await manager.delete_file('p1_c0')
+    await manager.shutdown()
+
+    # Simulate a write torn by power loss
+    manifest_path = tmp_path / 'sessions' / session_id / 'metadata' / 'manifest.jsonl'
+    with open(manifest_path, 'a') as f:
+        f.write('{"op": "put", "rec')
+
+    restarted = await make_manager()
+    data, metadata = await restarted.retrieve_file('p0_c0')
+    assert data == b'first'
+    assert metadata.tags == ['keep']
+    assert await restarted.retrieve_file('p1_c0') is None
+
+    manifest = await restarted._get_manifest(session_id)
+    manifest.append({'file_id': 'p2_c0', 'data_type': 'scan_image'})
+    await restarted.shutdown()
+
+    reloaded = SessionManifest(session_id, manifest_path.parent).load()
+    assert sorted(r['file_id'] for r in reloaded.records()) == ['p0_c0', 'p2_c0']
+
+
+def test_legacy_sidecars_imported_once(tmp_path):
+    metadata_dir = tmp_path / 'metadata'
+    metadata_dir.mkdir()
+    for index in range(3):
+        record = {'file_id': f"old_{index}", 'data_type': 'scan_image', 'file_size': 10}
+        (metadata_dir / f"old_{index}_metadata.json").write_text(json.dumps(record))
+
+    manifest = SessionManifest('legacy', metadata_dir).load()
+    manifest.close()
+
+    assert len(manifest) == 3
+    assert manifest.summary() == {'scan_image': {'count': 3, 'total_size': 30}}
+    assert len(SessionManifest('legacy', metadata_dir).load()) == 3
@@ -0,0 +1,101 @@
+"""
+Test Status Broadcaster
+
+Checks that status is computed once per tick for all SSE clients, that
+clients get a snapshot followed by deltas, and that change events push
+immediately.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+import threading
+import time
+
+from web.status_broadcaster import StatusBroadcaster, compute_delta
+
+
+class StatusSource:
+    def __init__(self):
+        self.calls = 0
+        self.x = 0.0
+
+    def __call__(self):
+        self.calls += 1
+        return {
+            'timestamp': time.time(),
+            'motion': {'position': {'x': self.x, 'y': 0.0}, 'status': 'idle'},
+            'scan': {'active': False}
+        }
+
+
+def parse(message):
+    fields = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+    return fields['event'], json.loads(fields['data'])
+
+
+def test_compute_delta():
+    old = {'a': 1, 'b': {'c': 2, 'd': 3}, 'gone': True}
+    new = {'a': 1, 'b': {'c': 2, 'd': 4}, 'e': [1]}
+
+    assert compute_delta(old, new) == {'b': {'d': 4}, 'e': [1], 'gone': None}
+    assert compute_delta(new, new) == {}
+
+
+def test_snapshot_then_delta_on_change_event():
+    source = StatusSource()
+    broadcaster = StatusBroadcaster(source, interval=10.0, min_interval=0.0)
+    stream = broadcaster.subscribe()
+
+    event, snapshot = parse(next(stream))
+    assert event == 'snapshot'
+    assert snapshot['motion']['position']['x'] == 0.0
+
+    source.x = 5.0
+    start = time.time()
+    broadcaster.request_update()
+    event, delta = parse(next(stream))
+
+    assert time.time() - start < 1.0  # Pushed by the event, not the 10 s tick
+    assert event == 'delta'
+    assert delta['motion'] == {'position': {'x': 5.0}}
+    stream.close()
+    broadcaster.stop()
+
+
+def test_clients_share_status_computation():
+    source = StatusSource()
+    broadcaster = StatusBroadcaster(source, interval=0.05, min_interval=0.0)
+    received = []
+
+    def client():
+        stream = broadcaster.subscribe()
+        next(stream)
+        received.append(True)
+        time.sleep(0.5)
+        stream.close()
+
+    threads = [threading.Thread(target=client) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    # ~10 ticks in 0.5 s regardless of the number of clients
+    assert len(received) == 5
+    assert source.calls < 25
+    broadcaster.stop()
+
+
+def test_unchanged_status_not_pushed():
+    source = StatusSource()
+    broadcaster = StatusBroadcaster(source, interval=0.02, min_interval=0.0)
+    stream = broadcaster.subscribe()
+    next(stream)
+
+    time.sleep(0.2)
+    assert broadcaster.stats['computations'] > 3
+    assert broadcaster.stats['deltas_sent'] == 0  # Only the timestamp changed
+    stream.close()
+    broadcaster.stop()
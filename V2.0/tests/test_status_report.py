@@ -0,0 +1,81 @@
+"""
+Test FluidNC Status Reports
+
+Checks the status parser (fields, cached WCO, corrupted coordinates) and
+that status callbacks run off the reader thread without losing state
+changes.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import threading
+import time
+
+import pytest
+
+from motion.status_report import StatusDispatcher, StatusParser, StatusReport
+
+
+def test_parse_fields_and_positions():
+    parser = StatusParser()
+    status = parser.parse("<Run|MPos:10.000,20.000,30.000,40.000|FS:800,0|Pn:XZ|WCO:1.000,2.000,0.000,0.000>", 5.0)
+
+    assert status.state == 'Run'
+    assert status.mpos == (10.0, 20.0, 30.0, 40.0)
+    assert status.feed_rate == 800.0
+    assert status.pins == 'XZ'
+    assert status.timestamp == 5.0
+    assert status.position == {'x': 10.0, 'y': 20.0, 'z': 30.0, 'a': 40.0}
+    assert status.work_position == {'x': 9.0, 'y': 18.0, 'z': 30.0, 'a': 40.0}
+
+    # WCO is only sent now and then; later reports keep the last offset
+    later = parser.parse("<Idle|MPos:11.000,20.000,30.000,40.000|FS:0,0>")
+    assert later.wco == (1.0, 2.0, 0.0, 0.0)
+    assert later.work_axes[0] == 10.0
+
+    with pytest.raises(AttributeError):
+        later.state = 'Run'
+
+
+def test_parse_repairs_corrupted_and_skips_bad_fields():
+    parser = StatusParser()
+    status = parser.parse("<Idle|MPos:0.0000.673,1.000,2.000,3.000|FS:x,y>")
+
+    assert status.mpos == (0.0, 1.0, 2.0, 3.0)
+    assert status.feed_rate == 0.0
+    assert parser.parse("ok") is None
+    assert parser.parse("<Alarm>").state == 'Alarm'
+    assert StatusReport().position == {'x': 0.0, 'y': 0.0, 'z': 0.0, 'a': 0.0}
+
+
+def test_dispatcher_runs_callbacks_off_thread_and_keeps_state_changes():
+    release = threading.Event()
+    seen = []
+
+    def slow_callback(status):
+        release.wait(1.0)
+        seen.append((status.state, status.mpos[0], threading.current_thread().name))
+
+    dispatcher = StatusDispatcher([slow_callback])
+    dispatcher.start()
+    parser = StatusParser()
+    reports = ["<Run|MPos:1,0,0,0>", "<Run|MPos:2,0,0,0>", "<Run|MPos:3,0,0,0>",
+               "<Idle|MPos:4,0,0,0>", "<Idle|MPos:5,0,0,0>"]
+
+    start = time.time()
+    for line in reports:
+        dispatcher.submit(parser.parse(line))
+    assert time.time() - start < 0.5  # Submitting never waits for the callback
+
+    release.set()
+    deadline = time.time() + 2.0
+    while (not seen or seen[-1][:2] != ('Idle', 5.0)) and time.time() < deadline:
+        time.sleep(0.01)
+    dispatcher.stop()
+
+    states = [state for state, _, _ in seen]
+    assert states.count('Idle') >= 1 and states.index('Run') < states.index('Idle')
+    assert seen[-1][:2] == ('Idle', 5.0)
+    assert len(seen) < len(reports)
+    assert all(name == "fluidnc-status-callbacks" for _, _, name in seen)
@@ -0,0 +1,92 @@
+"""
+Test Storage Statistics
+
+Checks the running usage counters: store/delete updates, seeding from the
+metadata index on restart, reconciliation against disk, and
+get_storage_stats answering without walking the location.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+from pathlib import Path
+
+import pytest
+
+from storage.base import DataType
+
+
+@pytest.mark.asyncio
+async def test_counters_follow_store_and_delete(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager()
+    session_id = await manager.create_session({'name': 'stats'})
+    await manager.store_file(b'a' * 100, storage_metadata('img0'))
+    await manager.store_file(b'b' * 50, storage_metadata('img1'))
+    await manager.store_file(b'c' * 10, storage_metadata('raw0', DataType.RAW_IMAGE))
+
+    counters = manager.get_usage_counters()
+    assert counters['sessions'][session_id] == {'files': 3, 'bytes': 160}
+    assert counters['data_types']['scan_image'] == {'files': 2, 'bytes': 150}
+
+    assert await manager.delete_file('img1')
+    assert manager.get_usage_counters()['sessions'][session_id] == {'files': 2, 'bytes': 110}
+
+    assert await manager.finalize_session(session_id)
+    assert manager.sessions_index[session_id].total_size_bytes == 110
+    await manager.shutdown()
+
+    restarted = await make_manager()
+    counters = restarted.get_usage_counters()
+    assert counters['sessions'][session_id] == {'files': 2, 'bytes': 110}
+    assert counters['data_types']['raw_image'] == {'files': 1, 'bytes': 10}
+    await restarted.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_storage_stats_do_not_walk(tmp_path, monkeypatch, make_manager, storage_metadata):
+    manager = await make_manager()
+    await manager.create_session({'name': 'stats'})
+    await manager.store_file(b'x' * 1000, storage_metadata('img0'))
+
+    counters = await manager.reconcile_storage_stats()
+    on_disk = sum(p.stat().st_size for p in tmp_path.rglob('*') if p.is_file())
+    assert counters['locations']['primary']['bytes'] == on_disk
+
+    def no_walk(*args, **kwargs):
+        raise AssertionError("get_storage_stats walked the tree")
+
+    monkeypatch.setattr(Path, 'rglob', no_walk)
+    stats = await manager.get_storage_stats('primary')
+    assert stats.used_space_gb * 1024 ** 3 == pytest.approx(on_disk)
+    assert stats.session_count == 1
+    assert stats.available_space_gb > 0
+    monkeypatch.undo()
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cleanup_drops_counters_before_reconcile(make_manager, storage_metadata):
+    manager = await make_manager()
+    old = await manager.create_session({'name': 'old'})
+    await manager.store_file(b'a' * 100, storage_metadata('img0'))
+    await manager.store_file(b'c' * 10, storage_metadata('raw0', DataType.RAW_IMAGE))
+    await manager.finalize_session(old)
+    active = await manager.create_session({'name': 'active'})
+    await manager.store_file(b'b' * 50, storage_metadata('img1'))
+
+    assert await manager.cleanup_old_sessions(days_old=0)
+
+    expected = {
+        'sessions': {active: {'files': 1, 'bytes': 50}},
+        'data_types': {'scan_image': {'files': 1, 'bytes': 50}, 'raw_image': {'files': 0, 'bytes': 0}},
+    }
+    counters = manager.get_usage_counters()
+    assert counters['sessions'] == expected['sessions']
+    assert counters['data_types'] == expected['data_types']
+
+    # Reconcile reseeds from the index, which no longer holds the old session
+    counters = await manager.reconcile_storage_stats()
+    assert counters['sessions'] == expected['sessions']
+    assert counters['data_types']['scan_image'] == {'files': 1, 'bytes': 50}
+    assert counters['data_types'].get('raw_image', {'files': 0, 'bytes': 0}) == {'files': 0, 'bytes': 0}
+    await manager.shutdown()
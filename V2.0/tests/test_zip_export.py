@@ -0,0 +1,80 @@
+"""
+Test Session ZIP Export
+
+Checks per-file compression (JPEG stored, JSON compressed), the streamed
+archive, and SessionManager.export_session / stream_session_zip.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+from core.exceptions import StorageError
+from storage.zip_export import ZipExporter, compression_for, session_entries
+
+
+def make_tree(root):
+    (root / 'images').mkdir(parents=True)
+    (root / 'images' / 'a.jpg').write_bytes(os.urandom(20000))
+    (root / 'images' / 'big.JPEG').write_bytes(os.urandom(300000))
+    (root / 'scan.json').write_text('{"point": 1}\n' * 500)
+
+
+def test_compression_by_type(tmp_path):
+    assert compression_for(tmp_path / 'x.jpg') == zipfile.ZIP_STORED
+    assert compression_for(tmp_path / 'x.JPEG') == zipfile.ZIP_STORED
+    assert compression_for(tmp_path / 'x.json') != zipfile.ZIP_STORED
+
+
+def test_stream_matches_file_export(tmp_path):
+    source = tmp_path / 'session'
+    make_tree(source)
+    exporter = ZipExporter(read_workers=2, prefetch=2, large_file_bytes=100000)
+
+    chunks = list(exporter.stream(session_entries(source)))
+    assert len(chunks) > 1
+
+    streamed = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+    written = zipfile.ZipFile(exporter.write_to_file(session_entries(source), tmp_path / 'out.zip'))
+
+    for archive in (streamed, written):
+        assert archive.testzip() is None
+        assert sorted(archive.namelist()) == ['images/a.jpg', 'images/big.JPEG', 'scan.json']
+        assert archive.getinfo('images/big.JPEG').compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo('scan.json').compress_type != zipfile.ZIP_STORED
+        assert archive.read('images/big.JPEG') == (source / 'images' / 'big.JPEG').read_bytes()
+    assert not list(tmp_path.glob('.out.zip.tmp'))
+
+
+@pytest.mark.asyncio
+async def test_session_export_and_stream(tmp_path, make_manager, storage_metadata):
+    manager = await make_manager(tmp_path / 'data')
+    session_id = await manager.create_session({'name': 'export'})
+    await manager.store_file(b'jpeg-bytes', storage_metadata('img0'))
+    await manager.finalize_session(session_id)
+
+    export_file = await manager.export_session(session_id, tmp_path / 'exports')
+    with zipfile.ZipFile(export_file) as archive:
+        names = archive.namelist()
+        assert any(name.endswith('img0.jpg') for name in names)
+        assert 'metadata/manifest.jsonl' in names
+
+    streamed = zipfile.ZipFile(io.BytesIO(b''.join(manager.stream_session_zip(session_id))))
+    assert sorted(streamed.namelist()) == sorted(names)
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('session_id', ['..', '.', '', '../sessions', 'unknown', '/etc'])
+async def test_stream_rejects_ids_outside_sessions(tmp_path, make_manager, session_id):
+    manager = await make_manager(tmp_path / 'data')
+    await manager.create_session({'name': 'export'})
+
+    with pytest.raises(StorageError):
+        manager.stream_session_zip(session_id)
+    await manager.shutdown()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+FluidNC Motion Path Benchmark (simulated board)
+
+Runs FluidNCEngine against the pty FluidNC simulator and measures:
+
+- command throughput: synchronous round trips and streamed lines per second
+- move-complete latency: time from sending a move until the engine reports
+  it finished, minus the simulator's kinematic move time
+- status freshness: age of the newest status report while a move is running
+
+The simulator times moves from the axis limits in the YAML configuration,
+so numbers are comparable between runs and usable in CI.
+
+Usage:
+    python tests/validation/benchmark_fluidnc_sim.py [--commands N] [--moves N] [--time-scale S]
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import yaml
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from motion.fluidnc_engine import FluidNCEngine
+from motion.fluidnc_simulator import FluidNCSimulator
+from motion.fluidnc_streamer import CharacterCountingStreamer
+
+CONFIG_FILE = Path(__file__).resolve().parents[2] / 'config' / 'scanner_config.yaml'
+
+
+def summary(values, unit="ms", scale=1000.0):
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    return (f"mean {statistics.mean(values) * scale:7.2f} {unit}   p95 {p95 * scale:7.2f} {unit}   "
+            f"max {values[-1] * scale:7.2f} {unit}")
+
+
+def bench_commands(engine, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        engine.send_command('G90')
+    round_trip = count / (time.perf_counter() - start)
+
+    streamer = CharacterCountingStreamer(engine)
+    start = time.perf_counter()
+    result = streamer.stream(['G90'] * count, wait_for_completion=False)
+    streamed = result.lines_acknowledged / (time.perf_counter() - start)
+
+    print(f"📊 Commands: {round_trip:8.0f} cmd/s round trip (command_delay {engine.command_delay * 1000:.0f} ms)   "
+          f"{streamed:8.0f} lines/s streamed")
+
+
+def bench_moves(engine, simulator, count):
+    latencies = []
+    position = 0.0
+    for i in range(count):
+        target = 20.0 + (i % 2) * 60.0  # Alternate 20 <-> 80 mm
+        expected = simulator.move_time({'x': position}, {'x': target}, 1000) / simulator.time_scale
+        start = time.perf_counter()
+        success, _ = engine.send_command_with_motion_wait(f'G1 X{target:.1f} F1000')
+        elapsed = time.perf_counter() - start
+        if not success:
+            print(f"❌ Move {i} failed")
+            continue
+        latencies.append(elapsed - expected)
+        position = target
+    print(f"📊 Move-complete latency (beyond kinematic time): {summary(latencies)}")
+
+
+def bench_freshness(engine):
+    ages = []
+    done = threading.Event()
+
+    def move():
+        engine.send_command_with_motion_wait('G1 X180 Y20 F1000')
+        done.set()
+
+    threading.Thread(target=move, daemon=True).start()
+    time.sleep(0.1)  # Let the motion report interval kick in
+    while not done.is_set():
+        ages.append(time.time() - engine.last_status_time)
+        time.sleep(0.002)
+    interval = f"{engine.motion_report_interval_ms} ms reports" if engine.auto_reporting else "polled"
+    print(f"📊 Status age during motion ({interval}): "
+          f"{summary(ages)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the motion path against the FluidNC simulator")
+    parser.add_argument('--commands', type=int, default=500, help="Commands per throughput measurement")
+    parser.add_argument('--moves', type=int, default=20, help="Moves for the latency measurement")
+    parser.add_argument('--time-scale', type=float, default=10.0, help="Machine seconds per wall second")
+    args = parser.parse_args()
+
+    with open(CONFIG_FILE) as f:
+        motion_config = yaml.safe_load(f)['motion']
+    controller = motion_config['controller'].get('status_reports', {})
+
+    with FluidNCSimulator(motion_config, time_scale=args.time_scale, must_home=False) as simulator:
+        engine = FluidNCEngine(port=simulator.port, command_timeout=5.0,
+                               report_interval_ms=controller.get('idle_interval_ms', 500),
+                               motion_report_interval_ms=controller.get('motion_interval_ms', 50))
+        if not engine.connect():
+            print("❌ Could not connect to the simulator")
+            return 1
+        try:
+            print(f"🧪 Simulator on {simulator.port} (time scale {args.time_scale}x)")
+            bench_commands(engine, args.commands)
+            bench_moves(engine, simulator, args.moves)
+            bench_freshness(engine)
+        finally:
+            engine.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
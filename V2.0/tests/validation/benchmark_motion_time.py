@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Motion Time Estimator Benchmark
+
+Measures MotionTimeEstimator.path_time on random 4-axis point lists of a
+few sizes, using the axis limits from the scanner configuration. Pattern
+duration estimates call it once per pattern, so this is the cost of
+showing an estimate in the web UI.
+
+Usage:
+    python tests/validation/benchmark_motion_time.py [--repeat N]
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import argparse
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from core.types import Position4D
+from motion.motion_time import MotionTimeEstimator
+
+MOTION_CONFIG = {
+    'axes': {
+        'x_axis': {'max_feedrate': 1000, 'acceleration': 25.0},
+        'y_axis': {'max_feedrate': 1000, 'acceleration': 25.0},
+        'z_axis': {'max_feedrate': 800, 'acceleration': 50.0},
+        'c_axis': {'max_feedrate': 5000, 'acceleration': 100.0},
+    },
+    'feedrates': {'scanning_mode': {'x_axis': 850.0, 'y_axis': 850.0, 'z_axis': 650.0, 'c_axis': 4000.0}},
+}
+
+
+def random_points(count, seed=1):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(0, 200, count), rng.uniform(0, 200, count),
+        rng.uniform(-180, 180, count), rng.uniform(-90, 90, count)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the motion time estimator")
+    parser.add_argument('--repeat', type=int, default=50, help="Measurements per size")
+    args = parser.parse_args()
+
+    estimator = MotionTimeEstimator.from_config(MOTION_CONFIG)
+    start = Position4D(0, 200, 0, 0)
+    print(f"📊 path_time over random points ({args.repeat} runs each)")
+    for count in (100, 1000, 10000, 100000):
+        points = random_points(count)
+        times = timeit.repeat(lambda: estimator.path_time(points, start=start), number=1, repeat=args.repeat)
+        print(f"   {count:7d} points   best {min(times) * 1e3:7.2f} ms   "
+              f"median {statistics.median(times) * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
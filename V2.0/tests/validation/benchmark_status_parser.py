@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+FluidNC Status Parser Benchmark
+
+Measures the cost of parsing one status report with StatusParser against
+the split-and-dict approach the protocol used before, on the reports seen
+during a move (position changes every report) and while idle (identical
+reports). At 50 Hz auto-reporting the parser runs 50 times a second on
+the reader thread.
+
+Usage:
+    python tests/validation/benchmark_status_parser.py [--number N]
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import argparse
+import itertools
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from motion.status_report import StatusParser
+
+
+def moving(suffix=""):
+    """Reports from a move: the position changes every time"""
+    return [f"<Run|MPos:{i * 0.125:.3f},187.500,-45.000,{i * 0.05:.3f}|FS:1000,0{suffix}>" for i in range(1000)]
+
+
+REPORTS = {
+    'moving': moving(),
+    'moving+wco': moving("|WCO:0.000,0.000,0.000,0.000"),
+    'idle+pins+ov': ["<Idle|MPos:100.000,50.000,90.000,0.000|FS:0,0|Pn:XY|Ov:100,100,100>"],
+}
+
+
+def split_parse(line):
+    """Reference: string splitting with three dicts and two copies per report"""
+    parts = line[1:-1].split('|')
+    result = {'state': parts[0], 'position': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'a': 0.0},
+              'work_position': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'a': 0.0},
+              'machine_position': {'x': 0.0, 'y': 0.0, 'z': 0.0, 'a': 0.0}}
+    for part in parts[1:]:
+        if part.startswith('MPos:'):
+            coords = [float(c.strip()) for c in part[5:].split(',')[:4]]
+            result['machine_position'] = dict(zip('xyza', coords))
+            result['position'] = result['machine_position'].copy()
+            result['work_position'] = result['machine_position'].copy()
+        elif part.startswith('FS:'):
+            fs = part[3:].split(',')
+            result['feed_rate'], result['spindle_speed'] = float(fs[0]), float(fs[1])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the FluidNC status parser")
+    parser.add_argument('--number', type=int, default=100000, help="Reports parsed per measurement")
+    args = parser.parse_args()
+
+    status_parser = StatusParser()
+    print(f"📊 Parsing {args.number} reports per case (best of 5)")
+    for name, lines in REPORTS.items():
+        next_line = itertools.cycle(lines).__next__
+        fast = min(timeit.repeat(lambda: status_parser.parse(next_line(), 0.0), number=args.number, repeat=5))
+        split = min(timeit.repeat(lambda: split_parse(next_line()), number=args.number, repeat=5))
+        print(f"   {name:14s} StatusParser {fast / args.number * 1e6:6.2f} µs   "
+              f"split+dict {split / args.number * 1e6:6.2f} µs   ({split / fast:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
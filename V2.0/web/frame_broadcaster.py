@@ -0,0 +1,237 @@
+"""
+Shared MJPEG Frame Broadcaster
+
+One background producer per camera captures and JPEG-encodes each preview
+frame exactly once and publishes it into a shared slot. Every HTTP client
+of ``/camera/<id>`` subscribes to the broadcaster and simply yields the
+most recent encoded frame.
+
+Clients never queue frames: a subscriber that is slower than the producer
+skips straight to the newest frame (per-client frame dropping), so one slow
+browser tab cannot stall the producer or the other viewers.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+# Same encoding the per-client stream loop used
+DEFAULT_ENCODE_PARAMS = [
+    cv2.IMWRITE_JPEG_QUALITY, 90,
+    cv2.IMWRITE_JPEG_OPTIMIZE, 1,
+    cv2.IMWRITE_JPEG_PROGRESSIVE, 1
+]
+
+
+def mjpeg_part(jpeg_data: bytes) -> bytes:
+    """Wrap encoded JPEG bytes as one multipart/x-mixed-replace part"""
+    return (b'--frame\r\n'
+            b'Content-Type: image/jpeg\r\n'
+            b'Content-Length: ' + str(len(jpeg_data)).encode() + b'\r\n\r\n' +
+            jpeg_data + b'\r\n')
+
+
+class FrameBroadcaster:
+    """
+    Single-producer, multi-subscriber MJPEG source for one camera
+
+    Args:
+        name: Camera name used in logs and the producer thread name
+        frame_source: Returns the next preview frame (BGR ndarray) or None
+        fallback_source: Returns a placeholder frame when no camera frame
+            is available (optional)
+        jpeg_source: Returns an already-encoded JPEG (e.g. from the camera's
+            lores/MJPEG preview path) or None; tried before ``frame_source``
+        fps: Target producer frame rate
+        encode_params: cv2.imencode parameters for the JPEG
+        idle_timeout: Seconds without subscribers before the producer stops
+    """
+
+    def __init__(self, name: str,
+                 frame_source: Callable[[], Optional[Any]],
+                 fallback_source: Optional[Callable[[], Optional[Any]]] = None,
+                 jpeg_source: Optional[Callable[[], Optional[bytes]]] = None,
+                 fps: float = 20.0,
+                 encode_params: Optional[List[int]] = None,
+                 idle_timeout: float = 5.0):
+        self.name = name
+        self.frame_source = frame_source
+        self.fallback_source = fallback_source
+        self.jpeg_source = jpeg_source
+        self.frame_interval = 1.0 / fps
+        self.encode_params = encode_params if encode_params is not None else DEFAULT_ENCODE_PARAMS
+        self.idle_timeout = idle_timeout
+
+        # Latest encoded frame slot, guarded by the condition
+        self._condition = threading.Condition()
+        self._latest_part: Optional[bytes] = None
+        self._sequence = 0
+
+        self._subscribers = 0
+        self._last_unsubscribe = 0.0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'frames_encoded': 0,
+            'frames_passthrough': 0,  # Pre-encoded JPEGs served without re-encoding
+            'frames_dropped': 0,     # Frames skipped by slow subscribers
+            'fallback_frames': 0,
+            'encode_errors': 0,
+            'total_subscribers': 0
+        }
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._subscribers
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start the producer thread (no-op if already running)"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._latest_part = None  # Never replay a frame from a previous run
+
+        self._thread = threading.Thread(target=self._produce_loop, name=f"mjpeg-{self.name}", daemon=True)
+        self._thread.start()
+        logger.info(f"📹 Frame broadcaster started for {self.name}")
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the producer and release waiting subscribers"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        logger.info(f"📹 Frame broadcaster stopped for {self.name}: {self.stats}")
+
+    def subscribe(self, keep_running: Optional[Callable[[], bool]] = None,
+                  frame_timeout: float = 2.0) -> Iterator[bytes]:
+        """
+        Yield multipart JPEG parts for one client
+
+        Always yields the newest frame; frames produced while the client
+        was still sending the previous one are dropped for this client only.
+        """
+        with self._condition:
+            self._subscribers += 1
+            self.stats['total_subscribers'] += 1
+        self.start()
+
+        last_sequence = 0
+        try:
+            while keep_running is None or keep_running():
+                with self._condition:
+                    if self._sequence == last_sequence:
+                        self._condition.wait_for(
+                            lambda: self._sequence != last_sequence or not self._running,
+                            timeout=frame_timeout
+                        )
+                    if not self._running:
+                        break
+                    if self._sequence == last_sequence:
+                        continue  # No new frame yet
+
+                    skipped = self._sequence - last_sequence - 1
+                    if last_sequence and skipped > 0:
+                        self.stats['frames_dropped'] += skipped
+                    last_sequence = self._sequence
+                    part = self._latest_part
+
+                if part:
+                    yield part
+        finally:
+            with self._condition:
+                self._subscribers -= 1
+                self._last_unsubscribe = time.time()
+
+    def _produce_loop(self):
+        """Capture and encode frames while anyone is watching"""
+        next_frame_time = time.time()
+
+        while self._running:
+            # Stop once nobody has watched for a while
+            if self._subscribers == 0 and time.time() - self._last_unsubscribe > self.idle_timeout:
+                with self._condition:
+                    if self._subscribers == 0:
+                        self._running = False
+                        self._condition.notify_all()
+                        break
+
+            delay = next_frame_time - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            next_frame_time = max(next_frame_time + self.frame_interval, time.time())
+
+            part = self._capture_and_encode()
+            if part is None:
+                continue
+
+            with self._condition:
+                self._latest_part = part
+                self._sequence += 1
+                self._condition.notify_all()
+
+        logger.debug(f"Frame broadcaster producer for {self.name} exited")
+
+    def _capture_and_encode(self) -> Optional[bytes]:
+        """Grab one frame from the camera (or fallback) and encode it"""
+        if self.jpeg_source:
+            try:
+                jpeg_data = self.jpeg_source()
+            except Exception as e:
+                jpeg_data = None
+                logger.debug(f"JPEG source error for {self.name}: {e}")
+            if jpeg_data:
+                self.stats['frames_passthrough'] += 1
+                return mjpeg_part(jpeg_data)
+
+        frame = None
+        try:
+            frame = self.frame_source()
+        except Exception as e:
+            logger.debug(f"Frame source error for {self.name}: {e}")
+
+        if frame is None or getattr(frame, 'size', 0) == 0:
+            if not self.fallback_source:
+                return None
+            frame = self.fallback_source()
+            if frame is None:
+                return None
+            self.stats['fallback_frames'] += 1
+
+        try:
+            ret, jpeg_buffer = cv2.imencode('.jpg', frame, self.encode_params)
+        except Exception as e:
+            ret, jpeg_buffer = False, None
+            logger.debug(f"JPEG encode error for {self.name}: {e}")
+
+        if not ret or jpeg_buffer is None or len(jpeg_buffer) == 0:
+            self.stats['encode_errors'] += 1
+            return None
+
+        self.stats['frames_encoded'] += 1
+        return mjpeg_part(jpeg_buffer.tobytes())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get broadcaster statistics"""
+        stats = self.stats.copy()
+        stats['subscribers'] = self._subscribers
+        stats['running'] = self._running
+        return stats
@@ -12,6 +12,8 @@ window.ScannerBase = {
         updateInterval: 1000,           // Base status update interval (ms) - faster for better responsiveness
         fastUpdateInterval: 250,        // Fast update interval (ms) - much faster during movement
         requestTimeout: 2000,           // API request timeout (ms) - faster failure detection for web UI responsiveness
+        statusStreamUrl: '/api/status/stream', // Server-Sent Events status push (snapshot + deltas)
+        maxStreamFailures: 3,           // Consecutive stream errors before falling back to HTTP polling
         showDebugLogs: true,            // Enable debug logging to troubleshoot position delays
         debug: true                     // Master debug flag for position debugging
     },
@@ -23,7 +25,10 @@ window.ScannerBase = {
         lastUpdate: null,
         pendingRequests: new Map(),
         isMoving: false,                // Track if system is currently moving
-        fastPolling: false              // Track if we're in fast polling mode
+        fastPolling: false,             // Track if we're in fast polling mode
+        statusStream: null,             // EventSource for pushed status updates
+        streamStatus: null,             // Full status assembled from snapshot + deltas
+        streamFailures: 0
     },
 
     // Polling interval reference
@@ -34,14 +39,109 @@ window.ScannerBase = {
      */
     init() {
         this.log('Initializing scanner base...');
-        this.setupHttpPolling();
+        if (window.EventSource) {
+            this.setupStatusStream();
+        } else {
+            this.setupHttpPolling();
+        }
         this.setupEventHandlers();
         this.startStatusUpdater();
         this.log('Scanner base initialized');
     },
 
     /**
-     * Setup HTTP polling for status updates (replacing WebSocket)
+     * Subscribe to server-pushed status (one snapshot, then deltas)
+     *
+     * The server computes status once per tick for all tabs, so no
+     * per-tab polling is needed. Falls back to HTTP polling if the
+     * stream keeps failing.
+     */
+    setupStatusStream() {
+        try {
+            this.log('Connecting to status push channel...');
+            const source = new EventSource(this.config.statusStreamUrl);
+            this.state.statusStream = source;
+
+            source.addEventListener('snapshot', (event) => {
+                this.state.streamStatus = JSON.parse(event.data);
+                this.applyStreamedStatus();
+            });
+
+            source.addEventListener('delta', (event) => {
+                if (!this.state.streamStatus) {
+                    return; // Wait for the next snapshot
+                }
+                this.mergeStatusDelta(this.state.streamStatus, JSON.parse(event.data));
+                this.applyStreamedStatus();
+            });
+
+            source.onopen = () => {
+                this.log('Status push channel connected');
+                this.state.streamFailures = 0;
+                if (this.pollingInterval) {
+                    clearInterval(this.pollingInterval);
+                    this.pollingInterval = null;
+                }
+            };
+
+            source.onerror = () => {
+                this.state.streamFailures += 1;
+                this.log(`Status push channel error (${this.state.streamFailures})`);
+                if (this.state.streamFailures >= this.config.maxStreamFailures) {
+                    source.close();
+                    this.state.statusStream = null;
+                    this.log('Falling back to HTTP status polling');
+                    this.setupHttpPolling();
+                }
+            };
+        } catch (error) {
+            this.log('Status push channel unavailable:', error);
+            this.setupHttpPolling();
+        }
+    },
+
+    /**
+     * Apply a pushed delta in place: nested objects merge, null removes a key
+     */
+    mergeStatusDelta(target, delta) {
+        Object.entries(delta).forEach(([key, value]) => {
+            if (value === null) {
+                delete target[key];
+            } else if (typeof value === 'object' && !Array.isArray(value) &&
+                       target[key] && typeof target[key] === 'object' && !Array.isArray(target[key])) {
+                this.mergeStatusDelta(target[key], value);
+            } else {
+                target[key] = value;
+            }
+        });
+    },
+
+    /**
+     * Hand the assembled streamed status to the normal update path
+     */
+    applyStreamedStatus() {
+        // Pass a copy so listeners never see the object mutate under them
+        this.processStatus(JSON.parse(JSON.stringify(this.state.streamStatus)));
+    },
+
+    /**
+     * Update UI and connection state from a full status object
+     */
+    processStatus(status) {
+        this.handleStatusUpdate(status);
+
+        // Determine system connection based on motion controller status
+        const motionConnected = Boolean(status.motion?.connected);
+        const systemConnected = motionConnected; // Base system connection on motion controller
+
+        if (systemConnected !== this.state.connected) {
+            this.state.connected = systemConnected;
+            this.updateConnectionStatus(systemConnected);
+        }
+    },
+
+    /**
+     * Setup HTTP polling for status updates (fallback when the push channel is unavailable)
      */
     setupHttpPolling() {
         try {
@@ -138,16 +238,7 @@ window.ScannerBase = {
             .then(response => {
                 // Extract the data from the API response
                 const status = response.data || response;
-                this.handleStatusUpdate(status);
-                
-                // Determine system connection based on motion controller status
-                const motionConnected = Boolean(status.motion?.connected);
-                const systemConnected = motionConnected; // Base system connection on motion controller
-                
-                if (systemConnected !== this.state.connected) {
-                    this.state.connected = systemConnected;
-                    this.updateConnectionStatus(systemConnected);
-                }
+                this.processStatus(status);
             })
             .catch(error => {
                 this.log('Polling error:', error);
@@ -190,6 +281,9 @@ window.ScannerBase = {
             if (this.pollingInterval) {
                 clearInterval(this.pollingInterval);
             }
+            if (this.state.statusStream) {
+                this.state.statusStream.close();
+            }
         });
     },
 
@@ -0,0 +1,294 @@
+"""
+Server-Sent Events Status Broadcaster
+
+Computes the system status once per tick (or immediately when an EventBus
+change event arrives) and pushes it to every connected browser over SSE.
+A new client receives one full snapshot; after that only the changed keys
+are sent as deltas. N open tabs therefore cost one status computation per
+tick instead of N polling requests.
+
+Each client has a small bounded queue. A client that falls behind is not
+allowed to stall the producer: its queue is dropped and it is resynced with
+a fresh snapshot.
+
+Author: Scanner System Development
+Created: October 2026
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Keys that change on every computation and alone do not warrant a push
+VOLATILE_KEYS = {'timestamp'}
+
+
+def compute_delta(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Recursive dict difference: changed/added keys with new values,
+    removed keys as None. Lists and scalars are replaced as a whole.
+    """
+    if old is None:
+        return dict(new)
+
+    delta: Dict[str, Any] = {}
+    for key, value in new.items():
+        if key not in old:
+            delta[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested = compute_delta(old[key], value)
+            if nested:
+                delta[key] = nested
+        elif value != old[key]:
+            delta[key] = value
+
+    for key in old:
+        if key not in new:
+            delta[key] = None
+    return delta
+
+
+def sse_message(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Events message"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class _StatusClient:
+    """Per-connection delivery queue"""
+
+    def __init__(self, max_queue: int):
+        self.queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        self.needs_resync = False
+
+
+class StatusBroadcaster:
+    """
+    Single-producer status push channel
+
+    Args:
+        compute_status: Builds the full status dict (called once per tick)
+        interval: Tick interval while the system is idle (seconds)
+        fast_interval: Tick interval while ``is_busy(status)`` is true
+        is_busy: Returns True for statuses that need fast updates
+            (motion in progress, scan running)
+        min_interval: Lower bound between computations when change
+            events arrive in bursts
+        client_queue_size: Messages buffered per client before resync
+        keepalive: Seconds between SSE keepalive comments
+    """
+
+    def __init__(self, compute_status: Callable[[], Dict[str, Any]],
+                 interval: float = 1.0,
+                 fast_interval: float = 0.2,
+                 is_busy: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 min_interval: float = 0.05,
+                 client_queue_size: int = 32,
+                 keepalive: float = 15.0):
+        self.compute_status = compute_status
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.is_busy = is_busy
+        self.min_interval = min_interval
+        self.client_queue_size = client_queue_size
+        self.keepalive = keepalive
+
+        self._condition = threading.Condition()
+        self._clients: List[_StatusClient] = []
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._sequence = 0
+        self._update_requested = False
+        self._last_compute = 0.0
+
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'computations': 0,
+            'deltas_sent': 0,
+            'event_triggers': 0,
+            'resyncs': 0,
+            'compute_errors': 0
+        }
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start the producer thread"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+
+        self._thread = threading.Thread(target=self._produce_loop, name="status-push", daemon=True)
+        self._thread.start()
+        logger.info("📡 Status broadcaster started")
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the producer and disconnect clients"""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+        logger.info(f"📡 Status broadcaster stopped: {self.stats}")
+
+    def request_update(self, *_args, **_kwargs):
+        """Recompute and push as soon as possible (safe to use as an EventBus callback)"""
+        with self._condition:
+            self._update_requested = True
+            self.stats['event_triggers'] += 1
+            self._condition.notify_all()
+
+    def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Most recently computed full status"""
+        return self._snapshot
+
+    def subscribe(self, keep_running: Optional[Callable[[], bool]] = None,
+                  snapshot_timeout: float = 2.0) -> Iterator[str]:
+        """Yield SSE messages for one client: a snapshot, then deltas"""
+        client = _StatusClient(self.client_queue_size)
+        with self._condition:
+            self._clients.append(client)
+            self._update_requested = True  # Fresh status for the newcomer
+            self._condition.notify_all()
+        self.start()
+
+        try:
+            # Initial snapshot (computed by the producer, not per client)
+            with self._condition:
+                self._condition.wait_for(lambda: self._snapshot is not None or not self._running,
+                                         timeout=snapshot_timeout)
+                snapshot, sequence = self._snapshot, self._sequence
+                self._drain(client)
+            if snapshot is not None:
+                yield sse_message('snapshot', snapshot, sequence)
+
+            while self._running and (keep_running is None or keep_running()):
+                if client.needs_resync:
+                    with self._condition:
+                        self._drain(client)
+                        client.needs_resync = False
+                        snapshot, sequence = self._snapshot, self._sequence
+                    self.stats['resyncs'] += 1
+                    yield sse_message('snapshot', snapshot, sequence)
+                    continue
+
+                try:
+                    event, sequence, data = client.queue.get(timeout=self.keepalive)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+
+                if event == 'close':
+                    break
+                yield sse_message(event, data, sequence)
+        finally:
+            with self._condition:
+                if client in self._clients:
+                    self._clients.remove(client)
+
+    @staticmethod
+    def _drain(client: _StatusClient):
+        while True:
+            try:
+                client.queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _produce_loop(self):
+        """Compute status on each tick or change event while clients are connected"""
+        while self._running:
+            busy = bool(self._snapshot is not None and self.is_busy and self._safe_is_busy(self._snapshot))
+            tick = self.fast_interval if busy else self.interval
+
+            with self._condition:
+                self._condition.wait_for(lambda: self._update_requested or not self._running, timeout=tick)
+                if not self._running:
+                    break
+                self._update_requested = False
+                has_clients = bool(self._clients)
+
+            if not has_clients:
+                continue
+
+            # Coalesce bursts of change events
+            since_last = time.time() - self._last_compute
+            if since_last < self.min_interval:
+                time.sleep(self.min_interval - since_last)
+
+            try:
+                status = self.compute_status()
+            except Exception as e:
+                self.stats['compute_errors'] += 1
+                logger.error(f"Status computation failed: {e}")
+                continue
+            finally:
+                self._last_compute = time.time()
+
+            self.stats['computations'] += 1
+            self._publish(status)
+
+        # Wake clients so their generators can finish
+        with self._condition:
+            for client in self._clients:
+                try:
+                    client.queue.put_nowait(('close', self._sequence, None))
+                except queue.Full:
+                    client.needs_resync = True
+
+    def _safe_is_busy(self, status: Dict[str, Any]) -> bool:
+        try:
+            return self.is_busy(status)
+        except Exception:
+            return False
+
+    def _publish(self, status: Dict[str, Any]):
+        """Send the change against the previous snapshot to every client"""
+        with self._condition:
+            previous = self._snapshot
+            self._snapshot = status
+            if previous is None:
+                # First status: clients pick it up as their snapshot
+                self._condition.notify_all()
+                return
+
+            delta = compute_delta(previous, status)
+            if not delta or set(delta) <= VOLATILE_KEYS:
+                self._condition.notify_all()
+                return
+
+            self._sequence += 1
+            message = ('delta', self._sequence, delta)
+            for client in self._clients:
+                try:
+                    client.queue.put_nowait(message)
+                except queue.Full:
+                    # Slow client: drop its backlog and send a fresh snapshot
+                    client.needs_resync = True
+            self.stats['deltas_sent'] += 1
+            self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get broadcaster statistics"""
+        stats = self.stats.copy()
+        stats['clients'] = len(self._clients)
+        stats['running'] = self._running
+        return stats
@@ -34,6 +34,9 @@ import cv2
 from flask import Flask, render_template, jsonify, request, Response, redirect, url_for
 from werkzeug.exceptions import BadRequest
 
+from web.frame_broadcaster import FrameBroadcaster
+from web.status_broadcaster import StatusBroadcaster
+
 # Import scanner modules
 try:
     from core.exceptions import ScannerSystemError, HardwareError
@@ -294,7 +297,16 @@ class ScannerWebInterface:
         # Web interface state (simplified without SocketIO for now)
         self._connected_clients = set()
         self._last_status_update = None
-        self._camera_streams = {}
+        self._camera_streams: Dict[str, FrameBroadcaster] = {}  # One shared producer per camera
+        self._camera_streams_lock = threading.Lock()
+
+        # Push channel: status computed once per tick and shared by all clients
+        self._status_broadcaster = StatusBroadcaster(
+            self._get_system_status,
+            interval=1.0,
+            fast_interval=0.2,
+            is_busy=self._status_needs_fast_updates
+        )
         self._running = False
         
         # Setup routes
@@ -377,7 +389,37 @@ class ScannerWebInterface:
             except Exception as e:
                 self.logger.error(f"Status API error: {e}")
                 return jsonify({'success': False, 'error': str(e)}), 500
-        
+
+        @self.app.route('/api/status/stream')
+        def api_status_stream():
+            """Server-Sent Events status push: one snapshot, then deltas"""
+            response = Response(
+                self._status_broadcaster.subscribe(keep_running=lambda: self._running),
+                mimetype='text/event-stream'
+            )
+            response.headers['Cache-Control'] = 'no-cache'
+            response.headers['X-Accel-Buffering'] = 'no'
+            return response
+
+        @self.app.route('/api/sessions/<session_id>/export.zip')
+        def api_session_export(session_id):
+            """Stream a session archive (built on the fly, no temporary file)"""
+            storage_manager = getattr(self.orchestrator, 'storage_manager', None)
+            if storage_manager is None or not hasattr(storage_manager, 'stream_session_zip'):
+                return jsonify({'success': False, 'error': 'Session storage not available'}), 503
+
+            try:
+                # Only cataloged sessions directly under sessions/ can be exported
+                chunks = storage_manager.stream_session_zip(session_id)
+            except Exception as e:
+                self.logger.warning(f"Session export refused for {session_id!r}: {e}")
+                return jsonify({'success': False, 'error': 'Session not found'}), 404
+
+            response = Response(chunks, mimetype='application/zip')
+            response.headers['Content-Disposition'] = f'attachment; filename="{session_id}.zip"'
+            response.headers['X-Accel-Buffering'] = 'no'
+            return response
+
         @self.app.route('/api/move', methods=['POST'])
         def api_move():
             """Execute manual movement command"""
@@ -1205,11 +1247,42 @@ class ScannerWebInterface:
                 # Return empty response that will trigger onerror in HTML
                 return Response("", status=404)
     
+    # Events that change what /api/status reports; each one triggers an immediate push
+    STATUS_CHANGE_EVENTS = [
+        'motion_status_changed', 'motion_completed', 'motion_connected', 'motion_disconnected',
+        'homing_completed', 'homing_failed', 'emergency_stop', 'controller_reset',
+        'operating_mode_changed', 'motion_error', 'camera_error'
+    ]
+
     def _setup_orchestrator_integration(self):
         """Setup integration with the scan orchestrator"""
-        # This will be implemented to listen to orchestrator events
-        # Note: SocketIO functionality temporarily removed for simplified deployment
-        pass
+        if not self.orchestrator:
+            return
+
+        # Components keep their own EventBus instances - listen on each of them
+        motion_controller = getattr(self.orchestrator, 'motion_controller', None)
+        sources = [
+            self.orchestrator,
+            motion_controller,
+            getattr(motion_controller, 'controller', None)
+        ]
+
+        subscribed = 0
+        for source in sources:
+            event_bus = getattr(source, 'event_bus', None) if source is not None else None
+            if event_bus is None or not hasattr(event_bus, 'subscribe'):
+                continue
+            for event_type in self.STATUS_CHANGE_EVENTS:
+                if event_bus.subscribe(event_type, self._status_broadcaster.request_update, "web_interface"):
+                    subscribed += 1
+
+        self.logger.info(f"📡 Status push subscribed to {subscribed} change events")
+
+    @staticmethod
+    def _status_needs_fast_updates(status: Dict[str, Any]) -> bool:
+        """Fast push rate while the machine is moving or scanning"""
+        motion_status = str(status.get('motion', {}).get('status', '')).lower()
+        return bool(status.get('scan', {}).get('active')) or motion_status in ('moving', 'homing', 'jogging', 'run', 'jog', 'home')
     
     def _setup_feedrate_integration(self):
         """Setup intelligent feedrate management for web interface"""
@@ -2234,7 +2307,7 @@ class ScannerWebInterface:
         return frame
     
     def _generate_camera_stream(self, camera_id):
-        """Simplified camera stream focused on Camera 0 only"""
+        """MJPEG stream for one client, fed by the camera's shared broadcaster"""
         import time
         import cv2
         import numpy as np
@@ -2271,112 +2344,51 @@ class ScannerWebInterface:
                 
                 time.sleep(0.1)  # 10 FPS for disabled camera
         
-        # High-performance camera streaming - supports both cameras
-        self.logger.debug(f"STREAM START: Camera {camera_id} high-performance streaming initialized")
-        
-        frame_counter = 0
-        last_log_time = 0
-        fps_target = 20  # Original 20 FPS target
-        frame_interval = 1.0 / fps_target
-        last_frame_time = 0
-        
-        while True:
-            frame_counter += 1
-            current_time = time.time()
-            
-            # Log every 20 seconds to reduce noise
-            should_log = (current_time - last_log_time) > 20.0
-            if should_log:
-                self.logger.debug(f"STREAM STATUS: Camera {camera_id} - Frame {frame_counter}")
-                last_log_time = current_time
-            
-            # Frame rate control
-            time_since_last = current_time - last_frame_time
-            if time_since_last < frame_interval:
-                time.sleep(frame_interval - time_since_last)
-                current_time = time.time()
-            
-            last_frame_time = current_time
-            
-            try:
-                orchestrator = getattr(self, 'orchestrator', None)
-                
-                if orchestrator and hasattr(orchestrator, 'camera_manager'):
-                    # High-performance streaming with direct frame access
-                    try:
-                        # Check if we should stop streaming (graceful shutdown)
-                        if not getattr(self, '_running', True):
-                            self.logger.info("STREAM SHUTDOWN: Graceful camera stream termination")
-                            break
-                            
-                        # Map camera_id to the correct backend camera
-                        if camera_id in [0, '0']:
-                            camera_key = 'camera_1'
-                        elif camera_id in [1, '1']:
-                            camera_key = 'camera_2'
-                        elif camera_id in ['camera_1', 'camera_2']:
-                            camera_key = camera_id
-                        else:
-                            camera_key = 'camera_1'  # Default fallback
-                            
-                        frame = orchestrator.camera_manager.get_preview_frame(camera_key)
-                        
-                        if frame is not None and frame.size > 0:
-                            if should_log:
-                                self.logger.debug(f"STREAM SUCCESS: High-performance frame received, shape: {frame.shape}")
-                            
-                            # Original high-quality encoding for smooth streaming
-                            encode_params = [
-                                cv2.IMWRITE_JPEG_QUALITY, 90,  # High quality for smooth experience
-                                cv2.IMWRITE_JPEG_OPTIMIZE, 1,  # Optimize file size
-                                cv2.IMWRITE_JPEG_PROGRESSIVE, 1  # Progressive JPEG for faster loading
-                            ]
-                            ret, jpeg_buffer = cv2.imencode('.jpg', frame, encode_params)
-                            
-                            if ret and len(jpeg_buffer) > 0:
-                                jpeg_data = jpeg_buffer.tobytes()
-                                
-                                yield (b'--frame\r\n'
-                                       b'Content-Type: image/jpeg\r\n'
-                                       b'Content-Length: ' + str(len(jpeg_data)).encode() + b'\r\n\r\n' +
-                                       jpeg_data + b'\r\n')
-                                continue
-                            else:
-                                if should_log:
-                                    self.logger.warning("STREAM WARNING: JPEG encoding failed")
-                        else:
-                            if should_log:
-                                self.logger.warning("STREAM WARNING: No frame data received")
-                    
-                    except (SystemExit, KeyboardInterrupt):
-                        self.logger.info("STREAM SHUTDOWN: Camera stream terminated by signal")
-                        break
-                    except Exception as e:
-                        if should_log:
-                            self.logger.error(f"STREAM ERROR: Frame capture failed: {e}")
-                else:
-                    if should_log:
-                        self.logger.warning("STREAM WARNING: No orchestrator available")
-                
-                # Lightweight fallback for unavailable camera
-                fallback_frame = self._create_fallback_frame(f"Camera {camera_id} - No Signal")
-                
-                # Encode fallback frame with lower quality
-                ret, jpeg_buffer = cv2.imencode('.jpg', fallback_frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-                if ret:
-                    jpeg_data = jpeg_buffer.tobytes()
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n'
-                           b'Content-Length: ' + str(len(jpeg_data)).encode() + b'\r\n\r\n' +
-                           jpeg_data + b'\r\n')
-                
-            except (SystemExit, KeyboardInterrupt):
-                self.logger.info("STREAM SHUTDOWN: Camera stream generator terminated gracefully")
-                break
-            except Exception as e:
-                if should_log:
-                    self.logger.error(f"STREAM CRITICAL: Unexpected error in Camera {camera_id} stream: {e}")
-                time.sleep(0.1)
+        # Map camera_id to the correct backend camera
+        if camera_id in [0, '0']:
+            camera_key = 'camera_1'
+        elif camera_id in [1, '1']:
+            camera_key = 'camera_2'
+        else:
+            camera_key = camera_id
+
+        # All clients of a camera share one capture + encode producer
+        self.logger.debug(f"STREAM START: Camera {camera_key} client subscribed to shared broadcaster")
+        broadcaster = self._get_frame_broadcaster(camera_key)
+        try:
+            yield from broadcaster.subscribe(keep_running=lambda: getattr(self, '_running', True))
+        except (SystemExit, KeyboardInterrupt, GeneratorExit):
+            self.logger.info(f"STREAM SHUTDOWN: Camera {camera_key} client disconnected")
+
+    def _get_frame_broadcaster(self, camera_key: str) -> FrameBroadcaster:
+        """Get (or create) the shared MJPEG producer for a camera"""
+        with self._camera_streams_lock:
+            broadcaster = self._camera_streams.get(camera_key)
+            if broadcaster is None:
+                broadcaster = FrameBroadcaster(
+                    camera_key,
+                    frame_source=lambda: self._get_stream_frame(camera_key),
+                    jpeg_source=lambda: self._get_stream_jpeg(camera_key),
+                    fallback_source=lambda: self._create_fallback_frame(f"Camera {camera_key} - No Signal"),
+                    fps=20
+                )
+                self._camera_streams[camera_key] = broadcaster
+            return broadcaster
+
+    def _get_stream_jpeg(self, camera_key: str) -> Optional[bytes]:
+        """Fetch a pre-encoded preview JPEG (lores/MJPEG path) if the camera manager offers one"""
+        orchestrator = getattr(self, 'orchestrator', None)
+        camera_manager = getattr(orchestrator, 'camera_manager', None) if orchestrator else None
+        if camera_manager and hasattr(camera_manager, 'get_preview_jpeg'):
+            return camera_manager.get_preview_jpeg(camera_key)
+        return None
+
+    def _get_stream_frame(self, camera_key: str):
+        """Fetch one preview frame from the orchestrator's camera manager"""
+        orchestrator = getattr(self, 'orchestrator', None)
+        if orchestrator and hasattr(orchestrator, 'camera_manager'):
+            return orchestrator.camera_manager.get_preview_frame(camera_key)
+        return None
     
     def start_web_server(self, host='0.0.0.0', port=8080, debug=False, use_reloader=None, production=False):
         """Start the Flask web server (simplified - Flask only)"""
@@ -2421,25 +2433,15 @@ class ScannerWebInterface:
     def stop_web_server(self):
         """Stop the web server"""
         self._running = False
+        for broadcaster in list(self._camera_streams.values()):
+            broadcaster.stop()
+        self._status_broadcaster.stop()
         self.logger.info("Web interface stopped")
     
     def _start_status_updater(self):
-        """Start background thread for status updates (simplified version without SocketIO)"""
-        def status_updater():
-            while self._running:
-                try:
-                    # In simplified mode, just log status periodically
-                    if self.orchestrator:
-                        status = self._get_system_status()
-                        self.logger.debug(f"System status: {status['system']['status']}")
-                    time.sleep(2.0)  # Update every 2 seconds - optimized for responsiveness
-                except Exception as e:
-                    self.logger.error(f"Status updater error: {e}")
-                    time.sleep(5.0)  # Faster recovery from errors
-        
-        update_thread = threading.Thread(target=status_updater, daemon=True)
-        update_thread.start()
-        self.logger.info("Status updater started")
+        """Start the status push channel (computes status only while clients are connected)"""
+        self._status_broadcaster.start()
+        self.logger.info("Status updater started (SSE push on /api/status/stream)")
 
 
 if __name__ == "__main__":